@@ -0,0 +1,434 @@
+"""User-defined alert rules compiled once and evaluated across the universe
+
+Rules are plain text, for example::
+
+    sector return < -5% over 5d AND crude up > 10%
+    RSI < 30 on any Banking stock
+    (rsi > 70 or %b > 1) and return over 20d > 15% on IT stocks
+
+``compile_rule`` turns a rule into disjunctive normal form over conditions
+``(feature, op, threshold)`` plus a scope. The engine stores every distinct
+condition once, compares the whole (tickers x conditions) feature matrix in
+one go and packs the result to bits along the ticker axis; clauses and rules
+are then bytewise AND/OR over packed rows, so 10k rules on 2k tickers touch a
+few MB per refresh. Rules that normalize to the same form are evaluated once,
+and a per-(rule, subject) cooldown keeps a rule from re-firing every refresh.
+"""
+import itertools
+import re
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+
+# Phrase -> (feature, level, windowed); level is what a rule on the feature alerts about
+METRICS = {
+    'rsi': ('rsi', 'ticker', False),
+    'atr': ('atr', 'ticker', False),
+    'macd': ('macd_hist', 'ticker', False),
+    'macd hist': ('macd_hist', 'ticker', False),
+    '%b': ('bb_pct_b', 'ticker', False),
+    'bollinger %b': ('bb_pct_b', 'ticker', False),
+    'close': ('close', 'ticker', False),
+    'price': ('close', 'ticker', False),
+    'return': ('return', 'ticker', True),
+    'stock return': ('return', 'ticker', True),
+    'sector return': ('sector_return', 'sector', True),
+    'crude': ('crude_oil', 'market', True),
+    'crude oil': ('crude_oil', 'market', True),
+    'brent': ('crude_oil', 'market', True),
+    'usd/inr': ('usd_inr', 'market', True),
+    'usd inr': ('usd_inr', 'market', True),
+    'gold': ('gold_price', 'market', True)
+}
+INDICATOR_FEATURES = ('rsi', 'atr', 'macd_hist', 'bb_pct_b')
+MACRO_FEATURES = ('crude_oil', 'usd_inr', 'gold_price')
+LEVELS = ('ticker', 'sector', 'market')
+OPS = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal}
+WORD_OPS = {'below': '<', 'under': '<', 'above': '>', 'over': '>'}
+FLIP = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+DEFAULT_DAYS = 5
+COOLDOWN_SECONDS = 3600
+DEFAULT_RULES = (
+    "sector return < -5% over 5d AND crude up > 10%",
+    "RSI < 30 on any Banking stock",
+    "RSI > 75 AND return over 20d > 15%",
+    "%b < 0 on any IT stock",
+)
+
+_TOKEN = re.compile(r"<=|>=|<|>|\(|\)|\d+d\b|-?\d+(?:\.\d+)?%?|[^\s()<>=]+")
+_DAYS = re.compile(r'\d+d')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?%?')
+_SCOPE_FILLER = {'any', 'all', 'every', 'stock', 'stocks', 'sector', 'the', 'in'}
+
+Condition = namedtuple('Condition', ['feature', 'op', 'threshold'])
+Rule = namedtuple('Rule', ['text', 'clauses', 'scope', 'level', 'severity'])
+
+
+class RuleError(ValueError):
+    """A rule that cannot be parsed"""
+
+
+def _window_feature(base, days):
+    return f"{base}_{days}d"
+
+
+def _parse_condition(tokens, text):
+    """['sector', 'return', '<', '-5%', 'over', '5d'] -> (Condition, level)"""
+    days, words = None, []
+    for i, token in enumerate(tokens):
+        if _DAYS.fullmatch(token):
+            days = int(token[:-1])
+        elif not (token in ('over', 'in', 'last') and i + 1 < len(tokens) and _DAYS.fullmatch(tokens[i + 1])):
+            words.append(token)
+
+    metric, op, threshold, direction, moved = [], None, None, 1, False
+    for token in words:
+        if token in ('up', 'rises', 'gains'):
+            direction, moved = 1, True
+        elif token in ('down', 'falls', 'drops'):
+            direction, moved = -1, True
+        elif _NUMBER.fullmatch(token) and threshold is None:
+            threshold = float(token.rstrip('%'))
+        elif token in OPS or token in WORD_OPS and metric:
+            op = WORD_OPS.get(token, token)
+        else:
+            metric.append(token)
+    if op is None and moved:
+        op = '>'  # 'crude up 10%'
+    name = ' '.join(metric)
+    if name not in METRICS:
+        raise RuleError(f"Unknown metric '{name}' in rule '{text}'")
+    if op is None or threshold is None:
+        raise RuleError(f"Missing comparison for '{name}' in rule '{text}'")
+    feature, level, windowed = METRICS[name]
+    if direction < 0:
+        # 'down > 10%' means the change is below -10%
+        op, threshold = FLIP[op], -threshold
+    if windowed:
+        feature = _window_feature(feature, days or DEFAULT_DAYS)
+    return Condition(feature, op, threshold), level
+
+
+def _split_scope(tokens):
+    """Split off a trailing top-level 'on ...' / 'for ...' scope"""
+    depth, cut = 0, None
+    for i, token in enumerate(tokens):
+        depth += token == '('
+        depth -= token == ')'
+        if depth == 0 and token in ('on', 'for'):
+            cut = i
+    if cut is None:
+        return tokens, []
+    return tokens[:cut], tokens[cut + 1:]
+
+
+def _dnf(tokens, text):
+    """Recursive descent: OR of ANDs, with parentheses; returns (clauses, levels)"""
+    pos = 0
+    levels = set()
+
+    def expr():
+        nonlocal pos
+        clauses = conjunction()
+        while pos < len(tokens) and tokens[pos] == 'or':
+            pos += 1
+            clauses = clauses + conjunction()
+        return clauses
+
+    def conjunction():
+        nonlocal pos
+        clauses = atom()
+        while pos < len(tokens) and tokens[pos] == 'and':
+            pos += 1
+            right = atom()
+            clauses = [a | b for a, b in itertools.product(clauses, right)]
+        return clauses
+
+    def atom():
+        nonlocal pos
+        if pos < len(tokens) and tokens[pos] == '(':
+            pos += 1
+            clauses = expr()
+            if pos >= len(tokens) or tokens[pos] != ')':
+                raise RuleError(f"Unbalanced parentheses in rule '{text}'")
+            pos += 1
+            return clauses
+        start = pos
+        while pos < len(tokens) and tokens[pos] not in ('and', 'or', '(', ')'):
+            pos += 1
+        if start == pos:
+            raise RuleError(f"Expected a condition in rule '{text}'")
+        condition, level = _parse_condition(tokens[start:pos], text)
+        levels.add(level)
+        return [frozenset([condition])]
+
+    clauses = expr()
+    if pos != len(tokens):
+        raise RuleError(f"Unexpected '{tokens[pos]}' in rule '{text}'")
+    return clauses, levels
+
+
+def compile_rule(text, sectors=(), resolve=None, severity='High'):
+    """Parse ``text`` into a ``Rule``; ``sectors`` and ``resolve`` give the scope vocabulary"""
+    tokens = [t.lower() for t in _TOKEN.findall(text)]
+    body, scope_tokens = _split_scope(tokens)
+    clauses, levels = _dnf(body, text)
+
+    scope = ('all',)
+    if scope_tokens:
+        name = ' '.join(t for t in scope_tokens if t not in _SCOPE_FILLER)
+        sector = next((s for s in sectors if s.lower() == name), None)
+        if sector is not None:
+            scope = ('sector', sector)
+        elif name:
+            ticker = resolve(name) if resolve else None
+            if ticker is None:
+                raise RuleError(f"Unknown sector or company '{name}' in rule '{text}'")
+            scope = ('ticker', ticker)
+
+    level = 'ticker' if scope[0] == 'ticker' else next(l for l in LEVELS if l in levels)
+    # Canonical order so equivalent rules compare equal
+    clauses = tuple(sorted({tuple(sorted(c)) for c in clauses}))
+    return Rule(text.strip(), clauses, scope, level, severity)
+
+
+def _pack(mask):
+    """(rows x tickers) bool -> (rows x ceil(tickers/8)) uint8"""
+    return np.packbits(mask, axis=1)
+
+
+class AlertEngine:
+    """Compiled rule set evaluated against a (tickers x features) snapshot each refresh"""
+
+    def __init__(self, sectors, resolve=None, cooldown=COOLDOWN_SECONDS):
+        """``sectors`` is the ``SectorAnalyzer`` sector dict (scope and sector returns)"""
+        self.sectors = sectors
+        self.resolve = resolve
+        self.cooldown = cooldown
+        self.rules = []
+        self.duplicates = 0
+        self._index = {}
+        self._arrays = None
+        self._masks = {}
+        self._subjects = {}
+        self._cool_keys = np.empty(0, dtype=np.int64)
+        self._cool_times = np.empty(0)
+        self._lock = threading.Lock()
+
+    def add(self, text, severity='High'):
+        """Compile and register a rule; an equivalent existing rule is reused (returns its id)"""
+        rule = compile_rule(text, self.sectors, self.resolve, severity)
+        key = (rule.clauses, rule.scope, rule.level)
+        with self._lock:
+            if key in self._index:
+                self.duplicates += 1
+                return self._index[key]
+            self._index[key] = len(self.rules)
+            self.rules.append(rule)
+            self._arrays = None
+            return self._index[key]
+
+    def add_many(self, texts, severity='High'):
+        """Register several rules; returns (rule ids, {text: error}) and skips rules that fail to parse"""
+        ids, errors = [], {}
+        for text in texts:
+            if not text.strip():
+                continue
+            try:
+                ids.append(self.add(text, severity))
+            except RuleError as e:
+                errors[text] = str(e)
+        return ids, errors
+
+    @property
+    def features(self):
+        """Snapshot columns the registered rules read"""
+        return sorted({c.feature for rule in self.rules for clause in rule.clauses for c in clause})
+
+    def _compile(self):
+        """Condition, clause and rule index arrays (padded with always-true/false sentinels)"""
+        conditions, clauses = {}, {}
+        for rule in self.rules:
+            for clause in rule.clauses:
+                for condition in clause:
+                    conditions.setdefault(condition, len(conditions))
+                clauses.setdefault(clause, len(clauses))
+        features = self.features
+        feature_ids = {f: i for i, f in enumerate(features)}
+        cond_list = list(conditions)
+        width = max((len(c) for c in clauses), default=1)
+        clause_conds = np.full((len(clauses), width), len(cond_list), dtype=np.int64)  # sentinel: true
+        for clause, k in clauses.items():
+            clause_conds[k, :len(clause)] = [conditions[c] for c in clause]
+        width = max((len(rule.clauses) for rule in self.rules), default=1)
+        rule_clauses = np.full((len(self.rules), width), len(clauses), dtype=np.int64)  # sentinel: false
+        for r, rule in enumerate(self.rules):
+            rule_clauses[r, :len(rule.clauses)] = [clauses[c] for c in rule.clauses]
+        scopes = {}
+        rule_scopes = np.array([scopes.setdefault((rule.scope, rule.level), len(scopes)) for rule in self.rules],
+                               dtype=np.int64)
+        severity_codes, severities = pd.factorize(pd.Series([rule.severity for rule in self.rules], dtype=object))
+        return {
+            'features': features,
+            'cond_feature': np.array([feature_ids[c.feature] for c in cond_list], dtype=np.int64),
+            'cond_op': np.array([c.op for c in cond_list]),
+            'cond_threshold': np.array([c.threshold for c in cond_list], dtype=float),
+            'clause_conds': clause_conds,
+            'rule_clauses': rule_clauses,
+            'texts': [rule.text for rule in self.rules],
+            'severity_codes': severity_codes,
+            'severities': list(severities),
+            'levels': np.array([LEVELS.index(rule.level) for rule in self.rules], dtype=np.int8),
+            'scopes': list(scopes),
+            'rule_scopes': rule_scopes
+        }
+
+    def _scope_masks(self, scopes, tickers, ticker_sectors):
+        """Packed ticker mask per (scope, level); sector/market rules keep one representative ticker"""
+        key = (tuple(scopes), tuple(tickers))
+        if key not in self._masks:
+            sector_of = pd.Series(ticker_sectors).reindex(tickers).to_numpy()
+            first_of_sector = ~pd.Series(sector_of).duplicated().to_numpy() & pd.notna(sector_of)
+            masks = np.zeros((len(scopes), len(tickers)), dtype=bool)
+            for i, (scope, level) in enumerate(scopes):
+                if scope[0] == 'sector':
+                    mask = sector_of == scope[1]
+                elif scope[0] == 'ticker':
+                    mask = np.asarray(tickers) == scope[1]
+                else:
+                    mask = np.ones(len(tickers), dtype=bool)
+                if level == 'sector':
+                    mask &= first_of_sector
+                elif level == 'market':
+                    mask &= np.cumsum(mask) == 1
+                masks[i] = mask
+            self._masks = {key: _pack(masks)}
+        return self._masks[key]
+
+    def snapshot(self, close, indicators=None, macro=None):
+        """Latest value of every feature the rules need, one row per ticker
+
+        ``close`` is a wide (dates x tickers) frame; ``indicators`` is either
+        the ``compute_indicators`` dict of wide frames or one (tickers x
+        indicators) frame as returned by ``IndicatorState.update``; ``macro``
+        maps indicator names to series (e.g. ``MacroStore.wide()``).
+        """
+        close = close.ffill()
+        tickers = close.columns
+        ticker_sectors = {t: s for s, data in self.sectors.items() for t in data['stocks']}
+        sector_of = pd.Series(ticker_sectors).reindex(tickers)
+        out = {}
+        if isinstance(indicators, dict):
+            indicators = pd.DataFrame({k: v.iloc[-1] for k, v in indicators.items() if k in INDICATOR_FEATURES})
+        latest = close.iloc[-1]
+        for feature in self.features:
+            base, _, days = feature.rpartition('_')
+            if feature in INDICATOR_FEATURES:
+                out[feature] = indicators[feature].reindex(tickers) if indicators is not None else np.nan
+            elif feature == 'close':
+                out[feature] = latest
+            elif base in ('return', 'sector_return'):
+                n = int(days[:-1])
+                ret = (latest / close.iloc[-1 - n] - 1) * 100 if len(close) > n else latest * np.nan
+                if base == 'sector_return':
+                    ret = sector_of.map(ret.groupby(sector_of).mean())
+                out[feature] = ret
+            elif base in MACRO_FEATURES:
+                n = int(days[:-1])
+                series = pd.Series(macro[base] if macro is not None and base in macro else [], dtype=float).dropna()
+                out[feature] = (series.iloc[-1] / series.iloc[-1 - n] - 1) * 100 if len(series) > n else np.nan
+        return pd.DataFrame(out, index=tickers).reindex(columns=self.features)
+
+    def evaluate(self, snapshot, now=None):
+        """Rules firing on ``snapshot`` and out of cooldown: one row per (rule, subject)"""
+        now = time.time() if now is None else now
+        columns = ['Rule', 'Severity', 'Level', 'Subject', 'Ticker', 'Sector']
+        with self._lock:
+            if self._arrays is None:
+                self._arrays = self._compile()
+            arrays = self._arrays
+            rules = list(self.rules)
+        if not rules:
+            return pd.DataFrame(columns=columns)
+
+        tickers = list(snapshot.index)
+        ticker_sectors = {t: s for s, data in self.sectors.items() for t in data['stocks']}
+        with tracer.span("alert_engine: evaluate", rules=len(rules), tickers=len(tickers)):
+            values = snapshot[arrays['features']].to_numpy(dtype=float)[:, arrays['cond_feature']]
+            hits = np.zeros((values.shape[1] + 1, len(tickers)), dtype=bool)
+            hits[-1] = True
+            for op, compare in OPS.items():
+                cols = np.nonzero(arrays['cond_op'] == op)[0]
+                if len(cols):
+                    # NaN compares False, so missing data never fires
+                    hits[cols] = compare(values[:, cols], arrays['cond_threshold'][cols]).T
+            packed = _pack(hits)
+
+            clause_conds = arrays['clause_conds']
+            clause_bits = packed[clause_conds[:, 0]]
+            for j in range(1, clause_conds.shape[1]):
+                clause_bits &= packed[clause_conds[:, j]]
+            clause_bits = np.vstack([clause_bits, np.zeros((1, packed.shape[1]), dtype=np.uint8)])
+
+            rule_clauses = arrays['rule_clauses']
+            rule_bits = clause_bits[rule_clauses[:, 0]]
+            for j in range(1, rule_clauses.shape[1]):
+                rule_bits |= clause_bits[rule_clauses[:, j]]
+            rule_bits &= self._scope_masks(arrays['scopes'], tickers, ticker_sectors)[arrays['rule_scopes']]
+
+            fired_rules = np.nonzero(rule_bits.any(axis=1))[0]
+            bits = np.unpackbits(rule_bits[fired_rules], axis=1, count=len(tickers)).astype(bool)
+            rows, cols = np.nonzero(bits)
+            rule_ids = fired_rules[rows]
+            with self._lock:
+                subjects = np.array([self._subjects.setdefault(t, len(self._subjects)) for t in tickers],
+                                    dtype=np.int64)
+                keep = self._out_of_cooldown(rule_ids, subjects[cols], now)
+            rule_ids, cols = rule_ids[keep], cols[keep]
+
+            # Categorical columns: a busy refresh can fire millions of (rule, ticker) pairs
+            sector_codes, sector_names = pd.factorize(pd.Series(ticker_sectors, dtype=object).reindex(tickers))
+            subject_names = pd.Index(tickers + list(sector_names) + ['Market']).unique()
+            ticker_subject = subject_names.get_indexer(tickers)
+            sector_subject = np.append(subject_names.get_indexer(sector_names), -1)[sector_codes]
+            levels = arrays['levels'][rule_ids]
+            subject = np.where(levels == 1, sector_subject[cols],
+                               np.where(levels == 2, len(subject_names) - 1, ticker_subject[cols]))
+            fired = pd.DataFrame({
+                'Rule': pd.Categorical.from_codes(rule_ids, arrays['texts']),
+                'Severity': pd.Categorical.from_codes(arrays['severity_codes'][rule_ids], arrays['severities']),
+                'Level': pd.Categorical.from_codes(levels, LEVELS),
+                'Subject': pd.Categorical.from_codes(subject, subject_names),
+                'Ticker': pd.Categorical.from_codes(cols, tickers),
+                'Sector': pd.Categorical.from_codes(sector_codes[cols], sector_names)
+            })
+        return fired[columns]
+
+    def _out_of_cooldown(self, rule_ids, subject_ids, now):
+        """Mask of (rule, subject) pairs not fired within ``cooldown``; stamps them with ``now``"""
+        keys = rule_ids.astype(np.int64) << 32 | subject_ids
+        pos = np.searchsorted(self._cool_keys, keys)
+        found = pos < len(self._cool_keys)
+        found[found] = self._cool_keys[pos[found]] == keys[found]
+        cooling = np.zeros(len(keys), dtype=bool)
+        cooling[found] = now - self._cool_times[pos[found]] < self.cooldown
+        emit = ~cooling
+        stamp = emit & found
+        self._cool_times[pos[stamp]] = now
+        new = emit & ~found
+        if new.any():
+            merged = np.concatenate([self._cool_keys, keys[new]])
+            times = np.concatenate([self._cool_times, np.full(int(new.sum()), now)])
+            order = np.argsort(merged, kind='stable')
+            self._cool_keys, self._cool_times = merged[order], times[order]
+        return emit
+
+    def reset_cooldowns(self):
+        with self._lock:
+            self._cool_keys = np.empty(0, dtype=np.int64)
+            self._cool_times = np.empty(0)
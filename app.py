@@ -4,10 +4,33 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import requests
+import functools
+import hashlib
 import json
 import os
-from global_impact_analyzer import GlobalImpactAnalyzer, SupplyChainMonitor
+from global_impact_analyzer import GlobalImpactAnalyzer, SupplyChainMonitor, event_ingestor
 from fund_analyzer import display_fund_analysis, get_fund_recommendations
+from performance_tracker import tracer, display_performance_page
+from chart_cache import chart_cache, MAX_POINTS
+from table_styles import show_table, RATING_STYLES, LEVEL_STYLES, PRIORITY_STYLES, BIAS_STYLES
+from sector_analyzer import SectorAnalyzer
+from tick_store import TickStore
+from quote_stream import QuoteStreamEngine, feed_from_env, MACRO_SYMBOLS
+from technical_indicators import compute_indicators, screen_signals
+from backtester import Backtester, collect_rating_events
+from budget_tracker import BudgetTracker, PolicyTracker
+from event_study import EventStudy, policy_entities, required_tickers, window_label, HEADLINE_WINDOW
+from portfolio_optimizer import PortfolioOptimizer
+from macro_store import MacroStore, INDICATORS, LEVEL_INDICATORS
+from sector_regression import SectorRegression
+from correlation_clusters import CorrelationClusters, compare_sectors, DEFAULT_DRIFT
+from page_loader import PageLoader
+from entity_resolver import get_resolver
+from alert_engine import AlertEngine, DEFAULT_RULES
+from portfolio_tracker import PortfolioBook, get_portfolio_store, priority_map
+from snapshot_store import get_snapshot_store, versioned
+from news_api import NewsAPI, get_google_news
+from article_extractor import get_article_extractor
 
 # Access control check
 if os.getenv("APP_ACCESS_ENABLED", "false").lower() != "true":
@@ -19,534 +42,1148 @@ st.set_page_config(page_title="Top-Down Stock Analysis", page_icon="📊", layou
 
 # Sidebar
 st.sidebar.title("🔍 Top-Down Analysis")
-analysis_mode = st.sidebar.radio("Select Analysis Level", 
-    ["📈 Macro Economy", "🏭 Sector Analysis", "🏢 Company Analysis", "📰 News & Budget", "🌍 Global Impact", "💰 Fund Analysis"])
+pages = ["📈 Macro Economy", "🏭 Sector Analysis", "🏢 Company Analysis", "📰 News & Budget", "🌍 Global Impact", "💰 Fund Analysis", "💼 Portfolio"]
+# Hidden page: enable with PERF_PAGE_ENABLED=true or the ?perf=1 query param
+if os.getenv("PERF_PAGE_ENABLED", "false").lower() == "true" or st.query_params.get("perf") == "1":
+    pages.append("⏱ Performance")
+analysis_mode = st.sidebar.radio("Select Analysis Level", pages)
 
-# Main Title
-st.title("📊 Top-Down Stock Analysis Dashboard")
-st.markdown("---")
+# Live quotes are available when QUOTE_FEED points at a replay file or socket
+live_quotes = bool(os.getenv("QUOTE_FEED")) and st.sidebar.toggle("📡 Live Quotes")
 
-# ===== MACRO ECONOMY =====
-if analysis_mode == "📈 Macro Economy":
-    st.header("📈 Macro Economic Indicators")
-    
-    col1, col2, col3, col4 = st.columns(4)
+# Time travel: render every page from the datasets recorded by the end of a chosen day
+snapshot_store = get_snapshot_store()
+snapshot_datasets = snapshot_store.datasets()
+as_of = None
+if snapshot_datasets and st.sidebar.toggle("🕰 Time Travel"):
+    first_saved = min(snapshot_store.versions(name)[0] for name in snapshot_datasets)
+    as_of_day = st.sidebar.date_input("Show data as of", value=datetime.now().date(),
+                                      min_value=first_saved.date(), max_value=datetime.now().date())
+    as_of = pd.Timestamp(as_of_day) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+    st.sidebar.caption(f"{len(snapshot_datasets)} datasets recorded since {first_saved:%d %b %Y}")
+    live_quotes = False
+
+def get_quote_stream():
+    """Per-session feed and incremental quote engine"""
+    if 'quote_engine' not in st.session_state:
+        try:
+            st.session_state.quote_feed, st.session_state.quote_feed_error = feed_from_env(), None
+        except (OSError, ValueError) as e:  # missing replay file, refused connection, bad QUOTE_FEED
+            st.session_state.quote_feed, st.session_state.quote_feed_error = None, str(e)
+        st.session_state.quote_engine = QuoteStreamEngine(SectorAnalyzer().sectors)
+    engine, feed = st.session_state.quote_engine, st.session_state.quote_feed
+    if feed is None:
+        st.warning(f"Live quote feed unavailable: {st.session_state.quote_feed_error}. Check QUOTE_FEED.")
+    else:
+        with tracer.span("quote_stream.poll"):
+            engine.consume(feed.poll())
+    return engine, engine.drain_deltas()
+
+@st.fragment(run_every=2)
+def live_macro_quotes():
+    engine, deltas = get_quote_stream()
+    cols = st.columns(len(MACRO_SYMBOLS))
+    for col, (label, symbol) in zip(cols, MACRO_SYMBOLS.items()):
+        quote = engine.symbol(symbol)
+        with col:
+            if quote:
+                st.metric(label, f"{quote['price']:,.2f}", f"{quote['change']:+.2f}")
+            else:
+                st.metric(label, "—")
+    st.caption(f"{engine.ticks_processed:,} ticks processed | {len(deltas['symbols'])} symbols updated")
+
+@st.fragment(run_every=2)
+def live_sector_quotes():
+    engine, deltas = get_quote_stream()
+    table = engine.sector_table()
+    cols = st.columns(len(table))
+    for col, (_, row) in zip(cols, table.iterrows()):
+        with col:
+            st.metric(row['sector'], f"{row['level']:,.1f}", f"{row['return_%']:+.2f}%")
+    st.dataframe(table.round(3), use_container_width=True, hide_index=True)
+    st.caption(f"{engine.ticks_processed:,} ticks processed | {len(deltas['sectors'])} sectors updated")
+
+# Datasets this run had no recording of by ``as_of`` and showed live; the page banner names them
+live_datasets = []
+
+def unwrap_versioned(loader):
+    """Return the value of a cached loader's ``Versioned`` result, noting it in ``live_datasets`` if served live"""
+    @functools.wraps(loader)
+    def load(*args, **kwargs):
+        result = loader(*args, **kwargs)
+        if result.live:
+            live_datasets.append(result.name)
+        return result.value
+    return load
+
+# Each loader records what it fetched in the snapshot store; with ``as_of`` it reads that record back.
+# The cached value keeps its live/recorded flag, so cache hits still report it
+@unwrap_versioned
+@st.cache_data(ttl=3600, show_spinner="Fetching price history...")
+def load_price_matrix(period='1y', as_of=None):
+    return versioned(f"price_matrix_{period}", lambda: SectorAnalyzer().get_price_matrix(period=period), as_of)
+
+@unwrap_versioned
+@st.cache_data(ttl=3600, show_spinner="Fetching price history...")
+def load_close_prices(tickers, period='2y', as_of=None):
+    name = f"close_prices_{period}_{hashlib.sha1(','.join(tickers).encode()).hexdigest()[:12]}"
+    return versioned(name, lambda: SectorAnalyzer().get_price_matrix(tickers=tickers, period=period,
+                                                                     fields=('Close',))['Close'], as_of)
+
+@unwrap_versioned
+@st.cache_data(ttl=3600, show_spinner="Fetching macro history...")
+def load_macro_store(period='5y', as_of=None):
+    return versioned(f"macro_store_{period}", lambda: MacroStore.load(period=period), as_of)
+
+@unwrap_versioned
+@st.cache_data(ttl=3600, show_spinner="Fetching sector indices...")
+def load_sector_returns(period='5y', as_of=None):
+    return versioned(f"sector_returns_{period}", lambda: SectorAnalyzer().get_sector_returns(period=period), as_of)
+
+@st.cache_data(ttl=900, show_spinner="Fetching articles...")
+def load_sector_headlines(sector):
+    """NewsAPI and Google News items for a sector with the linked article's summary"""
+    items = [{'title': a.get('title', ''), 'url': a.get('url', ''), 'source': (a.get('source') or {}).get('name', 'NewsAPI'),
+              'published': a.get('publishedAt', '')} for a in NewsAPI().get_sector_news(sector)]
+    items += [{'title': e['title'], 'url': e['link'], 'source': e['source'], 'published': e['published']}
+              for e in get_google_news(sector)]
+    return get_article_extractor().enrich(items)
+
+@st.cache_resource
+def get_sector_regression():
+    """Shared regression engine; each refresh of the cached returns only solves the new days"""
+    return SectorRegression()
+
+@st.cache_resource
+def get_correlation_clusters():
+    """Shared EWMA correlation engine; each refresh of the cached prices only applies the new bars"""
+    return CorrelationClusters()
+
+@st.cache_resource
+def get_event_study(prices):
+    """Shared event study; each policy's abnormal returns are computed once per price history"""
+    return EventStudy(prices)
+
+def get_alert_engine(rules_text):
+    """Compiled rules kept per session so cooldowns survive reruns; recompiled when the rules change"""
+    if st.session_state.get('alert_rules') != rules_text:
+        engine = AlertEngine(SectorAnalyzer().sectors, get_resolver())
+        st.session_state.alert_errors = engine.add_many(rules_text.splitlines())[1]
+        st.session_state.alert_engine = engine
+        st.session_state.alert_rules = rules_text
+    return st.session_state.alert_engine, st.session_state.alert_errors
+
+def get_portfolio_book():
+    """Book loaded from the store once per session; lot edits and price marks then apply as deltas"""
+    if 'portfolio_book' not in st.session_state:
+        book = PortfolioBook(SectorAnalyzer().sectors, priority_map(BudgetTracker().get_stock_universe()))
+        book.load(get_portfolio_store().lots())
+        st.session_state.portfolio_book = book
+    return st.session_state.portfolio_book
+
+def portfolio_ticker(resolver, name):
+    """Ticker for a typed company name or ticker; None (with a warning) for a name that does not resolve"""
+    match = resolver.match(name)
+    if match.ticker:
+        return match.ticker
+    if ' ' not in name.strip():  # looks like a ticker symbol: take it as typed
+        return name.strip().upper()
+    hint = f" Did you mean **{match.suggestion}**?" if match.suggestion else ""
+    st.warning(f"'{name}' is not a known company. Enter its NSE ticker (e.g. TATAMOTORS.NS).{hint}")
+    return None
+
+@st.fragment(run_every=2)
+def live_portfolio_marks(book):
+    engine, deltas = get_quote_stream()
+    marked = book.mark({symbol: quote['price'] for symbol, quote in deltas['symbols'].items()})
+    summary = book.summary()
+    col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("GDP Growth", "7.8%", "0.6%")
+        st.metric("Market Value", f"₹{summary['value']:,.0f}")
     with col2:
-        st.metric("Inflation (CPI)", "4.8%", "-0.3%")
+        st.metric("Unrealized P&L", f"₹{summary['pnl']:,.0f}", f"{summary['pnl_%']:+.2f}%")
     with col3:
-        st.metric("Interest Rate", "6.5%", "0%")
-    with col4:
-        st.metric("USD/INR", "₹82.8", "-0.4")
-    
-    st.markdown("---")
-    
-    # Economic Indicators Chart
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("GDP Growth Trend")
-        gdp_data = pd.DataFrame({
-            'Quarter': ['Q1 2025', 'Q2 2025', 'Q3 2025', 'Q4 2025', 'Q1 2026'],
-            'GDP Growth %': [7.2, 7.8, 8.1, 7.9, 7.6]
-        })
-        fig = px.line(gdp_data, x='Quarter', y='GDP Growth %', markers=True)
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.subheader("Inflation Trend")
-        inflation_data = pd.DataFrame({
-            'Month': ['Aug 25', 'Sep 25', 'Oct 25', 'Nov 25', 'Dec 25', 'Jan 26'],
-            'CPI %': [5.2, 4.9, 4.6, 4.5, 4.3, 4.8]
-        })
-        fig = px.bar(inflation_data, x='Month', y='CPI %', color='CPI %')
-        st.plotly_chart(fig, use_container_width=True)
-    
+        st.metric("Positions Revalued", marked)
+    st.caption(f"{engine.ticks_processed:,} ticks processed | {len(deltas['symbols'])} symbols updated")
+
+def get_portfolio_optimizer(universe, as_of=None):
+    """Optimizer kept per session so slider changes warm-start from the last solve"""
+    tickers = tuple(sorted(universe['Ticker'].dropna().unique()))
+    if st.session_state.get('optimizer_tickers') != (tickers, as_of):
+        prices = load_close_prices(tickers, as_of=as_of)
+        st.session_state.portfolio_optimizer = PortfolioOptimizer(prices, universe) if not prices.empty else None
+        st.session_state.optimizer_tickers = (tickers, as_of)
+    return st.session_state.portfolio_optimizer
+
+# Every page renders inside its span, so reruns and exceptions still close it
+with tracer.span(f"page: {analysis_mode}"):
+    # Main Title
+    st.title("📊 Top-Down Stock Analysis Dashboard")
+    as_of_banner = st.empty()
+    if as_of is not None:
+        as_of_banner.info(f"🕰 Showing the data recorded as of {as_of:%d %b %Y}")
     st.markdown("---")
-    st.subheader("🎯 Investment Recommendation")
-    st.success("✅ **Bullish Market**: Strong GDP growth with controlled inflation. Favor cyclical sectors.")
 
-# ===== SECTOR ANALYSIS =====
-elif analysis_mode == "🏭 Sector Analysis":
-    st.header("🏭 Sector Performance & Government Spending")
-    
-    # Government Budget Allocation
-    st.subheader("💰 Government Budget Allocation (FY 2025-26)")
+    # ===== MACRO ECONOMY =====
+    if analysis_mode == "📈 Macro Economy":
+        st.header("📈 Macro Economic Indicators")
+    
+        macro_store = load_macro_store(as_of=as_of)
+        snapshot = macro_store.snapshot()
+        metric_formats = {
+            'gdp_growth': "{:.1f}%", 'inflation_cpi': "{:.2f}%", 'repo_rate': "{:.2f}%", 'usd_inr': "₹{:.2f}",
+            'crude_oil': "${:.2f}", 'gold_price': "₹{:,.0f}", 'fii_inflow': "₹{:,.0f} Cr", 'dii_inflow': "₹{:,.0f} Cr"
+        }
+        for row in (list(metric_formats)[:4], list(metric_formats)[4:]):
+            for col, name in zip(st.columns(4), row):
+                with col:
+                    value, change = snapshot.loc[name, 'value'], snapshot.loc[name, 'change']
+                    if snapshot.loc[name, 'placeholder']:
+                        st.metric(snapshot.loc[name, 'label'], metric_formats[name].format(value),
+                                  help="Placeholder: no dated series (add one under MACRO_DIR)")
+                    else:
+                        st.metric(snapshot.loc[name, 'label'], metric_formats[name].format(value), f"{change:+,.2f}",
+                                  help=f"As of {snapshot.loc[name, 'as_of']:%d %b %Y}")
+        stale = macro_store.stale(now=as_of)
+        if stale:
+            st.warning("⚠️ Stale macro data, last observation older than one release period: " +
+                       ", ".join(f"{INDICATORS.get(name, name)} ({date:%d %b %Y})" for name, date in stale.items()))
+    
+        if live_quotes:
+            st.subheader("📡 Live Quotes")
+            live_macro_quotes()
     
-    budget_data = pd.DataFrame({
-        'Sector': ['Infrastructure', 'Defense', 'Healthcare', 'Green Energy', 'Agriculture', 
-                   'Education', 'Digital India', 'Railways', 'Manufacturing', 'MSME'],
-        'Budget (₹ Cr)': [175000, 140000, 105000, 95000, 135000, 78000, 58000, 110000, 98000, 65000],
-        'YoY Change %': [17, 12, 18, 27, 12, 15, 29, 16, 20, 18]
-    })
+        st.markdown("---")
     
-    col1, col2 = st.columns(2)
+        # Economic Indicators Chart
+        col1, col2 = st.columns(2)
     
-    with col1:
-        fig = px.bar(budget_data.sort_values('Budget (₹ Cr)', ascending=False).head(10), 
-                     x='Sector', y='Budget (₹ Cr)', color='YoY Change %',
-                     title="Top 10 Sectors by Budget Allocation")
-        st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            st.subheader("GDP Growth Trend")
+            gdp = macro_store.series('gdp_growth').iloc[-8:]
+            gdp_data = pd.DataFrame({'Released': gdp.index.strftime('%b %Y'), 'GDP Growth %': gdp.to_numpy()})
+            with tracer.span("figure: gdp_trend"):
+                fig = chart_cache.figure("gdp_trend", px.line, gdp_data, max_points=MAX_POINTS,
+                                         x='Released', y='GDP Growth %', markers=True)
+                st.plotly_chart(fig, use_container_width=True)
     
-    with col2:
-        fig = px.pie(budget_data, values='Budget (₹ Cr)', names='Sector', 
-                     title="Budget Distribution")
-        st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            st.subheader("Inflation Trend")
+            cpi = macro_store.series('inflation_cpi').iloc[-12:]
+            inflation_data = pd.DataFrame({'Released': cpi.index.strftime('%b %y'), 'CPI %': cpi.to_numpy()})
+            with tracer.span("figure: inflation_trend"):
+                fig = chart_cache.figure("inflation_trend", px.bar, inflation_data, max_points=MAX_POINTS,
+                                         x='Released', y='CPI %', color='CPI %')
+                st.plotly_chart(fig, use_container_width=True)
     
-    st.markdown("---")
+        st.markdown("---")
+        st.subheader("📐 Sector Sensitivity to Macro Factors")
     
-    # Sector Performance
-    st.subheader("📊 Sector Performance (Last 6 Months)")
+        col1, col2 = st.columns(2)
+        with col1:
+            factors = [name for name in macro_store.names if len(macro_store.series(name)) > 1]
+            factor = st.selectbox("Macro factor", factors, format_func=lambda name: INDICATORS.get(name, name),
+                                  index=factors.index('usd_inr') if 'usd_inr' in factors else 0)
+        with col2:
+            beta_window = st.select_slider("Rolling window (trading days)", [21, 63, 126, 252], value=63)
+    
+        sector_returns = load_sector_returns(as_of=as_of)
+        if sector_returns.empty:
+            st.info("Sector index history unavailable.")
+        else:
+            betas = macro_store.rolling_betas(sector_returns, factor, window=beta_window).dropna(how='all')
+            if betas.empty:
+                st.info(f"{INDICATORS.get(factor, factor)} did not move within any {beta_window}-day window.")
+            else:
+                unit = "1 pp change" if factor in LEVEL_INDICATORS else "1% move"
+                with tracer.span("figure: macro_betas"):
+                    fig = chart_cache.figure("macro_betas", px.line, betas.rename_axis('Date').reset_index(),
+                                             max_points=MAX_POINTS, x='Date', y=list(betas.columns),
+                                             labels={'value': 'Beta', 'variable': 'Sector'},
+                                             title=f"Rolling {beta_window}-day beta of sector returns per {unit} in {INDICATORS.get(factor, factor)}")
+                    st.plotly_chart(fig, use_container_width=True)
+                latest = betas.iloc[-1].dropna().sort_values()
+                if not latest.empty:
+                    st.caption(f"Most exposed: {latest.index[-1]} ({latest.iloc[-1]:+.3f}) | "
+                               f"Least exposed: {latest.index[0]} ({latest.iloc[0]:+.3f})")
     
-    sector_performance = pd.DataFrame({
-        'Sector': ['IT', 'Banking', 'Pharma', 'Auto', 'Infrastructure', 'FMCG', 'Energy', 'Metals'],
-        'Returns %': [12.5, 18.3, 8.7, 22.1, 28.5, 6.2, 15.8, 19.4],
-        'PE Ratio': [25.3, 18.5, 28.9, 22.1, 35.2, 45.6, 12.3, 8.7],
-        'Govt Focus': ['High', 'Medium', 'High', 'High', 'Very High', 'Low', 'Very High', 'Medium']
-    })
+        st.markdown("---")
+        st.subheader("🎯 Investment Recommendation")
+        st.success("✅ **Bullish Market**: Strong GDP growth with controlled inflation. Favor cyclical sectors.")
+
+    # ===== SECTOR ANALYSIS =====
+    elif analysis_mode == "🏭 Sector Analysis":
+        st.header("🏭 Sector Performance & Government Spending")
+    
+        # Government Budget Allocation
+        st.subheader("💰 Government Budget Allocation (FY 2025-26)")
+    
+        budget_data = pd.DataFrame({
+            'Sector': ['Infrastructure', 'Defense', 'Healthcare', 'Green Energy', 'Agriculture', 
+                       'Education', 'Digital India', 'Railways', 'Manufacturing', 'MSME'],
+            'Budget (₹ Cr)': [175000, 140000, 105000, 95000, 135000, 78000, 58000, 110000, 98000, 65000],
+            'YoY Change %': [17, 12, 18, 27, 12, 15, 29, 16, 20, 18]
+        })
     
-    st.dataframe(sector_performance, use_container_width=True)
+        col1, col2 = st.columns(2)
     
-    # Sector Heatmap
-    st.subheader("🔥 Sector Heatmap (Government Focus vs Returns)")
-    fig = px.scatter(sector_performance, x='PE Ratio', y='Returns %', 
-                     size='Returns %', color='Govt Focus', hover_name='Sector',
-                     size_max=60, color_discrete_map={
-                         'Very High': 'green', 'High': 'lightgreen', 
-                         'Medium': 'yellow', 'Low': 'orange'
-                     })
-    st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            with tracer.span("figure: budget_bar"):
+                fig = chart_cache.figure("budget_bar", px.bar, budget_data.sort_values('Budget (₹ Cr)', ascending=False).head(10), 
+                                         x='Sector', y='Budget (₹ Cr)', color='YoY Change %',
+                                         title="Top 10 Sectors by Budget Allocation")
+                st.plotly_chart(fig, use_container_width=True)
     
-    st.markdown("---")
-    st.subheader("🎯 Top Sectors to Watch")
+        with col2:
+            with tracer.span("figure: budget_pie"):
+                fig = chart_cache.figure("budget_pie", px.pie, budget_data, values='Budget (₹ Cr)', names='Sector', 
+                                         title="Budget Distribution")
+                st.plotly_chart(fig, use_container_width=True)
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.info("**🏗️ Infrastructure**\n\n₹1.75L Cr Budget (+17%)\n\nTop Pick: L&T, IRB Infra")
-    with col2:
-        st.success("**⚡ Green Energy**\n\n₹95K Cr Budget (+27%)\n\nTop Pick: Adani Green, Tata Power")
-    with col3:
-        st.warning("**🚗 Auto & EV**\n\n24.5% Returns\n\nTop Pick: Tata Motors, M&M")
-
-# ===== COMPANY ANALYSIS =====
-elif analysis_mode == "🏢 Company Analysis":
-    st.header("🏢 Company Fundamental Analysis")
-    
-    # Company Selector
-    sector = st.selectbox("Select Sector", 
-        ['IT', 'Banking', 'Pharma', 'Auto', 'Infrastructure', 'Energy'])
-    
-    # Sector-specific companies
-    sector_companies = {
-        'IT': ['TCS', 'Infosys', 'HCL Tech', 'Wipro'],
-        'Banking': ['HDFC Bank', 'ICICI Bank', 'SBI', 'Axis Bank'],
-        'Pharma': ['Sun Pharma', 'Dr Reddy', 'Cipla', 'Lupin'],
-        'Auto': ['Tata Motors', 'M&M', 'Maruti Suzuki', 'Bajaj Auto'],
-        'Infrastructure': ['L&T', 'UltraTech', 'Adani Ports', 'IRB Infra'],
-        'Energy': ['Reliance Industries', 'ONGC', 'Adani Green', 'Tata Power']
-    }
-    
-    company = st.selectbox("Select Company", sector_companies[sector])
-    
-    # Sector-specific metrics
-    sector_metrics = {
-        'IT': {'market_cap': '₹12.5L Cr', 'pe': '24.8', 'roe': '22.1%', 'de': '0.15', 'div': '2.8%'},
-        'Banking': {'market_cap': '₹8.9L Cr', 'pe': '16.5', 'roe': '15.8%', 'de': '2.1', 'div': '3.2%'},
-        'Pharma': {'market_cap': '₹6.2L Cr', 'pe': '28.9', 'roe': '18.5%', 'de': '0.25', 'div': '1.5%'},
-        'Auto': {'market_cap': '₹4.8L Cr', 'pe': '22.1', 'roe': '16.2%', 'de': '0.65', 'div': '2.1%'},
-        'Infrastructure': {'market_cap': '₹16.8L Cr', 'pe': '26.2', 'roe': '19.5%', 'de': '0.38', 'div': '2.1%'},
-        'Energy': {'market_cap': '₹18.5L Cr', 'pe': '15.8', 'roe': '14.2%', 'de': '0.42', 'div': '0.8%'}
-    }
-    
-    # Company-specific metrics
-    company_metrics = {
-        'TCS': {'market_cap': '₹13.2L Cr', 'pe': '25.1', 'roe': '23.5%', 'de': '0.12', 'div': '3.1%'},
-        'Infosys': {'market_cap': '₹7.8L Cr', 'pe': '24.5', 'roe': '21.8%', 'de': '0.18', 'div': '2.5%'},
-        'HDFC Bank': {'market_cap': '₹9.2L Cr', 'pe': '17.2', 'roe': '16.5%', 'de': '1.8', 'div': '3.5%'},
-        'ICICI Bank': {'market_cap': '₹8.6L Cr', 'pe': '15.8', 'roe': '15.1%', 'de': '2.4', 'div': '2.9%'},
-        'Sun Pharma': {'market_cap': '₹6.5L Cr', 'pe': '29.2', 'roe': '19.1%', 'de': '0.22', 'div': '1.8%'},
-        'Dr Reddy': {'market_cap': '₹5.9L Cr', 'pe': '28.6', 'roe': '17.9%', 'de': '0.28', 'div': '1.2%'},
-        'Tata Motors': {'market_cap': '₹5.1L Cr', 'pe': '23.5', 'roe': '17.2%', 'de': '0.72', 'div': '1.8%'},
-        'M&M': {'market_cap': '₹4.5L Cr', 'pe': '20.7', 'roe': '15.2%', 'de': '0.58', 'div': '2.4%'},
-        'L&T': {'market_cap': '₹17.2L Cr', 'pe': '27.1', 'roe': '20.1%', 'de': '0.35', 'div': '2.3%'},
-        'UltraTech': {'market_cap': '₹16.4L Cr', 'pe': '25.3', 'roe': '18.9%', 'de': '0.41', 'div': '1.9%'},
-        'Reliance Industries': {'market_cap': '₹19.1L Cr', 'pe': '16.2', 'roe': '14.8%', 'de': '0.39', 'div': '0.9%'},
-        'ONGC': {'market_cap': '₹17.9L Cr', 'pe': '15.4', 'roe': '13.6%', 'de': '0.45', 'div': '0.7%'}
-    }
+        st.markdown("---")
     
-    st.markdown("---")
+        # Sector Performance
+        st.subheader("📊 Sector Performance (Last 6 Months)")
     
-    # Company Metrics
-    metrics = company_metrics.get(company, sector_metrics[sector])
-    col1, col2, col3, col4, col5 = st.columns(5)
-    with col1:
-        st.metric("Market Cap", metrics['market_cap'])
-    with col2:
-        st.metric("P/E Ratio", metrics['pe'], "-2.3")
-    with col3:
-        st.metric("ROE", metrics['roe'], "1.3%")
-    with col4:
-        st.metric("Debt/Equity", metrics['de'], "-0.07")
-    with col5:
-        st.metric("Dividend Yield", metrics['div'])
+        sector_performance = pd.DataFrame({
+            'Sector': ['IT', 'Banking', 'Pharma', 'Auto', 'Infrastructure', 'FMCG', 'Energy', 'Metals'],
+            'Returns %': [12.5, 18.3, 8.7, 22.1, 28.5, 6.2, 15.8, 19.4],
+            'PE Ratio': [25.3, 18.5, 28.9, 22.1, 35.2, 45.6, 12.3, 8.7],
+            'Govt Focus': ['High', 'Medium', 'High', 'High', 'Very High', 'Low', 'Very High', 'Medium']
+        })
     
-    st.markdown("---")
+        show_table(sector_performance, {'Govt Focus': PRIORITY_STYLES}, hide_index=False)
+    
+        if live_quotes:
+            st.subheader("📡 Live Sector Indices")
+            live_sector_quotes()
+    
+        # Clusters from how stocks actually co-move, next to the curated sectors
+        st.subheader("🧬 Data-Driven Sectors")
+        if st.toggle("Cluster stocks by return correlation"):
+            prices = load_price_matrix(as_of=as_of)
+            if prices['Close'].empty:
+                st.warning("Price data unavailable. Check your internet connection.")
+            else:
+                analyzer = SectorAnalyzer()
+                names, ticker_sectors = analyzer.ticker_labels()
+                clustering = get_correlation_clusters()
+                col1, col2 = st.columns(2)
+                with col1:
+                    n_clusters = st.slider("Number of clusters", 2, 15, len(analyzer.sectors))
+                with col2:
+                    drift = st.slider("Recluster when any correlation moves by", 0.02, 0.5, DEFAULT_DRIFT, 0.01)
+                # The engine is shared across sessions: settings are passed per call, never set on it
+                clustering.extend(prices['Close'].sort_index().pct_change(fill_method=None).iloc[1:])
+                labels = clustering.clusters(n_clusters, drift)
+                if labels.empty:
+                    st.info("Not enough price history to cluster.")
+                else:
+                    st.dataframe(compare_sectors(labels, ticker_sectors, names), use_container_width=True, hide_index=True)
+                    corr = clustering.correlation().loc[labels.index, labels.index]
+                    corr.index = corr.columns = [f"{names.get(t, t)} (C{c})" for t, c in labels.items()]
+                    with tracer.span("figure: cluster_correlation", tickers=len(corr)):
+                        fig = chart_cache.figure("cluster_correlation", px.imshow, corr, aspect='auto',
+                                                 color_continuous_scale='RdBu', color_continuous_midpoint=0,
+                                                 title="EWMA return correlation, ordered by cluster")
+                        st.plotly_chart(fig, use_container_width=True)
+                    moved = clustering.drift_since_cluster(n_clusters)
+                    st.caption(f"{len(labels)} stocks over {len(clustering.index)} sessions | half-life {clustering.halflife} sessions | "
+                               f"largest correlation move since clustering {moved:.3f} | "
+                               f"{clustering.reclusters} reclusters, {clustering.cache_hits} cached")
+    
+        # Sector Heatmap
+        st.subheader("🔥 Sector Heatmap (Government Focus vs Returns)")
+        with tracer.span("figure: sector_scatter"):
+            fig = chart_cache.figure("sector_scatter", px.scatter, sector_performance, x='PE Ratio', y='Returns %', 
+                                     size='Returns %', color='Govt Focus', hover_name='Sector',
+                                     size_max=60, color_discrete_map={
+                                         'Very High': 'green', 'High': 'lightgreen', 
+                                         'Medium': 'yellow', 'Low': 'orange'
+                                     })
+            st.plotly_chart(fig, use_container_width=True)
+    
+        # Intraday history from the local memory-mapped tick store
+        st.markdown("---")
+        st.subheader("⏱️ Intraday Price History")
+        tick_store = TickStore()
+        intraday_analyzer = SectorAnalyzer(tick_store=tick_store)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            record_sector = st.selectbox("Record 1-minute bars for", list(intraday_analyzer.sectors), key="record_sector")
+        with col2:
+            if st.button("Record Intraday Bars"):
+                record_tickers = [intraday_analyzer.sectors[record_sector]['index']] + intraday_analyzer.sectors[record_sector]['stocks']
+                with st.spinner(f"Fetching intraday bars for {len(record_tickers)} tickers..."):
+                    recorded = sum(intraday_analyzer.record_intraday(ticker) for ticker in record_tickers)
+                st.success(f"Stored {recorded:,} new bars for {record_sector}")
+        stored_tickers = tick_store.tickers()
+        if not stored_tickers:
+            st.info("No intraday bars stored yet. Record a sector above; later recordings only append new bars.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                intraday_ticker = st.selectbox("Ticker", stored_tickers)
+            with col2:
+                bar_size = st.selectbox("Bar Size", ['1m', '5m', '15m', '1h', '1d'], index=1)
+            with col3:
+                lookback = st.selectbox("Lookback", ['1 Week', '1 Month', '1 Year', 'All'], index=1)
+        
+            lookback_days = {'1 Week': 7, '1 Month': 30, '1 Year': 365, 'All': None}[lookback]
+            start = datetime.now() - timedelta(days=lookback_days) if lookback_days else None
+            bars = intraday_analyzer.get_intraday_bars(intraday_ticker, bar_size, start=start)
+        
+            if bars.empty:
+                st.info("No stored bars in the selected window.")
+            else:
+                with tracer.span("figure: intraday", points=len(bars)):
+                    fig = chart_cache.figure("intraday", px.line, bars.reset_index(), max_points=MAX_POINTS,
+                                             x='Datetime', y='Close', title=f"{intraday_ticker} ({bar_size} bars)")
+                    st.plotly_chart(fig, use_container_width=True)
+    
+        # Technical signal screen across every sector stock
+        st.markdown("---")
+        st.subheader("📐 Technical Signal Screen")
+        if st.toggle("Run screen on live prices (RSI, MACD, Bollinger, ATR, 50/200 DMA)"):
+            prices = load_price_matrix(as_of=as_of)
+            if prices['Close'].empty:
+                st.warning("Price data unavailable. Check your internet connection.")
+            else:
+                lookback = st.slider("Crossovers within last N sessions", 1, 20, 5)
+                with tracer.span("indicators: compute", tickers=prices['Close'].shape[1]):
+                    indicators = compute_indicators(prices['High'], prices['Low'], prices['Close'])
+                    names, ticker_sectors = SectorAnalyzer().ticker_labels()
+                    signals = screen_signals(indicators, prices['Close'], lookback=lookback,
+                                             names=names, sectors=ticker_sectors)
+                if signals.empty:
+                    st.info("No crossovers or extremes in the selected window.")
+                else:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric("Bullish Signals", int((signals['Bias'] == 'Bullish').sum()))
+                    with col2:
+                        st.metric("Bearish Signals", int((signals['Bias'] == 'Bearish').sum()))
+                    show_table(signals, {'Bias': BIAS_STYLES})
+    
+        # User-defined alert rules evaluated over every sector stock at once
+        st.markdown("---")
+        st.subheader("🔔 Alert Rules")
+        rules_text = st.text_area("One rule per line", "\n".join(DEFAULT_RULES),
+                                  help="Metrics: RSI, %b, MACD, ATR, close, return, sector return, crude, USD/INR, gold. "
+                                       "Windows: 'over 5d'. Combine with AND/OR and parentheses; scope with 'on any Banking stock' or 'on TCS'.")
+        if st.toggle("Evaluate alert rules on latest prices"):
+            prices = load_price_matrix(as_of=as_of)
+            if prices['Close'].empty:
+                st.warning("Price data unavailable. Check your internet connection.")
+            else:
+                engine, errors = get_alert_engine(rules_text)
+                for rule, error in errors.items():
+                    st.warning(f"Skipped: {error}")
+                engine.cooldown = st.slider("Cooldown before a rule re-fires (minutes)", 0, 240, 60) * 60
+                with tracer.span("indicators: compute", tickers=prices['Close'].shape[1]):
+                    indicators = compute_indicators(prices['High'], prices['Low'], prices['Close'])
+                snapshot = engine.snapshot(prices['Close'], indicators, load_macro_store(as_of=as_of).wide())
+                alerts = engine.evaluate(snapshot)
+                if alerts.empty:
+                    st.info("No rule fired (or all are cooling down).")
+                else:
+                    show_table(alerts.astype(str), {'Severity': LEVEL_STYLES})
+                st.caption(f"{len(engine.rules)} rules ({engine.duplicates} duplicates merged) over {len(snapshot)} stocks | "
+                           f"{len(alerts)} alerts this refresh")
     
-    col1, col2 = st.columns(2)
+        st.markdown("---")
+        st.subheader("🧭 Sector Sensitivity to Repo Rate, Crude & USD/INR")
+        sector_returns = load_sector_returns(as_of=as_of)
+        if sector_returns.empty:
+            st.info("Sector index history unavailable.")
+        else:
+            regression = get_sector_regression()
+            macro_store = load_macro_store(as_of=as_of)
+            macro_changes = macro_store.factor_changes(sector_returns.index, regression.factors)
+            stale = macro_store.stale(now=as_of, names=regression.factors)
+            if stale:
+                st.warning("⚠️ Regression uses stale macro data: " +
+                           ", ".join(f"{INDICATORS.get(name, name)} last observed {date:%d %b %Y}" for name, date in stale.items()))
+            # Cached bars can outlive a failed macro fetch: nothing to regress on then
+            if pd.concat([sector_returns, macro_changes], axis=1).dropna().empty:
+                st.info("Macro factor history unavailable.")
+            else:
+                regression.extend(sector_returns, macro_changes)
+                regression_window = st.select_slider("Regression window (trading days)", regression.windows, value=252)
+                heat = regression.latest(regression_window)
+                with tracer.span("figure: sector_macro_heatmap"):
+                    fig = chart_cache.figure("sector_macro_heatmap", px.imshow, heat, text_auto='.3f', aspect='auto',
+                                             color_continuous_scale='RdBu', color_continuous_midpoint=0,
+                                             labels={'x': 'Factor', 'y': 'Sector', 'color': 'Beta'},
+                                             title=f"Multi-factor betas over the last {regression_window} sessions")
+                    st.plotly_chart(fig, use_container_width=True)
+                ranking = regression.sensitivity_ranking(regression_window).dropna()
+                if not ranking.empty:
+                    st.caption(f"Most macro-sensitive: {', '.join(ranking.index[:3])} | "
+                               "Betas are elasticities for crude and USD/INR and return per 1 pp repo change; "
+                               "blank cells mean the factor did not move within the window.")
     
-    with col1:
-        st.subheader("📈 Revenue & Profit Trend")
-        financial_data = pd.DataFrame({
-            'Year': ['FY21', 'FY22', 'FY23', 'FY24', 'FY25'],
-            'Revenue (₹ Cr)': [48000, 52000, 58000, 65000, 72000],
-            'Net Profit (₹ Cr)': [8500, 9200, 10500, 12000, 14000]
-        })
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=financial_data['Year'], y=financial_data['Revenue (₹ Cr)'], 
-                             name='Revenue', marker_color='lightblue'))
-        fig.add_trace(go.Scatter(x=financial_data['Year'], y=financial_data['Net Profit (₹ Cr)'], 
-                                 name='Net Profit', mode='lines+markers', marker_color='green'))
-        st.plotly_chart(fig, use_container_width=True)
+        st.markdown("---")
+        st.subheader("🎯 Top Sectors to Watch")
     
-    with col2:
-        st.subheader("📊 Key Ratios")
-        ratios = pd.DataFrame({
-            'Metric': ['Current Ratio', 'Quick Ratio', 'Operating Margin', 'Net Margin', 'Asset Turnover'],
-            'Value': [1.8, 1.5, '22%', '18%', 1.2],
-            'Industry Avg': [1.5, 1.2, '18%', '15%', 1.0],
-            'Status': ['✅ Good', '✅ Good', '✅ Above Avg', '✅ Above Avg', '✅ Good']
-        })
-        st.dataframe(ratios, use_container_width=True, hide_index=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.info("**🏗️ Infrastructure**\n\n₹1.75L Cr Budget (+17%)\n\nTop Pick: L&T, IRB Infra")
+        with col2:
+            st.success("**⚡ Green Energy**\n\n₹95K Cr Budget (+27%)\n\nTop Pick: Adani Green, Tata Power")
+        with col3:
+            st.warning("**🚗 Auto & EV**\n\n24.5% Returns\n\nTop Pick: Tata Motors, M&M")
+
+    # ===== COMPANY ANALYSIS =====
+    elif analysis_mode == "🏢 Company Analysis":
+        st.header("🏢 Company Fundamental Analysis")
+    
+        # Company Selector
+        sector = st.selectbox("Select Sector", 
+            ['IT', 'Banking', 'Pharma', 'Auto', 'Infrastructure', 'Energy'])
+    
+        # Sector-specific companies
+        sector_companies = {
+            'IT': ['TCS', 'Infosys', 'HCL Tech', 'Wipro'],
+            'Banking': ['HDFC Bank', 'ICICI Bank', 'SBI', 'Axis Bank'],
+            'Pharma': ['Sun Pharma', 'Dr Reddy', 'Cipla', 'Lupin'],
+            'Auto': ['Tata Motors', 'M&M', 'Maruti Suzuki', 'Bajaj Auto'],
+            'Infrastructure': ['L&T', 'UltraTech', 'Adani Ports', 'IRB Infra'],
+            'Energy': ['Reliance Industries', 'ONGC', 'Adani Green', 'Tata Power']
+        }
     
-    st.markdown("---")
+        company = st.selectbox("Select Company", sector_companies[sector])
     
-    # Valuation
-    st.subheader("💰 Valuation Analysis")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Current Price", "₹2,680")
-    with col2:
-        st.metric("Target Price", "₹3,150", "17.5%")
-    with col3:
-        st.metric("Analyst Rating", "BUY", "Strong")
-    
-    st.success("✅ **Recommendation**: BUY - Strong fundamentals, government sector focus, undervalued compared to peers")
-
-# ===== NEWS & BUDGET =====
-elif analysis_mode == "📰 News & Budget":
-    st.header("📰 Latest News & Budget Updates")
-    
-    # News Feed
-    st.subheader("🔔 Real-Time Sector News")
-    
-    news_data = [
-        {
-            'time': '2 hours ago',
-            'sector': 'Infrastructure',
-            'headline': 'Government announces ₹50,000 Cr additional allocation for highway projects (FY 2025-26)',
-            'impact': 'Positive',
-            'stocks': 'L&T, IRB Infra, Ashoka Buildcon'
-        },
-        {
-            'time': '5 hours ago',
-            'sector': 'Green Energy',
-            'headline': 'New PLI scheme for solar manufacturing with ₹24,000 Cr outlay (FY 2025-26)',
-            'impact': 'Very Positive',
-            'stocks': 'Adani Green, Tata Power, Waaree Energies'
-        },
-        {
-            'time': '1 day ago',
-            'sector': 'Defense',
-            'headline': 'Defense Ministry clears procurement worth ₹70,000 Cr for FY 2025-26',
-            'impact': 'Positive',
-            'stocks': 'HAL, BEL, Mazagon Dock'
-        },
-        {
-            'time': '1 day ago',
-            'sector': 'Banking',
-            'headline': 'RBI maintains repo rate at 6.5% for FY 2025-26, signals pause in rate hikes',
-            'impact': 'Neutral',
-            'stocks': 'HDFC Bank, ICICI Bank, SBI'
-        },
-        {
-            'time': '2 days ago',
-            'sector': 'Auto',
-            'headline': 'EV subsidy extended for FY 2025-26, ₹10,000 Cr allocated',
-            'impact': 'Positive',
-            'stocks': 'Tata Motors, M&M, Ola Electric'
+        # Sector-specific metrics
+        sector_metrics = {
+            'IT': {'market_cap': '₹12.5L Cr', 'pe': '24.8', 'roe': '22.1%', 'de': '0.15', 'div': '2.8%'},
+            'Banking': {'market_cap': '₹8.9L Cr', 'pe': '16.5', 'roe': '15.8%', 'de': '2.1', 'div': '3.2%'},
+            'Pharma': {'market_cap': '₹6.2L Cr', 'pe': '28.9', 'roe': '18.5%', 'de': '0.25', 'div': '1.5%'},
+            'Auto': {'market_cap': '₹4.8L Cr', 'pe': '22.1', 'roe': '16.2%', 'de': '0.65', 'div': '2.1%'},
+            'Infrastructure': {'market_cap': '₹16.8L Cr', 'pe': '26.2', 'roe': '19.5%', 'de': '0.38', 'div': '2.1%'},
+            'Energy': {'market_cap': '₹18.5L Cr', 'pe': '15.8', 'roe': '14.2%', 'de': '0.42', 'div': '0.8%'}
         }
-    ]
     
-    for news in news_data:
-        impact_color = 'green' if 'Positive' in news['impact'] else 'orange'
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"**{news['headline']}**")
-                st.caption(f"🏷️ {news['sector']} | ⏰ {news['time']} | 📈 Stocks: {news['stocks']}")
-            with col2:
-                if 'Very Positive' in news['impact']:
-                    st.success(news['impact'])
-                elif 'Positive' in news['impact']:
-                    st.info(news['impact'])
-                else:
-                    st.warning(news['impact'])
-            st.markdown("---")
+        # Company-specific metrics
+        company_metrics = {
+            'TCS': {'market_cap': '₹13.2L Cr', 'pe': '25.1', 'roe': '23.5%', 'de': '0.12', 'div': '3.1%'},
+            'Infosys': {'market_cap': '₹7.8L Cr', 'pe': '24.5', 'roe': '21.8%', 'de': '0.18', 'div': '2.5%'},
+            'HDFC Bank': {'market_cap': '₹9.2L Cr', 'pe': '17.2', 'roe': '16.5%', 'de': '1.8', 'div': '3.5%'},
+            'ICICI Bank': {'market_cap': '₹8.6L Cr', 'pe': '15.8', 'roe': '15.1%', 'de': '2.4', 'div': '2.9%'},
+            'Sun Pharma': {'market_cap': '₹6.5L Cr', 'pe': '29.2', 'roe': '19.1%', 'de': '0.22', 'div': '1.8%'},
+            'Dr Reddy': {'market_cap': '₹5.9L Cr', 'pe': '28.6', 'roe': '17.9%', 'de': '0.28', 'div': '1.2%'},
+            'Tata Motors': {'market_cap': '₹5.1L Cr', 'pe': '23.5', 'roe': '17.2%', 'de': '0.72', 'div': '1.8%'},
+            'M&M': {'market_cap': '₹4.5L Cr', 'pe': '20.7', 'roe': '15.2%', 'de': '0.58', 'div': '2.4%'},
+            'L&T': {'market_cap': '₹17.2L Cr', 'pe': '27.1', 'roe': '20.1%', 'de': '0.35', 'div': '2.3%'},
+            'UltraTech': {'market_cap': '₹16.4L Cr', 'pe': '25.3', 'roe': '18.9%', 'de': '0.41', 'div': '1.9%'},
+            'Reliance Industries': {'market_cap': '₹19.1L Cr', 'pe': '16.2', 'roe': '14.8%', 'de': '0.39', 'div': '0.9%'},
+            'ONGC': {'market_cap': '₹17.9L Cr', 'pe': '15.4', 'roe': '13.6%', 'de': '0.45', 'div': '0.7%'}
+        }
     
-    # Budget Tracker
-    st.subheader("💼 Budget Tracker & Policy Updates")
+        st.markdown("---")
     
-    col1, col2 = st.columns(2)
+        # Company Metrics
+        metrics = company_metrics.get(company, sector_metrics[sector])
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric("Market Cap", metrics['market_cap'])
+        with col2:
+            st.metric("P/E Ratio", metrics['pe'], "-2.3")
+        with col3:
+            st.metric("ROE", metrics['roe'], "1.3%")
+        with col4:
+            st.metric("Debt/Equity", metrics['de'], "-0.07")
+        with col5:
+            st.metric("Dividend Yield", metrics['div'])
     
-    with col1:
-        st.markdown("### 📅 Upcoming Events")
-        events = pd.DataFrame({
-            'Date': ['1 Feb 2026', '15 Feb 2026', '28 Feb 2026', '5 Mar 2026'],
-            'Event': ['Union Budget 2026-27', 'RBI Monetary Policy', 'Q4 FY26 GDP Data', 'State Budget - Maharashtra FY26'],
-            'Impact': ['High', 'High', 'Medium', 'Medium']
-        })
-        st.dataframe(events, use_container_width=True, hide_index=True)
+        st.markdown("---")
     
-    with col2:
-        st.markdown("### 🎯 Key Policy Changes")
-        policies = pd.DataFrame({
-            'Policy': ['PLI for Electronics 3.0', 'Green Hydrogen Mission', 'Digital India 3.0', 'Atmanirbhar Bharat 4.0'],
-            'Allocation': ['₹85K Cr', '₹42K Cr', '₹75K Cr', '₹1.5L Cr'],
-            'Status': ['Active FY26', 'Active FY26', 'Active FY26', 'Active FY26']
-        })
-        st.dataframe(policies, use_container_width=True, hide_index=True)
+        col1, col2 = st.columns(2)
     
-    st.markdown("---")
+        with col1:
+            st.subheader("📈 Revenue & Profit Trend")
+            financial_data = pd.DataFrame({
+                'Year': ['FY21', 'FY22', 'FY23', 'FY24', 'FY25'],
+                'Revenue (₹ Cr)': [48000, 52000, 58000, 65000, 72000],
+                'Net Profit (₹ Cr)': [8500, 9200, 10500, 12000, 14000]
+            })
+            def revenue_profit_figure(data):
+                fig = go.Figure()
+                fig.add_trace(go.Bar(x=data['Year'], y=data['Revenue (₹ Cr)'], 
+                                     name='Revenue', marker_color='lightblue'))
+                fig.add_trace(go.Scatter(x=data['Year'], y=data['Net Profit (₹ Cr)'], 
+                                         name='Net Profit', mode='lines+markers', marker_color='green'))
+                return fig
+        
+            with tracer.span("figure: revenue_profit"):
+                fig = chart_cache.figure("revenue_profit", revenue_profit_figure, financial_data)
+                st.plotly_chart(fig, use_container_width=True)
     
-    # Sector Alerts
-    st.subheader("🚨 Sector Alerts Based on Government Actions")
+        with col2:
+            st.subheader("📊 Key Ratios")
+            ratios = pd.DataFrame({
+                'Metric': ['Current Ratio', 'Quick Ratio', 'Operating Margin', 'Net Margin', 'Asset Turnover'],
+                'Value': [1.8, 1.5, '22%', '18%', 1.2],
+                'Industry Avg': [1.5, 1.2, '18%', '15%', 1.0],
+                'Status': ['✅ Good', '✅ Good', '✅ Above Avg', '✅ Above Avg', '✅ Good']
+            })
+            st.dataframe(ratios, use_container_width=True, hide_index=True)
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.error("⚠️ **FMCG Sector**\n\nRising input costs, no new subsidies announced")
-    with col2:
-        st.success("✅ **Infrastructure**\n\nMassive capex push, 18% budget increase")
-    with col3:
-        st.info("ℹ️ **IT Sector**\n\nDigital India 2.0 approved, ₹45K Cr allocation")
-
-# ===== GLOBAL IMPACT =====
-elif analysis_mode == "🌍 Global Impact":
-    st.header("🌍 Global Events & Supply Chain Impact")
+        st.markdown("---")
     
-    analyzer = GlobalImpactAnalyzer()
-    monitor = SupplyChainMonitor()
+        # Valuation
+        st.subheader("💰 Valuation Analysis")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Current Price", "₹2,680")
+        with col2:
+            st.metric("Target Price", "₹3,150", "17.5%")
+        with col3:
+            st.metric("Analyst Rating", "BUY", "Strong")
     
-    # Critical Alerts
-    st.subheader("🚨 Critical Supply Chain Alerts")
-    alerts = monitor.get_critical_alerts()
+        st.success("✅ **Recommendation**: BUY - Strong fundamentals, government sector focus, undervalued compared to peers")
     
-    for alert in alerts:
-        with st.container():
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.warning(alert['alert'])
-                st.caption(f"**Action**: {alert['action']}")
-            with col2:
-                st.info(f"**Stocks**: {alert['stocks']}")
+        position = get_portfolio_book().position(get_resolver().resolve(company))
+        if position:
+            st.info(f"💼 **In your portfolio**: {position['quantity']:,.0f} shares @ ₹{position['avg_cost']:,.2f} avg cost"
+                    + (f" | P&L ₹{position['pnl']:,.0f} ({position['pnl_%']:+.1f}%)" if position['price'] == position['price'] else ""))
+
+    # ===== NEWS & BUDGET =====
+    elif analysis_mode == "📰 News & Budget":
+        st.header("📰 Latest News & Budget Updates")
+    
+        # News Feed
+        st.subheader("🔔 Real-Time Sector News")
+    
+        news_data = [
+            {
+                'time': '2 hours ago',
+                'sector': 'Infrastructure',
+                'headline': 'Government announces ₹50,000 Cr additional allocation for highway projects (FY 2025-26)',
+                'impact': 'Positive',
+                'stocks': 'L&T, IRB Infra, Ashoka Buildcon'
+            },
+            {
+                'time': '5 hours ago',
+                'sector': 'Green Energy',
+                'headline': 'New PLI scheme for solar manufacturing with ₹24,000 Cr outlay (FY 2025-26)',
+                'impact': 'Very Positive',
+                'stocks': 'Adani Green, Tata Power, Waaree Energies'
+            },
+            {
+                'time': '1 day ago',
+                'sector': 'Defense',
+                'headline': 'Defense Ministry clears procurement worth ₹70,000 Cr for FY 2025-26',
+                'impact': 'Positive',
+                'stocks': 'HAL, BEL, Mazagon Dock'
+            },
+            {
+                'time': '1 day ago',
+                'sector': 'Banking',
+                'headline': 'RBI maintains repo rate at 6.5% for FY 2025-26, signals pause in rate hikes',
+                'impact': 'Neutral',
+                'stocks': 'HDFC Bank, ICICI Bank, SBI'
+            },
+            {
+                'time': '2 days ago',
+                'sector': 'Auto',
+                'headline': 'EV subsidy extended for FY 2025-26, ₹10,000 Cr allocated',
+                'impact': 'Positive',
+                'stocks': 'Tata Motors, M&M, Ola Electric'
+            }
+        ]
+    
+        for news in news_data:
+            impact_color = 'green' if 'Positive' in news['impact'] else 'orange'
+            with st.container():
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"**{news['headline']}**")
+                    st.caption(f"🏷️ {news['sector']} | ⏰ {news['time']} | 📈 Stocks: {news['stocks']}")
+                with col2:
+                    if 'Very Positive' in news['impact']:
+                        st.success(news['impact'])
+                    elif 'Positive' in news['impact']:
+                        st.info(news['impact'])
+                    else:
+                        st.warning(news['impact'])
+                st.markdown("---")
+    
+        if st.toggle("Fetch live headlines with article summaries"):
+            headline_sector = st.selectbox("Sector", ['Infrastructure', 'Defense', 'Green Energy', 'Banking', 'Auto', 'IT', 'Pharma', 'Agriculture'])
+            headlines = load_sector_headlines(headline_sector)
+            if not headlines:
+                st.warning("No headlines available. Check your internet connection.")
+            for item in headlines:
+                st.markdown(f"**[{item['title']}]({item['url']})**")
+                st.caption(f"📰 {item['source']} | ⏰ {item['published']}")
+                if item['summary']:
+                    st.write(item['summary'])
+            summarized = sum(1 for item in headlines if item['summary'])
+            st.caption(f"{summarized} of {len(headlines)} articles summarized")
             st.markdown("---")
     
-    # Recent Global Events
-    st.subheader("📰 Recent Global Events Affecting India")
+        # Budget Tracker
+        st.subheader("💼 Budget Tracker & Policy Updates")
     
-    events_df = pd.DataFrame(analyzer.global_events)
-    
-    for _, event in events_df.iterrows():
-        with st.expander(f"🔴 {event['event']} - {event['date']}"):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Impact Level", event['impact_level'])
-            with col2:
-                st.metric("Price Impact", event['price_impact'])
-            with col3:
-                st.metric("Timeline", event['timeline'])
-            
-            st.markdown(f"**Commodity**: {event['commodity']}")
-            st.markdown(f"**Affected Sectors**: {', '.join(event['affected_sectors'])}")
-            st.markdown(f"**Indian Impact**: {event['indian_impact']}")
-            
-            st.markdown("**💡 Investment Opportunities:**")
-            for opp in event['opportunities']:
-                st.success(f"✅ {opp}")
+        col1, col2 = st.columns(2)
     
-    st.markdown("---")
+        with col1:
+            st.markdown("### 📅 Upcoming Events")
+            events = pd.DataFrame({
+                'Date': ['1 Feb 2026', '15 Feb 2026', '28 Feb 2026', '5 Mar 2026'],
+                'Event': ['Union Budget 2026-27', 'RBI Monetary Policy', 'Q4 FY26 GDP Data', 'State Budget - Maharashtra FY26'],
+                'Impact': ['High', 'High', 'Medium', 'Medium']
+            })
+            show_table(events, {'Impact': LEVEL_STYLES})
     
-    # Commodity Analysis
-    st.subheader("⚙️ Commodity Disruption Analysis")
+        with col2:
+            st.markdown("### 🎯 Key Policy Changes")
+            policies = pd.DataFrame({
+                'Policy': ['PLI for Electronics 3.0', 'Green Hydrogen Mission', 'Digital India 3.0', 'Atmanirbhar Bharat 4.0'],
+                'Allocation': ['₹85K Cr', '₹42K Cr', '₹75K Cr', '₹1.5L Cr'],
+                'Status': ['Active FY26', 'Active FY26', 'Active FY26', 'Active FY26']
+            })
+            st.dataframe(policies, use_container_width=True, hide_index=True)
+    
+        # Measured announcement impact instead of the subjective label
+        st.markdown("### 📏 Measured Policy Impact")
+        if st.toggle("Run event study on recent policy announcements"):
+            entities = policy_entities(PolicyTracker.get_recent_policies())
+            prices = load_close_prices(required_tickers(entities), period='5y', as_of=as_of)
+            if prices.empty:
+                st.warning("Price data unavailable. Check your internet connection.")
+            else:
+                study = get_event_study(prices)
+                measured = PolicyTracker.get_measured_policies(study, entities)
+                table = measured[['date', 'policy', 'allocation', 'label', 'impact', 'sector_car', 't_stat', 'priced']].rename(columns={
+                    'date': 'Date', 'policy': 'Policy', 'allocation': 'Allocation', 'label': 'Label',
+                    'impact': 'Measured Impact', 'sector_car': 'Sector CAR %', 't_stat': 't-stat', 'priced': 'Stocks'
+                })
+                st.dataframe(table.round(2), use_container_width=True, hide_index=True)
+            
+                results = study.measure(entities)
+                labels = [window_label(w) for w in study.windows]
+                with st.expander("CAR by stock and window"):
+                    st.dataframe(results[['policy', 'kind', 'name', 'ticker', 'beta'] + labels].round(2),
+                                 use_container_width=True, hide_index=True)
+                unresolved = results.loc[results['ticker'].isna(), 'name']
+                st.caption(f"Market model vs sector index, {study.estimation_days}-session estimation ending "
+                           f"{study.gap} sessions before the announcement | headline {window_label(HEADLINE_WINDOW)}"
+                           + (f" | unresolved: {', '.join(unresolved)}" if len(unresolved) else ""))
     
-    commodity = st.selectbox("Select Commodity", 
-        ['Cobalt', 'Lithium', 'Rare Earth Elements', 'Crude Oil', 'Semiconductor Chips'])
+        st.markdown("---")
     
-    impact = analyzer.analyze_event_impact(commodity)
+        # Sector Alerts
+        st.subheader("🚨 Sector Alerts Based on Government Actions")
     
-    if impact:
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Impact Level", impact['impact_level'])
+            st.error("⚠️ **FMCG Sector**\n\nRising input costs, no new subsidies announced")
         with col2:
-            st.metric("Price Trend", impact['price_trend'])
+            st.success("✅ **Infrastructure**\n\nMassive capex push, 18% budget increase")
         with col3:
-            st.metric("Affected Sectors", len(impact['dependent_sectors']))
-        
+            st.info("ℹ️ **IT Sector**\n\nDigital India 2.0 approved, ₹45K Cr allocation")
+    
+        # Position sizing for the budget Top_Stocks picks
         st.markdown("---")
+        st.subheader("📊 Budget-Tilted Portfolio")
+        if st.toggle("Optimize allocation across budget Top Stocks"):
+            tracker = BudgetTracker(as_of)
+            live_datasets.extend(tracker.live_datasets)
+            universe = tracker.get_stock_universe()
+            optimizer = get_portfolio_optimizer(universe, as_of)
+            if optimizer is None or not len(optimizer.tickers):
+                st.warning("Price data unavailable. Check your internet connection.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    method = st.radio("Method", ["Risk Parity", "Mean-Variance"], horizontal=True)
+                with col2:
+                    tilt = st.slider("Budget priority tilt", 0.0, 2.0, 0.5, 0.05)
+                with col3:
+                    max_weight = st.slider("Max weight per stock (%)", 5, 50, 15, disabled=method == "Risk Parity") / 100
+            
+                if method == "Risk Parity":
+                    weights = optimizer.risk_parity(tilt=tilt)
+                else:
+                    weights = optimizer.mean_variance(tilt=tilt, max_weight=max_weight)
+                stats = optimizer.portfolio_stats(weights, tilt=tilt)
+            
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Expected Return", f"{stats['expected_return'] * 100:.1f}%")
+                with col2:
+                    st.metric("Volatility", f"{stats['volatility'] * 100:.1f}%")
+                with col3:
+                    st.metric("Effective Stocks", f"{stats['effective_assets']:.1f}")
+                with col4:
+                    st.metric("Weighted Budget Growth", f"{stats['budget_growth']:.1f}%")
+            
+                table = optimizer.allocation_table(weights)
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.dataframe(table, use_container_width=True, hide_index=True)
+                with col2:
+                    with tracer.span("figure: portfolio_sectors"):
+                        fig = chart_cache.figure("portfolio_sectors", px.pie, table, values='Weight %', names='Sector',
+                                                 title="Allocation by Budget Sector")
+                        st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"Ledoit-Wolf shrinkage {optimizer.shrinkage:.2f} | solved in {optimizer.last_iterations} iterations | "
+                           f"unpriced: {', '.join(universe.loc[~universe['Ticker'].isin(optimizer.tickers), 'Stock'])}")
+
+    # ===== GLOBAL IMPACT =====
+    elif analysis_mode == "🌍 Global Impact":
+        st.header("🌍 Global Events & Supply Chain Impact")
+    
+        commodities = ['Cobalt', 'Lithium', 'Rare Earth Elements', 'Crude Oil', 'Semiconductor Chips']
+    
+        # Every section's data loads concurrently; sections fill in as their inputs arrive
+        page = PageLoader("global_impact")
+        page.load('analyzer', lambda: GlobalImpactAnalyzer(as_of))
+        page.load('monitor', lambda: SupplyChainMonitor(as_of))
+        page.load('alerts', lambda monitor: monitor.get_critical_alerts(), deps=['monitor'])
+        page.load('events', lambda analyzer: pd.DataFrame(analyzer.global_events), deps=['analyzer'])
+        page.load('risks', lambda monitor: monitor.get_geopolitical_risks(), deps=['monitor'])
+        page.load('opportunities', lambda analyzer: pd.DataFrame(analyzer.get_investment_opportunities()), deps=['analyzer'])
+        page.load('vulnerabilities', lambda analyzer: pd.DataFrame(analyzer.get_supply_chain_risks()), deps=['analyzer'])
+        page.load('strategy', lambda analyzer: analyzer.get_strategy_recommendations(), deps=['analyzer'])
+    
+        def render_alerts(alerts):
+            for alert in alerts:
+                with st.container():
+                    col1, col2 = st.columns([2, 1])
+                    with col1:
+                        st.warning(alert['alert'])
+                        st.caption(f"**Action**: {alert['action']}")
+                    with col2:
+                        st.info(f"**Stocks**: {alert['stocks']}")
+                    st.markdown("---")
+    
+        def render_events(events_df):
+            stats = event_ingestor().stats
+            if stats['seen'] > stats['added']:
+                st.caption(f"{stats['added']} events | {stats['duplicates']} near-duplicate headlines merged | "
+                           f"{stats['unmatched']} without a tracked commodity"
+                           + (f" | {stats['invalid']} malformed skipped" if stats['invalid'] else ""))
+            for _, event in events_df.iterrows():
+                with st.expander(f"🔴 {event['event']} - {event['date']}"):
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Impact Level", event['impact_level'])
+                    with col2:
+                        st.metric("Price Impact", event['price_impact'])
+                    with col3:
+                        st.metric("Timeline", event['timeline'])
+                
+                    st.markdown(f"**Commodity**: {event['commodity']}")
+                    st.markdown(f"**Affected Sectors**: {', '.join(event['affected_sectors'])}")
+                    st.markdown(f"**Indian Impact**: {event['indian_impact']}")
+                
+                    st.markdown("**💡 Investment Opportunities:**")
+                    for opp in event['opportunities']:
+                        st.success(f"✅ {opp}")
+    
+        def render_impact(impact):
+            if not impact:
+                return
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Impact Level", impact['impact_level'])
+            with col2:
+                st.metric("Price Trend", impact['price_trend'])
+            with col3:
+                st.metric("Affected Sectors", len(impact['dependent_sectors']))
         
-        col1, col2 = st.columns(2)
+            st.markdown("---")
         
-        with col1:
-            st.markdown("### 🏭 Affected Indian Companies")
-            for company in impact['affected_companies']:
-                st.markdown(f"- {company}")
+            col1, col2 = st.columns(2)
         
-        with col2:
-            st.markdown("### 🔄 Substitute Materials & Companies")
-            for substitute, companies in impact['substitute_options'].items():
-                st.markdown(f"**{substitute}**")
-                st.caption(f"Companies: {', '.join(companies)}")
-    
-    st.markdown("---")
+            with col1:
+                st.markdown("### 🏭 Affected Indian Companies")
+                for company in impact['affected_companies']:
+                    st.markdown(f"- {company}")
+        
+            with col2:
+                st.markdown("### 🔄 Substitute Materials & Companies")
+                for substitute, companies in impact['substitute_options'].items():
+                    st.markdown(f"**{substitute}**")
+                    st.caption(f"Companies: {', '.join(companies)}")
+    
+        def render_projections(projections):
+            if projections:
+                proj_df = pd.DataFrame(projections)
+            
+                # Color code by investment rating
+                with tracer.span("styler: substitute_projections", rows=len(proj_df)):
+                    show_table(proj_df, {'investment_rating': RATING_STYLES})
+    
+        def render_risks(risks_df):
+            with tracer.span("figure: risk_matrix"):
+                fig = chart_cache.figure("risk_matrix", px.scatter, risks_df, x='India_Dependency', y='Risk_Level', 
+                                         size=[100]*len(risks_df), color='Commodity',
+                                         hover_name='Region', size_max=60,
+                                         title='Supply Chain Risk Matrix')
+                st.plotly_chart(fig, use_container_width=True)
+        
+            show_table(risks_df, {'Risk_Level': LEVEL_STYLES, 'India_Dependency': LEVEL_STYLES})
     
-    # Substitute Projections
-    st.subheader("📊 Substitute Material Projections")
+        def render_opportunities(opp_df):
+            col1, col2, col3 = st.columns(3)
+        
+            with col1:
+                st.markdown("### 🚀 High Priority")
+                high_priority = opp_df[opp_df['impact_level'] == 'Very High']
+                for _, opp in high_priority.iterrows():
+                    st.success(f"**{opp['opportunity']}**\n\n{opp['trigger_event']}\n\nTimeline: {opp['timeline']}")
+        
+            with col2:
+                st.markdown("### ⚡ Medium Priority")
+                med_priority = opp_df[opp_df['impact_level'] == 'High']
+                for _, opp in med_priority.iterrows():
+                    st.info(f"**{opp['opportunity']}**\n\n{opp['trigger_event']}\n\nTimeline: {opp['timeline']}")
+        
+            with col3:
+                st.markdown("### 📌 Watch List")
+                low_priority = opp_df[opp_df['impact_level'] == 'Critical']
+                for _, opp in low_priority.iterrows():
+                    st.warning(f"**{opp['opportunity']}**\n\n{opp['trigger_event']}\n\nTimeline: {opp['timeline']}")
     
-    projections = analyzer.get_substitute_projections(commodity)
+        def render_vulnerabilities(vuln_df):
+            show_table(vuln_df, {'risk_level': LEVEL_STYLES})
     
-    if projections:
-        proj_df = pd.DataFrame(projections)
+        def render_strategy(strategy):
+            col1, col2 = st.columns(2)
         
-        # Color code by investment rating
-        def color_rating(val):
-            colors = {
-                'STRONG BUY': 'background-color: darkgreen; color: white',
-                'BUY': 'background-color: lightgreen',
-                'ACCUMULATE': 'background-color: lightyellow',
-                'HOLD': 'background-color: lightgray'
-            }
-            return colors.get(val, '')
+            with col1:
+                st.markdown("### ✅ BUY Recommendations")
+                lines = ["**Based on Global Disruptions:**", ""]
+                for i, rec in enumerate([r for r in strategy if r['action'] == 'BUY'], 1):
+                    stocks = ', '.join(rec['stocks']) + (f" {rec['note']}" if rec['note'] else '')
+                    lines += [f"{i}. **{rec['theme']}** - {rec['trigger']}", f"   - {stocks}", ""]
+                st.success("\n".join(lines))
         
-        styled_df = proj_df.style.applymap(color_rating, subset=['investment_rating'])
-        st.dataframe(styled_df, use_container_width=True, hide_index=True)
+            with col2:
+                st.markdown("### ⚠️ AVOID/REDUCE")
+                lines = ["**High Risk Sectors:**", ""]
+                for i, rec in enumerate([r for r in strategy if r['action'] == 'AVOID'], 1):
+                    lines += [f"{i}. **{rec['theme']}**", f"   - {rec['note']}", ""]
+                st.error("\n".join(lines))
     
-    st.markdown("---")
+        # Critical Alerts
+        st.subheader("🚨 Critical Supply Chain Alerts")
+        page.section(render_alerts, 'alerts')
     
-    # Geopolitical Risks
-    st.subheader("🗺️ Geopolitical Supply Chain Risks")
+        # Recent Global Events
+        st.subheader("📰 Recent Global Events Affecting India")
+        page.section(render_events, 'events')
     
-    risks_df = monitor.get_geopolitical_risks()
+        st.markdown("---")
     
-    fig = px.scatter(risks_df, x='India_Dependency', y='Risk_Level', 
-                     size=[100]*len(risks_df), color='Commodity',
-                     hover_name='Region', size_max=60,
-                     title='Supply Chain Risk Matrix')
-    st.plotly_chart(fig, use_container_width=True)
+        # Commodity Analysis
+        st.subheader("⚙️ Commodity Disruption Analysis")
     
-    st.dataframe(risks_df, use_container_width=True, hide_index=True)
+        commodity = st.selectbox("Select Commodity", commodities)
+        page.load('impact', lambda analyzer: analyzer.analyze_event_impact(commodity), deps=['analyzer'])
+        page.load('projections', lambda analyzer: analyzer.get_substitute_projections(commodity), deps=['analyzer'])
+        page.section(render_impact, 'impact')
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # Investment Opportunities
-    st.subheader("💰 Investment Opportunities from Global Disruptions")
+        # Substitute Projections
+        st.subheader("📊 Substitute Material Projections")
+        page.section(render_projections, 'projections')
     
-    opportunities = analyzer.get_investment_opportunities()
-    opp_df = pd.DataFrame(opportunities)
+        st.markdown("---")
     
-    col1, col2, col3 = st.columns(3)
+        # Geopolitical Risks
+        st.subheader("🗺️ Geopolitical Supply Chain Risks")
+        page.section(render_risks, 'risks')
     
-    with col1:
-        st.markdown("### 🚀 High Priority")
-        high_priority = opp_df[opp_df['impact_level'] == 'Very High']
-        for _, opp in high_priority.iterrows():
-            st.success(f"**{opp['opportunity']}**\n\n{opp['trigger_event']}\n\nTimeline: {opp['timeline']}")
+        st.markdown("---")
     
-    with col2:
-        st.markdown("### ⚡ Medium Priority")
-        med_priority = opp_df[opp_df['impact_level'] == 'High']
-        for _, opp in med_priority.iterrows():
-            st.info(f"**{opp['opportunity']}**\n\n{opp['trigger_event']}\n\nTimeline: {opp['timeline']}")
+        # Investment Opportunities
+        st.subheader("💰 Investment Opportunities from Global Disruptions")
+        page.section(render_opportunities, 'opportunities')
     
-    with col3:
-        st.markdown("### 📌 Watch List")
-        low_priority = opp_df[opp_df['impact_level'] == 'Critical']
-        for _, opp in low_priority.iterrows():
-            st.warning(f"**{opp['opportunity']}**\n\n{opp['trigger_event']}\n\nTimeline: {opp['timeline']}")
+        st.markdown("---")
     
-    st.markdown("---")
+        # Supply Chain Vulnerabilities
+        st.subheader("⚠️ Supply Chain Vulnerabilities")
+        page.section(render_vulnerabilities, 'vulnerabilities')
     
-    # Supply Chain Vulnerabilities
-    st.subheader("⚠️ Supply Chain Vulnerabilities")
+        st.markdown("---")
     
-    vulnerabilities = analyzer.get_supply_chain_risks()
-    vuln_df = pd.DataFrame(vulnerabilities)
+        # Actionable Insights
+        st.subheader("🎯 Actionable Investment Strategy")
+        page.section(render_strategy, 'strategy')
     
-    st.dataframe(vuln_df, use_container_width=True, hide_index=True)
+        results = page.run()
+        analyzer, monitor = results.get('analyzer'), results.get('monitor')
+        for source in (analyzer, monitor):
+            live_datasets.extend(getattr(source, 'live_datasets', []))
     
-    st.markdown("---")
+        # Backtest of the ratings above against what prices actually did
+        st.markdown("---")
+        st.subheader("🧪 Recommendation Backtest")
+        if analyzer is not None and monitor is not None and st.toggle("Backtest ratings and alerts against price history"):
+            events = collect_rating_events(analyzer, monitor)
+            prices = load_close_prices(tuple(sorted(events['ticker'].dropna().unique())), as_of=as_of)
+            if prices.empty:
+                st.warning("Price data unavailable. Check your internet connection.")
+            else:
+                col1, col2 = st.columns(2)
+                with col1:
+                    event_driven = st.checkbox("Exit early when a stock is re-rated", value=True)
+                with col2:
+                    hold_band = st.slider("HOLD hit band (±%)", 1, 10, 2) / 100
+                backtester = Backtester(prices)
+                results = backtester.run(events, event_driven=event_driven, hold_band=hold_band)
+                summary = backtester.summarize(results)
+                show_table(summary, {'Rating': RATING_STYLES})
+            
+                if not summary.empty:
+                    hit_cols = [c for c in summary.columns if c.startswith('Hit Rate')]
+                    with tracer.span("figure: backtest_hit_rates"):
+                        fig = chart_cache.figure("backtest_hit_rates", px.bar,
+                                                 summary.melt(id_vars='Rating', value_vars=hit_cols, var_name='Horizon', value_name='Hit Rate (%)'),
+                                                 x='Rating', y='Hit Rate (%)', color='Horizon', barmode='group',
+                                                 title="Hit Rate by Rating Class")
+                        st.plotly_chart(fig, use_container_width=True)
+            
+                unresolved = events.loc[events['ticker'].isna(), 'name'].unique()
+                st.caption(f"{len(results)} rated events replayed | {len(unresolved)} unlisted names skipped: {', '.join(unresolved)}")
+                if len(unresolved):
+                    with st.expander("Unresolved company names"):
+                        st.dataframe(get_resolver().unresolved(events['name']), use_container_width=True, hide_index=True)
+
+    # ===== FUND ANALYSIS =====
+    elif analysis_mode == "💰 Fund Analysis":
+        live_datasets.extend(display_fund_analysis(as_of))
     
-    # Actionable Insights
-    st.subheader("🎯 Actionable Investment Strategy")
+        # Integration with budget analysis
+        st.markdown("---")
+        st.subheader("🎯 Fund Recommendations Based on Budget Analysis")
     
-    col1, col2 = st.columns(2)
+        high_budget_sectors = ['Infrastructure', 'Green Energy', 'Technology', 'Healthcare', 'Manufacturing']
+        recommended_funds = get_fund_recommendations(high_budget_sectors)
     
-    with col1:
-        st.markdown("### ✅ BUY Recommendations")
-        st.success("""
-        **Based on Global Disruptions:**
-        
-        1. **LFP Battery Makers** - Cobalt shortage
-           - Reliance New Energy, Exide Industries
-        
-        2. **Green Hydrogen** - Oil price surge
-           - Reliance, Adani Green, NTPC
-        
-        3. **Semiconductor Ecosystem** - Chip shortage
-           - Tata Electronics, HCL Tech, Dixon
-        
-        4. **Domestic Mining** - Rare earth curbs
-           - IREL India, Coal India (diversification)
+        if recommended_funds:
+            st.success(f"**Recommended Funds**: {', '.join(recommended_funds[:3])}")
+            st.info("These funds align with high government spending sectors from your budget analysis.")
+
+    # ===== PORTFOLIO =====
+    elif analysis_mode == "💼 Portfolio":
+        st.header("💼 Watchlist & Portfolio")
+    
+        store = get_portfolio_store()
+        book = get_portfolio_book()
+        resolver = get_resolver()
+        watchlist = store.watchlist()
+    
+        tickers = tuple(sorted(set(book.tickers) | set(watchlist['ticker'])))
+        closes = load_close_prices(tickers, as_of=as_of) if tickers else pd.DataFrame()
+        if not closes.empty:
+            with tracer.span("portfolio: mark closes"):
+                book.mark(closes.ffill().iloc[-1])
+    
+        summary = book.summary()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Market Value", f"₹{summary['value']:,.0f}")
+        with col2:
+            st.metric("Cost Basis", f"₹{summary['cost']:,.0f}")
+        with col3:
+            st.metric("Unrealized P&L", f"₹{summary['pnl']:,.0f}", f"{summary['pnl_%']:+.2f}%")
+        with col4:
+            st.metric("Positions", f"{summary['positions']:,}", f"{summary['lots']:,} lots", delta_color="off")
+        if summary['priced'] < summary['positions']:
+            st.caption(f"{summary['positions'] - summary['priced']} positions have no price yet and are left out of value and P&L")
+    
+        if live_quotes:
+            st.subheader("📡 Live Mark-to-Market")
+            live_portfolio_marks(book)
+    
+        with st.expander("➕ Add or remove a lot"):
+            with st.form("add_lot", clear_on_submit=True):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    name = st.text_input("Company or ticker", placeholder="e.g. Tata Motors or TATAMOTORS.NS")
+                with col2:
+                    quantity = st.number_input("Quantity", min_value=0.0, value=10.0, step=1.0)
+                with col3:
+                    cost = st.number_input("Cost per share (₹)", min_value=0.0, value=100.0, step=1.0)
+                if st.form_submit_button("Add Lot") and name:
+                    ticker = portfolio_ticker(resolver, name)
+                    if ticker:
+                        book.add_lot(store.add_lot(ticker, quantity, cost), ticker, quantity, cost)
+                        st.success(f"Added {quantity:,.0f} × {ticker} @ ₹{cost:,.2f}")
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                lot_id = st.number_input("Lot ID", min_value=1, step=1)
+            with col2:
+                if st.button("Remove Lot"):
+                    if store.remove_lot(lot_id) and book.remove_lot(lot_id):
+                        st.success(f"Removed lot {lot_id}")
+                    else:
+                        st.warning(f"No open lot {lot_id}")
+    
+        if not summary['positions']:
+            st.info("No holdings yet. Add a lot above to start tracking P&L and exposure.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("🏭 Exposure by Sector")
+                sector_exposure = book.exposure('sector')
+                with tracer.span("figure: portfolio_sectors"):
+                    fig = chart_cache.figure("portfolio_sectors", px.pie, sector_exposure, values='Value', names='Sector')
+                    st.plotly_chart(fig, use_container_width=True)
+            with col2:
+                st.subheader("🏛️ Exposure by Budget Priority")
+                priority_exposure = book.exposure('priority')
+                show_table(priority_exposure.round(2), {'Priority': PRIORITY_STYLES})
         
-        5. **Battery Recycling** - Resource scarcity
-           - Attero Recycling, Gravita India
-        """)
+            st.subheader("📋 Largest Positions by P&L")
+            st.dataframe(book.positions(top=50).round(2), use_container_width=True, hide_index=True)
+            with st.expander(f"All {summary['positions']:,} positions"):
+                st.dataframe(book.positions().round(2), use_container_width=True, hide_index=True)
+            with st.expander(f"All {summary['lots']:,} lots"):
+                st.dataframe(book.lots().round(2), use_container_width=True, hide_index=True)
     
-    with col2:
-        st.markdown("### ⚠️ AVOID/REDUCE")
-        st.error("""
-        **High Risk Sectors:**
-        
-        1. **High Cobalt Dependency EVs**
-           - Companies without LFP transition plans
-        
-        2. **Import-Heavy Electronics**
-           - No domestic manufacturing pivot
-        
-        3. **Fuel-Intensive Airlines**
-           - Rising crude oil prices
-        
-        4. **China-Dependent Supply Chains**
-           - Rare earth, semiconductors exposure
-        
-        5. **Single-Source Commodity Traders**
-           - Geopolitical risk concentration
-        """)
+        st.markdown("---")
+        st.subheader("👀 Watchlist")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            watch_name = st.text_input("Watch a company or ticker", key="watch_name")
+        with col2:
+            if st.button("Add to Watchlist") and watch_name:
+                watch_ticker = portfolio_ticker(resolver, watch_name)
+                if watch_ticker:
+                    store.watch(watch_ticker)
+                    st.rerun()
+        if watchlist.empty:
+            st.caption("Nothing on the watchlist yet.")
+        else:
+            watched = watchlist.set_index('ticker')
+            if not closes.empty:
+                last = closes.reindex(columns=watched.index).ffill().iloc[-2:]
+                watched['Price'] = last.iloc[-1]
+                watched['Change_%'] = (last.iloc[-1] / last.iloc[0] - 1) * 100
+            watched['Held'] = [book.position(ticker) is not None for ticker in watched.index]
+            st.dataframe(watched.round(2), use_container_width=True)
+            remove = st.selectbox("Remove from watchlist", [''] + list(watched.index))
+            if remove:
+                store.unwatch(remove)
+                st.rerun()
 
-# ===== FUND ANALYSIS =====
-elif analysis_mode == "💰 Fund Analysis":
-    display_fund_analysis()
-    
-    # Integration with budget analysis
-    st.markdown("---")
-    st.subheader("🎯 Fund Recommendations Based on Budget Analysis")
-    
-    high_budget_sectors = ['Infrastructure', 'Green Energy', 'Technology', 'Healthcare', 'Manufacturing']
-    recommended_funds = get_fund_recommendations(high_budget_sectors)
-    
-    if recommended_funds:
-        st.success(f"**Recommended Funds**: {', '.join(recommended_funds[:3])}")
-        st.info("These funds align with high government spending sectors from your budget analysis.")
+    # ===== PERFORMANCE (hidden) =====
+    elif analysis_mode == "⏱ Performance":
+        display_performance_page()
+
+    # Datasets with nothing recorded by ``as_of`` were loaded live: say so instead of claiming the record
+    if live_datasets:
+        as_of_banner.warning(f"🕰 Showing the data recorded as of {as_of:%d %b %Y}. Nothing was recorded by then for "
+                             f"{', '.join(dict.fromkeys(live_datasets))}: those show live data.")
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,249 @@
+"""Article bodies and extractive summaries for news items
+
+News items from ``NewsAPI`` and ``get_google_news`` carry a title and a link.
+``ArticleExtractor.enrich(items)`` adds the article text and a summary:
+
+* linked pages are downloaded through the provider's pooled session on a
+  thread pool of ``max_workers``, with at most ``per_host`` requests in
+  flight against any one site,
+* the main text is extracted with BeautifulSoup (lxml parser): boilerplate
+  tags are dropped and the element holding the most paragraph text wins,
+* the extracted text is cached under the SHA-256 of the URL
+  (``ARTICLE_CACHE_DIR``, default ``data/articles``), so a page is only
+  downloaded and parsed once,
+* summaries are the top TF-IDF sentences. One sparse sentence x term matrix
+  is built per chunk of ``SUMMARY_CHUNK`` articles, and each sentence is
+  scored by the mean article TF-IDF weight of its words. Batches larger than
+  one chunk are spread over a process pool. Chunks are fixed-size, so a
+  summary does not depend on the number of workers.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import numpy as np
+from bs4 import BeautifulSoup
+from scipy import sparse
+
+from data_providers import get_provider
+from performance_tracker import tracer
+
+DEFAULT_CACHE_DIR = os.path.join('data', 'articles')
+SUMMARY_SENTENCES = 3
+SUMMARY_CHUNK = 128
+MIN_PARAGRAPH_CHARS = 40
+MIN_SENTENCE_WORDS = 6
+BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form',
+                    'iframe', 'svg', 'button', 'figure', 'figcaption']
+
+SENTENCE_END = re.compile(r'(?<=[.!?])["”’)]?\s+(?=["“‘(]?[A-Z0-9₹])')
+TOKEN = re.compile(r"[a-z][a-z0-9'&-]*[a-z0-9]|\d+(?:\.\d+)?%?")
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own said same says she should so some
+such than that the their theirs them themselves then there these they this those through to too under until
+up very was we were what when where which while who whom why will with would year years you your yours
+""".split())
+
+
+def extract_text(html):
+    """(title, main text) of an HTML page; paragraphs of the text are separated by blank lines"""
+    soup = BeautifulSoup(html, 'lxml')
+    title = soup.title.get_text(' ', strip=True) if soup.title else ''
+    heading = soup.find('h1')
+    if heading is not None:
+        title = heading.get_text(' ', strip=True) or title
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    root = soup.find('article') or soup.find('main') or soup.body or soup
+
+    # The element whose paragraphs hold the most text is the article body
+    blocks, lengths = {}, defaultdict(int)
+    for paragraph in root.find_all('p'):
+        text = paragraph.get_text(' ', strip=True)
+        if len(text) >= MIN_PARAGRAPH_CHARS:
+            parent = paragraph.parent
+            blocks.setdefault(id(parent), []).append(text)
+            lengths[id(parent)] += len(text)
+    if lengths:
+        return title, '\n\n'.join(blocks[max(lengths, key=lengths.get)])
+    return title, re.sub(r'\s+', ' ', root.get_text(' ', strip=True))
+
+
+def split_sentences(text):
+    sentences = (s.strip() for paragraph in text.split('\n\n') for s in SENTENCE_END.split(paragraph))
+    return [s for s in sentences if len(s.split()) >= MIN_SENTENCE_WORDS]
+
+
+def _summarize_chunk(texts, n_sentences):
+    """Top ``n_sentences`` TF-IDF sentences of each text, in their original order"""
+    sentences, doc_of, rows, cols = [], [], [], []
+    vocabulary = {}
+    for doc, text in enumerate(texts):
+        for sentence in split_sentences(text):
+            row = len(sentences)
+            sentences.append(sentence)
+            doc_of.append(doc)
+            for token in TOKEN.findall(sentence.lower()):
+                if token not in STOPWORDS:
+                    rows.append(row)
+                    cols.append(vocabulary.setdefault(token, len(vocabulary)))
+    if not sentences or not vocabulary:
+        return [''] * len(texts)
+
+    doc_of = np.asarray(doc_of)
+    rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+    ones = np.ones(len(rows))
+    counts = sparse.csr_matrix((ones, (rows, cols)), shape=(len(sentences), len(vocabulary)))
+    # Article term frequencies weighted by inverse document frequency over the chunk, L2-normalized per article
+    tf = sparse.csr_matrix((ones, (doc_of[rows], cols)), shape=(len(texts), len(vocabulary)))
+    df = np.bincount(tf.indices, minlength=len(vocabulary))
+    weights = tf.multiply(np.log((1 + len(texts)) / (1 + df)) + 1).tocsr()
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    weights = sparse.diags(1 / np.where(norms > 0, norms, 1)) @ weights
+    # Mean weight of a sentence's words under its own article's vector
+    totals = np.asarray(counts.multiply(weights[doc_of]).sum(axis=1)).ravel()
+    lengths = np.asarray(counts.sum(axis=1)).ravel()
+    scores = totals / np.where(lengths > 0, lengths, 1)
+
+    order = np.lexsort((-scores, doc_of))  # by article, best sentence first
+    starts = np.searchsorted(doc_of[order], np.arange(len(texts)))
+    rank = np.arange(len(order)) - starts[doc_of[order]]
+    chosen = np.sort(order[rank < n_sentences])
+    summaries = [[] for _ in texts]
+    for row in chosen:
+        summaries[doc_of[row]].append(sentences[row])
+    return [' '.join(parts) for parts in summaries]
+
+
+def _summarize_chunk_args(args):
+    return _summarize_chunk(*args)
+
+
+def summarize(texts, n_sentences=SUMMARY_SENTENCES, workers=None):
+    """Extractive summary per text; more than one chunk of texts goes to a process pool"""
+    texts = list(texts)
+    chunks = [texts[i:i + SUMMARY_CHUNK] for i in range(0, len(texts), SUMMARY_CHUNK)]
+    with tracer.span("articles: summarize", texts=len(texts), chunks=len(chunks)):
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_summarize_chunk_args, [(chunk, n_sentences) for chunk in chunks]))
+        else:
+            results = [_summarize_chunk(chunk, n_sentences) for chunk in chunks]
+    return [summary for result in results for summary in result]
+
+
+def item_url(item):
+    """Article link of a NewsAPI ('url') or RSS ('link') item"""
+    return item.get('url') or item.get('link') or ''
+
+
+class ArticleExtractor:
+    """Concurrency-limited article downloads with a URL-hash text cache"""
+
+    def __init__(self, provider=None, cache_dir=None, max_workers=8, per_host=2):
+        self.provider = provider or get_provider()
+        self.cache_dir = cache_dir or os.getenv('ARTICLE_CACHE_DIR', DEFAULT_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.stats = {'fetched': 0, 'cache_hits': 0, 'failed': 0}
+
+    def _path(self, url):
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def cached(self, url):
+        """Cached {'url', 'title', 'text', 'fetched_at'} for ``url``, or None"""
+        try:
+            with open(self._path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, article):
+        path = self._path(article['url'])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(article, f)
+        os.replace(tmp, path)
+
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def _download(self, url, parent=None):
+        with tracer.attach(parent), self._host_slot(url):
+            try:
+                html = self.provider.page(url)
+            except Exception:
+                html = ''
+        if not html:
+            self._count('failed')
+            return None
+        title, text = extract_text(html)
+        article = {'url': url, 'title': title, 'text': text, 'fetched_at': datetime.now().isoformat(timespec='seconds')}
+        if text:
+            self._store(article)  # failed or empty pages are retried next time
+        self._count('fetched')
+        return article
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def fetch(self, urls):
+        """{url: article} for every URL that is cached or could be downloaded"""
+        urls = [u for u in dict.fromkeys(urls) if u]
+        articles, missing = {}, []
+        for url in urls:
+            article = self.cached(url)
+            if article is None:
+                missing.append(url)
+            else:
+                articles[url] = article
+        with self._lock:
+            self.stats['cache_hits'] += len(articles)
+        if missing:
+            with tracer.span("articles: download", pages=len(missing)), \
+                    ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing)),
+                                       thread_name_prefix='articles') as pool:
+                parent = tracer.current()
+                downloaded = pool.map(self._download, missing, [parent] * len(missing))
+                articles.update((url, a) for url, a in zip(missing, downloaded) if a is not None)
+        return articles
+
+    def enrich(self, items, n_sentences=SUMMARY_SENTENCES, workers=None):
+        """Copies of news ``items`` with 'text' and 'summary' added ('' when the page is unavailable)"""
+        articles = self.fetch(item_url(item) for item in items)
+        texts = [articles.get(item_url(item), {}).get('text', '') for item in items]
+        summaries = summarize(texts, n_sentences, workers)
+        return [dict(item, text=text, summary=summary) for item, text, summary in zip(items, texts, summaries)]
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_article_extractor():
+    """Process-wide extractor with its cache at ``ARTICLE_CACHE_DIR``"""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = ArticleExtractor()
+        return _extractor
@@ -0,0 +1,245 @@
+"""Replay dashboard ratings and alerts against historical prices
+
+Rating events come from ``GlobalImpactAnalyzer`` substitute projections and
+strategy recommendations plus the stock lists in ``SupplyChainMonitor``
+alerts, each stamped with the date of the event behind it. Forward returns
+and drawdowns for every event are gathered from the close matrix in one
+fancy-indexing pass; in event-driven mode a position is closed early when the
+same ticker is re-rated.
+"""
+import hashlib
+import itertools
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+from entity_resolver import clean_name, get_resolver
+
+RATING_DIRECTION = {'STRONG BUY': 1, 'BUY': 1, 'ACCUMULATE': 1, 'HOLD': 0,
+                    'REDUCE': -1, 'AVOID': -1, 'SELL': -1}
+DEFAULT_HORIZONS = (5, 21, 63)
+CACHE_DIR = os.getenv('BACKTEST_CACHE_DIR', os.path.join('.cache', 'backtests'))
+
+def _parse_stock_actions(text):
+    """'BUY: A, B (x) | AVOID: C' -> [('BUY', 'A'), ('BUY', 'B'), ('AVOID', 'C')]"""
+    pairs = []
+    for part in text.split('|'):
+        action, _, names = part.partition(':')
+        action = action.strip().upper()
+        if action in RATING_DIRECTION:
+            pairs += [(action, clean_name(n)) for n in names.split(',') if n.strip()]
+    return pairs
+
+
+def collect_rating_events(analyzer, monitor=None, resolver=None):
+    """Every dated rating the dashboard emits, one row per (date, company, rating)
+
+    Unresolved company names keep ``ticker`` as None so they can be reported.
+    """
+    resolver = resolver or get_resolver()
+    rows = []
+
+    def add(date, name, rating, source, label):
+        rows.append({'date': pd.Timestamp(date), 'name': clean_name(name),
+                     'rating': rating, 'source': source, 'label': label})
+
+    for commodity, data in analyzer.commodity_map.items():
+        date = analyzer.get_event_date(commodity)
+        if date is None:
+            continue
+        for proj in analyzer.get_substitute_projections(commodity):
+            for company in data['substitutes'][proj['substitute']]:
+                add(date, company, proj['investment_rating'], 'substitute', f"{commodity}: {proj['substitute']}")
+
+    if monitor is not None:
+        for alert in monitor.get_critical_alerts():
+            for action, company in _parse_stock_actions(alert['stocks']):
+                add(alert['date'], company, action, 'alert', alert['alert'])
+
+    for rec in analyzer.get_strategy_recommendations():
+        date = analyzer.get_event_date(rec['commodity']) if rec['commodity'] else None
+        if date is None:
+            continue
+        for company in rec['stocks']:
+            add(date, company, rec['action'], 'strategy', rec['theme'])
+
+    events = pd.DataFrame(rows, columns=['date', 'name', 'rating', 'source', 'label'])
+    events.insert(2, 'ticker', resolver.resolve_many(events['name']))
+    events['direction'] = events['rating'].map(RATING_DIRECTION)
+    return events
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+    return h.hexdigest()
+
+
+def frame_digest(df):
+    """Content hash of a DataFrame (values, index and columns)"""
+    return _digest(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes(), list(df.columns))
+
+
+class Backtester:
+    """Vectorized forward-return, hit-rate and drawdown evaluation of rating events"""
+
+    def __init__(self, prices, horizons=DEFAULT_HORIZONS):
+        prices = prices.sort_index().ffill()
+        index = pd.DatetimeIndex(prices.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        self.prices = prices.set_axis(index, axis=0)
+        self.horizons = tuple(sorted(horizons))
+        self._close = self.prices.to_numpy(dtype=float, copy=True)
+        self._dates = index.as_unit('ns').asi8
+        self._digest = None
+
+    @property
+    def digest(self):
+        if self._digest is None:
+            self._digest = frame_digest(self.prices)
+        return self._digest
+
+    def _locate(self, events, entry_lag):
+        """Keep events with a price on/after their date; returns (events, column, entry row)"""
+        events = events.dropna(subset=['ticker'])
+        events = events[events['rating'].isin(list(RATING_DIRECTION))]
+        events = events.drop_duplicates(subset=['date', 'ticker', 'rating']).reset_index(drop=True)
+        cols = self.prices.columns.get_indexer(events['ticker'])
+        dates = pd.DatetimeIndex(pd.to_datetime(events['date'])).as_unit('ns').asi8
+        entry = np.searchsorted(self._dates, dates, side='left') + entry_lag
+        n = len(self._dates)
+        keep = (cols >= 0) & (entry < n)
+        keep[keep] = ~np.isnan(self._close[entry[keep], cols[keep]])
+        return events[keep].reset_index(drop=True), cols[keep], entry[keep]
+
+    def _next_rating_rows(self, cols, entry):
+        """Row of the next (strictly later) rating for the same ticker, or len(prices)"""
+        n = len(self._dates)
+        keys = cols.astype(np.int64) * n + entry
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        u_cols, u_entry = uniq // n, uniq % n
+        same = np.r_[u_cols[1:] == u_cols[:-1], False]
+        nxt = np.where(same, np.r_[u_entry[1:], n], n)
+        return nxt[inverse]
+
+    def run(self, events, event_driven=True, hold_band=0.02, entry_lag=0, sources=None):
+        """Per-event forward return, hit and max drawdown for every horizon
+
+        ``hold_band`` is the absolute return within which a HOLD counts as a
+        hit; ``entry_lag`` delays entry by that many sessions.
+        """
+        if sources is not None:
+            events = events[events['source'].isin(sources)]
+        events, cols, entry = self._locate(events, entry_lag)
+        out = events.copy()
+        out['entry_date'] = self.prices.index[entry]
+        if not len(entry):
+            return out
+
+        with tracer.span("backtest: run", events=len(entry)):
+            n, max_h = len(self._dates), self.horizons[-1]
+            offsets = np.arange(max_h + 1)
+            rows = np.minimum(entry[:, None] + offsets, n - 1)
+            window = self._close[rows, cols[:, None]]
+            direction = out['direction'].to_numpy()
+            side = np.where(direction == 0, 1, direction)[:, None]
+            equity = 1 + side * (window / window[:, :1] - 1)
+            cap = self._next_rating_rows(cols, entry) - entry if event_driven else np.full(len(entry), max_h)
+            idx = np.arange(len(entry))
+
+            for h in self.horizons:
+                stop = np.minimum(h, cap)
+                ok = entry + stop <= n - 1
+                ret = np.where(ok, window[idx, stop] / window[:, 0] - 1, np.nan)
+                held = np.where(offsets <= stop[:, None], equity, equity[idx, stop][:, None])
+                drawdown = (held / np.maximum.accumulate(held, axis=1) - 1).min(axis=1)
+                hit = np.where(direction > 0, ret > 0, np.where(direction < 0, ret < 0, np.abs(ret) <= hold_band))
+                out[f'ret_{h}d'] = ret
+                out[f'hit_{h}d'] = np.where(ok, hit, np.nan)
+                out[f'mdd_{h}d'] = np.where(ok, drawdown, np.nan)
+        return out
+
+    def summarize(self, results):
+        """Hit rate, mean forward return and mean max drawdown (%) per rating class"""
+        agg = {'Events': ('ticker', 'size')}
+        for h in self.horizons:
+            agg[f'Hit Rate {h}d (%)'] = (f'hit_{h}d', 'mean')
+            agg[f'Avg Return {h}d (%)'] = (f'ret_{h}d', 'mean')
+            agg[f'Avg Max DD {h}d (%)'] = (f'mdd_{h}d', 'mean')
+        if results.empty or f'ret_{self.horizons[0]}d' not in results:
+            return pd.DataFrame(columns=['Rating'] + list(agg))
+        summary = results.groupby('rating').agg(**agg)
+        pct = [c for c in summary.columns if c != 'Events']
+        summary[pct] = (summary[pct] * 100).round(2)
+        order = [r for r in RATING_DIRECTION if r in summary.index]
+        return summary.loc[order].rename_axis('Rating').reset_index()
+
+    def evaluate(self, events, **params):
+        return self.summarize(self.run(events, **params))
+
+    def strategy_hash(self, events, params):
+        """Cache key: parameters, horizons, event set and price data"""
+        spec = json.dumps({'params': params, 'horizons': self.horizons}, sort_keys=True, default=list)
+        return _digest(spec, frame_digest(events.astype(str)), self.digest)
+
+    def sweep(self, events, param_grid, workers=None, cache_dir=CACHE_DIR):
+        """Evaluate every combination in ``param_grid`` across a process pool
+
+        Summaries are cached on disk by strategy hash, so re-running a sweep
+        only computes new combinations. Returns one long frame with the
+        parameters as extra columns.
+        """
+        keys = list(param_grid)
+        combos = [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+        hashes = [self.strategy_hash(events, params) for params in combos]
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        summaries, pending = {}, []
+        for key, params in zip(hashes, combos):
+            path = os.path.join(cache_dir, f"{key}.pkl") if cache_dir else None
+            if path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    summaries[key] = pickle.load(f)
+            else:
+                pending.append((key, params))
+
+        with tracer.span("backtest: sweep", combos=len(combos), computed=len(pending)):
+            workers = min(workers or os.cpu_count() or 1, len(pending))
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.prices, self.horizons, events)) as pool:
+                    computed = list(pool.map(_sweep_worker, [params for _, params in pending]))
+            else:
+                computed = [self.evaluate(events, **params) for _, params in pending]
+
+        for (key, _), summary in zip(pending, computed):
+            summaries[key] = summary
+            if cache_dir:
+                with open(os.path.join(cache_dir, f"{key}.pkl"), 'wb') as f:
+                    pickle.dump(summary, f)
+
+        frames = [summaries[key].assign(**{k: str(v) if isinstance(v, (list, tuple)) else v
+                                           for k, v in params.items()})
+                  for key, params in zip(hashes, combos)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+_worker_state = {}
+
+
+def _init_worker(prices, horizons, events):
+    """Build the price matrix once per worker process"""
+    _worker_state['backtester'] = Backtester(prices, horizons)
+    _worker_state['events'] = events
+
+
+def _sweep_worker(params):
+    return _worker_state['backtester'].evaluate(_worker_state['events'], **params)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from alert_engine import AlertEngine, OPS
+from benchmarks.fixtures import ticker_universe
+from benchmarks.harness import benchmark
+
+N_RULES = 10_000
+BASELINE_RULES = 500
+TEMPLATES = [
+    ('rsi', (15, 85)),
+    ('%b', (-1, 2)),
+    ('return over 5d', (-10, 10)),
+    ('return over 20d', (-20, 20)),
+    ('sector return over 5d', (-5, 5)),
+    ('crude up', (0, 15)),
+    ('usd/inr down', (0, 3)),
+]
+_cases = {}
+
+
+def _rules(sectors, n, rng):
+    """``n`` random 1-3 condition rules, a third of them scoped to a sector"""
+    names = list(sectors)
+    texts = []
+    for _ in range(n):
+        conditions = []
+        for _ in range(rng.integers(1, 4)):
+            metric, (lo, hi) = TEMPLATES[rng.integers(len(TEMPLATES))]
+            op = '>' if metric.endswith(('up', 'down')) else ['<', '>', '<=', '>='][rng.integers(4)]
+            conditions.append(f"{metric} {op} {int(rng.integers(lo, hi + 1))}")
+        text = (' and ' if rng.random() < 0.7 else ' or ').join(conditions)
+        if rng.random() < 0.33:
+            text += f" on any {names[rng.integers(len(names))]} stock"
+        texts.append(text)
+    return texts
+
+
+def _case(scale):
+    """Engine with ``N_RULES`` rules over the universe and a snapshot built from synthetic bars"""
+    key = scale['tickers']
+    if key not in _cases:
+        rng = np.random.default_rng(43)
+        sectors = ticker_universe(scale['tickers'])
+        tickers = [t for data in sectors.values() for t in data['stocks']]
+        index = pd.bdate_range(end='2026-09-30', periods=60)
+        close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(index), len(tickers))), axis=0)),
+                             index=index, columns=tickers)
+        indicators = pd.DataFrame({'rsi': rng.uniform(5, 95, len(tickers)),
+                                   'bb_pct_b': rng.normal(0.5, 0.5, len(tickers))}, index=tickers)
+        macro = {name: pd.Series(level * np.exp(np.cumsum(rng.normal(0, vol, len(index)))), index=index)
+                 for name, level, vol in (('crude_oil', 80, 0.03), ('usd_inr', 83, 0.004))}
+        texts = _rules(sectors, N_RULES, rng)
+        engine = AlertEngine(sectors, cooldown=0)
+        engine.add_many(texts)
+        _cases[key] = (sectors, texts, engine, engine.snapshot(close, indicators, macro), (close, indicators, macro))
+    return _cases[key]
+
+
+@benchmark(f'AlertEngine.add_many[{N_RULES} rules, compile + dedupe]', repeat=5)
+def bench_compile(scale):
+    sectors, texts, _, _, _ = _case(scale)
+
+    def run():
+        engine = AlertEngine(sectors)
+        engine.add_many(texts)
+        return engine._compile()
+    return run
+
+
+@benchmark('AlertEngine.snapshot[universe features]', repeat=50, items='tickers')
+def bench_snapshot(scale):
+    _, _, engine, _, (close, indicators, macro) = _case(scale)
+    return lambda: engine.snapshot(close, indicators, macro)
+
+
+@benchmark(f'AlertEngine.evaluate[{N_RULES} rules x universe]', repeat=20, items='tickers')
+def bench_evaluate(scale):
+    _, _, engine, snapshot, _ = _case(scale)
+    return lambda: engine.evaluate(snapshot)
+
+
+@benchmark(f'per-rule pandas loop[{BASELINE_RULES} rules, baseline]', repeat=3, items='tickers')
+def bench_rule_loop(scale):
+    _, _, engine, snapshot, _ = _case(scale)
+    rules = engine.rules[:BASELINE_RULES]
+
+    def run():
+        fired = []
+        for rule in rules:
+            hit = pd.Series(False, index=snapshot.index)
+            for clause in rule.clauses:
+                clause_hit = pd.Series(True, index=snapshot.index)
+                for condition in clause:
+                    clause_hit &= OPS[condition.op](snapshot[condition.feature], condition.threshold)
+                hit |= clause_hit
+            fired.append(hit[hit].index)
+        return fired
+    return run
@@ -0,0 +1,61 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+from article_extractor import ArticleExtractor, extract_text, summarize
+from benchmarks.fixtures import DATA_DIR, article_urls
+from benchmarks.harness import benchmark
+from data_providers import YFinanceProvider
+
+_texts = []
+
+
+def _extractor(per_host=8):
+    """Extractor with a fresh cache directory, fetching from the local article server"""
+    root = tempfile.mkdtemp(prefix='bench-articles-')
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    return ArticleExtractor(YFinanceProvider(), root, max_workers=8, per_host=per_host)
+
+
+def _article_texts():
+    if not _texts:
+        for name in sorted(os.listdir(os.path.join(DATA_DIR, 'articles'))):
+            with open(os.path.join(DATA_DIR, 'articles', name), encoding='utf-8') as f:
+                _texts.append(extract_text(f.read())[1])
+    return _texts
+
+
+@benchmark('ArticleExtractor.fetch[cold, local server]', repeat=3, items='rss_items')
+def bench_fetch_cold(scale):
+    urls = article_urls(scale['rss_items'])
+    return lambda: _extractor().fetch(urls)
+
+
+@benchmark('ArticleExtractor.fetch[warm cache]', repeat=10, items='rss_items')
+def bench_fetch_warm(scale):
+    urls = article_urls(scale['rss_items'])
+    extractor = _extractor()
+    extractor.fetch(urls)
+    return lambda: extractor.fetch(urls)
+
+
+@benchmark('extract_text[saved page]', repeat=200)
+def bench_extract_text(scale):
+    with open(os.path.join(DATA_DIR, 'articles', 'infra_capex.html'), encoding='utf-8') as f:
+        html = f.read()
+    return lambda: extract_text(html)
+
+
+@benchmark('summarize[serial]', repeat=3, items='articles')
+def bench_summarize_serial(scale):
+    texts = _article_texts()
+    texts = [texts[i % len(texts)] for i in range(scale['articles'])]
+    return lambda: summarize(texts, workers=1)
+
+
+@benchmark('summarize[process pool]', repeat=3, items='articles')
+def bench_summarize_pool(scale):
+    texts = _article_texts()
+    texts = [texts[i % len(texts)] for i in range(scale['articles'])]
+    return lambda: summarize(texts)
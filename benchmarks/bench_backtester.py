@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from backtester import Backtester, RATING_DIRECTION
+from benchmarks.harness import benchmark
+
+EVENTS_PER_TICKER = 20
+_cases = {}
+
+
+def _case(scale):
+    """Close matrix plus ``EVENTS_PER_TICKER`` random ratings per ticker"""
+    key = (scale['tickers'], scale['years'])
+    if key not in _cases:
+        rng = np.random.default_rng(21)
+        n_days, n_tickers = scale['years'] * 252, scale['tickers']
+        index = pd.bdate_range(end='2026-09-30', periods=n_days)
+        columns = [f"SYN{i:04d}.NS" for i in range(n_tickers)]
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.018, (n_days, n_tickers)), axis=0))
+        ratings = np.array(list(RATING_DIRECTION))
+        n_events = n_tickers * EVENTS_PER_TICKER
+        events = pd.DataFrame({
+            'date': index[rng.integers(0, n_days, n_events)],
+            'ticker': np.repeat(columns, EVENTS_PER_TICKER),
+            'rating': ratings[rng.integers(0, len(ratings), n_events)],
+            'source': 'synthetic'
+        })
+        events['direction'] = events['rating'].map(RATING_DIRECTION)
+        _cases[key] = (pd.DataFrame(close, index=index, columns=columns), events)
+    return _cases[key]
+
+
+@benchmark('Backtester.run[universe]', repeat=5, items='tickers')
+def bench_run(scale):
+    prices, events = _case(scale)
+    backtester = Backtester(prices)
+    return lambda: backtester.summarize(backtester.run(events))
+
+
+@benchmark('Backtester.sweep[8 combos, uncached]', repeat=3, items='tickers')
+def bench_sweep(scale):
+    prices, events = _case(scale)
+    backtester = Backtester(prices)
+    grid = {'event_driven': [True, False], 'hold_band': [0.02, 0.05], 'entry_lag': [0, 1]}
+    return lambda: backtester.sweep(events, grid, workers=4, cache_dir=None)
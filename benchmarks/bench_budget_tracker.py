@@ -0,0 +1,48 @@
+import pandas as pd
+
+from benchmarks.fixtures import budget_universe
+from benchmarks.harness import benchmark
+from budget_tracker import BudgetTracker, PolicyTracker
+
+
+def _tracker(scale):
+    tracker = BudgetTracker()
+    df = pd.DataFrame(budget_universe(scale['budget_rows']))
+    df['YoY_Change_%'] = ((df['Budget_FY25'] - df['Budget_FY24']) / df['Budget_FY24'] * 100).round(2)
+    df['Priority'] = df['YoY_Change_%'].apply(tracker._get_priority)
+    tracker.budget_data = df
+    return tracker
+
+
+@benchmark('BudgetTracker.load_budget_data', repeat=100)
+def bench_load_budget(scale):
+    return BudgetTracker().load_budget_data
+
+
+@benchmark('BudgetTracker.get_top_sectors', repeat=100, items='budget_rows')
+def bench_top_sectors(scale):
+    tracker = _tracker(scale)
+    return lambda: tracker.get_top_sectors(10)
+
+
+@benchmark('BudgetTracker.get_high_growth_sectors', repeat=100, items='budget_rows')
+def bench_high_growth(scale):
+    tracker = _tracker(scale)
+    return tracker.get_high_growth_sectors
+
+
+@benchmark('BudgetTracker.get_sector_details', repeat=100, items='budget_rows')
+def bench_sector_details(scale):
+    tracker = _tracker(scale)
+    return lambda: tracker.get_sector_details('Sector 0001')
+
+
+@benchmark('BudgetTracker.get_investment_recommendations', repeat=10, items='budget_rows')
+def bench_recommendations(scale):
+    tracker = _tracker(scale)
+    return tracker.get_investment_recommendations
+
+
+@benchmark('PolicyTracker.get_recent_policies', repeat=100)
+def bench_recent_policies(scale):
+    return PolicyTracker.get_recent_policies
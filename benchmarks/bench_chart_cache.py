@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from benchmarks.harness import benchmark
+from chart_cache import ChartCache, lttb, MAX_POINTS
+
+MINUTES_PER_SESSION = 375
+_series = {}
+
+
+def _intraday(scale):
+    """One ticker's 1-minute closes over the scale's history length"""
+    key = scale['years']
+    if key not in _series:
+        rng = np.random.default_rng(34)
+        n = scale['years'] * 252 * MINUTES_PER_SESSION
+        _series[key] = pd.DataFrame({
+            'Datetime': pd.date_range('2016-01-01 09:15', periods=n, freq='min'),
+            'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.0008, n)))
+        })
+    return _series[key]
+
+
+@benchmark('lttb[1m history -> MAX_POINTS]', repeat=10)
+def bench_lttb(scale):
+    bars = _intraday(scale)
+    x = bars['Datetime'].to_numpy().astype(np.int64).astype(float)
+    y = bars['Close'].to_numpy()
+    return lambda: lttb(x, y, MAX_POINTS)
+
+
+@benchmark('ChartCache.figure[miss, downsampled]', repeat=5)
+def bench_miss(scale):
+    bars = _intraday(scale)
+    cache = ChartCache()
+
+    def run():
+        cache.clear()
+        return cache.figure("intraday", px.line, bars, max_points=MAX_POINTS, x='Datetime', y='Close')
+    return run
+
+
+@benchmark('ChartCache.figure[hit]', repeat=20)
+def bench_hit(scale):
+    bars = _intraday(scale)
+    cache = ChartCache()
+    return lambda: cache.figure("intraday", px.line, bars, max_points=MAX_POINTS, x='Datetime', y='Close')
+
+
+@benchmark('px.line[full resolution, uncached]', repeat=3)
+def bench_uncached(scale):
+    bars = _intraday(scale)
+    return lambda: px.line(bars, x='Datetime', y='Close').to_json()
@@ -0,0 +1,72 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from benchmarks.fixtures import synthetic_history
+from benchmarks.harness import benchmark
+from corporate_actions import CorporateActions
+
+TICKER = 'SYN0000.NS'
+HISTORY_YEARS = 10
+N_SPLITS = 3
+_cases = {}
+
+
+def _case(scale):
+    """Ten years of bars with quarterly dividends and a few (already applied) splits, as yfinance reports them"""
+    if TICKER not in _cases:
+        rng = np.random.default_rng(47)
+        hist = synthetic_history(TICKER, HISTORY_YEARS)
+        dividends = np.arange(40, len(hist), 63)
+        hist.iloc[dividends, hist.columns.get_loc('Dividends')] = rng.uniform(0.5, 2.0, len(dividends))
+        splits = rng.choice(len(hist), N_SPLITS, replace=False)
+        hist.iloc[splits, hist.columns.get_loc('Stock Splits')] = 2.0
+        root = tempfile.mkdtemp(prefix='bench-actions-')
+        atexit.register(shutil.rmtree, root, ignore_errors=True)
+        actions = CorporateActions(os.path.join(root, 'actions.db'))
+        actions.ingest(TICKER, hist)
+        _cases[TICKER] = (actions, hist)
+    return _cases[TICKER]
+
+
+def _window(hist, scale):
+    return hist.index[-scale['years'] * 252], hist.index[-1]
+
+
+@benchmark(f'CorporateActions.adjust[slice of {HISTORY_YEARS}y raw bars]', repeat=200)
+def bench_adjust_slice(scale):
+    actions, hist = _case(scale)
+    start, end = _window(hist, scale)
+    return lambda: actions.adjust(hist, TICKER, start, end)
+
+
+@benchmark(f'CorporateActions.record_split + adjust[{HISTORY_YEARS}y]', repeat=50)
+def bench_record_split(scale):
+    actions, hist = _case(scale)
+    start, end = _window(hist, scale)
+    ex_date = hist.index[len(hist) // 2]
+
+    def run():
+        actions.record_split(TICKER, ex_date, 2.0)
+        return actions.adjust(hist, TICKER, start, end)
+    return run
+
+
+@benchmark(f'eager rewrite[{HISTORY_YEARS}y bars per action, baseline]', repeat=20)
+def bench_eager_rewrite(scale):
+    """Adjusting the stored history in place: every dividend rescales all bars before its ex-date
+
+    The splits are already in yfinance's bars, so as in ``adjust`` only dividends are applied.
+    """
+    _, hist = _case(scale)
+    events = [(i, v) for i, v in enumerate(hist['Dividends'].to_numpy()) if v > 0]
+
+    def run():
+        adjusted = hist[['Open', 'High', 'Low', 'Close', 'Volume']].astype(float)
+        for i, value in events:
+            adjusted.iloc[:i, :4] *= 1 - value / hist['Close'].iloc[i - 1]
+        return adjusted
+    return run
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from correlation_clusters import CorrelationClusters
+
+N_FACTORS = 20
+_cases = {}
+
+
+def _case(scale):
+    """Daily returns driven by ``N_FACTORS`` latent sectors, plus one extra bar to apply incrementally"""
+    key = (scale['tickers'], scale['years'])
+    if key not in _cases:
+        rng = np.random.default_rng(46)
+        n_days = scale['years'] * 252 + 1
+        factor_of = rng.integers(0, N_FACTORS, scale['tickers'])
+        values = rng.normal(0, 0.01, (n_days, N_FACTORS))[:, factor_of] + \
+            rng.normal(0, 0.01, (n_days, scale['tickers']))
+        returns = pd.DataFrame(values, index=pd.bdate_range(end='2026-09-30', periods=n_days),
+                               columns=[f"SYN{i:04d}.NS" for i in range(scale['tickers'])])
+        _cases[key] = returns
+    return _cases[key]
+
+
+def _fitted(scale):
+    returns = _case(scale)
+    return CorrelationClusters(n_clusters=N_FACTORS).fit(returns.iloc[:-1]), returns
+
+
+@benchmark('CorrelationClusters.fit[full history, baseline]', repeat=5, items='tickers')
+def bench_fit(scale):
+    returns = _case(scale)
+    clustering = CorrelationClusters(n_clusters=N_FACTORS)
+    return lambda: clustering.fit(returns)
+
+
+@benchmark('CorrelationClusters.update[1 bar, rank-one]', repeat=20, items='tickers')
+def bench_update(scale):
+    clustering, returns = _fitted(scale)
+    date, row = returns.index[-1], returns.iloc[-1].to_numpy()
+    return lambda: clustering.update(date, row)
+
+
+@benchmark('CorrelationClusters.clusters[cached, drift check]', repeat=20, items='tickers')
+def bench_clusters_cached(scale):
+    clustering, _ = _fitted(scale)
+    clustering.clusters()
+    return clustering.clusters
+
+
+@benchmark('CorrelationClusters.clusters[recluster]', repeat=5, items='tickers')
+def bench_recluster(scale):
+    clustering, _ = _fitted(scale)
+
+    def run():
+        clustering._cached = {}
+        return clustering.clusters()
+    return run
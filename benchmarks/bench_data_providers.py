@@ -0,0 +1,63 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fixtures import offline, ticker_universe
+from benchmarks.harness import benchmark
+from data_providers import RecordingProvider, ReplayProvider, YFinanceProvider
+from fetch_planner import BarCache, FetchPlanner
+from sector_analyzer import SectorAnalyzer
+
+REQUESTS_PER_THREAD = 50
+THREADS = 8
+_recordings = {}
+
+
+def _planner(provider, root):
+    """Planner over an empty bar cache, so every bar is served by ``provider``"""
+    return FetchPlanner(provider, BarCache(tempfile.mktemp(dir=root, suffix='.db')))
+
+
+def _recording(scale):
+    """Record one price-history pass over the synthetic universe (recorders bypass the planner: per-ticker history)"""
+    key = (scale['tickers'], scale['years'])
+    if key not in _recordings:
+        root = tempfile.mkdtemp(prefix='replay-')
+        path = os.path.join(root, 'responses.sqlite')
+        sectors = ticker_universe(scale['tickers'])
+        with offline(scale):
+            recorder = RecordingProvider(YFinanceProvider(), path)
+            analyzer = SectorAnalyzer(provider=recorder, planner=_planner(recorder, root))
+            analyzer.sectors = sectors
+            analyzer.load_price_history(period='1y')
+        _recordings[key] = (path, sectors)
+    return _recordings[key]
+
+
+@benchmark('ReplayProvider: load_price_history[universe]', repeat=5, items='tickers')
+def bench_replay_history(scale):
+    path, sectors = _recording(scale)
+    provider = ReplayProvider(path)
+    root = os.path.dirname(path)
+
+    def run():
+        analyzer = SectorAnalyzer(provider=provider, planner=_planner(provider, root))
+        analyzer.sectors = sectors
+        return analyzer.load_price_history(period='1y')
+    return run
+
+
+@benchmark(f'ReplayProvider: history x{THREADS * REQUESTS_PER_THREAD} requests, {THREADS} threads', repeat=5)
+def bench_replay_concurrent(scale):
+    path, sectors = _recording(scale)
+    provider = ReplayProvider(path)
+    tickers = [t for data in sectors.values() for t in data['stocks']]
+
+    def worker(offset):
+        for i in range(REQUESTS_PER_THREAD):
+            provider.history(tickers[(offset + i) % len(tickers)], period='1y')
+
+    def run():
+        with ThreadPoolExecutor(THREADS) as pool:
+            list(pool.map(worker, range(0, THREADS * REQUESTS_PER_THREAD, REQUESTS_PER_THREAD)))
+    return run
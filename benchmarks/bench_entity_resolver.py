@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import ticker_universe
+from benchmarks.harness import benchmark
+from entity_resolver import EntityResolver, TICKER_ALIASES
+
+COLUMN_ROWS = 100_000
+_cases = {}
+
+
+def _variants(name, rng):
+    """Free-text spellings seen in recommendations: qualifiers, suffixes, case, typos"""
+    choice = rng.integers(0, 5)
+    if choice == 0:
+        return f"{name} (planned)"
+    if choice == 1:
+        return f"{name} Ltd"
+    if choice == 2:
+        return name.upper()
+    if choice == 3:
+        return name[:-1]  # dropped last character
+    return name
+
+
+def _case(scale):
+    """Resolver over a synthetic universe plus a column of noisy names (some unknown)"""
+    key = scale['tickers']
+    if key not in _cases:
+        rng = np.random.default_rng(42)
+        sectors = ticker_universe(scale['tickers'])
+        names = [n for data in sectors.values() for n in data['names']] + list(TICKER_ALIASES)
+        noisy = [_variants(names[i], rng) for i in rng.integers(0, len(names), 2000)]
+        noisy += [f"Unlisted Venture {i}" for i in range(200)]
+        column = pd.Series(rng.choice(noisy, COLUMN_ROWS))
+        _cases[key] = (sectors, noisy, column)
+    return _cases[key]
+
+
+@benchmark('EntityResolver.from_sectors[universe + aliases]', repeat=20, items='tickers')
+def bench_build(scale):
+    sectors, _, _ = _case(scale)
+    return lambda: EntityResolver.from_sectors(sectors)
+
+
+@benchmark('EntityResolver.match[2200 distinct names, cold]', repeat=10)
+def bench_match_cold(scale):
+    sectors, noisy, _ = _case(scale)
+    resolver = EntityResolver.from_sectors(sectors)
+
+    def run():
+        resolver._memo.clear()
+        return [resolver.match(name) for name in noisy]
+    return run
+
+
+@benchmark(f'EntityResolver.resolve_many[{COLUMN_ROWS} rows, warm]', repeat=20)
+def bench_resolve_many(scale):
+    sectors, _, column = _case(scale)
+    resolver = EntityResolver.from_sectors(sectors)
+    resolver.resolve_many(column)
+    return lambda: resolver.resolve_many(column)
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from event_ingestion import EventIngestor, JsonlDropSource
+from global_impact_analyzer import GlobalImpactAnalyzer
+
+TEMPLATES = [
+    "{country} tightens {commodity} export controls",
+    "{commodity} prices surge {pct}% on {country} supply disruption",
+    "{country} extends {commodity} production cuts",
+    "Strike halts {commodity} output in {country}",
+    "{country} eases {commodity} export quotas after talks"
+]
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+COMMODITY_WORDS = ['cobalt', 'lithium', 'rare earth', 'Brent crude', 'semiconductor', 'nickel']
+
+
+def synthetic_events(n, duplicate_rate=0.3, seed=40):
+    """``n`` raw headlines; ``duplicate_rate`` of them are re-worded repeats with a source suffix"""
+    rng = np.random.default_rng(seed)
+    events = []
+    for i in range(n):
+        if events and rng.random() < duplicate_rate:
+            original = events[rng.integers(0, len(events))]
+            events.append(dict(original, event=f"{original['event'].upper()} - Reuters"))
+            continue
+        events.append({
+            'date': f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            'event': TEMPLATES[rng.integers(0, len(TEMPLATES))].format(
+                country=''.join(rng.choice(list(LETTERS), 9)).title(),
+                commodity=COMMODITY_WORDS[rng.integers(0, len(COMMODITY_WORDS))],
+                pct=rng.integers(5, 60))
+        })
+    return events
+
+
+def _ingestor():
+    return EventIngestor(GlobalImpactAnalyzer.load_commodity_dependencies(), seed_events=GlobalImpactAnalyzer.builtin_events())
+
+
+@benchmark('EventIngestor.add[articles, 30% near-duplicates]', repeat=3, items='articles')
+def bench_ingest(scale):
+    events = synthetic_events(scale['articles'])
+    return lambda: _ingestor().add(events)
+
+
+@benchmark('EventIngestor.poll[JSONL drop, 100 appended lines]', repeat=20)
+def bench_poll_append(scale):
+    directory = tempfile.mkdtemp(prefix='events-')
+    path = os.path.join(directory, 'feed.jsonl')
+    events = synthetic_events(scale['articles'])
+    with open(path, 'w') as f:
+        f.writelines(json.dumps(e) + '\n' for e in events)
+    ingestor = _ingestor()
+    ingestor.sources = [JsonlDropSource(directory)]
+    ingestor.poll()
+    appended = synthetic_events(100 * 200, seed=41)
+    batches = iter([appended[i:i + 100] for i in range(0, len(appended), 100)])
+
+    def run():
+        with open(path, 'a') as f:
+            f.writelines(json.dumps(e) + '\n' for e in next(batches))
+        return ingestor.poll()
+    return run
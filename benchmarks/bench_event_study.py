@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from event_study import EventStudy, ENTITY_COLUMNS, DEFAULT_WINDOWS
+
+STOCKS_PER_POLICY = 5
+BASELINE_PAIRS = 100
+_cases = {}
+
+
+def _case(scale):
+    """Synthetic closes (stocks + sector indices) and ``budget_rows`` policies tagging random stocks"""
+    key = (scale['tickers'], scale['years'], scale['budget_rows'])
+    if key not in _cases:
+        rng = np.random.default_rng(41)
+        n_days = max(scale['years'], 3) * 252
+        n_sectors = 10
+        index = pd.bdate_range(end='2026-09-30', periods=n_days)
+        sector_ret = rng.normal(0, 0.01, (n_days, n_sectors))
+        sector_of = rng.integers(0, n_sectors, scale['tickers'])
+        stock_ret = sector_ret[:, sector_of] * rng.uniform(0.5, 1.5, scale['tickers']) + \
+            rng.normal(0, 0.015, (n_days, scale['tickers']))
+        stocks = [f"SYN{i:04d}" for i in range(scale['tickers'])]
+        indices = [f"^IDX{i}" for i in range(n_sectors)]
+        close = 100 * np.exp(np.cumsum(np.column_stack([stock_ret, sector_ret]), axis=0))
+        prices = pd.DataFrame(close, index=index, columns=stocks + indices)
+
+        dates = rng.choice(index[200:-70], scale['budget_rows'])
+        rows = []
+        for p, date in enumerate(dates):
+            for s in rng.choice(scale['tickers'], STOCKS_PER_POLICY, replace=False):
+                rows.append((f"Policy {p}", date, 'stock', stocks[s], stocks[s], indices[sector_of[s]]))
+        _cases[key] = (prices, pd.DataFrame(rows, columns=ENTITY_COLUMNS))
+    return _cases[key]
+
+
+@benchmark(f'EventStudy.run[policies x {STOCKS_PER_POLICY} stocks x {len(DEFAULT_WINDOWS)} windows]',
+           repeat=20, items='budget_rows')
+def bench_run(scale):
+    prices, entities = _case(scale)
+    study = EventStudy(prices)
+    return lambda: study.run(entities)
+
+
+@benchmark('EventStudy.measure[all policies cached]', repeat=50, items='budget_rows')
+def bench_measure_cached(scale):
+    prices, entities = _case(scale)
+    study = EventStudy(prices)
+    study.measure(entities)
+    return lambda: study.measure(entities)
+
+
+@benchmark(f'np.polyfit loop[{BASELINE_PAIRS} pairs, baseline]', repeat=5)
+def bench_polyfit_loop(scale):
+    prices, entities = _case(scale)
+    returns = prices.pct_change(fill_method=None)
+    pairs = entities.head(BASELINE_PAIRS)
+
+    def run():
+        cars = []
+        for _, pair in pairs.iterrows():
+            e = returns.index.searchsorted(pair['date'])
+            y, x = returns[pair['ticker']], returns[pair['benchmark']]
+            beta, alpha = np.polyfit(x.iloc[e - 130:e - 10], y.iloc[e - 130:e - 10], 1)
+            abnormal = y.iloc[e - 5:e + 61] - alpha - beta * x.iloc[e - 5:e + 61]
+            cars.append([abnormal.iloc[5 + lo:6 + hi].sum() for lo, hi in DEFAULT_WINDOWS])
+        return cars
+    return run
@@ -0,0 +1,67 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from benchmarks.fixtures import ticker_universe
+from benchmarks.harness import benchmark
+from data_providers import YFinanceProvider
+from fetch_planner import BarCache, FetchPlanner
+
+PERIOD = '6mo'
+STALE_SESSIONS = 3
+NOW = pd.Timestamp('2026-09-30 18:00')  # after the close of the fixtures' last bar
+_root = tempfile.mkdtemp(prefix='bench-planner-')
+atexit.register(shutil.rmtree, _root, True)
+_caches = {}
+
+
+def _tickers(scale):
+    return [t for data in ticker_universe(scale['tickers']).values() for t in data['stocks']]
+
+
+def _fresh_planner():
+    return FetchPlanner(YFinanceProvider(), BarCache(tempfile.mktemp(dir=_root, suffix='.db')))
+
+
+def _warm_cache(scale):
+    """Cache holding the period for every ticker, the way a previous page load leaves it"""
+    key = scale['tickers']
+    if key not in _caches:
+        planner = _fresh_planner()
+        planner.histories(_tickers(scale), period=PERIOD, now=NOW)
+        _caches[key] = planner.cache
+    return _caches[key]
+
+
+@benchmark(f'FetchPlanner.histories[{PERIOD}, cold cache]', repeat=5, items='tickers')
+def bench_histories_cold(scale):
+    tickers = _tickers(scale)
+    return lambda: _fresh_planner().histories(tickers, period=PERIOD, now=NOW)
+
+
+@benchmark(f'FetchPlanner.histories[{PERIOD}, warm cache]', repeat=20, items='tickers')
+def bench_histories_warm(scale):
+    tickers = _tickers(scale)
+    planner = FetchPlanner(YFinanceProvider(), _warm_cache(scale))
+    return lambda: planner.histories(tickers, period=PERIOD, now=NOW)
+
+
+@benchmark(f'FetchPlanner.plan[{STALE_SESSIONS} stale sessions]', repeat=50, items='tickers')
+def bench_plan_stale(scale):
+    """Every ticker is missing the sessions that closed since the cache was filled"""
+    tickers = _tickers(scale)
+    planner = FetchPlanner(YFinanceProvider(), _warm_cache(scale))
+    stale_until = planner.calendar.sessions(NOW + pd.Timedelta(days=1), NOW + pd.Timedelta(days=14))[STALE_SESSIONS - 1]
+    now = stale_until + pd.Timedelta(hours=18)
+    window = planner.calendar.window(PERIOD, now)
+    return lambda: planner.plan(tickers, window, now=now)
+
+
+@benchmark(f'blind history per ticker[{PERIOD}, baseline]', repeat=5, items='tickers')
+def bench_blind_history(scale):
+    tickers = _tickers(scale)
+    provider = YFinanceProvider()
+    return lambda: {ticker: provider.history(ticker, period=PERIOD) for ticker in tickers}
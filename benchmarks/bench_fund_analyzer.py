@@ -0,0 +1,28 @@
+from unittest import mock
+
+import fund_analyzer
+from benchmarks.fixtures import fund_universe, SECTOR_NAMES
+from benchmarks.harness import benchmark
+
+
+@benchmark('get_top_equity_funds', repeat=100)
+def bench_top_equity_funds(scale):
+    return fund_analyzer.get_top_equity_funds
+
+
+@benchmark('display_fund_analysis', repeat=5, items='funds')
+def bench_display_fund_analysis(scale):
+    funds = fund_universe(scale['funds'])
+
+    def run():
+        # Streamlit calls are no-ops outside a script run; this times filtering,
+        # figure construction and the top-picks loop over the scaled frame.
+        with mock.patch.object(fund_analyzer, 'get_top_equity_funds', lambda compact=False: funds):
+            fund_analyzer.display_fund_analysis()
+    return run
+
+
+@benchmark('get_fund_recommendations', repeat=100, items='funds')
+def bench_fund_recommendations(scale):
+    sectors = [SECTOR_NAMES[i % len(SECTOR_NAMES)] for i in range(scale['funds'])]
+    return lambda: fund_analyzer.get_fund_recommendations(sectors)
@@ -0,0 +1,58 @@
+import numpy as np
+
+from benchmarks.fixtures import holdings_disclosure
+from benchmarks.harness import benchmark
+from fund_holdings import HoldingsMonth
+
+SELECTED = 8
+_cases = {}
+
+
+def _disclosure(scale):
+    n = scale['holding_funds']
+    if n not in _cases:
+        _cases[n] = holdings_disclosure(n)
+    return _cases[n]
+
+
+def _month(scale):
+    return HoldingsMonth.from_frame('2026-09', _disclosure(scale))
+
+
+@benchmark('HoldingsMonth.from_frame[disclosure rows]', repeat=10, items='holding_funds')
+def bench_from_frame(scale):
+    frame = _disclosure(scale)
+    return lambda: HoldingsMonth.from_frame('2026-09', frame)
+
+
+@benchmark('HoldingsMonth.overlap[cosine, all pairs, cold]', repeat=5, items='holding_funds')
+def bench_overlap_cold(scale):
+    parsed = _month(scale)
+    # A fresh month each call, so the Gram matrix is never cached
+    return lambda: HoldingsMonth(parsed.month, parsed.funds, parsed.stocks, parsed.weights).overlap('cosine')
+
+
+@benchmark('HoldingsMonth.similar[cached month]', repeat=200)
+def bench_similar_cached(scale):
+    holdings = _month(scale)
+    holdings.overlap('cosine')
+    return lambda: holdings.similar(holdings.funds[0])
+
+
+@benchmark('dense pairwise cosine[baseline]', repeat=5, items='holding_funds')
+def bench_dense_cosine(scale):
+    """Dense funds x stocks matrix and a dense product, as without the sparse layout"""
+    holdings = _month(scale)
+
+    def run():
+        dense = holdings.weights.toarray()
+        norms = np.linalg.norm(dense, axis=1)
+        return dense @ dense.T / np.outer(norms, norms)
+    return run
+
+
+@benchmark(f'HoldingsMonth.diversification[{SELECTED} funds]', repeat=200)
+def bench_diversification(scale):
+    holdings = _month(scale)
+    funds = list(holdings.funds[:SELECTED])
+    return lambda: holdings.diversification(funds)
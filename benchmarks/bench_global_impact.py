@@ -0,0 +1,46 @@
+from benchmarks.fixtures import commodity_universe
+from benchmarks.harness import benchmark
+from global_impact_analyzer import GlobalImpactAnalyzer, SupplyChainMonitor
+
+
+def _analyzer(scale):
+    analyzer = GlobalImpactAnalyzer()
+    analyzer.commodity_map, analyzer.global_events = commodity_universe(scale['commodities'])
+    return analyzer
+
+
+@benchmark('GlobalImpactAnalyzer.__init__', repeat=100)
+def bench_init(scale):
+    return GlobalImpactAnalyzer
+
+
+@benchmark('GlobalImpactAnalyzer.analyze_event_impact', repeat=200)
+def bench_event_impact(scale):
+    analyzer = _analyzer(scale)
+    return lambda: analyzer.analyze_event_impact('Commodity 001')
+
+
+@benchmark('GlobalImpactAnalyzer.get_substitute_projections[all]', repeat=20, items='commodities')
+def bench_substitute_projections(scale):
+    analyzer = _analyzer(scale)
+    return lambda: [analyzer.get_substitute_projections(c) for c in analyzer.commodity_map]
+
+
+@benchmark('GlobalImpactAnalyzer.get_supply_chain_risks', repeat=20, items='commodities')
+def bench_supply_chain_risks(scale):
+    return _analyzer(scale).get_supply_chain_risks
+
+
+@benchmark('GlobalImpactAnalyzer.get_investment_opportunities', repeat=20, items='commodities')
+def bench_investment_opportunities(scale):
+    return _analyzer(scale).get_investment_opportunities
+
+
+@benchmark('SupplyChainMonitor.get_critical_alerts', repeat=200)
+def bench_critical_alerts(scale):
+    return SupplyChainMonitor().get_critical_alerts
+
+
+@benchmark('SupplyChainMonitor.get_geopolitical_risks', repeat=200)
+def bench_geopolitical_risks(scale):
+    return SupplyChainMonitor().get_geopolitical_risks
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from macro_store import MacroStore
+
+WINDOW = 63
+_cases = {}
+
+
+def _case(scale):
+    """Reference store plus synthetic daily FX/crude/gold and a (dates x tickers) return frame"""
+    key = (scale['tickers'], scale['years'])
+    if key not in _cases:
+        rng = np.random.default_rng(37)
+        n_days, n_cols = scale['years'] * 252, scale['tickers']
+        index = pd.bdate_range(end='2026-09-30', periods=n_days)
+        store = MacroStore.reference()
+        for name, start, vol in (('usd_inr', 83.0, 0.003), ('crude_oil', 80.0, 0.02), ('gold_price', 62000, 0.01)):
+            store.update(name, pd.Series(start * np.exp(np.cumsum(rng.normal(0, vol, n_days))), index=index))
+        returns = pd.DataFrame(rng.normal(0, 0.015, (n_days, n_cols)), index=index,
+                               columns=[f"SYN{i:04d}" for i in range(n_cols)])
+        _cases[key] = (store, returns)
+    return _cases[key]
+
+
+@benchmark('MacroStore.asof[all indicators]', repeat=50)
+def bench_asof(scale):
+    store, returns = _case(scale)
+    return lambda: store.asof(returns.index)
+
+
+@benchmark(f'MacroStore.rolling_betas[{WINDOW}d, universe]', repeat=20, items='tickers')
+def bench_rolling_betas(scale):
+    store, returns = _case(scale)
+    return lambda: store.rolling_betas(returns, 'usd_inr', window=WINDOW)
+
+
+@benchmark(f'pandas rolling cov/var[{WINDOW}d, universe, baseline]', repeat=5, items='tickers')
+def bench_rolling_betas_pandas(scale):
+    store, returns = _case(scale)
+    x = store.factor_changes(returns.index, ['usd_inr'])['usd_inr']
+    return lambda: returns.rolling(WINDOW).cov(x).div(x.rolling(WINDOW).var(), axis=0)
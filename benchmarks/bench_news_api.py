@@ -0,0 +1,24 @@
+from benchmarks.harness import benchmark
+from news_api import NewsAPI, get_google_news, get_current_fy_dates
+
+
+@benchmark('NewsAPI.get_sector_news', repeat=10, items='articles')
+def bench_sector_news(scale):
+    api = NewsAPI(api_key='offline')
+    return lambda: api.get_sector_news('Infrastructure')
+
+
+@benchmark('NewsAPI.get_budget_news', repeat=10, items='articles')
+def bench_budget_news(scale):
+    api = NewsAPI(api_key='offline')
+    return api.get_budget_news
+
+
+@benchmark('get_google_news', repeat=3, items='rss_items')
+def bench_google_news(scale):
+    return lambda: get_google_news('IT')
+
+
+@benchmark('get_current_fy_dates', repeat=200)
+def bench_fy_dates(scale):
+    return get_current_fy_dates
@@ -0,0 +1,55 @@
+import time
+
+from benchmarks.harness import benchmark
+from global_impact_analyzer import GlobalImpactAnalyzer, SupplyChainMonitor
+from page_loader import PageLoader
+
+# Simulated per-section fetch latency once sections are backed by real I/O
+IO_LATENCY_S = (0.02, 0.03, 0.04, 0.05, 0.06, 0.07, 0.08)
+
+
+def _io(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@benchmark(f'sequential loads[{len(IO_LATENCY_S)} x simulated I/O]', repeat=5)
+def bench_sequential_io(scale):
+    return lambda: [_io(s) for s in IO_LATENCY_S]
+
+
+@benchmark(f'PageLoader[{len(IO_LATENCY_S)} x simulated I/O]', repeat=5)
+def bench_page_loader_io(scale):
+    def run():
+        page = PageLoader("bench")
+        for i, seconds in enumerate(IO_LATENCY_S):
+            page.load(f"section_{i}", _io, seconds)
+        return list(page.iter_completed())
+    return run
+
+
+@benchmark(f'PageLoader[{len(IO_LATENCY_S)} x simulated I/O, first section]', repeat=5)
+def bench_page_loader_first(scale):
+    def run():
+        page = PageLoader("bench")
+        for i, seconds in enumerate(IO_LATENCY_S):
+            page.load(f"section_{i}", _io, seconds)
+        return next(page.iter_completed())
+    return run
+
+
+@benchmark('PageLoader[Global Impact loads]', repeat=20)
+def bench_global_impact_loads(scale):
+    def run():
+        page = PageLoader("global_impact")
+        page.load('analyzer', GlobalImpactAnalyzer)
+        page.load('monitor', SupplyChainMonitor)
+        page.load('alerts', lambda monitor: monitor.get_critical_alerts(), deps=['monitor'])
+        page.load('risks', lambda monitor: monitor.get_geopolitical_risks(), deps=['monitor'])
+        page.load('impact', lambda analyzer: analyzer.analyze_event_impact('Cobalt'), deps=['analyzer'])
+        page.load('projections', lambda analyzer: analyzer.get_substitute_projections('Cobalt'), deps=['analyzer'])
+        page.load('opportunities', lambda analyzer: analyzer.get_investment_opportunities(), deps=['analyzer'])
+        page.load('vulnerabilities', lambda analyzer: analyzer.get_supply_chain_risks(), deps=['analyzer'])
+        page.load('strategy', lambda analyzer: analyzer.get_strategy_recommendations(), deps=['analyzer'])
+        return list(page.iter_completed())
+    return run
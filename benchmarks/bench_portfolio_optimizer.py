@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import SECTOR_NAMES
+from benchmarks.harness import benchmark
+from portfolio_optimizer import PortfolioOptimizer
+
+ASSETS = 500  # target universe for slider re-optimization
+_cases = {}
+
+
+def _case(scale):
+    """Factor-model returns for ``ASSETS`` stocks with a budget sector each"""
+    key = scale['years']
+    if key not in _cases:
+        rng = np.random.default_rng(33)
+        n_days = max(2, scale['years']) * 252
+        factors = rng.normal(0, 0.01, (n_days, 5))
+        returns = factors @ rng.normal(0, 0.8, (5, ASSETS)) + rng.normal(0.0004, 0.015, (n_days, ASSETS))
+        index = pd.bdate_range(end='2026-09-30', periods=n_days)
+        tickers = [f"SYN{i:04d}.NS" for i in range(ASSETS)]
+        prices = pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=index, columns=tickers)
+        growth = rng.uniform(0, 40, len(SECTOR_NAMES)).round(2)
+        universe = pd.DataFrame({
+            'Sector': [SECTOR_NAMES[i % len(SECTOR_NAMES)] for i in range(ASSETS)],
+            'Stock': tickers,
+            'Ticker': tickers,
+            'YoY_Change_%': [growth[i % len(SECTOR_NAMES)] for i in range(ASSETS)],
+            'Priority': 'High'
+        })
+        _cases[key] = (prices, universe)
+    return _cases[key]
+
+
+@benchmark('PortfolioOptimizer[covariance, 500 assets]', repeat=5)
+def bench_covariance(scale):
+    prices, universe = _case(scale)
+    return lambda: PortfolioOptimizer(prices, universe)
+
+
+def _slider(method):
+    """Each call nudges the tilt slider and re-solves from the previous optimum"""
+    def setup(scale):
+        optimizer = PortfolioOptimizer(*_case(scale))
+        solve = getattr(optimizer, method)
+        tilts = iter(np.tile(np.linspace(0.4, 0.6, 5), 1000))
+        solve(tilt=0.5)
+        return lambda: solve(tilt=next(tilts))
+    return setup
+
+
+benchmark('PortfolioOptimizer.mean_variance[slider, warm]', repeat=20)(_slider('mean_variance'))
+benchmark('PortfolioOptimizer.risk_parity[slider, warm]', repeat=20)(_slider('risk_parity'))
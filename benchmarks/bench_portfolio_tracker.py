@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import ticker_universe
+from benchmarks.harness import benchmark
+from portfolio_tracker import PortfolioBook
+
+N_POSITIONS = 5000
+LOTS_PER_POSITION = 4
+CHANGED_PRICES = 10
+_cases = {}
+
+
+def _case(scale):
+    """Lots over the scale's universe padded with unclassified tickers to ``N_POSITIONS`` names"""
+    key = scale['tickers']
+    if key not in _cases:
+        rng = np.random.default_rng(44)
+        sectors = ticker_universe(scale['tickers'])
+        tickers = [t for data in sectors.values() for t in data['stocks']]
+        tickers += [f"OTC{i:05d}.NS" for i in range(N_POSITIONS - len(tickers))]
+        priorities = dict(zip(tickers, rng.choice(['Very High', 'High', 'Medium', 'Low'], len(tickers))))
+        n_lots = N_POSITIONS * LOTS_PER_POSITION
+        lots = pd.DataFrame({'id': np.arange(1, n_lots + 1), 'ticker': np.repeat(tickers, LOTS_PER_POSITION),
+                             'quantity': rng.integers(1, 500, n_lots).astype(float),
+                             'price': rng.uniform(50, 5000, n_lots)})
+        prices = pd.Series(rng.uniform(50, 5000, len(tickers)), index=tickers)
+        _cases[key] = (sectors, priorities, lots, prices)
+    return _cases[key]
+
+
+def _book(scale):
+    sectors, priorities, lots, prices = _case(scale)
+    book = PortfolioBook(sectors, priorities)
+    book.load(lots)
+    book.mark(prices)
+    return book, prices
+
+
+@benchmark(f'PortfolioBook.load[{N_POSITIONS * LOTS_PER_POSITION} lots]', repeat=10)
+def bench_load(scale):
+    sectors, priorities, lots, _ = _case(scale)
+
+    def run():
+        book = PortfolioBook(sectors, priorities)
+        book.load(lots)
+        return book
+    return run
+
+
+@benchmark(f'PortfolioBook.mark[{CHANGED_PRICES} changed of {N_POSITIONS}] + summary + exposure', repeat=200)
+def bench_mark_changed(scale):
+    book, prices = _book(scale)
+    rng = np.random.default_rng(0)
+    ticks = prices.sample(CHANGED_PRICES, random_state=0)
+
+    def run():
+        book.mark(ticks * rng.uniform(0.99, 1.01, CHANGED_PRICES))
+        return book.summary(), book.exposure('sector'), book.exposure('priority')
+    return run
+
+
+@benchmark(f'PortfolioBook.mark[{N_POSITIONS} unchanged closes, rerun]', repeat=100)
+def bench_mark_unchanged(scale):
+    book, prices = _book(scale)
+    return lambda: book.mark(prices)
+
+
+@benchmark(f'full revalue[{N_POSITIONS} positions, baseline]', repeat=20)
+def bench_full_revalue(scale):
+    sectors, priorities, lots, prices = _case(scale)
+    sector_of = {t: name for name, data in reversed(list(sectors.items())) for t in data['stocks']}
+
+    def run():
+        book = lots.assign(cost=lots['quantity'] * lots['price']).groupby('ticker')[['quantity', 'cost']].sum()
+        book['value'] = book['quantity'] * prices.reindex(book.index)
+        book['sector'] = book.index.map(lambda t: sector_of.get(t, 'Unclassified'))
+        book['priority'] = book.index.map(priorities)
+        return (book['value'].sum() - book['cost'].sum(),
+                book.groupby('sector')['value'].sum(), book.groupby('priority')['value'].sum())
+    return run
@@ -0,0 +1,23 @@
+import numpy as np
+
+from benchmarks.fixtures import ticker_universe
+from benchmarks.harness import benchmark
+from quote_stream import QuoteStreamEngine, Tick
+
+TICKS = 100_000
+
+
+@benchmark('QuoteStreamEngine.consume[100k ticks]', repeat=5)
+def bench_consume(scale):
+    sectors = ticker_universe(scale['tickers'])
+    tickers = [t for data in sectors.values() for t in data['stocks']]
+    rng = np.random.default_rng(5)
+    picks = rng.integers(0, len(tickers), TICKS)
+    prices = 100 + rng.normal(0, 1, TICKS)
+    ticks = [Tick(i, tickers[j], p, 10) for i, (j, p) in enumerate(zip(picks, prices))]
+
+    def run():
+        engine = QuoteStreamEngine(sectors)
+        engine.consume(ticks)
+        engine.drain_deltas()
+    return run
@@ -0,0 +1,57 @@
+from benchmarks.fixtures import ticker_universe
+from benchmarks.harness import benchmark
+from sector_analyzer import SectorAnalyzer, MacroEconomicData
+
+
+def _analyzer(scale):
+    analyzer = SectorAnalyzer()
+    analyzer.sectors = ticker_universe(scale['tickers'])
+    return analyzer
+
+
+@benchmark('SectorAnalyzer.get_sector_performance', repeat=50)
+def bench_sector_performance(scale):
+    analyzer = _analyzer(scale)
+    sector = next(iter(analyzer.sectors))
+    return lambda: analyzer.get_sector_performance(sector, period='max')
+
+
+@benchmark('SectorAnalyzer.compare_sectors', repeat=20)
+def bench_compare_sectors(scale):
+    analyzer = _analyzer(scale)
+    return lambda: analyzer.compare_sectors(period='max')
+
+
+@benchmark('SectorAnalyzer.get_top_stocks_in_sector', repeat=5)
+def bench_top_stocks(scale):
+    analyzer = _analyzer(scale)
+    sector = next(iter(analyzer.sectors))
+    return lambda: analyzer.get_top_stocks_in_sector(sector)
+
+
+@benchmark('SectorAnalyzer.get_top_stocks_in_sector[all sectors]', repeat=3, items='tickers')
+def bench_top_stocks_universe(scale):
+    analyzer = _analyzer(scale)
+    return lambda: [analyzer.get_top_stocks_in_sector(s) for s in analyzer.sectors]
+
+
+@benchmark('SectorAnalyzer.get_sector_fundamentals', repeat=10)
+def bench_sector_fundamentals(scale):
+    analyzer = _analyzer(scale)
+    sector = next(iter(analyzer.sectors))
+    return lambda: analyzer.get_sector_fundamentals(sector)
+
+
+@benchmark('MacroEconomicData.get_indicators', repeat=200)
+def bench_macro_indicators(scale):
+    return MacroEconomicData.get_indicators
+
+
+@benchmark('MacroEconomicData.get_gdp_trend', repeat=200)
+def bench_gdp_trend(scale):
+    return MacroEconomicData.get_gdp_trend
+
+
+@benchmark('MacroEconomicData.get_inflation_trend', repeat=200)
+def bench_inflation_trend(scale):
+    return MacroEconomicData.get_inflation_trend
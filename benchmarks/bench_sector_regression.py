@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from sector_regression import SectorRegression, DEFAULT_FACTORS, DEFAULT_WINDOWS
+
+MAX_SECTORS = 200
+_cases = {}
+
+
+def _case(scale):
+    """Synthetic factor changes and (dates x sectors) returns with known betas"""
+    key = (scale['tickers'], scale['years'])
+    if key not in _cases:
+        rng = np.random.default_rng(38)
+        n_days = max(scale['years'], 3) * 252
+        n_sectors = min(scale['tickers'], MAX_SECTORS)
+        index = pd.bdate_range(end='2026-09-30', periods=n_days)
+        repo = np.where(rng.random(n_days) < 0.01, rng.choice([-0.25, 0.25], n_days), 0.0)
+        changes = pd.DataFrame({'repo_rate': repo, 'crude_oil': rng.normal(0, 0.02, n_days),
+                                'usd_inr': rng.normal(0, 0.003, n_days)}, index=index)
+        betas = rng.normal(0, 0.5, (len(DEFAULT_FACTORS), n_sectors))
+        returns = pd.DataFrame(changes.to_numpy() @ betas + rng.normal(0, 0.012, (n_days, n_sectors)),
+                               index=index, columns=[f"Sector {i:03d}" for i in range(n_sectors)])
+        _cases[key] = (returns, changes)
+    return _cases[key]
+
+
+@benchmark(f'SectorRegression.fit[{len(DEFAULT_WINDOWS)} windows, all days]', repeat=5)
+def bench_fit(scale):
+    returns, changes = _case(scale)
+    return lambda: SectorRegression().fit(returns, changes)
+
+
+@benchmark('SectorRegression.update[1 new day]', repeat=200)
+def bench_update(scale):
+    returns, changes = _case(scale)
+    regression = SectorRegression().fit(returns, changes)
+    row_y, row_x = returns.iloc[-1].to_numpy(), changes.iloc[-1].to_numpy()
+    date = [returns.index[-1]]
+
+    def run():
+        date[0] += pd.offsets.BDay()
+        regression.update(date[0], row_y, row_x)
+    return run
+
+
+@benchmark('np.linalg.lstsq loop[252d window, last 20 days, baseline]', repeat=5)
+def bench_lstsq_loop(scale):
+    returns, changes = _case(scale)
+    x = np.column_stack([np.ones(len(changes)), changes.to_numpy()])
+    y = returns.to_numpy()
+
+    def run():
+        return [np.linalg.lstsq(x[t - 252:t], y[t - 252:t], rcond=None)[0] for t in range(len(y) - 20, len(y))]
+    return run
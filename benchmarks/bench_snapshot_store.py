@@ -0,0 +1,94 @@
+import atexit
+import itertools
+import pickle
+import shutil
+import tempfile
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from snapshot_store import SnapshotStore
+
+FIELDS = ('High', 'Low', 'Close')
+_cases = {}
+
+
+def _case(scale):
+    """Two years more history than the window so each saved day can roll the window forward"""
+    key = (scale['tickers'], scale['years'])
+    if key not in _cases:
+        rng = np.random.default_rng(45)
+        n_days = scale['years'] * 252
+        index = pd.bdate_range(end='2026-09-30', periods=n_days + 504)
+        columns = [f"SYN{i:04d}.NS" for i in range(scale['tickers'])]
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(index), len(columns))), axis=0))
+        frames = {field: pd.DataFrame(close * scale_, index=index, columns=columns)
+                  for field, scale_ in zip(FIELDS, (1.01, 0.99, 1.0))}
+        _cases[key] = (frames, n_days)
+    return _cases[key]
+
+
+def _window(frames, n_days, day):
+    return {field: frame.iloc[day:day + n_days] for field, frame in frames.items()}
+
+
+def _store(scale):
+    """Temporary store holding the first window, removed at exit"""
+    frames, n_days = _case(scale)
+    root = tempfile.mkdtemp(prefix='bench-snapshots-')
+    atexit.register(shutil.rmtree, root, True)
+    store = SnapshotStore(root)
+    store.save('price_matrix', _window(frames, n_days, 0), saved_at='2024-01-01')
+    return store
+
+
+@benchmark('SnapshotStore.save[price matrix, rolled 1 day]', repeat=20, items='tickers')
+def bench_save_rolled(scale):
+    frames, n_days = _case(scale)
+    store = _store(scale)
+    days = itertools.count(1)
+
+    def run():
+        day = next(days)
+        return store.save('price_matrix', _window(frames, n_days, day),
+                          saved_at=pd.Timestamp('2024-01-01') + pd.Timedelta(days=day))
+    return run
+
+
+@benchmark('SnapshotStore.save[price matrix, unchanged]', repeat=20, items='tickers')
+def bench_save_unchanged(scale):
+    frames, n_days = _case(scale)
+    store = _store(scale)
+    window = _window(frames, n_days, 0)
+    return lambda: store.save('price_matrix', window)
+
+
+@benchmark('pickle + zlib[price matrix, full copy per version, baseline]', repeat=10, items='tickers')
+def bench_full_copy(scale):
+    frames, n_days = _case(scale)
+    window = _window(frames, n_days, 0)
+    return lambda: zlib.compress(pickle.dumps(window, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@benchmark('SnapshotStore.load[price matrix as of, cold]', repeat=20, items='tickers')
+def bench_load_cold(scale):
+    store = _store(scale)
+
+    def run():
+        store._cache.clear()
+        return store.load('price_matrix', as_of='2024-06-01')
+    return run
+
+
+@benchmark('SnapshotStore.load[Close, last month only, cold]', repeat=50, items='tickers')
+def bench_load_month(scale):
+    frames, n_days = _case(scale)
+    store = _store(scale)
+    start = frames['Close'].index[n_days - 1] - pd.Timedelta(days=30)
+
+    def run():
+        store._cache.clear()
+        return store.load('price_matrix', as_of='2024-06-01', start=start, keys=['Close'])
+    return run
@@ -0,0 +1,63 @@
+"""Render cost of the rating table: per-cell Styler vs vectorized styling
+
+Each benchmark includes Streamlit's own serialization step (Styler ->
+ArrowData proto, or plain DataFrame -> Arrow bytes), since that is what
+``st.dataframe`` pays on every rerun.
+"""
+import numpy as np
+import pandas as pd
+from streamlit import dataframe_util
+from streamlit.elements.lib.pandas_styler_utils import marshall_styler
+from streamlit.proto.ArrowData_pb2 import ArrowData
+
+from benchmarks.harness import benchmark
+from table_styles import RATING_STYLES, style_columns, mark_columns, styled_table
+
+SUBSTITUTES_PER_COMMODITY = 3
+_tables = {}
+
+
+def _projections(scale):
+    """Substitute projections table with ``commodities`` x 3 rows"""
+    n = scale['commodities'] * SUBSTITUTES_PER_COMMODITY
+    if n not in _tables:
+        rng = np.random.default_rng(35)
+        ratings = np.array(list(RATING_STYLES))
+        _tables[n] = pd.DataFrame({
+            'substitute': [f"Substitute {i}" for i in range(n)],
+            'companies': 'Synthetic Co A, Synthetic Co B',
+            'adoption_timeline': '2-4 years',
+            'market_potential': 'High',
+            'investment_rating': ratings[rng.integers(0, len(ratings), n)]
+        })
+    return _tables[n]
+
+
+def _render(styler):
+    proto = ArrowData()
+    marshall_styler(proto, styler, 'bench')
+    return proto
+
+
+@benchmark('rating table[Styler.map per cell]', repeat=5)
+def bench_per_cell(scale):
+    df = _projections(scale)
+    return lambda: _render(df.style.map(lambda v: RATING_STYLES.get(v, ''), subset=['investment_rating']))
+
+
+@benchmark('rating table[style_columns]', repeat=5)
+def bench_vectorized(scale):
+    df = _projections(scale)
+    return lambda: _render(style_columns(df, {'investment_rating': RATING_STYLES}))
+
+
+@benchmark('rating table[mark_columns, no Styler]', repeat=20)
+def bench_markers(scale):
+    df = _projections(scale)
+    return lambda: dataframe_util.convert_pandas_df_to_arrow_bytes(mark_columns(df, {'investment_rating': RATING_STYLES}))
+
+
+@benchmark('rating table[styled_table, default]', repeat=20)
+def bench_default(scale):
+    df = _projections(scale)
+    return lambda: dataframe_util.convert_pandas_df_to_arrow_bytes(styled_table(df, {'investment_rating': RATING_STYLES}))
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from technical_indicators import compute_indicators, screen_signals, IndicatorState
+
+_matrices = {}
+
+
+def _matrix(scale):
+    """(dates x tickers) High/Low/Close built straight in NumPy for speed"""
+    key = (scale['tickers'], scale['years'])
+    if key not in _matrices:
+        rng = np.random.default_rng(9)
+        n_days, n_tickers = scale['years'] * 252, scale['tickers']
+        index = pd.bdate_range(end='2026-09-30', periods=n_days)
+        columns = [f"SYN{i:04d}.NS" for i in range(n_tickers)]
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.018, (n_days, n_tickers)), axis=0))
+        spread = np.abs(rng.normal(0, 0.01, (n_days, n_tickers)))
+        _matrices[key] = tuple(pd.DataFrame(a, index=index, columns=columns)
+                               for a in (close * (1 + spread), close * (1 - spread), close))
+    return _matrices[key]
+
+
+@benchmark('compute_indicators[universe]', repeat=3, items='tickers')
+def bench_compute(scale):
+    high, low, close = _matrix(scale)
+    return lambda: compute_indicators(high, low, close)
+
+
+@benchmark('screen_signals[universe]', repeat=5, items='tickers')
+def bench_screen(scale):
+    high, low, close = _matrix(scale)
+    indicators = compute_indicators(high, low, close)
+    return lambda: screen_signals(indicators, close, lookback=5)
+
+
+@benchmark('IndicatorState.update[one bar]', repeat=200, items='tickers')
+def bench_incremental(scale):
+    high, low, close = _matrix(scale)
+    state = IndicatorState(high.iloc[:-1], low.iloc[:-1], close.iloc[:-1])
+    bar = (high.iloc[-1].to_numpy(), low.iloc[-1].to_numpy(), close.iloc[-1].to_numpy())
+    return lambda: state.update(*bar)
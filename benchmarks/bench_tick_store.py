@@ -0,0 +1,46 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from tick_store import TickStore
+
+MINUTES_PER_SESSION = 375
+_stores = {}
+
+
+def _store(scale):
+    """Store holding ``years`` of NSE minute bars for one ticker (built once per scale)"""
+    key = scale['years']
+    if key not in _stores:
+        store = TickStore(tempfile.mkdtemp(prefix='bench_ticks_'))
+        sessions = pd.bdate_range(end='2026-09-30', periods=scale['years'] * 252)
+        offsets = pd.to_timedelta(np.arange(MINUTES_PER_SESSION), unit='min') + pd.Timedelta(hours=9, minutes=15)
+        index = (sessions.values[:, None] + offsets.values[None, :]).ravel()
+        rng = np.random.default_rng(3)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0008, len(index))))
+        bars = pd.DataFrame({'Open': close, 'High': close * 1.001, 'Low': close * 0.999, 'Close': close,
+                             'Volume': rng.integers(100, 10_000, len(index))},
+                            index=pd.DatetimeIndex(index).tz_localize('Asia/Kolkata'))
+        store.append('SYN0000.NS', bars)
+        _stores[key] = store
+    return _stores[key]
+
+
+@benchmark('TickStore.slice[1 month]', repeat=200)
+def bench_slice(scale):
+    store = _store(scale)
+    return lambda: store.slice('SYN0000.NS', '2026-08-01', '2026-09-01')
+
+
+@benchmark('TickStore.resample[1d, full history]', repeat=5)
+def bench_resample_daily(scale):
+    store = _store(scale)
+    return lambda: store.resample('SYN0000.NS', '1d')
+
+
+@benchmark('TickStore.resample[5m, 1 year]', repeat=10)
+def bench_resample_5m(scale):
+    store = _store(scale)
+    return lambda: store.resample('SYN0000.NS', '5m', start='2025-10-01')
@@ -0,0 +1,284 @@
+"""Offline fixtures for benchmarks
+
+Recorded NewsAPI/RSS responses live in ``benchmarks/data``, saved news
+article pages in ``benchmarks/data/articles``. yfinance bars
+recorded with ``Ticker(t).history(...).to_csv()`` can be dropped there as
+``yf_history_<ticker>.csv`` (and ``yf_info_<ticker>.json``); any ticker
+without a recording gets a deterministic synthetic series, which is also how
+the scale-up datasets are built.
+"""
+import atexit
+import functools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+TRADING_DAYS_PER_YEAR = 252
+PERIOD_BARS = {'1d': 1, '5d': 5, '1mo': 21, '3mo': 63, '6mo': 126, '1y': 252,
+               '2y': 504, '5y': 1260, '10y': 2520, 'max': None}
+
+SECTOR_NAMES = ['IT', 'Banking', 'Auto', 'Pharma', 'Energy', 'Infrastructure', 'FMCG', 'Metals',
+                'Realty', 'Media', 'PSU Bank', 'Financial Services', 'Chemicals', 'Telecom',
+                'Consumer Durables', 'Oil & Gas', 'Healthcare', 'Capital Goods', 'Textiles', 'Defense']
+
+
+def _seed(key):
+    return zlib.crc32(key.encode())
+
+
+def _load_json(name):
+    with open(os.path.join(DATA_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def recorded_history(ticker):
+    """Return recorded daily bars for ``ticker`` if a fixture exists"""
+    path = os.path.join(DATA_DIR, f"yf_history_{ticker}.csv")
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+
+
+def synthetic_history(ticker, years):
+    """Geometric random walk OHLCV bars, deterministic per ticker"""
+    rng = np.random.default_rng(_seed(ticker))
+    n = years * TRADING_DAYS_PER_YEAR
+    index = pd.bdate_range(end='2026-09-30', periods=n, name='Date')
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.018, n)))
+    spread = np.abs(rng.normal(0, 0.01, n))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread),
+        'Low': np.minimum(open_, close) * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(100_000, 5_000_000, n),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0
+    }, index=index)
+
+
+def synthetic_info(ticker):
+    rng = np.random.default_rng(_seed(ticker) + 1)
+    return {
+        'symbol': ticker,
+        'trailingPE': float(rng.uniform(8, 60)),
+        'priceToBook': float(rng.uniform(0.8, 12)),
+        'returnOnEquity': float(rng.uniform(0.05, 0.35)),
+        'marketCap': int(rng.uniform(5e10, 2e13))
+    }
+
+
+def ticker_universe(n):
+    """``n`` synthetic NSE tickers spread across up to 20 sectors"""
+    n_sectors = min(len(SECTOR_NAMES), max(1, n // 100))
+    sectors = {}
+    for i in range(n):
+        sector = SECTOR_NAMES[i % n_sectors]
+        data = sectors.setdefault(sector, {'index': f"^SYN{sector.upper().replace(' ', '')}",
+                                           'stocks': [], 'names': []})
+        data['stocks'].append(f"SYN{i:04d}.NS")
+        data['names'].append(f"Synthetic Co {i:04d}")
+    return sectors
+
+
+class FakeTicker:
+    """Stand-in for ``yf.Ticker`` serving recorded or synthetic data"""
+
+    _history_cache = {}
+    years = 10
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def _full_history(self):
+        key = (self.ticker, self.years)
+        if key not in self._history_cache:
+            hist = recorded_history(self.ticker)
+            self._history_cache[key] = hist if hist is not None else synthetic_history(self.ticker, self.years)
+        return self._history_cache[key]
+
+    def history(self, period='1mo', start=None, end=None, **kwargs):
+        hist = self._full_history()
+        if start is not None:
+            # ``end`` is exclusive, as in yfinance
+            return hist.loc[pd.Timestamp(start):pd.Timestamp(end) - pd.Timedelta(days=1)].copy()
+        bars = PERIOD_BARS.get(period)
+        return hist.copy() if bars is None else hist.iloc[-bars:].copy()
+
+    @property
+    def info(self):
+        path = os.path.join(DATA_DIR, f"yf_info_{self.ticker}.json")
+        if os.path.exists(path):
+            return _load_json(f"yf_info_{self.ticker}.json")
+        return synthetic_info(self.ticker)
+
+
+def fake_download(tickers, period='1mo', start=None, end=None, **kwargs):
+    """Stand-in for ``yf.download(group_by='column')`` built from ``FakeTicker`` histories"""
+    frames = {ticker: FakeTicker(ticker).history(period=period, start=start, end=end) for ticker in tickers}
+    return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+
+def newsapi_payload(n):
+    """NewsAPI ``/v2/everything`` response with ``n`` articles"""
+    recorded = _load_json('newsapi_everything.json')
+    articles = recorded['articles']
+    scaled = [dict(articles[i % len(articles)], title=f"{articles[i % len(articles)]['title']} #{i}")
+              for i in range(n)]
+    return json.dumps({'status': 'ok', 'totalResults': n, 'articles': scaled}).encode()
+
+
+def rss_feed(n):
+    """Google News style RSS document with ``n`` items"""
+    with open(os.path.join(DATA_DIR, 'google_news_rss.xml'), encoding='utf-8') as f:
+        recorded = f.read()
+    head, rest = recorded.split('<item>', 1)
+    item = '<item>' + rest.split('</item>', 1)[0] + '</item>'
+    tail = recorded.rsplit('</item>', 1)[1]
+    return head + ''.join(item.replace('</title>', f" #{i}</title>", 1) for i in range(n)) + tail
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+_article_server = None
+
+
+def article_server():
+    """Base URL of a local static HTTP server for ``benchmarks/data/articles``, started on first use"""
+    global _article_server
+    if _article_server is None:
+        handler = functools.partial(_QuietHandler, directory=os.path.join(DATA_DIR, 'articles'))
+        _article_server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        _article_server.daemon_threads = True
+        threading.Thread(target=_article_server.serve_forever, daemon=True).start()
+        atexit.register(_article_server.shutdown)
+    return f"http://127.0.0.1:{_article_server.server_address[1]}"
+
+
+def article_urls(n):
+    """``n`` distinct article URLs on the local server, cycling through the saved pages"""
+    pages = sorted(f for f in os.listdir(os.path.join(DATA_DIR, 'articles')) if f.endswith('.html'))
+    base = article_server()
+    return [f"{base}/{pages[i % len(pages)]}?id={i}" for i in range(n)]
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def fund_universe(n):
+    """Fund table shaped like ``get_top_equity_funds`` with ``n`` rows"""
+    rng = np.random.default_rng(42)
+    categories = np.array(['Large Cap', 'Mid Cap', 'Small Cap', 'Sectoral', 'Flexi Cap', 'ELSS'])
+    risks = np.array(['Low', 'Medium', 'High'])
+    return pd.DataFrame({
+        'Fund Name': [f"Synthetic Fund {i:05d}" for i in range(n)],
+        'Category': categories[rng.integers(0, len(categories), n)],
+        '1Y Return (%)': rng.normal(15, 5, n).round(1),
+        '3Y Return (%)': rng.normal(16, 4, n).round(1),
+        'Risk Level': risks[rng.integers(0, len(risks), n)],
+        'Min Investment': rng.choice([100, 500, 1000, 5000], n)
+    })
+
+
+def holdings_disclosure(n_funds, n_stocks=2500, holdings=60):
+    """Monthly disclosure rows for ``n_funds`` funds; popular stocks are held by most funds, as in practice"""
+    rng = np.random.default_rng(50)
+    popularity = 1 / np.arange(1, n_stocks + 1) ** 0.8
+    popularity /= popularity.sum()
+    rows = []
+    for i in range(n_funds):
+        stocks = rng.choice(n_stocks, holdings, replace=False, p=popularity)
+        weights = rng.dirichlet(np.full(holdings, 0.8)) * rng.uniform(92, 99)
+        rows.append(pd.DataFrame({'Fund Name': f"Synthetic Fund {i:05d}", 'ISIN': [f"INE{s:06d}01" for s in stocks],
+                                  'Stock': [f"Synthetic Co {s:04d}" for s in stocks], 'Weight (%)': weights.round(2)}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def commodity_universe(n):
+    """Synthetic ``commodity_map`` and matching events with ``n`` commodities"""
+    rng = np.random.default_rng(7)
+    levels = ['Medium', 'High', 'Very High', 'Critical']
+    commodity_map, events = {}, []
+    for i in range(n):
+        name = f"Commodity {i:03d}"
+        commodity_map[name] = {
+            'source_countries': [f"Country {rng.integers(0, 40)} ({rng.integers(10, 90)}%)", 'USA', 'Australia'],
+            'dependent_sectors': [SECTOR_NAMES[j] for j in rng.choice(len(SECTOR_NAMES), 3, replace=False)],
+            'indian_companies_affected': [f"Synthetic Co {j:04d}" for j in rng.integers(0, 2000, 5)],
+            'substitutes': {f"Substitute {i}-{k}": [f"Synthetic Co {j:04d}" for j in rng.integers(0, 2000, 2)]
+                            for k in range(3)},
+            'impact': levels[i % len(levels)],
+            'price_trend': f"+{rng.integers(5, 60)}%"
+        }
+        events.append({
+            'date': f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            'event': f"Disruption in {name}",
+            'commodity': name,
+            'impact_level': levels[i % len(levels)],
+            'affected_sectors': commodity_map[name]['dependent_sectors'],
+            'price_impact': commodity_map[name]['price_trend'],
+            'timeline': '6-12 months',
+            'indian_impact': 'Synthetic impact',
+            'opportunities': [f"Opportunity {i}-{k}" for k in range(3)]
+        })
+    return commodity_map, events
+
+
+def budget_universe(n):
+    """Budget frame columns as in ``BudgetTracker.load_budget_data`` with ``n`` sectors"""
+    rng = np.random.default_rng(11)
+    fy24 = rng.integers(5_000, 200_000, n)
+    return {
+        'Sector': [f"Sector {i:04d}" for i in range(n)],
+        'Budget_FY24': fy24,
+        'Budget_FY25': (fy24 * rng.uniform(0.9, 1.4, n)).astype(int),
+        'Key_Schemes': ['Scheme A, Scheme B'] * n,
+        'Top_Stocks': ['L&T, IRB Infra, Ashoka Buildcon'] * n
+    }
+
+
+@contextmanager
+def offline(scale):
+    """Patch yfinance (Ticker and download), requests and feedparser so analyzers never touch the network
+
+    The planner's bar cache goes to a temporary file so synthetic bars never
+    reach the app's ``data/bars.db``.
+    """
+    import feedparser
+    import requests
+    import yfinance as yf
+
+    FakeTicker.years = scale['years']
+    newsapi_body = newsapi_payload(scale['articles'])
+    rss_body = rss_feed(scale['rss_items'])
+    real_parse = feedparser.parse
+
+    cache_dir = tempfile.mkdtemp(prefix='bench-bars-')
+    atexit.register(shutil.rmtree, cache_dir, True)
+
+    with mock.patch.dict(os.environ, {'BAR_CACHE_DB': os.path.join(cache_dir, 'bars.db')}), \
+            mock.patch.object(yf, 'Ticker', FakeTicker), \
+            mock.patch.object(yf, 'download', fake_download), \
+            mock.patch.object(requests, 'get', lambda *a, **k: FakeResponse(newsapi_body)), \
+            mock.patch.object(feedparser, 'parse', lambda url, *a, **k: real_parse(rss_body)):
+        yield
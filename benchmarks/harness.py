@@ -0,0 +1,108 @@
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCHMARKS = []
+
+# Dataset sizes per scale; "full" is the target production universe
+SCALES = {
+    'small': {'tickers': 100, 'years': 1, 'articles': 5000, 'rss_items': 500,
+              'funds': 500, 'commodities': 50, 'budget_rows': 200, 'holding_funds': 500},
+    'full': {'tickers': 2000, 'years': 10, 'articles': 100000, 'rss_items': 10000,
+             'funds': 10000, 'commodities': 500, 'budget_rows': 2000,
+             'holding_funds': 3000}
+}
+
+
+class Benchmark:
+    """A registered benchmark: ``setup(scale)`` returns the zero-arg callable to time"""
+
+    def __init__(self, name, setup, repeat, items):
+        self.name = name
+        self.setup = setup
+        self.repeat = repeat
+        self.items = items
+
+
+def benchmark(name, repeat=20, items=None):
+    """Register a benchmark setup function under ``name``
+
+    ``items`` optionally names a key of the scale dict so throughput is also
+    reported per item (e.g. tickers/s) rather than only calls/s.
+    """
+    def decorator(setup):
+        BENCHMARKS.append(Benchmark(name, setup, repeat, items))
+        return setup
+    return decorator
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def run_benchmark(bench, scale_name, max_seconds=30.0):
+    """Time one benchmark; returns a result dict"""
+    scale = SCALES[scale_name]
+    func = bench.setup(scale)
+
+    func()  # warm caches and lazily generated fixtures
+    samples = []
+    budget_start = time.perf_counter()
+    for _ in range(bench.repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+        if time.perf_counter() - budget_start > max_seconds:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = statistics.mean(samples)
+    result = {
+        'benchmark': bench.name,
+        'calls': len(samples),
+        'ops_per_s': round(1 / mean, 3) if mean else None,
+        'mean_ms': round(mean * 1000, 3),
+        'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(_percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(_percentile(samples, 99) * 1000, 3),
+        'peak_mb': round(peak / 1024 / 1024, 3)
+    }
+    if bench.items:
+        result['items'] = scale[bench.items]
+        result['items_per_s'] = round(scale[bench.items] / mean, 1) if mean else None
+    return result
+
+
+def save_results(results, scale_name, output_dir):
+    """Write results as JSON so runs can be compared over time"""
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(output_dir, f"{stamp}-{scale_name}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'scale': scale_name, 'created': stamp, 'sizes': SCALES[scale_name],
+                   'results': results}, f, indent=2)
+    return path
+
+
+def compare_results(results, baseline_path):
+    """Attach p50 change vs. a previous results file"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {r['benchmark']: r for r in json.load(f)['results']}
+    for result in results:
+        before = baseline.get(result['benchmark'])
+        if before and before['p50_ms']:
+            result['p50_change_%'] = round((result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100, 1)
+    return results
@@ -0,0 +1,57 @@
+"""Memory footprint of the default vs. compact layouts
+
+    python -m benchmarks.memory_report [--scale small|full]
+"""
+import argparse
+import sys
+import tracemalloc
+
+from benchmarks.fixtures import offline, ticker_universe, fund_universe
+from benchmarks.harness import SCALES
+from memory_layout import compact_frame, footprint_report
+from sector_analyzer import SectorAnalyzer, StockSummary
+
+
+def _records_bytes(make, n):
+    tracemalloc.start()
+    records = [make(i) for i in range(n)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def build_report(scale):
+    pairs = {}
+    with offline(scale):
+        universe = ticker_universe(scale['tickers'])
+        frames = []
+        for compact in (False, True):
+            analyzer = SectorAnalyzer(compact=compact)
+            analyzer.sectors = universe
+            frames.append(analyzer.load_price_history(period='max'))
+        pairs[f"Price history ({scale['tickers']} tickers x {scale['years']}y)"] = tuple(frames)
+
+    funds = fund_universe(scale['funds'])
+    pairs[f"Fund frame ({scale['funds']} funds)"] = (
+        funds, compact_frame(funds, categorical=['Category', 'Risk Level'],
+                             float32=['1Y Return (%)', '3Y Return (%)']))
+
+    fields = dict(name='Synthetic Co', ticker='SYN0000.NS', returns=1.5, pe_ratio=20.0,
+                  market_cap=1000.0, current_price=100.0)
+    n = scale['tickers']
+    pairs[f"Stock summaries ({n} records)"] = (
+        _records_bytes(lambda i: dict(fields), n),
+        _records_bytes(lambda i: StockSummary(**fields), n))
+    return footprint_report(pairs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=sorted(SCALES), default='full')
+    args = parser.parse_args(argv)
+    print(build_report(SCALES[args.scale]).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+"""Run the offline benchmark suite
+
+    python -m benchmarks.run                     # full-scale universe
+    python -m benchmarks.run --scale small -k Sector
+    python -m benchmarks.run --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import importlib
+import logging
+import os
+import pkgutil
+import sys
+import warnings
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import harness  # noqa: E402
+from benchmarks.fixtures import offline  # noqa: E402
+
+
+def discover():
+    """Import every ``benchmarks/bench_*.py`` so its benchmarks register"""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in pkgutil.iter_modules([package_dir]):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f"benchmarks.{module.name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=sorted(harness.SCALES), default='full')
+    parser.add_argument('-k', '--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results'))
+    parser.add_argument('--compare', help='previous results JSON to diff p50 latency against')
+    parser.add_argument('--max-seconds', type=float, default=30.0, help='time budget per benchmark')
+    args = parser.parse_args(argv)
+
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    discover()
+
+    scale = harness.SCALES[args.scale]
+    results = []
+    with offline(scale):
+        for bench in harness.BENCHMARKS:
+            if args.filter.lower() not in bench.name.lower():
+                continue
+            result = harness.run_benchmark(bench, args.scale, args.max_seconds)
+            results.append(result)
+            print(f"{result['benchmark']:<60} p50 {result['p50_ms']:>10.3f} ms  "
+                  f"p95 {result['p95_ms']:>10.3f} ms  peak {result['peak_mb']:>8.2f} MB", flush=True)
+
+    if args.compare:
+        results = harness.compare_results(results, args.compare)
+
+    print()
+    print(pd.DataFrame(results).to_string(index=False))
+    path = harness.save_results(results, args.scale, args.output)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,17 @@
 import pandas as pd
 from datetime import datetime
+from performance_tracker import tracer
+from snapshot_store import versioned
 
+@tracer.instrument
 class BudgetTracker:
     """Track government budget allocations and spending"""
     
-    def __init__(self):
-        self.budget_data = self.load_budget_data()
+    def __init__(self, as_of=None):
+        """``as_of`` loads the budget table recorded at that date instead of the current one"""
+        budget = versioned('budget_data', self.load_budget_data, as_of)
+        self.budget_data = budget.value
+        self.live_datasets = [budget.name] if budget.live else []  # nothing recorded by ``as_of``
     
     def load_budget_data(self):
         """Load government budget allocation data"""
@@ -100,7 +106,23 @@ class BudgetTracker:
         
         return recommendations
 
+    def get_stock_universe(self, resolver=None, priorities=None):
+        """One row per Top_Stocks entry with its ticker (``EntityResolver``) and sector budget priority"""
+        if resolver is None:
+            from entity_resolver import get_resolver
+            resolver = get_resolver()
+        data = self.budget_data
+        if priorities:
+            data = data[data['Priority'].isin(priorities)]
+
+        universe = data.assign(Stock=data['Top_Stocks'].str.split(',')).explode('Stock')
+        universe['Stock'] = universe['Stock'].str.strip()
+        universe = universe[universe['Stock'].fillna('') != ''].reset_index(drop=True)
+        universe['Ticker'] = resolver.resolve_many(universe['Stock'])
+        return universe[['Sector', 'Stock', 'Ticker', 'YoY_Change_%', 'Priority']]
+
 # Policy Impact Tracker
+@tracer.instrument
 class PolicyTracker:
     """Track policy changes and their market impact"""
     
@@ -151,3 +173,8 @@ class PolicyTracker:
         ]
         
         return pd.DataFrame(policies)
+
+    @staticmethod
+    def get_measured_policies(study, entities):
+        """Recent policies with the ``impact`` label replaced by the measured CAR (see ``event_study``)"""
+        return study.policy_impact(PolicyTracker.get_recent_policies(), entities)
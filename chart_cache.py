@@ -0,0 +1,144 @@
+"""Serialized Plotly figure cache with LTTB downsampling for long series
+
+``chart_cache.figure(name, builder, data, **params)`` keys each figure by a
+hash of its input data and parameters. A miss calls ``builder(data,
+**params)`` (e.g. ``px.line``) and stores the figure JSON; a hit rebuilds the
+figure from that JSON without re-running Plotly Express. Passing
+``max_points`` thins series longer than the budget with Largest-Triangle-
+Three-Buckets on the ``x``/``y`` columns before the figure is built, so the
+browser payload stays bounded however long the history gets.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from performance_tracker import tracer
+
+MAX_POINTS = int(os.getenv('CHART_MAX_POINTS', '2000'))
+MAX_ENTRIES = int(os.getenv('CHART_CACHE_ENTRIES', '256'))
+
+
+def lttb(x, y, threshold):
+    """Indices of ``threshold`` points chosen by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept; each bucket in between keeps
+    the point forming the largest triangle with the previously kept point
+    and the average of the next bucket.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    # Average of every bucket up front; the last bucket looks ahead to the final point
+    next_x = np.r_[np.add.reduceat(x[1:n - 1], edges[:-1] - 1)[1:] / sizes[1:], x[-1]]
+    next_y = np.r_[np.add.reduceat(y[1:n - 1], edges[:-1] - 1)[1:] / sizes[1:], y[-1]]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_frame(df, x, y, max_points=MAX_POINTS):
+    """Rows of ``df`` kept by LTTB on each ``y`` column (budget split across columns)"""
+    if len(df) <= max_points:
+        return df
+    y_cols = [y] if isinstance(y, str) else list(y)
+    xs = df.index if x is None else df[x]
+    if pd.api.types.is_datetime64_any_dtype(xs):
+        xs = pd.DatetimeIndex(xs).as_unit('ns').asi8
+    elif not pd.api.types.is_numeric_dtype(xs):
+        xs = np.arange(len(df))
+    xs = np.asarray(xs, dtype=float)
+
+    per_column = max(3, max_points // len(y_cols))
+    keep = set()
+    for col in y_cols:
+        values = df[col].to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(values))
+        keep.update(valid[lttb(xs[valid], values[valid], per_column)].tolist())
+    return df.iloc[sorted(keep)]
+
+
+def data_key(data):
+    """Stable content hash for frames, series, arrays and plain values"""
+    h = hashlib.sha256()
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        h.update(repr(list(data.columns) if isinstance(data, pd.DataFrame) else data.name).encode())
+    elif isinstance(data, np.ndarray):
+        h.update(np.ascontiguousarray(data).tobytes())
+    else:
+        h.update(json.dumps(data, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class ChartCache:
+    """Process-wide LRU of serialized figures keyed by chart name and input hash"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name, data, params):
+        return hashlib.sha256(
+            f"{name}|{data_key(data)}|{json.dumps(params, sort_keys=True, default=str)}".encode()
+        ).hexdigest()
+
+    def figure(self, name, builder, data, max_points=None, **params):
+        """Figure for ``builder(data, **params)``, built at most once per distinct input"""
+        key = self.key(name, data, dict(params, max_points=max_points))
+        with self._lock:
+            payload = self._figures.get(key)
+            if payload is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+        if payload is not None:
+            return pio.from_json(payload)
+
+        with tracer.span("chart_cache: build", chart=name, rows=len(data)):
+            if max_points and isinstance(data, pd.DataFrame) and 'y' in params:
+                data = downsample_frame(data, params.get('x'), params['y'], max_points)
+            payload = builder(data, **params).to_json()
+            tracer.add_bytes(len(payload))
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = payload
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return pio.from_json(payload)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._figures),
+                'bytes': sum(len(p) for p in self._figures.values()),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self.hits = self.misses = 0
+
+
+chart_cache = ChartCache()
@@ -0,0 +1,256 @@
+"""Corporate actions kept next to cached price history and applied lazily on read
+
+Cached bars stay as the provider returned them. yfinance bars are already
+split-adjusted, even with ``auto_adjust=False``; only dividends are left
+out. So splits read from its 'Stock Splits' column are stored as *applied*
+and only kept for reference. Splits and bonuses recorded by hand
+(``record_split``/``record_bonus``) are for bars that really are as traded,
+and are applied on read. Every action is one row in SQLite
+(``CORPORATE_ACTIONS_DB``, default ``data/corporate_actions.db``), so a new
+action is a single insert and never a rewrite of years of bars.
+
+``adjust(frame, ticker, start, end)`` builds the cumulative adjustment
+factor only for the requested slice. Each action whose ex-date falls inside
+the slice multiplies a step into a reverse cumulative product. Actions after
+the slice end contribute one constant. The cost is O(slice + actions).
+
+* split / bonus not yet applied: prices before the ex-date x 1/ratio, volume x ratio
+* dividend: prices before the ex-date x (1 - amount / previous raw close)
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+
+DEFAULT_DB = os.path.join('data', 'corporate_actions.db')
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+SPLIT_KINDS = ('split', 'bonus')
+KINDS = SPLIT_KINDS + ('dividend',)
+
+
+class CorporateActions:
+    """SQLite table of splits, bonuses and dividends per ticker, with lazy price adjustment"""
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('CORPORATE_ACTIONS_DB', DEFAULT_DB)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._events = {}  # ticker -> (ex-dates, kinds, values), loaded on first use
+        self._tickers = None  # tickers with any action
+        with self._connection() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS actions (
+                ticker TEXT NOT NULL,
+                ex_date TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                value REAL NOT NULL,
+                recorded_at TEXT NOT NULL,
+                applied INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (ticker, ex_date, kind)
+            )""")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(actions)")]
+            if 'applied' not in columns:
+                conn.execute("ALTER TABLE actions ADD COLUMN applied INTEGER NOT NULL DEFAULT 0")
+                # Older stores only got their splits from yfinance bars, which already carry them
+                conn.execute("UPDATE actions SET applied = 1 WHERE kind = 'split'")
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+    # ---- writing ----
+
+    def record(self, ticker, ex_date, kind, value, applied=False):
+        """Store one action; ``value`` is the split ratio (new/old shares) or the dividend per share
+
+        ``applied=True`` marks a split the bars already reflect: it is stored
+        but never applied again.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown corporate action '{kind}', expected one of {list(KINDS)}")
+        if value <= 0:
+            raise ValueError(f"{kind} value must be positive, got {value}")
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO actions (ticker, ex_date, kind, value, recorded_at, applied) "
+                         "VALUES (?, ?, ?, ?, ?, ?)",
+                         (ticker, pd.Timestamp(ex_date).strftime('%Y-%m-%d'), kind, float(value),
+                          datetime.now().isoformat(timespec='seconds'), int(applied)))
+        with self._lock:
+            self._events.pop(ticker, None)
+            self._tickers = None
+
+    def record_split(self, ticker, ex_date, ratio):
+        """``ratio`` new shares per old share (2 for a 1:2 split)"""
+        self.record(ticker, ex_date, 'split', ratio)
+
+    def record_bonus(self, ticker, ex_date, new, held):
+        """``new`` bonus shares for every ``held`` shares (1:1 doubles the share count)"""
+        self.record(ticker, ex_date, 'bonus', (new + held) / held)
+
+    def record_dividend(self, ticker, ex_date, amount):
+        self.record(ticker, ex_date, 'dividend', amount)
+
+    def ingest(self, ticker, hist):
+        """Record actions from yfinance's 'Stock Splits'/'Dividends' columns that are not stored yet
+
+        The bars already carry the splits, so those are recorded as applied.
+        Returns the number of new actions.
+        """
+        ex_dates, kinds, _, _ = self._ticker_events(ticker)
+        known = set(zip(ex_dates.tolist(), kinds.tolist()))
+        new = []
+        for column, kind in (('Stock Splits', 'split'), ('Dividends', 'dividend')):
+            if column not in hist.columns:
+                continue
+            values = hist[column].to_numpy(dtype=float)
+            for i in np.flatnonzero(values > 0):
+                ex_date = pd.Timestamp(hist.index[i]).tz_localize(None).normalize()
+                if (ex_date.value, kind) not in known:
+                    new.append((ex_date, kind, values[i]))
+        for ex_date, kind, value in new:
+            self.record(ticker, ex_date, kind, value, applied=kind == 'split')
+        return len(new)
+
+    # ---- reading ----
+
+    def tickers(self):
+        """Tickers with at least one stored action"""
+        with self._lock:
+            tickers = self._tickers
+        if tickers is None:
+            rows = self._connection().execute("SELECT DISTINCT ticker FROM actions").fetchall()
+            tickers = frozenset(r[0] for r in rows)
+            with self._lock:
+                self._tickers = tickers
+        return tickers
+
+    def events(self, ticker=None):
+        """Stored actions (all tickers by default) ordered by ex-date"""
+        query = "SELECT ticker, ex_date, kind, value, applied FROM actions"
+        params = ()
+        if ticker is not None:
+            query, params = query + " WHERE ticker = ?", (ticker,)
+        frame = pd.read_sql_query(query + " ORDER BY ticker, ex_date", self._connection(), params=params)
+        frame['ex_date'] = pd.to_datetime(frame['ex_date'])
+        frame['applied'] = frame['applied'].astype(bool)
+        return frame
+
+    def _ticker_events(self, ticker):
+        """(ex-date ns, kind, value, applied) arrays for one ticker, sorted by ex-date"""
+        with self._lock:
+            cached = self._events.get(ticker)
+        if cached is None and ticker not in self.tickers():
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=object), np.zeros(0), np.zeros(0, dtype=bool)
+        if cached is None:
+            rows = self._connection().execute(
+                "SELECT ex_date, kind, value, applied FROM actions WHERE ticker = ? ORDER BY ex_date",
+                (ticker,)).fetchall()
+            cached = (pd.DatetimeIndex([r[0] for r in rows]).as_unit('ns').asi8,
+                      np.array([r[1] for r in rows], dtype=object),
+                      np.array([r[2] for r in rows], dtype=float),
+                      np.array([bool(r[3]) for r in rows], dtype=bool))
+            with self._lock:
+                self._events[ticker] = cached
+        return cached
+
+    def factors(self, ticker, index, raw_close, start=0, stop=None):
+        """Cumulative price and split factors for rows ``start:stop`` of ``index``
+
+        ``raw_close`` covers the whole ``index`` so dividends can look up the
+        close before their ex-date even when it lies outside the slice.
+        """
+        stop = len(index) if stop is None else stop
+        price, split = np.ones(stop - start), np.ones(stop - start)
+        ex_dates, kinds, values, applied = self._ticker_events(ticker)
+        # Splits the bars already reflect must not be divided out a second time
+        ex_dates, kinds, values = ex_dates[~applied], kinds[~applied], values[~applied]
+        if not len(ex_dates) or stop <= start:
+            return price, split
+
+        # Look the few ex-dates up in the index rather than converting the whole index
+        index = pd.DatetimeIndex(index)
+        ex_dates = pd.DatetimeIndex(ex_dates)
+        if index.tz is not None:
+            ex_dates = ex_dates.tz_localize(index.tz)
+        positions = index.searchsorted(ex_dates, side='left')  # first bar on/after the ex-date
+        affects = positions > start
+        positions, kinds, values = positions[affects], kinds[affects], values[affects]
+        is_split = np.isin(kinds, SPLIT_KINDS)
+        multipliers = np.where(is_split, 1.0 / values, 1.0)
+        dividend = ~is_split
+        if dividend.any():
+            previous = np.asarray(raw_close, dtype=float)[positions[dividend] - 1]
+            multipliers[dividend] = np.where(previous > values[dividend], 1.0 - values[dividend] / previous, 1.0)
+
+        for out, mask in ((price, np.ones(len(positions), dtype=bool)), (split, is_split)):
+            inside = mask & (positions < stop)
+            steps = np.ones(stop - start + 1)
+            np.multiply.at(steps, positions[inside] - start, multipliers[inside])
+            # Row i is scaled by every action at a position after i: reverse cumulative product
+            out *= np.cumprod(steps[::-1])[::-1][1:] * np.prod(multipliers[mask & (positions >= stop)])
+        return price, split
+
+    def adjust(self, frame, ticker, start=None, end=None):
+        """Adjusted copy of ``frame.loc[start:end]`` (OHLCV of raw bars); ``frame`` may hold more history"""
+        lo = 0 if start is None else _position(frame.index, start, 'left')
+        hi = len(frame) if end is None else _position(frame.index, end, 'right')
+        window = frame.iloc[lo:hi]
+        if 'Close' not in frame.columns or not len(window) or ticker not in self.tickers():
+            return window.copy()
+        with tracer.span("corporate_actions: adjust", rows=len(window)):
+            price, split = self.factors(ticker, frame.index, frame['Close'].to_numpy(), lo, hi)
+            # Assemble a new frame column by column: cheaper than copying and assigning into one
+            data = {column: window[column].to_numpy() for column in window.columns}
+            for column in PRICE_COLUMNS:
+                if column in data:
+                    data[column] = data[column].astype(float) * price
+            if 'Volume' in data:
+                data['Volume'] = data['Volume'].astype(float) / split
+            return pd.DataFrame(data, index=window.index)
+
+    def adjust_matrix(self, frame, close=None, volume=False):
+        """Adjust a wide (dates x tickers) matrix; only tickers with actions are touched
+
+        ``close`` is the raw close matrix dividends are measured against
+        (``frame`` itself by default); ``volume=True`` applies split factors only.
+        """
+        tickers = [t for t in frame.columns if t in self.tickers()]
+        if not tickers:
+            return frame
+        close = frame if close is None else close
+        out = frame.copy()
+        with tracer.span("corporate_actions: adjust_matrix", tickers=len(tickers), rows=len(frame)):
+            for ticker in tickers:
+                price, split = self.factors(ticker, frame.index, close[ticker].to_numpy())
+                out[ticker] = frame[ticker].to_numpy(dtype=float) * (1.0 / split if volume else price)
+        return out
+
+
+def _position(index, value, side):
+    """Row position of a date bound in a (possibly tz-aware) DatetimeIndex"""
+    value = pd.Timestamp(value)
+    if index.tz is not None and value.tz is None:
+        value = value.tz_localize(index.tz)
+    return index.searchsorted(value, side=side)
+
+
+_actions = None
+_actions_lock = threading.Lock()
+
+
+def get_corporate_actions():
+    """Process-wide store at ``CORPORATE_ACTIONS_DB``"""
+    global _actions
+    with _actions_lock:
+        if _actions is None:
+            _actions = CorporateActions()
+        return _actions
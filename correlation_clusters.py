@@ -0,0 +1,182 @@
+"""Data-driven sectors from an incrementally updated EWMA correlation matrix
+
+The exponentially weighted covariance of daily returns across every tracked
+ticker follows the recursion
+
+    d = r - mean;  mean += (1 - lam) * d;  cov = lam * (cov + (1 - lam) * d d')
+
+so ``update`` costs one O(n^2) rank-one update per new bar. ``fit`` replays
+only the O(n) mean recursion row by row. It then forms the covariance from
+the unrolled sum as a single weighted ``D' W D`` product. Missing returns
+leave a ticker's mean alone and add no deviation.
+
+``clusters()`` cuts an average-linkage tree over the correlation distance
+``sqrt((1 - rho) / 2)``. The labels are cached per number of clusters,
+with the correlation matrix they came from. They are only recomputed once
+some pair's correlation has moved more than ``drift`` away from that
+reference. Both are arguments of ``clusters()``, so one shared instance can
+serve callers with different settings.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, leaves_list, linkage
+from scipy.spatial.distance import squareform
+
+from performance_tracker import tracer
+
+DEFAULT_HALFLIFE = 63
+DEFAULT_DRIFT = 0.1
+MIN_PERIODS = 20
+
+
+class CorrelationClusters:
+    """EWMA covariance of all tickers with a drift-invalidated hierarchical clustering"""
+
+    def __init__(self, halflife=DEFAULT_HALFLIFE, n_clusters=8, drift=DEFAULT_DRIFT,
+                 method='average', min_periods=MIN_PERIODS):
+        self.halflife = halflife
+        self.decay = 0.5 ** (1 / halflife)
+        self.n_clusters = n_clusters
+        self.drift = drift
+        self.method = method
+        self.min_periods = min_periods
+        self.tickers = []
+        self.index = pd.DatetimeIndex([])
+        self.reclusters = 0
+        self.cache_hits = 0
+        self._mean = np.zeros(0)
+        self._cov = np.zeros((0, 0))
+        self._count = np.zeros(0, dtype=np.int64)
+        self._cached = {}  # n_clusters -> (reference correlation, labels, leaf order, tickers kept)
+        self._lock = threading.Lock()
+
+    def fit(self, returns):
+        """EWMA mean/covariance over the whole history of ``returns`` (dates x tickers)"""
+        values = returns.to_numpy(dtype=float)
+        lam = self.decay
+        with tracer.span("correlation: fit", rows=len(values), tickers=values.shape[1]):
+            mean = np.zeros(values.shape[1])
+            count = np.zeros(values.shape[1], dtype=np.int64)
+            deviations = np.zeros_like(values)
+            for t, row in enumerate(values):
+                seen = ~np.isnan(row)
+                first = seen & (count == 0)
+                mean[first] = row[first]  # start each mean at its first observation
+                d = np.where(seen & ~first, row - mean, 0.0)
+                mean += (1 - lam) * d
+                deviations[t] = d
+                count += seen
+            # Unrolled recursion: cov_T = sum_t (1 - lam) * lam^(T - t + 1) * d_t d_t'
+            weights = (1 - lam) * lam ** np.arange(len(values), 0, -1)
+            cov = (deviations * weights[:, None]).T @ deviations
+        with self._lock:
+            self.tickers = list(returns.columns)
+            self.index = returns.index
+            self._mean, self._cov, self._count = mean, cov, count
+            self._cached = {}
+        return self
+
+    def extend(self, returns):
+        """Apply rows after the last fitted date one bar at a time; refit if the universe or history changed"""
+        if not len(self.index) or list(returns.columns) != self.tickers or \
+                not returns.index[:len(self.index)].equals(self.index):
+            return self.fit(returns)
+        new = returns.loc[returns.index > self.index[-1]]
+        for date, row in zip(new.index, new.to_numpy(dtype=float)):
+            self.update(date, row)
+        return self
+
+    def update(self, date, row):
+        """Rank-one EWMA update for one bar of returns (NaN = no observation): O(n^2)"""
+        row = np.asarray(row, dtype=float)
+        lam = self.decay
+        with self._lock, tracer.span("correlation: update", tickers=len(self.tickers)):
+            seen = ~np.isnan(row)
+            first = seen & (self._count == 0)
+            self._mean[first] = row[first]
+            d = np.where(seen & ~first, row - self._mean, 0.0)
+            self._mean += (1 - lam) * d
+            self._cov += (1 - lam) * np.outer(d, d)
+            self._cov *= lam
+            self._count += seen
+            self.index = self.index.append(pd.DatetimeIndex([date]))
+
+    def covariance(self):
+        return pd.DataFrame(self._cov, index=self.tickers, columns=self.tickers)
+
+    def _correlation(self):
+        """Correlation of tickers with at least ``min_periods`` returns, and which tickers those are"""
+        keep = np.flatnonzero((self._count >= self.min_periods) & (np.diag(self._cov) > 0))
+        cov = self._cov[np.ix_(keep, keep)]
+        std = np.sqrt(np.diag(cov))
+        corr = np.clip(cov / np.outer(std, std), -1.0, 1.0)
+        np.fill_diagonal(corr, 1.0)
+        return corr, keep
+
+    def correlation(self):
+        corr, keep = self._correlation()
+        tickers = [self.tickers[i] for i in keep]
+        return pd.DataFrame(corr, index=tickers, columns=tickers)
+
+    def _cluster(self, corr, n_clusters):
+        distance = np.sqrt(np.clip((1.0 - corr) / 2.0, 0.0, None))
+        np.fill_diagonal(distance, 0.0)
+        tree = linkage(squareform(distance, checks=False), method=self.method)
+        labels = fcluster(tree, t=min(n_clusters, len(corr)), criterion='maxclust')
+        return labels, leaves_list(tree)
+
+    def clusters(self, n_clusters=None, drift=None):
+        """Cluster label per ticker (1 = largest cluster), in dendrogram leaf order
+
+        Reuses the labels cached for ``n_clusters`` while no pairwise
+        correlation has drifted by more than ``drift`` from the matrix they
+        were computed on. Either defaults to the instance setting.
+        """
+        n_clusters = self.n_clusters if n_clusters is None else n_clusters
+        drift = self.drift if drift is None else drift
+        with self._lock:
+            corr, keep = self._correlation()
+            cached = self._cached.get(n_clusters)
+            if cached is not None and np.array_equal(cached[3], keep) and np.abs(corr - cached[0]).max() <= drift:
+                self.cache_hits += 1
+            elif len(keep) >= 2:
+                with tracer.span("correlation: cluster", tickers=len(keep)):
+                    labels, order = self._cluster(corr, n_clusters)
+                    # Number clusters by size so labels stay readable across reclusters
+                    sizes = np.bincount(labels)
+                    rank = np.empty_like(sizes)
+                    rank[np.argsort(-sizes, kind='stable')] = np.arange(len(sizes))
+                    cached = self._cached[n_clusters] = (corr, rank[labels] + 1, order, keep)
+                    self.reclusters += 1
+            else:
+                return pd.Series(dtype=int, name='Cluster')
+            _, labels, order, keep = cached
+        tickers = np.array(self.tickers, dtype=object)[keep]
+        return pd.Series(labels[order], index=tickers[order], name='Cluster')
+
+    def drift_since_cluster(self, n_clusters=None):
+        """Largest pairwise correlation change since the clustering cached for ``n_clusters`` (NaN if none)"""
+        n_clusters = self.n_clusters if n_clusters is None else n_clusters
+        with self._lock:
+            corr, keep = self._correlation()
+            cached = self._cached.get(n_clusters)
+            if cached is None or not np.array_equal(cached[3], keep):
+                return np.nan
+            return float(np.abs(corr - cached[0]).max())
+
+
+def compare_sectors(labels, sectors, names=None):
+    """One row per cluster: size, dominant static sector, its share, and the members"""
+    names = names or {}
+    frame = pd.DataFrame({'Cluster': labels.to_numpy(),
+                          'Sector': [sectors.get(t, 'Other') for t in labels.index],
+                          'Member': [names.get(t, t) for t in labels.index]})
+    rows = []
+    for cluster, group in frame.groupby('Cluster', sort=True):
+        counts = group['Sector'].value_counts()
+        rows.append({'Cluster': f"C{cluster}", 'Size': len(group), 'Dominant Sector': counts.index[0],
+                     'Share %': round(counts.iloc[0] / len(group) * 100, 1),
+                     'Sectors Spanned': len(counts), 'Members': ', '.join(group['Member'])})
+    return pd.DataFrame(rows, columns=['Cluster', 'Size', 'Dominant Sector', 'Share %', 'Sectors Spanned', 'Members'])
@@ -0,0 +1,364 @@
+"""Pluggable data sources for prices, fundamentals, news and macro data
+
+Analyzers talk to a ``DataProvider`` instead of importing yfinance,
+requests or feedparser directly. ``get_provider()`` picks the process-wide
+default from ``DATA_PROVIDER``:
+
+* unset / ``live``      - ``YFinanceProvider`` (yfinance, NewsAPI, Google News RSS)
+* ``record:<db>``       - live provider wrapped in ``RecordingProvider``, which
+  writes every response to a SQLite file
+* ``replay:<db>``       - ``ReplayProvider`` serving those recorded responses
+  with no network access, for deterministic load tests
+"""
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+import pandas as pd
+
+from performance_tracker import tracer, frame_bytes
+from quote_stream import MACRO_SYMBOLS
+
+# Indicators without a free market-data source
+MACRO_DEFAULTS = {
+    'gdp_growth': 7.2,
+    'inflation_cpi': 5.1,
+    'repo_rate': 6.5,
+    'usd_inr': 83.2,
+    'crude_oil': 82.5,
+    'gold_price': 62500,
+    'fii_inflow': 15000,  # Crores
+    'dii_inflow': 18000   # Crores
+}
+TROY_OUNCE_GRAMS = 31.1035
+PAGE_POOL_SIZE = 16
+
+
+class DataProvider:
+    """Interface for every data source used by the analyzers"""
+
+    name = 'base'
+    # False when responses are recorded/replayed by request: the fetch planner's date ranges would never match
+    plannable = True
+
+    def history(self, ticker, period='6mo', interval='1d'):
+        """OHLCV indexed by date, split- but not dividend-adjusted, with 'Dividends'/'Stock Splits' where known"""
+        raise NotImplementedError
+
+    def download(self, tickers, period='1y'):
+        """Batched OHLCV with (field, ticker) columns, as ``yf.download(group_by='column')``"""
+        raise NotImplementedError
+
+    def download_range(self, tickers, start, end):
+        """As ``download`` for dates ``start`` <= date < ``end``, with 'Dividends'/'Stock Splits' fields"""
+        raise NotImplementedError
+
+    def info(self, ticker):
+        """Fundamentals dict (trailingPE, priceToBook, returnOnEquity, marketCap, ...)"""
+        raise NotImplementedError
+
+    def news(self, url, params):
+        """NewsAPI-style article dicts for a query (empty on a non-200 response)"""
+        raise NotImplementedError
+
+    def rss(self, url):
+        """Feed entries as dicts with title, link, published and source"""
+        raise NotImplementedError
+
+    def page(self, url):
+        """HTML of a web page ('' on a non-200 response)"""
+        raise NotImplementedError
+
+    def macro(self):
+        """Current macro indicators keyed as ``MACRO_DEFAULTS``"""
+        raise NotImplementedError
+
+
+class YFinanceProvider(DataProvider):
+    """Live data: yfinance for market data, NewsAPI, Google News RSS and the linked pages for news"""
+
+    name = 'live'
+
+    def __init__(self):
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def history(self, ticker, period='6mo', interval='1d'):
+        import yfinance as yf
+        # Raw bars like ``download``; splits/dividends are applied on read by corporate_actions
+        hist = yf.Ticker(ticker).history(period=period, interval=interval, auto_adjust=False)
+        tracer.add_bytes(frame_bytes(hist))
+        return hist
+
+    def download(self, tickers, period='1y'):
+        import yfinance as yf
+        data = yf.download(list(tickers), period=period, group_by='column', auto_adjust=False,
+                           progress=False, threads=True)
+        tracer.add_bytes(frame_bytes(data))
+        return data
+
+    def download_range(self, tickers, start, end):
+        import yfinance as yf
+        data = yf.download(list(tickers), start=pd.Timestamp(start).strftime('%Y-%m-%d'),
+                           end=pd.Timestamp(end).strftime('%Y-%m-%d'), group_by='column', auto_adjust=False,
+                           actions=True, progress=False, threads=True)
+        tracer.add_bytes(frame_bytes(data))
+        return data
+
+    def info(self, ticker):
+        import yfinance as yf
+        info = yf.Ticker(ticker).info
+        tracer.add_bytes(len(str(info)))
+        return info
+
+    def news(self, url, params):
+        import requests
+        response = requests.get(url, params=params, timeout=10)
+        tracer.add_bytes(len(response.content))
+        if response.status_code != 200:
+            return []
+        return response.json().get('articles', [])
+
+    def rss(self, url):
+        import feedparser
+        feed = feedparser.parse(url)
+        return [{
+            'title': entry.title,
+            'link': entry.link,
+            'published': entry.published,
+            'source': entry.source.title if hasattr(entry, 'source') else 'Google News'
+        } for entry in feed.entries]
+
+    def page(self, url):
+        import requests
+        with self._session_lock:
+            if self._session is None:
+                # One keep-alive connection pool shared by every article download
+                self._session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=PAGE_POOL_SIZE, pool_maxsize=PAGE_POOL_SIZE)
+                self._session.mount('http://', adapter)
+                self._session.mount('https://', adapter)
+                self._session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; TopDownDashboard/1.0)'
+        response = self._session.get(url, timeout=10)
+        tracer.add_bytes(len(response.content))
+        if response.status_code != 200:
+            return ''
+        return response.text
+
+    def macro(self):
+        indicators = dict(MACRO_DEFAULTS)
+        try:
+            symbols = [MACRO_SYMBOLS['USD/INR'], MACRO_SYMBOLS['Crude Oil'], MACRO_SYMBOLS['Gold']]
+            close = self.download(symbols, period='5d')['Close'].ffill().iloc[-1]
+        except:
+            return indicators
+        usd_inr, crude, gold_usd_oz = (close.get(s) for s in symbols)
+        if pd.notna(usd_inr):
+            indicators['usd_inr'] = round(float(usd_inr), 2)
+        if pd.notna(crude):
+            indicators['crude_oil'] = round(float(crude), 2)
+        if pd.notna(gold_usd_oz):
+            # USD per troy ounce -> INR per 10 g
+            indicators['gold_price'] = round(float(gold_usd_oz) * indicators['usd_inr'] / TROY_OUNCE_GRAMS * 10)
+        return indicators
+
+
+def _request_key(method, args):
+    return json.dumps([method, args], sort_keys=True, default=str)
+
+
+class ResponseStore:
+    """SQLite table of pickled provider responses keyed by (method, arguments)"""
+
+    def __init__(self, path, cache_entries=1024):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self.cache_entries = cache_entries
+        with self._connection() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                recorded_at TEXT NOT NULL
+            )""")
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+    def get(self, key):
+        """Decoded payload or KeyError; hot entries are kept decoded in memory"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        row = self._connection().execute("SELECT payload FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        value = pickle.loads(zlib.decompress(row[0]))
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return value
+
+    def put(self, key, method, value):
+        payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                         (key, method, payload, datetime.now().isoformat(timespec='seconds')))
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def methods(self):
+        """Recorded response counts per provider method"""
+        rows = self._connection().execute("SELECT method, COUNT(*) FROM responses GROUP BY method").fetchall()
+        return dict(rows)
+
+
+def _copy(value):
+    # Callers may mutate frames/dicts; never hand out the cached object itself
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, (dict, list)):
+        return pickle.loads(pickle.dumps(value))
+    return value
+
+
+class ReplayProvider(DataProvider):
+    """Serve responses recorded by ``RecordingProvider``; no network access
+
+    A request that was never recorded raises ``KeyError`` (the analyzers
+    treat it like a failed fetch) unless a ``fallback`` provider is given.
+    """
+
+    name = 'replay'
+    plannable = False
+
+    def __init__(self, path, fallback=None):
+        self.store = ResponseStore(path)
+        self.fallback = fallback
+        self.misses = 0
+
+    def _replay(self, method, *args):
+        try:
+            return _copy(self.store.get(_request_key(method, args)))
+        except KeyError:
+            self.misses += 1
+            if self.fallback is None:
+                raise
+            return getattr(self.fallback, method)(*args)
+
+    def history(self, ticker, period='6mo', interval='1d'):
+        return self._replay('history', ticker, period, interval)
+
+    def download(self, tickers, period='1y'):
+        return self._replay('download', list(tickers), period)
+
+    def download_range(self, tickers, start, end):
+        return self._replay('download_range', list(tickers), start, end)
+
+    def info(self, ticker):
+        return self._replay('info', ticker)
+
+    def news(self, url, params):
+        return self._replay('news', url, _without_key(params))
+
+    def rss(self, url):
+        return self._replay('rss', url)
+
+    def page(self, url):
+        return self._replay('page', url)
+
+    def macro(self):
+        return self._replay('macro')
+
+
+class RecordingProvider(DataProvider):
+    """Proxy that forwards to ``inner`` and records every successful response"""
+
+    name = 'record'
+    plannable = False
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.store = ResponseStore(path)
+
+    def _record(self, method, key_args, *args):
+        value = getattr(self.inner, method)(*args)
+        self.store.put(_request_key(method, key_args), method, value)
+        return value
+
+    def history(self, ticker, period='6mo', interval='1d'):
+        return self._record('history', (ticker, period, interval), ticker, period, interval)
+
+    def download(self, tickers, period='1y'):
+        return self._record('download', (list(tickers), period), tickers, period)
+
+    def download_range(self, tickers, start, end):
+        return self._record('download_range', (list(tickers), start, end), tickers, start, end)
+
+    def info(self, ticker):
+        return self._record('info', (ticker,), ticker)
+
+    def news(self, url, params):
+        return self._record('news', (url, _without_key(params)), url, params)
+
+    def rss(self, url):
+        return self._record('rss', (url,), url)
+
+    def page(self, url):
+        return self._record('page', (url,), url)
+
+    def macro(self):
+        return self._record('macro', ())
+
+
+def _without_key(params):
+    """Request params minus the API key, so recordings match across keys"""
+    return {k: v for k, v in params.items() if k != 'apiKey'}
+
+
+def provider_from_spec(spec):
+    """'live', 'record:<db>' or 'replay:<db>' -> provider"""
+    kind, _, path = (spec or 'live').partition(':')
+    if kind == 'live':
+        return YFinanceProvider()
+    if kind == 'record':
+        return RecordingProvider(YFinanceProvider(), path)
+    if kind == 'replay':
+        return ReplayProvider(path)
+    raise ValueError(f"Unknown DATA_PROVIDER '{spec}'")
+
+
+_default_provider = None
+_default_lock = threading.Lock()
+
+
+def get_provider():
+    """Process-wide provider named by ``DATA_PROVIDER``"""
+    global _default_provider
+    with _default_lock:
+        if _default_provider is None:
+            _default_provider = provider_from_spec(os.getenv('DATA_PROVIDER'))
+        return _default_provider
+
+
+def set_provider(provider):
+    """Swap the process-wide provider (e.g. for load tests); returns the previous one"""
+    global _default_provider
+    with _default_lock:
+        previous, _default_provider = _default_provider, provider
+        return previous
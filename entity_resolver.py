@@ -0,0 +1,302 @@
+"""Resolve free-text company names to NSE tickers
+
+Recommendations name companies as free text ('Tata Motors (EV)', 'L&T',
+'Dr. Reddy's', 'Ambuja'). ``EntityResolver`` precomputes an alias index from
+the ``SectorAnalyzer`` display names, the ticker symbols themselves and
+``TICKER_ALIASES``, and resolves a name in three steps:
+
+1. exact walk of the normalized tokens through a token trie
+2. trie prefix: an unambiguous abbreviation ('Ambuja' -> 'Ambuja Cement') or
+   an alias followed only by generic words ('Infosys Technologies')
+3. fuzzy fallback: character-trigram Dice similarity over an inverted index,
+   only against aliases whose first word is the same (up to one typo), so a
+   different company sharing most words ('Bank of India' vs 'State Bank of
+   India') stays unresolved; the nearest alias is kept as a suggestion
+
+Every distinct name is resolved once and memoized, so repeated lookups and
+whole-column ``resolve_many`` calls are dictionary hits.
+"""
+import re
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+
+# Names used in recommendations that are not display names in the sector universe
+TICKER_ALIASES = {
+    'Reliance New Energy': 'RELIANCE.NS',
+    'Reliance Industries': 'RELIANCE.NS',
+    'Tata Consultancy Services': 'TCS.NS',
+    'HCL Technologies': 'HCLTECH.NS',
+    'Mahindra & Mahindra': 'M&M.NS',
+    'Larsen & Toubro': 'LT.NS',
+    'Maruti Suzuki': 'MARUTI.NS',
+    'State Bank of India': 'SBIN.NS',
+    'Kotak Mahindra Bank': 'KOTAKBANK.NS',
+    "Dr Reddy's Laboratories": 'DRREDDY.NS',
+    'Sun Pharmaceutical': 'SUNPHARMA.NS',
+    'Oil and Natural Gas Corporation': 'ONGC.NS',
+    'Bharat Petroleum': 'BPCL.NS',
+    'UltraTech Cement': 'ULTRACEMCO.NS',
+    'Exide': 'EXIDEIND.NS',
+    'Exide Industries': 'EXIDEIND.NS',
+    'Adani': 'ADANIENT.NS',
+    'Adani Green': 'ADANIGREEN.NS',
+    'Adani Green Energy': 'ADANIGREEN.NS',
+    'Tata Power': 'TATAPOWER.NS',
+    'Dixon': 'DIXON.NS',
+    'Amber': 'AMBER.NS',
+    'Kaynes Technology': 'KAYNES.NS',
+    'Bharti Airtel': 'BHARTIARTL.NS',
+    'Airtel': 'BHARTIARTL.NS',
+    'Coal India': 'COALINDIA.NS',
+    'Gravita India': 'GRAVITA.NS',
+    'Hindalco': 'HINDALCO.NS',
+    'Vedanta': 'VEDL.NS',
+    'Indian Oil': 'IOC.NS',
+    'HPCL': 'HINDPETRO.NS',
+    'Ola Electric': 'OLAELEC.NS',
+    'IRB Infra': 'IRB.NS',
+    'Ashoka Buildcon': 'ASHOKA.NS',
+    'HAL': 'HAL.NS',
+    'BEL': 'BEL.NS',
+    'Mazagon Dock': 'MAZDOCK.NS',
+    'Waaree': 'WAAREEENER.NS',
+    'Waaree Energies': 'WAAREEENER.NS',
+    'UPL': 'UPL.NS',
+    'Coromandel': 'COROMANDEL.NS',
+    'PI Industries': 'PIIND.NS',
+    'NIIT': 'NIITLTD.NS',
+    'Aptech': 'APTECHT.NS',
+    'Zee Learn': 'ZEELEARN.NS',
+    'IRCTC': 'IRCTC.NS',
+    'RVNL': 'RVNL.NS',
+    'IRFC': 'IRFC.NS',
+    'Bharat Forge': 'BHARATFORG.NS',
+    'Bajaj Finance': 'BAJFINANCE.NS',
+    'AU Bank': 'AUBANK.NS',
+    'DLF': 'DLF.NS',
+    'Oberoi Realty': 'OBEROIRLTY.NS',
+    'Prestige': 'PRESTIGE.NS',
+    'Jain Irrigation': 'JISLJALEQS.NS',
+    'Escorts': 'ESCORTS.NS',
+    'VST': 'VSTTILLERS.NS',
+    'Centum Electronics': 'CENTUM.NS',
+    'Indian Hotels': 'INDHOTEL.NS',
+    'Lemon Tree': 'LEMONTREE.NS',
+    'Thomas Cook': 'THOMASCOOK.NS',
+    'Welspun': 'WELSPUNLIV.NS',
+    'Trident': 'TRIDENT.NS',
+    'Vardhman': 'VTL.NS'
+}
+
+# Dropped from every name before matching
+STOPWORDS = {'ltd', 'limited', 'the', 'co', 'company', 'corp', 'corporation', 'inc', 'plc', 'pvt', 'private', 'ns'}
+# Words that may follow a known alias without changing the company ('Infosys Technologies')
+GENERIC_TOKENS = {'industries', 'enterprises', 'group', 'holdings', 'india', 'technologies', 'laboratories', 'labs'}
+FUZZY_THRESHOLD = 0.75
+MIN_TYPO_CHARS = 5  # shorter first words must match exactly ('tata', 'bank')
+MIN_PREFIX_CHARS = 4
+
+Match = namedtuple('Match', ['name', 'ticker', 'method', 'score', 'suggestion'], defaults=(None,))
+
+
+def clean_name(name):
+    """Drop qualifiers such as '(planned)' or '(design)'"""
+    return re.sub(r'\s*\(.*?\)', '', name).strip()
+
+
+def normalize(name):
+    """'Dr. Reddy's Ltd (API)' -> ('dr', 'reddys'); '&' is spelled out so 'L&T' == 'L & T'"""
+    text = clean_name(str(name)).lower().replace("'", '').replace('’', '').replace('&', ' and ')
+    return tuple(token for token in re.findall(r'[a-z0-9]+', text) if token not in STOPWORDS)
+
+
+def _one_edit(a, b):
+    """True when ``a`` and ``b`` differ by at most one insertion, deletion, substitution or swap"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2]
+                                          and a[i + 2:] == b[i + 2:])
+    longer, shorter = (a, b) if len(a) > len(b) else (b, a)
+    return longer[i + 1:] == shorter[i:]
+
+
+def _trigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Node:
+    __slots__ = ('children', 'ticker', 'tickers')
+
+    def __init__(self):
+        self.children = {}
+        self.ticker = None
+        self.tickers = set()  # every ticker at or below this node
+
+
+class EntityResolver:
+    """Precomputed alias index: token trie for exact/prefix matches, trigram index for fuzzy ones"""
+
+    def __init__(self, aliases, fuzzy_threshold=FUZZY_THRESHOLD):
+        """``aliases`` maps name -> ticker; later entries win on the same normalized name"""
+        self.fuzzy_threshold = fuzzy_threshold
+        self._root = _Node()
+        self._aliases = {}
+        for name, ticker in aliases.items():
+            tokens = normalize(name)
+            if tokens:
+                self._aliases[tokens] = (name, ticker)
+        for tokens, (_, ticker) in self._aliases.items():
+            node = self._root
+            node.tickers.add(ticker)
+            for token in tokens:
+                node = node.children.setdefault(token, _Node())
+                node.tickers.add(ticker)
+            node.ticker = ticker
+
+        # Trigram -> alias ids, for the fuzzy fallback
+        self._keys = [' '.join(tokens) for tokens in self._aliases]
+        self._first = np.array([tokens[0] for tokens in self._aliases], dtype=object)
+        self._names = [name for name, _ in self._aliases.values()]
+        self._tickers = [ticker for _, ticker in self._aliases.values()]
+        postings = {}
+        for i, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._gram_counts = np.array([len(_trigrams(key)) for key in self._keys])
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_sectors(cls, sectors, aliases=TICKER_ALIASES, **kwargs):
+        """Index ``SectorAnalyzer`` sectors: ticker symbols, display names, then ``aliases``"""
+        tickers = [t for data in sectors.values() for t in data['stocks']] + list(aliases.values())
+        index = {ticker.rsplit('.', 1)[0]: ticker for ticker in tickers}
+        for data in sectors.values():
+            index.update(zip(data['names'], data['stocks']))
+        index.update(aliases)
+        return cls(index, **kwargs)
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def __call__(self, name):
+        return self.resolve(name)
+
+    def resolve(self, name):
+        """Ticker for ``name`` or None"""
+        return self.match(name).ticker
+
+    def match(self, name):
+        """``Match(name, ticker, method, score, suggestion)``; method is exact/prefix/fuzzy or None
+
+        An unresolved name carries the nearest alias as ``suggestion`` (None if nothing is close).
+        """
+        found = self._memo.get(name)
+        if found is None:
+            found = self._match(name)
+            with self._lock:
+                self._memo[name] = found
+        return found
+
+    def _match(self, name):
+        tokens = normalize(name)
+        if not tokens:
+            return Match(name, None, None, 0.0)
+
+        node, depth, last = self._root, 0, None
+        for token in tokens:
+            child = node.children.get(token)
+            if child is None:
+                break
+            node, depth = child, depth + 1
+            if node.ticker is not None:
+                last = (depth, node.ticker)
+        rest_generic = all(token in GENERIC_TOKENS for token in tokens[depth:])
+        if depth == len(tokens) and node.ticker is not None:
+            return Match(name, node.ticker, 'exact', 1.0)
+        # Unambiguous abbreviation ('Ambuja', "Divi's Laboratories")
+        if depth and rest_generic and len(node.tickers) == 1 and \
+                sum(map(len, tokens[:depth])) >= MIN_PREFIX_CHARS:
+            return Match(name, next(iter(node.tickers)), 'prefix', 1.0)
+        if last is not None and all(token in GENERIC_TOKENS for token in tokens[last[0]:]):
+            return Match(name, last[1], 'prefix', 1.0)
+
+        key = ' '.join(tokens)
+        alias, score = self._nearest(key, first=tokens[0])
+        # A full alias followed by specific words is another company ('Reliance Power')
+        if alias is not None and score >= self.fuzzy_threshold and \
+                (last is None or self._keys[alias] != ' '.join(tokens[:last[0]])):
+            return Match(name, self._tickers[alias], 'fuzzy', score)
+        nearest, nearest_score = self._nearest(key)
+        suggestion = self._names[nearest] if nearest is not None and nearest_score > 0.5 else None
+        return Match(name, None, None, nearest_score, suggestion)
+
+    def _nearest(self, key, first=None):
+        """Alias id with the highest trigram Dice similarity to ``key``, and the score
+
+        With ``first``, only aliases whose first token equals it (or is one typo
+        away, for words of ``MIN_TYPO_CHARS`` or more) are candidates.
+        """
+        grams = [self._postings[gram] for gram in _trigrams(key) if gram in self._postings]
+        if not grams:
+            return None, 0.0
+        shared = np.bincount(np.concatenate(grams), minlength=len(self._keys))
+        dice = 2 * shared / (len(_trigrams(key)) + self._gram_counts)
+        if first is not None:
+            candidates = np.flatnonzero(shared)
+            allowed = [i for i in candidates if self._first[i] == first or
+                       (min(len(first), len(self._first[i])) >= MIN_TYPO_CHARS and _one_edit(first, self._first[i]))]
+            if not allowed:
+                return None, 0.0
+            dice = np.where(np.isin(np.arange(len(dice)), allowed), dice, -1.0)
+        best = int(dice.argmax())
+        return best, float(dice[best])
+
+    def resolve_many(self, names):
+        """Tickers for a whole column (None where unresolved); each distinct name is matched once"""
+        names = pd.Series(names)
+        codes, uniques = pd.factorize(names)
+        with tracer.span("entity_resolver: resolve_many", rows=len(names), distinct=len(uniques)):
+            tickers = np.array([self.resolve(name) for name in uniques] + [None], dtype=object)
+        return pd.Series(tickers[codes], index=names.index, name='ticker')
+
+    def unresolved(self, names):
+        """Names without a ticker, with their count and the closest alias as a suggestion"""
+        names = pd.Series(names).dropna()
+        counts = names.map(clean_name).value_counts()
+        rows = []
+        for name, count in counts.items():
+            if self.resolve(name) is None:
+                alias, score = self._nearest(' '.join(normalize(name)))
+                rows.append({'name': name, 'count': int(count),
+                             'suggestion': self._names[alias] if alias is not None else None,
+                             'suggested_ticker': self._tickers[alias] if alias is not None else None,
+                             'score': round(score, 2)})
+        return pd.DataFrame(rows, columns=['name', 'count', 'suggestion', 'suggested_ticker', 'score'])
+
+
+_default_resolver = None
+_default_lock = threading.Lock()
+
+
+def get_resolver():
+    """Process-wide resolver over the ``SectorAnalyzer`` universe and ``TICKER_ALIASES``"""
+    global _default_resolver
+    with _default_lock:
+        if _default_resolver is None:
+            from sector_analyzer import SectorAnalyzer
+            _default_resolver = EntityResolver.from_sectors(SectorAnalyzer().sectors)
+        return _default_resolver
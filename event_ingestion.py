@@ -0,0 +1,389 @@
+"""Streaming ingestion of global supply-chain events
+
+Raw events come from a JSONL drop directory (each ``*.jsonl`` file is read
+from the last consumed byte, so appended lines are picked up without
+re-reading the file) or a local RSS file (re-parsed only when it changes).
+Each headline is then
+
+* deduplicated against recent events with MinHash over character shingles,
+  with LSH banding so a new headline is compared only with likely matches,
+* mapped to a ``commodity_map`` entry by a token-indexed phrase matcher,
+* given an ``impact_level`` from ``IMPACT_RULES`` and the size of any quoted
+  price move when the source does not provide one,
+
+and appended to the in-memory event list. ``EVENT_FEED`` names the sources
+(comma-separated; directories are JSONL drops, files are RSS).
+"""
+import email.utils
+import glob
+import json
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from performance_tracker import tracer
+
+LEVELS = ['Low', 'Medium', 'High', 'Very High', 'Critical']
+
+# Extra phrases per commodity (the commodity name itself always matches)
+COMMODITY_KEYWORDS = {
+    'Cobalt': ['cobalt'],
+    'Lithium': ['lithium', 'spodumene', 'lithium carbonate'],
+    'Rare Earth Elements': ['rare earth', 'rare earths', 'neodymium', 'dysprosium', 'gallium', 'germanium'],
+    'Crude Oil': ['crude', 'brent', 'wti', 'opec', 'oil price', 'oil prices', 'oil output', 'oil supply'],
+    'Semiconductor Chips': ['semiconductor', 'semiconductors', 'chip', 'chips', 'chipmaker', 'foundry', 'tsmc']
+}
+
+# Highest matching level wins; checked before falling back to the commodity's own impact
+IMPACT_RULES = [
+    (['ban', 'bans', 'embargo', 'blockade', 'war', 'sanctions', 'halt', 'halts', 'halted', 'force majeure',
+      'shutdown', 'nationalises', 'nationalizes'], 'Critical'),
+    (['export restriction', 'export restrictions', 'export curbs', 'export controls', 'quota', 'quotas',
+      'shortage', 'production cut', 'production cuts', 'output cut', 'supply crunch'], 'Very High'),
+    (['disruption', 'disruptions', 'strike', 'tariff', 'tariffs', 'constraint', 'constraints', 'delay',
+      'delays', 'surge', 'surges', 'spike'], 'High'),
+    (['talks', 'review', 'considers', 'eases', 'easing', 'stable'], 'Medium')
+]
+
+# Quoted price move (absolute %) -> level
+PRICE_LEVELS = [(40, 'Critical'), (25, 'Very High'), (10, 'High'), (0, 'Medium')]
+
+FALLING = re.compile(r'\b(fall|falls|fell|drop|drops|dropped|down|slump|slumps|plunge|plunges|decline|declines)\b', re.I)
+
+TIMELINES = {'Critical': '18-36 months', 'Very High': '12-24 months', 'High': '6-12 months',
+             'Medium': '3-6 months', 'Low': '1-3 months'}
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+BANDS = 8
+DEDUPE_THRESHOLD = 0.7
+DEDUPE_DAYS = 14
+
+
+def tokenize(text):
+    return re.findall(r"[a-z0-9]+", (text or '').lower())
+
+
+def normalize_headline(title):
+    """Lowercase tokens without the trailing ' - Source' that news aggregators append"""
+    return ' '.join(tokenize(re.sub(r'\s+[-|–]\s+[^-|–]{2,40}$', '', title or '')))
+
+
+def _mix(x):
+    # splitmix64 finalizer, vectorized; uint64 arithmetic wraps
+    with np.errstate(over='ignore'):
+        x = x ^ (x >> np.uint64(30))
+        x = x * np.uint64(0xBF58476D1CE4E5B9)
+        x = x ^ (x >> np.uint64(27))
+        x = x * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+class MinHasher:
+    """MinHash signatures of byte shingles; ``num_perm`` hash functions in one array op
+
+    Each ``shingle_size``-byte window (at most 8) is packed into a uint64 and
+    mixed, so a headline needs no per-shingle Python hashing.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=40):
+        self.num_perm = num_perm
+        self.shingle_size = min(shingle_size, 8)
+        self.masks = np.random.default_rng(seed).integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def signatures(self, texts, chunk=1000):
+        """(len(texts) x num_perm) signatures; shingles of a whole chunk are packed and mixed together"""
+        out = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        k = self.shingle_size
+        for lo in range(0, len(texts), chunk):
+            encoded = [text.encode().ljust(k) for text in texts[lo:lo + chunk]]
+            lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+            ends = np.cumsum(lengths)
+            data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+            n = len(data) - k + 1
+            packed = np.zeros(n, dtype=np.uint64)
+            for j in range(k):
+                packed = (packed << np.uint64(8)) | data[j:j + n]
+            # Keep windows that end inside the text they start in
+            segment = np.repeat(np.arange(len(encoded)), lengths)[:n]
+            valid = np.arange(n) + k <= ends[segment]
+            hashes = _mix(_mix(packed[valid])[:, None] ^ self.masks[None, :])
+            starts = np.r_[0, np.cumsum(lengths - k + 1)[:-1]]
+            out[lo:lo + len(encoded)] = np.minimum.reduceat(hashes, starts, axis=0)
+        return out
+
+    def signature(self, text):
+        return self.signatures([text])[0]
+
+    @staticmethod
+    def similarity(a, b):
+        """Estimated Jaccard similarity of two signatures"""
+        return float((a == b).mean())
+
+
+class PhraseIndex:
+    """Multi-word phrase lookup indexed by first token: one pass over the text's tokens"""
+
+    def __init__(self, phrases):
+        self._index = defaultdict(list)
+        for phrase, value in phrases:
+            tokens = tuple(tokenize(phrase))
+            if tokens:
+                self._index[tokens[0]].append((tokens, value))
+        for entries in self._index.values():
+            entries.sort(key=lambda entry: -len(entry[0]))
+
+    def matches(self, text):
+        """Values of every phrase occurring in ``text``, in order of occurrence"""
+        tokens = tokenize(text)
+        found = []
+        for i, token in enumerate(tokens):
+            for phrase, value in self._index.get(token, ()):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found.append(value)
+                    break
+        return found
+
+
+class JsonlDropSource:
+    """``*.jsonl`` files in a directory; each poll reads only lines appended since the last one"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.offsets = {}
+
+    def poll(self):
+        for path in sorted(glob.glob(os.path.join(self.directory, '*.jsonl'))):
+            offset = self.offsets.get(path, 0)
+            if os.path.getsize(path) <= offset:
+                continue
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            end = data.rfind(b'\n') + 1  # leave a partially written last line for the next poll
+            self.offsets[path] = offset + end
+            tracer.add_bytes(end)
+            for line in data[:end].splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    record.setdefault('source', os.path.basename(path))
+                    yield record
+
+
+class RssFileSource:
+    """Local RSS/Atom file, re-parsed only when its modification time changes"""
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = None
+        self.seen = set()
+
+    def poll(self):
+        import feedparser
+
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self.mtime:
+            return
+        self.mtime = mtime
+        for entry in feedparser.parse(self.path).entries:
+            key = entry.get('id') or entry.get('link') or entry.get('title')
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            yield {
+                'event': entry.get('title', ''),
+                'summary': ' '.join(re.sub(r'<[^>]+>', ' ', entry.get('summary', '')).split()),
+                'date': _entry_date(entry.get('published') or entry.get('updated')),
+                'link': entry.get('link'),
+                'source': entry.source.title if hasattr(entry, 'source') else os.path.basename(self.path)
+            }
+
+
+def _entry_date(value):
+    if not value:
+        return datetime.now().strftime('%Y-%m-%d')
+    try:
+        return email.utils.parsedate_to_datetime(value).strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return str(value)[:10]
+
+
+def price_move(text):
+    """First quoted percentage move as '+12%' / '-8%' (unsigned moves read as rises unless the text says fall)"""
+    move = re.search(r'([+-]?)(\d+(?:\.\d+)?)\s*(?:%|per ?cent)', text or '')
+    if not move:
+        return None
+    sign = move.group(1) or ('-' if FALLING.search(text) else '+')
+    return f"{sign}{move.group(2)}%"
+
+
+def sources_from_spec(spec):
+    """``EVENT_FEED`` value -> sources (directories are JSONL drops, files are RSS)"""
+    sources = []
+    for path in filter(None, (p.strip() for p in (spec or '').split(','))):
+        sources.append(JsonlDropSource(path) if os.path.isdir(path) else RssFileSource(path))
+    return sources
+
+
+class EventIngestor:
+    """Dedupe, classify and append events to an in-memory store"""
+
+    def __init__(self, commodity_map, sources=(), seed_events=()):
+        self.commodity_map = commodity_map
+        self.sources = list(sources)
+        self.hasher = MinHasher()
+        self.rows_per_band = self.hasher.num_perm // BANDS
+        self.commodities = PhraseIndex(
+            [(name, name) for name in commodity_map] +
+            [(phrase, name) for name, phrases in COMMODITY_KEYWORDS.items() if name in commodity_map
+             for phrase in phrases])
+        self.rules = PhraseIndex([(phrase, level) for phrases, level in IMPACT_RULES for phrase in phrases])
+        self._events = []
+        self._signatures = np.empty((0, self.hasher.num_perm), dtype=np.uint64)
+        self._days = np.empty(0, dtype=np.int64)
+        self._buckets = defaultdict(list)
+        self._lock = threading.Lock()
+        self.stats = Counter()
+        self.add(seed_events, source='built-in')
+
+    def _bands(self, signature):
+        r = self.rows_per_band
+        return [(band, signature[band * r:(band + 1) * r].tobytes()) for band in range(BANDS)]
+
+    def is_duplicate(self, signature, day):
+        """Near-identical headline within ``DEDUPE_DAYS`` of an existing one"""
+        candidates = {i for key in self._bands(signature) for i in self._buckets.get(key, ())}
+        if not candidates:
+            return False
+        candidates = np.fromiter(candidates, dtype=np.int64)
+        recent = candidates[np.abs(self._days[candidates] - day) <= DEDUPE_DAYS]
+        if not len(recent):
+            return False
+        similarity = (self._signatures[recent] == signature).mean(axis=1)
+        return bool((similarity >= DEDUPE_THRESHOLD).any())
+
+    def _append(self, event, signature, day):
+        index = len(self._events)
+        if index == len(self._days):  # grow the signature/day arrays geometrically
+            capacity = max(64, 2 * index)
+            self._signatures = np.resize(self._signatures, (capacity, self.hasher.num_perm))
+            self._days = np.resize(self._days, capacity)
+        self._events.append(event)
+        self._signatures[index] = signature
+        self._days[index] = day
+        for key in self._bands(signature):
+            self._buckets[key].append(index)
+
+    def match_commodity(self, text):
+        """Most mentioned commodity (first mention breaks ties), or None"""
+        found = self.commodities.matches(text)
+        if not found:
+            return None
+        counts = Counter(found)
+        return max(found, key=lambda name: (counts[name], -found.index(name)))
+
+    def infer_impact(self, text, commodity):
+        levels = self.rules.matches(text)
+        move = re.search(r'([+-]?\d+(?:\.\d+)?)\s*(?:%|per ?cent)', text or '')
+        if move:
+            pct = abs(float(move.group(1)))
+            levels.append(next(level for threshold, level in PRICE_LEVELS if pct >= threshold))
+        if levels:
+            return max(levels, key=LEVELS.index)
+        return self.commodity_map[commodity]['impact']
+
+    def normalize(self, raw):
+        """Raw JSONL/RSS record -> event dict in the ``load_recent_events`` shape, or None if unmatched"""
+        title = str(raw.get('event') or raw.get('title') or '')
+        text = f"{title} {raw.get('summary', '')}"
+        commodity = raw.get('commodity') if raw.get('commodity') in self.commodity_map else self.match_commodity(text)
+        if commodity is None:
+            return None
+        data = self.commodity_map[commodity]
+        impact_level = raw.get('impact_level')
+        if impact_level not in LEVELS:  # missing or not one of ours ('Severe'): infer it
+            impact_level = self.infer_impact(text, commodity)
+        return {
+            'date': str(raw.get('date') or datetime.now().strftime('%Y-%m-%d'))[:10],
+            'event': title,
+            'commodity': commodity,
+            'impact_level': impact_level,
+            'affected_sectors': raw.get('affected_sectors') or data['dependent_sectors'],
+            'price_impact': raw.get('price_impact') or price_move(text) or data['price_trend'].split()[0],
+            'timeline': raw.get('timeline') or TIMELINES[impact_level],
+            'indian_impact': raw.get('indian_impact') or raw.get('summary') or '',
+            'opportunities': raw.get('opportunities') or list(data['substitutes']),
+            'source': raw.get('source', 'feed'),
+            'link': raw.get('link')
+        }
+
+    def add(self, raw_events, source=None):
+        """Append the new, non-duplicate events; returns them"""
+        added = []
+        with self._lock, tracer.span("events: ingest"):
+            events = []
+            for raw in raw_events:
+                self.stats['seen'] += 1
+                try:
+                    event = self.normalize(raw if source is None else dict(raw, source=source))
+                except (AttributeError, KeyError, TypeError, ValueError):
+                    # One malformed record must not lose the rest of the batch (sources have moved past it)
+                    self.stats['invalid'] += 1
+                    continue
+                if event is None:
+                    self.stats['unmatched'] += 1
+                else:
+                    events.append(event)
+            if not events:
+                return added
+            signatures = self.hasher.signatures([normalize_headline(e['event']) for e in events])
+            for event, signature in zip(events, signatures):
+                day = _day(event['date'])
+                if self.is_duplicate(signature, day):
+                    self.stats['duplicates'] += 1
+                    continue
+                self._append(event, signature, day)
+                self.stats['added'] += 1
+                added.append(event)
+        return added
+
+    def poll(self):
+        """Pull whatever the sources have appended since the last poll"""
+        return self.add(record for source in self.sources for record in source.poll())
+
+    def events(self, ingested_only=False):
+        """Events newest first"""
+        with self._lock:
+            events = [e for e in self._events if not ingested_only or e['source'] != 'built-in']
+        return sorted(events, key=lambda e: e['date'], reverse=True)
+
+
+def _day(value):
+    """'YYYY-MM-DD...' -> day ordinal (far past when unparseable, so it never dedupes)"""
+    try:
+        return datetime.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return -10 ** 9
+
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+
+def get_ingestor(commodity_map, seed_events=()):
+    """Process-wide ingestor over ``EVENT_FEED``, seeded on first use"""
+    global _ingestor
+    with _ingestor_lock:
+        if _ingestor is None:
+            _ingestor = EventIngestor(commodity_map, sources_from_spec(os.getenv('EVENT_FEED')), seed_events)
+        return _ingestor
@@ -0,0 +1,217 @@
+"""Market-model event study of policy announcements
+
+Every policy from ``PolicyTracker`` is expanded into (policy, entity) pairs:
+each tagged stock measured against its sector index, and each tagged sector
+index measured against the Nifty 50. For every pair alpha and beta come from
+an estimation window that ends ``gap`` sessions before the announcement;
+abnormal returns over the event window are the actual returns minus
+``alpha + beta * benchmark``. All pairs are gathered from the return matrix
+with one fancy-indexing pass and every CAR window is read off a single
+cumulative sum, so the cost does not grow with the number of windows.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+
+MARKET_INDEX = '^NSEI'
+# (first, last) trading day relative to the announcement session
+DEFAULT_WINDOWS = ((-1, 1), (0, 5), (0, 20), (-5, 60))
+HEADLINE_WINDOW = (0, 20)
+ESTIMATION_DAYS = 120
+ESTIMATION_GAP = 10
+
+# Policy sector tags -> SectorAnalyzer sector whose index is the benchmark
+POLICY_SECTORS = {
+    'IT': 'IT',
+    'Telecom': 'IT',
+    'Electronics': 'IT',
+    'Semiconductors': 'IT',
+    'Banking': 'Banking',
+    'Auto': 'Auto',
+    'Pharma': 'Pharma',
+    'Energy': 'Energy',
+    'Green Energy': 'Energy',
+    'Chemicals': 'Energy',
+    'Infrastructure': 'Infrastructure',
+    'Manufacturing': 'Infrastructure',
+    'Real Estate': 'Infrastructure',
+    'Cement': 'Infrastructure'
+}
+
+ENTITY_COLUMNS = ['policy', 'date', 'kind', 'name', 'ticker', 'benchmark']
+
+
+def window_label(window):
+    start, end = window
+    return f"CAR[{start:+d},{end:+d}]".replace('+0', '0')
+
+
+def policy_entities(policies, analyzer=None, resolve=None):
+    """One row per (policy, stock) and (policy, sector index) with its benchmark ticker
+
+    Stocks are resolved through ``EntityResolver``; unresolved names keep
+    ``ticker`` as None so they can be reported.
+    """
+    from entity_resolver import get_resolver
+    from sector_analyzer import SectorAnalyzer
+
+    analyzer = analyzer or SectorAnalyzer()
+    _, stock_sectors = analyzer.ticker_labels()
+    resolve = resolve or get_resolver()
+    indices = {sector: data['index'] for sector, data in analyzer.sectors.items()}
+
+    rows = []
+    for _, policy in policies.iterrows():
+        sectors = [POLICY_SECTORS[s] for s in policy['sectors'] if POLICY_SECTORS.get(s) in indices]
+        fallback = indices[sectors[0]] if sectors else MARKET_INDEX
+        for stock in policy['stocks'].split(','):
+            ticker = resolve(stock)
+            benchmark = indices[stock_sectors[ticker]] if ticker in stock_sectors else fallback
+            rows.append((policy['policy'], policy['date'], 'stock', stock.strip(), ticker, benchmark))
+        for sector in dict.fromkeys(sectors):
+            rows.append((policy['policy'], policy['date'], 'sector', sector, indices[sector], MARKET_INDEX))
+    entities = pd.DataFrame(rows, columns=ENTITY_COLUMNS)
+    entities['date'] = pd.to_datetime(entities['date'])
+    return entities
+
+
+def required_tickers(entities):
+    """Every stock and benchmark ticker an event study of ``entities`` needs"""
+    tickers = pd.concat([entities['ticker'], entities['benchmark']]).dropna()
+    return tuple(sorted(tickers.unique()))
+
+
+class EventStudy:
+    """Abnormal returns and CARs for (policy, entity) pairs, cached per policy"""
+
+    def __init__(self, prices, windows=DEFAULT_WINDOWS, estimation_days=ESTIMATION_DAYS,
+                 gap=ESTIMATION_GAP, min_obs=60):
+        prices = prices.sort_index()
+        index = pd.DatetimeIndex(prices.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        self.tickers = prices.columns
+        self.dates = index.as_unit('ns')
+        self.windows = tuple(tuple(w) for w in windows)
+        self.estimation_days = estimation_days
+        self.gap = gap
+        self.min_obs = min_obs
+        # Returns only across sessions where the previous close exists; no ffill across gaps
+        close = prices.to_numpy(dtype=float, copy=True)
+        self._returns = np.full_like(close, np.nan)
+        self._returns[1:] = close[1:] / close[:-1] - 1
+        self._results = self.run(pd.DataFrame(columns=ENTITY_COLUMNS).astype({'date': 'datetime64[ns]'}))
+        self._keys = pd.MultiIndex.from_arrays([[], []])
+        self._lock = threading.Lock()
+
+    def run(self, entities):
+        """Market-model fit and every window's CAR (%) and t-stat for each entity row"""
+        out = entities.reset_index(drop=True).copy()
+        assets = self.tickers.get_indexer(out['ticker'].fillna(''))
+        benchmarks = self.tickers.get_indexer(out['benchmark'].fillna(''))
+        event = np.searchsorted(self.dates.asi8, pd.DatetimeIndex(out['date']).as_unit('ns').asi8, side='left')
+        # Row 0 has no return, and announcements before the first session land on it
+        ok = (assets >= 0) & (benchmarks >= 0) & (event > 0) & (event < len(self.dates))
+        labels = [window_label(w) for w in self.windows]
+        columns = ['event_date', 'alpha', 'beta', 'obs'] + labels + [f"t {label}" for label in labels]
+        for column in columns:
+            out[column] = np.nan
+        out['event_date'] = pd.NaT
+        if not ok.any():
+            return out
+
+        a, b, e = assets[ok], benchmarks[ok], event[ok]
+        n_dates = len(self.dates)
+        with tracer.span("event_study: run", pairs=len(e), windows=len(self.windows)):
+            # Estimation window [e - gap - L, e - gap)
+            offsets = np.arange(-self.gap - self.estimation_days, -self.gap)
+            rows = e[:, None] + offsets
+            inside = rows >= 0
+            rows = np.clip(rows, 0, n_dates - 1)
+            y, x = self._returns[rows, a[:, None]], self._returns[rows, b[:, None]]
+            valid = inside & np.isfinite(y) & np.isfinite(x)
+            x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+            n = valid.sum(axis=1)
+            sx, sy = x.sum(axis=1), y.sum(axis=1)
+            sxx, sxy = (x * x).sum(axis=1), (x * y).sum(axis=1)
+            var = n * sxx - sx * sx
+            with np.errstate(divide='ignore', invalid='ignore'):
+                beta = (n * sxy - sx * sy) / var
+                alpha = (sy - beta * sx) / n
+                resid = np.where(valid, y - alpha[:, None] - beta[:, None] * x, 0.0)
+                sigma = np.sqrt((resid * resid).sum(axis=1) / (n - 2))
+            fitted = (n >= self.min_obs) & (var > 0)
+            beta[~fitted] = alpha[~fitted] = sigma[~fitted] = np.nan
+
+            # Event window: one gather covering every configured window
+            lo = min(w[0] for w in self.windows)
+            hi = max(w[1] for w in self.windows)
+            rows = e[:, None] + np.arange(lo, hi + 1)
+            inside = (rows >= 0) & (rows < n_dates)
+            rows = np.clip(rows, 0, n_dates - 1)
+            abnormal = self._returns[rows, a[:, None]] - alpha[:, None] - beta[:, None] * self._returns[rows, b[:, None]]
+            present = inside & np.isfinite(abnormal)
+            cum_ar = np.concatenate([np.zeros((len(e), 1)), np.cumsum(np.where(present, abnormal, 0.0), axis=1)], axis=1)
+            cum_days = np.concatenate([np.zeros((len(e), 1)), np.cumsum(present, axis=1)], axis=1)
+            starts = np.array([w[0] for w in self.windows]) - lo
+            ends = np.array([w[1] for w in self.windows]) - lo + 1
+            car = cum_ar[:, ends] - cum_ar[:, starts]
+            days = cum_days[:, ends] - cum_days[:, starts]
+            # Windows that run past the last session (or hit missing prices) are not reported
+            complete = days == (ends - starts)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t_stat = car / (sigma[:, None] * np.sqrt(days))
+            car[~complete] = np.nan
+            t_stat[~complete] = np.nan
+
+        out.loc[ok, 'event_date'] = self.dates[e]
+        out.loc[ok, 'alpha'] = alpha
+        out.loc[ok, 'beta'] = beta
+        out.loc[ok, 'obs'] = n
+        out.loc[ok, labels] = car * 100
+        out.loc[ok, [f"t {label}" for label in labels]] = t_stat
+        return out
+
+    def measure(self, entities):
+        """``run`` for every policy not studied yet (one batch), then the cached rows of all of them
+
+        Results are cached per (policy, date): re-measuring a policy, or a new
+        announcement next to already studied ones, only solves the new pairs.
+        """
+        keys = pd.MultiIndex.from_arrays([entities['policy'], pd.to_datetime(entities['date'])])
+        with self._lock:
+            missing = ~keys.isin(self._keys)
+        if missing.any():
+            fresh = self.run(entities[missing])
+            with self._lock:
+                self._results = pd.concat([self._results, fresh], ignore_index=True)
+                self._keys = pd.MultiIndex.from_arrays([self._results['policy'], self._results['date']])
+        with self._lock:
+            return self._results[self._keys.isin(keys)].reset_index(drop=True)
+
+    def policy_impact(self, policies, entities, window=HEADLINE_WINDOW):
+        """``policies`` with ``impact`` replaced by the mean CAR of their priced stocks
+
+        The original label is kept as ``label``; sector-index CARs are reported
+        alongside, and ``t-stat`` tests the equal-weighted stock CAR.
+        """
+        label = window_label(window)
+        results = self.measure(entities)
+        stocks = results[(results['kind'] == 'stock') & results[label].notna()]
+        sectors = results[(results['kind'] == 'sector') & results[label].notna()]
+        by_policy = stocks.groupby('policy')
+        # Abnormal returns of different stocks treated as independent
+        t_stat = by_policy[f"t {label}"].sum() / np.sqrt(by_policy.size())
+        summary = pd.DataFrame({
+            'car': by_policy[label].mean(),
+            'sector_car': sectors.groupby('policy')[label].mean(),
+            't_stat': t_stat,
+            'priced': by_policy.size()
+        })
+        out = policies.rename(columns={'impact': 'label'}).join(summary, on='policy')
+        out['priced'] = out['priced'].fillna(0).astype(int)
+        out['impact'] = out['car'].map(lambda car: f"{car:+.1f}% {label}" if pd.notna(car) else 'Not measured')
+        return out
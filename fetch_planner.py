@@ -0,0 +1,450 @@
+"""NSE trading-calendar-aware planning of daily price-history fetches
+
+Instead of asking the provider for ``history(period='6mo')`` per ticker on
+every call, ``FetchPlanner``
+
+1. turns the period into the NSE sessions it needs (weekends and exchange
+   holidays are never requested),
+2. diffs each ticker's cached coverage in ``BarCache`` against them,
+3. coalesces the gaps: runs of missing sessions per ticker (merged across a
+   few already-cached sessions), then tickers whose runs start and end within
+   ``max_gap`` sessions of each other share one range request, split into
+   batches of ``batch_size`` tickers,
+4. executes the requests with ``provider.download_range`` and stores the bars
+   with the sessions they now cover.
+
+A session only counts as covered once it has closed; while the market is
+open today's partial bar is refetched at most every ``LIVE_TTL`` seconds.
+Holidays come from ``NSE_HOLIDAYS`` plus the dates listed in
+``NSE_HOLIDAYS_FILE`` (one ISO date per line); a window reaching a year
+neither lists raises a warning, since its holidays would be requested as
+sessions. Providers that record or replay responses (``plannable = False``)
+bypass the planner, so recordings stay keyed by period rather than by dates.
+``report()`` gives planned vs. executed requests and the per-ticker requests
+a blind fetch would have made.
+"""
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import warnings
+import weakref
+import zlib
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_providers import get_provider
+from performance_tracker import tracer
+
+IST = 'Asia/Kolkata'
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+SESSION_CLOSE = pd.Timedelta(hours=15, minutes=30)
+LIVE_TTL = 300
+MAX_GAP = 5
+BATCH_SIZE = 100
+DEFAULT_DB = os.path.join('data', 'bars.db')
+DEFAULT_HOLIDAYS_FILE = os.path.join('data', 'nse_holidays.txt')
+BAR_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits')
+
+# NSE equity segment trading holidays that fall on weekdays; later years go in NSE_HOLIDAYS_FILE
+NSE_HOLIDAYS = (
+    '2024-01-22', '2024-01-26', '2024-03-08', '2024-03-25', '2024-03-29', '2024-04-11', '2024-04-17',
+    '2024-05-01', '2024-05-20', '2024-06-17', '2024-07-17', '2024-08-15', '2024-10-02', '2024-11-01',
+    '2024-11-15', '2024-11-20', '2024-12-25',
+    '2025-02-26', '2025-03-14', '2025-03-31', '2025-04-10', '2025-04-14', '2025-04-18', '2025-05-01',
+    '2025-08-15', '2025-08-27', '2025-10-02', '2025-10-21', '2025-10-22', '2025-11-05', '2025-12-25',
+    '2026-01-15', '2026-01-26', '2026-03-03', '2026-03-26', '2026-03-31', '2026-04-03', '2026-04-14',
+    '2026-05-01', '2026-05-28', '2026-06-26', '2026-09-14', '2026-10-02', '2026-10-20', '2026-11-10',
+    '2026-11-24', '2026-12-25',
+)
+
+
+
+def load_holidays(path=None):
+    """Built-in holidays plus the dates in ``path`` (default ``NSE_HOLIDAYS_FILE``), one per line, '#' comments"""
+    path = path or os.getenv('NSE_HOLIDAYS_FILE', DEFAULT_HOLIDAYS_FILE)
+    holidays = list(NSE_HOLIDAYS)
+    if os.path.exists(path):
+        with open(path) as f:
+            holidays.extend(line.split('#', 1)[0].strip() for line in f)
+    return sorted(set(filter(None, holidays)))
+
+
+FetchRequest = namedtuple('FetchRequest', ['tickers', 'start', 'end', 'sessions'])
+
+
+class NSECalendar:
+    """Trading sessions of the NSE cash market: weekdays minus exchange holidays"""
+
+    def __init__(self, holidays=None):
+        self.holidays = pd.DatetimeIndex(load_holidays() if holidays is None else holidays).as_unit('ns')
+        self._offset = pd.offsets.CustomBusinessDay(holidays=self.holidays)
+        self.years = frozenset(self.holidays.year)
+        self._warned = set()
+
+    def covers(self, day):
+        """Whether the holidays of ``day``'s year are known"""
+        return pd.Timestamp(day).year in self.years
+
+    def sessions(self, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        unknown = set(range(start.year, end.year + 1)) - self.years - self._warned
+        if unknown:
+            self._warned |= unknown
+            warnings.warn(f"NSE holiday calendar has no dates for {', '.join(map(str, sorted(unknown)))}; "
+                          f"their holidays are treated as sessions (add them to NSE_HOLIDAYS_FILE)", stacklevel=2)
+        return pd.date_range(start, end, freq=self._offset, name='Date').as_unit('ns')
+
+    def is_session(self, day):
+        day = pd.Timestamp(day).normalize()
+        return day.weekday() < 5 and day not in self.holidays
+
+    def previous_session(self, day):
+        """Last session strictly before ``day``"""
+        return pd.Timestamp(day).normalize() - self._offset
+
+    def now(self):
+        return pd.Timestamp.now(tz=IST).tz_localize(None)
+
+    def is_open(self, now=None):
+        now = self.now() if now is None else pd.Timestamp(now)
+        since_midnight = now - now.normalize()
+        return self.is_session(now) and SESSION_OPEN <= since_midnight < SESSION_CLOSE
+
+    def last_complete(self, now=None):
+        """Most recent session that has closed"""
+        now = self.now() if now is None else pd.Timestamp(now)
+        today = now.normalize()
+        if self.is_session(today) and now - today >= SESSION_CLOSE:
+            return today
+        return self.previous_session(today)
+
+    def window(self, period, now=None):
+        """Sessions a yfinance-style ``period`` covers, ending today if the market has opened
+
+        ``None`` for periods that cannot be expressed as a date range ('max').
+        """
+        now = self.now() if now is None else pd.Timestamp(now)
+        today = now.normalize()
+        end = today if self.is_session(today) and now - today >= SESSION_OPEN else self.previous_session(today)
+        if period == 'ytd':
+            return self.sessions(today.replace(month=1, day=1), end)
+        match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period or '')
+        if not match:
+            return None
+        n, unit = int(match.group(1)), match.group(2)
+        if unit == 'd':
+            return self.sessions(end - pd.Timedelta(days=2 * n + 14), end)[-n:]
+        offset = {'wk': pd.DateOffset(weeks=n), 'mo': pd.DateOffset(months=n), 'y': pd.DateOffset(years=n)}[unit]
+        return self.sessions(today - offset, end)
+
+
+class BarCache:
+    """SQLite table of raw daily bars, one compressed frame per ticker plus the date ranges it covers"""
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('BAR_CACHE_DB', DEFAULT_DB)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._entries = {}  # ticker -> (bars, [(first, last), ...]), loaded on first use
+        with self._connection() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS bars (
+                ticker TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                coverage TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )""")
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+    def _load(self, tickers):
+        """Read the tickers not in memory yet with one query per 500"""
+        with self._lock:
+            missing = [t for t in dict.fromkeys(tickers) if t not in self._entries]
+        loaded = {t: (_EMPTY_BARS, []) for t in missing}
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            rows = self._connection().execute(
+                f"SELECT ticker, payload, coverage FROM bars WHERE ticker IN ({','.join('?' * len(chunk))})",
+                chunk).fetchall()
+            for ticker, payload, coverage in rows:
+                loaded[ticker] = (pickle.loads(zlib.decompress(payload)),
+                                  [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in json.loads(coverage)])
+        with self._lock:
+            for ticker, entry in loaded.items():
+                self._entries.setdefault(ticker, entry)
+            return {t: self._entries[t] for t in tickers}
+
+    def covered(self, tickers, sessions):
+        """Boolean (len(sessions) x len(tickers)) mask of sessions already cached"""
+        entries = self._load(tickers)
+        values = sessions.asi8
+        mask = np.zeros((len(sessions), len(tickers)), dtype=bool)
+        for j, ticker in enumerate(tickers):
+            for first, last in entries[ticker][1]:
+                mask[values.searchsorted(first.value, 'left'):values.searchsorted(last.value, 'right'), j] = True
+        return mask
+
+    def bars(self, ticker, start=None, end=None):
+        """Cached bars of ``ticker`` between ``start`` and ``end`` (inclusive)"""
+        frame = self._load([ticker])[ticker][0]
+        return frame.loc[start:end].copy()
+
+    def store(self, items):
+        """Merge ``(ticker, bars, first, last)`` items; ``first``/``last`` is the date range now covered (or None)"""
+        entries = self._load([item[0] for item in items])
+        rows, updated = [], {}
+        stamp = datetime.now().isoformat(timespec='seconds')
+        for ticker, bars, first, last in items:
+            frame, ranges = entries[ticker]
+            if len(bars) and len(frame):
+                frame = pd.concat([frame[~frame.index.isin(bars.index)], bars]).sort_index()
+            elif len(bars):
+                frame = bars.sort_index()
+            if first is not None and last is not None and first <= last:
+                ranges = _merge_ranges(ranges + [(first, last)])
+            updated[ticker] = (frame, ranges)
+            rows.append((ticker, zlib.compress(pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)),
+                         json.dumps([[a.isoformat(), b.isoformat()] for a, b in ranges]), stamp))
+        with self._connection() as conn:
+            conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?)", rows)
+        with self._lock:
+            self._entries.update(updated)
+
+    def tickers(self):
+        return [r[0] for r in self._connection().execute("SELECT ticker FROM bars ORDER BY ticker").fetchall()]
+
+
+def _empty_bars():
+    return _EMPTY_BARS.copy()
+
+
+_EMPTY_BARS = pd.DataFrame({c: np.zeros(0) for c in BAR_COLUMNS}, index=pd.DatetimeIndex([], name='Date').as_unit('ns'))
+
+
+def _merge_ranges(ranges):
+    """Union of date ranges; ranges that touch (next day) are joined"""
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + pd.Timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def _split_download(data, tickers):
+    """Per-ticker ``BAR_COLUMNS`` frames (naive dates, rows with a close) from a batched (field, ticker) download"""
+    if not isinstance(data.columns, pd.MultiIndex):  # older yfinance flattens a single ticker
+        data = pd.concat({tickers[0]: data}, axis=1).swaplevel(axis=1) if len(tickers) == 1 else pd.DataFrame()
+    if data.empty or 'Close' not in data.columns.get_level_values(0):
+        return {ticker: _empty_bars() for ticker in tickers}
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None:
+        index = index.tz_convert(IST).tz_localize(None)
+    index = index.normalize().as_unit('ns').rename('Date')
+    present = set(data.columns.get_level_values(1))
+    fields = {}
+    for field in BAR_COLUMNS:
+        frame = data[field] if field in data.columns.get_level_values(0) else pd.DataFrame(index=data.index)
+        fields[field] = frame.reindex(columns=tickers).to_numpy(dtype=float)
+    out = {}
+    for j, ticker in enumerate(tickers):
+        if ticker not in present:
+            out[ticker] = _empty_bars()
+            continue
+        rows = ~np.isnan(fields['Close'][:, j])
+        columns = {field: values[rows, j] for field, values in fields.items()}
+        for field in ('Dividends', 'Stock Splits'):
+            columns[field] = np.nan_to_num(columns[field])
+        out[ticker] = pd.DataFrame(columns, index=index[rows])
+    return out
+
+
+class FetchPlanner:
+    """Coalesces the sessions missing from ``BarCache`` into few batched range requests"""
+
+    def __init__(self, provider=None, cache=None, calendar=None, max_gap=MAX_GAP, batch_size=BATCH_SIZE):
+        self.provider = provider or get_provider()
+        self.cache = cache or get_bar_cache()
+        self.calendar = calendar or NSECalendar()
+        self.max_gap = max_gap
+        self.batch_size = batch_size
+        self._live = {}  # ticker -> monotonic time today's partial bar was fetched
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stats = dict.fromkeys(('calls', 'blind', 'planned', 'executed', 'failed', 'unplanned',
+                                        'ticker_sessions', 'skipped_days'), 0)
+
+    def _count(self, **counts):
+        with self._lock:
+            for key, n in counts.items():
+                self.stats[key] += n
+
+    def plan(self, tickers, sessions, now=None):
+        """Range requests that fill every session of ``sessions`` missing for ``tickers``"""
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers or not len(sessions):
+            return []
+        now = self.calendar.now() if now is None else pd.Timestamp(now)
+        missing = ~self.cache.covered(tickers, sessions)
+        if sessions[-1] > self.calendar.last_complete(now):  # today's session is still trading
+            clock = time.monotonic()
+            with self._lock:
+                fresh = [clock - self._live.get(t, -np.inf) < LIVE_TTL for t in tickers]
+            missing[-1, fresh] = False
+
+        runs = {}
+        for j, ticker in enumerate(tickers):
+            idx = np.flatnonzero(missing[:, j])
+            if not len(idx):
+                continue
+            # Refetching up to max_gap cached sessions is cheaper than another request
+            breaks = np.flatnonzero(np.diff(idx) > self.max_gap + 1)
+            for lo, hi in zip(idx[np.r_[0, breaks + 1]], idx[np.r_[breaks, len(idx) - 1]]):
+                runs.setdefault((int(lo), int(hi)), []).append(ticker)
+
+        # Tickers whose runs start and end within max_gap sessions of each other share one range
+        groups = []  # [lo, hi, latest member start, earliest member end, tickers]
+        for (lo, hi), members in sorted(runs.items()):
+            if groups:
+                group = groups[-1]
+                start, end = min(group[0], lo), max(group[1], hi)
+                if max(group[2], lo) - start <= self.max_gap and end - min(group[3], hi) <= self.max_gap:
+                    group[:4] = start, end, max(group[2], lo), min(group[3], hi)
+                    group[4].extend(members)
+                    continue
+            groups.append([lo, hi, lo, hi, list(members)])
+
+        requests = [FetchRequest(tuple(members[i:i + self.batch_size]), sessions[lo], sessions[hi], hi - lo + 1)
+                    for lo, hi, _, _, members in groups for i in range(0, len(members), self.batch_size)]
+        calendar_days = (sessions[-1] - sessions[0]).days + 1
+        self._count(calls=1, blind=len(tickers), planned=len(requests),
+                    ticker_sessions=sum(len(r.tickers) * r.sessions for r in requests),
+                    skipped_days=calendar_days - len(sessions))
+        return requests
+
+    def execute(self, requests, now=None):
+        """Run planned requests and cache what they return; returns the number that succeeded"""
+        now = self.calendar.now() if now is None else pd.Timestamp(now)
+        last_complete = self.calendar.last_complete(now)
+        executed = 0
+        for request in requests:
+            with tracer.span("fetch_planner: request", tickers=len(request.tickers), sessions=request.sessions):
+                try:
+                    # yfinance treats ``end`` as exclusive
+                    data = self.provider.download_range(list(request.tickers), request.start,
+                                                        request.end + pd.Timedelta(days=1))
+                    bars = _split_download(data, list(request.tickers))
+                except Exception:
+                    bars = {}
+                if not any(len(b) for b in bars.values()):
+                    # yfinance answers a failed download with an empty frame: never cache that as coverage
+                    self._count(failed=1)
+                    continue
+                # Coverage runs from the day after the previous session, so adjacent ranges merge
+                first = self.calendar.previous_session(request.start) + pd.Timedelta(days=1)
+                last = min(request.end, last_complete)
+                # A ticker missing from a batch (delisted, bad symbol) is retried next time, not cached as covered
+                returned = [t for t in request.tickers if len(bars.get(t, ()))]
+                self.cache.store([(t, bars[t], first, last) for t in returned])
+                if request.end > last_complete:
+                    clock = time.monotonic()
+                    with self._lock:
+                        self._live.update(dict.fromkeys(returned, clock))
+            executed += 1
+        self._count(executed=executed)
+        return executed
+
+    def fetch(self, tickers, period='6mo', now=None):
+        """Bring the cache up to date for ``period``; the sessions it covers, or None if it cannot be planned"""
+        if not getattr(self.provider, 'plannable', True):
+            return None
+        sessions = self.calendar.window(period, now)
+        if sessions is None:
+            return None
+        with tracer.span("fetch_planner: fetch", tickers=len(tickers), period=period):
+            self.execute(self.plan(tickers, sessions, now), now)
+        return sessions
+
+    def histories(self, tickers, period='6mo', now=None):
+        """Raw daily bars per ticker for ``period`` (unplannable periods go straight to the provider)"""
+        tickers = list(dict.fromkeys(tickers))
+        sessions = self.fetch(tickers, period, now)
+        if sessions is None:
+            self._count(unplanned=len(tickers))
+            out = {}
+            for ticker in tickers:
+                try:
+                    out[ticker] = self.provider.history(ticker, period=period)
+                except Exception:
+                    out[ticker] = _empty_bars()
+            return out
+        if not len(sessions):
+            return {ticker: _empty_bars() for ticker in tickers}
+        return {ticker: self.cache.bars(ticker, sessions[0], sessions[-1]) for ticker in tickers}
+
+    def matrix(self, tickers, period='1y', fields=('High', 'Low', 'Close'), now=None):
+        """Wide (sessions x tickers) frame per field from the cache, or None if ``period``/``fields`` can't be planned"""
+        if any(field not in BAR_COLUMNS for field in fields):
+            return None
+        tickers = list(dict.fromkeys(tickers))
+        sessions = self.fetch(tickers, period, now)
+        if sessions is None:
+            return None
+        values = {field: np.full((len(sessions), len(tickers)), np.nan) for field in fields}
+        for j, ticker in enumerate(tickers):
+            frame = self.cache.bars(ticker, sessions[0], sessions[-1]) if len(sessions) else _empty_bars()
+            rows = sessions.get_indexer(frame.index)
+            keep = rows >= 0  # bars on non-session days are dropped
+            for field in fields:
+                values[field][rows[keep], j] = frame[field].to_numpy()[keep]
+        return {field: pd.DataFrame(values[field], index=sessions, columns=tickers).dropna(how='all')
+                for field in fields}
+
+    def report(self):
+        """Counters since the last reset: ``blind`` is the per-ticker requests a blind fetch would make"""
+        with self._lock:
+            return dict(self.stats)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_planners = weakref.WeakKeyDictionary()
+
+
+def get_bar_cache():
+    """Process-wide cache at ``BAR_CACHE_DB``"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = BarCache()
+        return _cache
+
+
+def get_fetch_planner(provider=None):
+    """One planner per provider (the default provider unless given), sharing the process-wide cache"""
+    provider = provider or get_provider()
+    with _cache_lock:
+        planner = _planners.get(provider)
+    if planner is None:
+        planner = FetchPlanner(provider)
+        with _cache_lock:
+            planner = _planners.setdefault(provider, planner)
+    return planner
@@ -1,9 +1,19 @@
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+from memory_layout import compact_frame
+from performance_tracker import tracer
+from chart_cache import chart_cache
+from table_styles import show_table, LEVEL_STYLES
+from snapshot_store import versioned
+from fund_holdings import get_fund_holdings
 
-def get_top_equity_funds():
-    """Returns top performing equity funds data"""
+@tracer.traced('get_top_equity_funds')
+def get_top_equity_funds(compact=False):
+    """Returns top performing equity funds data
+    
+    compact=True stores Category/Risk Level as categoricals and returns as float32.
+    """
     funds_data = {
         'Fund Name': [
             'Axis Bluechip Fund', 'Mirae Asset Large Cap', 'ICICI Pru Bluechip',
@@ -27,13 +37,22 @@ def get_top_equity_funds():
         ],
         'Min Investment': [500, 1000, 1000, 500, 1000, 1000, 500, 1000, 1000, 500, 1000, 1000]
     }
-    return pd.DataFrame(funds_data)
+    df = pd.DataFrame(funds_data)
+    if compact:
+        df = compact_frame(df, categorical=['Category', 'Risk Level'],
+                           float32=['1Y Return (%)', '3Y Return (%)'])
+    return df
+
+@tracer.traced('display_fund_analysis')
+def display_fund_analysis(as_of=None):
+    """Display fund analysis in Streamlit; ``as_of`` shows the fund table recorded at that date
 
-def display_fund_analysis():
-    """Display fund analysis in Streamlit"""
+    Returns the datasets that had nothing recorded by ``as_of`` and were shown live.
+    """
     st.header("🏆 Top Equity Funds Analysis")
     
-    df = get_top_equity_funds()
+    funds = versioned('equity_funds', lambda: get_top_equity_funds(compact=True), as_of)
+    df = funds.value
     
     # Filter options
     col1, col2 = st.columns(2)
@@ -50,14 +69,15 @@ def display_fund_analysis():
         filtered_df = filtered_df[filtered_df['Risk Level'] == risk_filter]
     
     # Display table
-    st.dataframe(filtered_df, use_container_width=True)
+    show_table(filtered_df, {'Risk Level': LEVEL_STYLES}, hide_index=False)
     
     # Returns chart
-    fig = px.scatter(filtered_df, x='1Y Return (%)', y='3Y Return (%)', 
-                     color='Category', size='Min Investment',
-                     hover_data=['Fund Name', 'Risk Level'],
-                     title="Fund Returns Comparison")
-    st.plotly_chart(fig, use_container_width=True)
+    with tracer.span("figure: fund_returns"):
+        fig = chart_cache.figure("fund_returns", px.scatter, filtered_df, x='1Y Return (%)', y='3Y Return (%)', 
+                                 color='Category', size='Min Investment',
+                                 hover_data=['Fund Name', 'Risk Level'],
+                                 title="Fund Returns Comparison")
+        st.plotly_chart(fig, use_container_width=True)
     
     # Top picks by category
     st.subheader("📈 Top Picks by Category")
@@ -65,6 +85,51 @@ def display_fund_analysis():
         cat_funds = filtered_df[filtered_df['Category'] == category]
         top_fund = cat_funds.loc[cat_funds['3Y Return (%)'].idxmax()]
         st.write(f"**{category}**: {top_fund['Fund Name']} ({top_fund['3Y Return (%)']}% 3Y return)")
+    
+    display_holdings_overlap(as_of)
+    return [funds.name] if funds.live else []
+
+def display_holdings_overlap(as_of=None):
+    """Overlap heatmap and diversification score for a user-selected set of funds"""
+    st.subheader("🔗 Portfolio Overlap")
+    store = get_fund_holdings()
+    months = store.months()
+    if as_of is not None:
+        months = [m for m in months if m <= pd.Timestamp(as_of).strftime('%Y-%m')]
+        if not months:
+            st.info(f"No holdings disclosure exists as of {pd.Timestamp(as_of):%d %b %Y}.")
+            return
+    month = st.selectbox("Disclosure month", months[::-1])
+    holdings = store.month(month)
+    funds = st.multiselect("Funds to compare", list(holdings.funds), default=list(holdings.funds[:2]))
+    if len(funds) < 2:
+        st.info("Select at least two funds to compare their holdings.")
+        return
+    
+    overlap = holdings.common_weight(funds)
+    diversification = holdings.diversification(funds)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Diversification Score", f"{diversification['score']:.0f}/100")
+    with col2:
+        st.metric("Average Overlap", f"{diversification['mean_overlap']:.1f}%")
+    with col3:
+        st.metric("Effective Stocks", f"{diversification['effective_stocks']:.1f}",
+                  f"{diversification['distinct_stocks']} distinct", delta_color="off")
+    
+    with tracer.span("figure: fund_overlap", funds=len(funds)):
+        fig = chart_cache.figure("fund_overlap", px.imshow, overlap.round(1), text_auto=True, aspect='auto',
+                                 color_continuous_scale='Reds', zmin=0, zmax=100,
+                                 title="Common holdings (% of NAV held in both funds)")
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Overlap = sum of the smaller weight in every stock both funds hold | {month} disclosures of "
+               f"{len(holdings.funds):,} funds | diversification score = 100 - average overlap")
+    
+    # Closest funds across the whole universe from the cached cosine similarity
+    similar = pd.DataFrame([{'Fund': fund, 'Most Similar': other, 'Cosine': round(score, 2)}
+                            for fund in funds for other, score in holdings.similar(fund, top=3).items()])
+    with st.expander("Most similar funds in the universe"):
+        st.dataframe(similar, use_container_width=True, hide_index=True)
 
 def get_fund_recommendations(budget_sectors):
     """Get fund recommendations based on budget analysis"""
@@ -0,0 +1,268 @@
+"""Fund portfolio disclosures as a sparse fund x stock weight matrix
+
+AMCs publish every scheme's holdings once a month. ``FundHoldings.month(m)``
+loads one disclosure, ``HOLDINGS_DIR/<YYYY-MM>.csv`` (default
+``data/holdings``), with columns 'Fund Name', 'Stock', 'Weight (%)' and
+optionally 'ISIN'. Each disclosure becomes a CSR matrix ``W`` of weights as
+fractions of NAV. Stocks are keyed by ISIN when a row gives one. Otherwise they
+are keyed by the NSE ticker from the entity resolver, so 'HDFC Bank Ltd.'
+and 'HDFC Bank' share a column. Without a disclosure file, the bundled
+sample for the funds in ``get_top_equity_funds`` is used.
+
+Overlap across the whole universe comes from the Gram matrix ``G = W W'``.
+That is one sparse product per month, cached with the month:
+
+    cosine(i, j)  = G_ij / sqrt(G_ii G_jj)
+    jaccard(i, j) = G_ij / (G_ii + G_jj - G_ij)   extended (Tanimoto) Jaccard
+
+For a selected handful of funds, the common weight ``sum_s min(w_is, w_js)``
+is computed exactly from the dense rows. This is the "portfolio overlap %"
+that fund trackers quote.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from performance_tracker import tracer
+
+DEFAULT_DIR = os.path.join('data', 'holdings')
+SAMPLE_MONTH = '2026-09'
+METRICS = ('cosine', 'jaccard')
+
+# Top holdings (% of NAV) of the funds in ``get_top_equity_funds``
+SAMPLE_HOLDINGS = {
+    'Axis Bluechip Fund': [
+        ('HDFC Bank', 9.8), ('ICICI Bank', 8.9), ('Reliance Industries', 6.1), ('Infosys', 5.4),
+        ('Bharti Airtel', 4.6), ('Larsen & Toubro', 4.2), ('Bajaj Finance', 4.0), ('TCS', 3.8),
+        ('Kotak Mahindra Bank', 3.1), ('Mahindra & Mahindra', 2.9), ('Avenue Supermarts', 2.6),
+        ('Sun Pharmaceutical', 2.4), ('UltraTech Cement', 2.1), ('Cholamandalam Investment', 1.9)],
+    'Mirae Asset Large Cap': [
+        ('HDFC Bank', 9.6), ('ICICI Bank', 8.1), ('Infosys', 5.8), ('Reliance Industries', 5.7),
+        ('Larsen & Toubro', 4.3), ('Bharti Airtel', 4.1), ('Axis Bank', 3.9), ('TCS', 3.5),
+        ('State Bank of India', 3.2), ('Kotak Mahindra Bank', 2.8), ('ITC', 2.7), ('Mahindra & Mahindra', 2.5),
+        ('Sun Pharmaceutical', 2.2), ('Maruti Suzuki', 1.8)],
+    'ICICI Pru Bluechip': [
+        ('ICICI Bank', 9.1), ('HDFC Bank', 8.4), ('Larsen & Toubro', 5.9), ('Reliance Industries', 5.2),
+        ('Bharti Airtel', 4.4), ('Maruti Suzuki', 4.1), ('Infosys', 3.9), ('Axis Bank', 3.7),
+        ('UltraTech Cement', 3.0), ('Sun Pharmaceutical', 2.8), ('NTPC', 2.6), ('Hindustan Unilever', 2.3),
+        ('Oil and Natural Gas Corporation', 2.0), ('Avenue Supermarts', 1.7)],
+    'Axis Midcap Fund': [
+        ('Cholamandalam Investment', 3.6), ('Persistent Systems', 3.3), ('Trent', 3.1), ('Coforge', 2.9),
+        ('Indian Hotels', 2.8), ('Max Healthcare', 2.6), ('Federal Bank', 2.5), ('PB Fintech', 2.3),
+        ('Supreme Industries', 2.2), ('Dixon Technologies', 2.1), ('Tube Investments', 2.0), ('Solar Industries', 1.9),
+        ('Phoenix Mills', 1.8), ('AU Small Finance Bank', 1.6), ('Bharat Electronics', 1.5)],
+    'DSP Midcap Fund': [
+        ('Federal Bank', 3.9), ('Coforge', 3.4), ('Max Healthcare', 3.2), ('Ipca Laboratories', 3.0),
+        ('Supreme Industries', 2.8), ('Indian Hotels', 2.6), ('Cholamandalam Investment', 2.4), ('Voltas', 2.3),
+        ('Phoenix Mills', 2.1), ('Alkem Laboratories', 2.0), ('Coromandel International', 1.9),
+        ('AU Small Finance Bank', 1.8), ('Balkrishna Industries', 1.6), ('Emami', 1.5)],
+    'Kotak Emerging Equity': [
+        ('Persistent Systems', 3.5), ('Supreme Industries', 3.3), ('Cummins India', 3.1), ('Oberoi Realty', 2.8),
+        ('Coforge', 2.7), ('Dixon Technologies', 2.6), ('Federal Bank', 2.4), ('Solar Industries', 2.3),
+        ('Max Healthcare', 2.1), ('Schaeffler India', 2.0), ('Thermax', 1.9), ('Trent', 1.8),
+        ('Indian Hotels', 1.7), ('Bharat Forge', 1.6)],
+    'Axis Small Cap Fund': [
+        ('Multi Commodity Exchange', 3.1), ('Kaynes Technology', 2.9), ('Krishna Institute of Medical Sciences', 2.7),
+        ('Brigade Enterprises', 2.5), ('Blue Star', 2.4), ('CCL Products', 2.2), ('Karur Vysya Bank', 2.1),
+        ('Apar Industries', 2.0), ('Cyient', 1.9), ('Navin Fluorine', 1.8), ('Century Plyboards', 1.7),
+        ('Techno Electric', 1.6), ('Sobha', 1.5), ('Aster DM Healthcare', 1.4)],
+    'SBI Small Cap Fund': [
+        ('Blue Star', 3.4), ('Chalet Hotels', 3.1), ('Karur Vysya Bank', 2.9), ('Kalpataru Projects', 2.7),
+        ('Finolex Industries', 2.5), ('Krishna Institute of Medical Sciences', 2.3), ('Navin Fluorine', 2.2),
+        ('City Union Bank', 2.1), ('Elgi Equipments', 2.0), ('Carborundum Universal', 1.9), ('Sobha', 1.8),
+        ('Century Plyboards', 1.7), ('Triveni Turbine', 1.6), ('CCL Products', 1.5)],
+    'Nippon Small Cap': [
+        ('Multi Commodity Exchange', 2.6), ('Tube Investments', 2.3), ('Karur Vysya Bank', 2.1), ('Apar Industries', 2.0),
+        ('Kaynes Technology', 1.9), ('Dixon Technologies', 1.8), ('Voltamp Transformers', 1.7), ('Elgi Equipments', 1.6),
+        ('Cyient', 1.5), ('Techno Electric', 1.4), ('Blue Star', 1.3), ('Brigade Enterprises', 1.2),
+        ('Tejas Networks', 1.1), ('Zydus Wellness', 1.0)],
+    'ICICI Pru Technology': [
+        ('Infosys', 22.4), ('TCS', 11.6), ('HCL Technologies', 9.2), ('Bharti Airtel', 8.1), ('Tech Mahindra', 6.5),
+        ('LTIMindtree', 5.2), ('Wipro', 4.4), ('Persistent Systems', 3.9), ('Coforge', 3.1), ('Zomato', 2.8),
+        ('Info Edge', 2.4), ('Cyient', 1.6)],
+    'SBI Healthcare Opp': [
+        ('Sun Pharmaceutical', 12.8), ("Dr Reddy's Laboratories", 7.4), ('Max Healthcare', 6.9), ('Cipla', 6.2),
+        ('Lupin', 5.5), ('Divis Laboratories', 5.1), ('Apollo Hospitals', 4.8), ('Ipca Laboratories', 4.1),
+        ('Alkem Laboratories', 3.6), ('Krishna Institute of Medical Sciences', 3.2), ('Mankind Pharma', 2.9),
+        ('Aster DM Healthcare', 2.3)],
+    'Mirae Infrastructure': [
+        ('Larsen & Toubro', 9.4), ('Reliance Industries', 7.2), ('NTPC', 6.1), ('Bharti Airtel', 5.9),
+        ('Power Grid', 4.8), ('UltraTech Cement', 4.2), ('Adani Ports', 3.7), ('Bharat Electronics', 3.5),
+        ('Siemens', 3.1), ('ABB India', 2.8), ('Cummins India', 2.6), ('Kalpataru Projects', 2.3),
+        ('Apar Industries', 2.0), ('Kaynes Technology', 1.8)],
+}
+
+
+def sample_disclosure():
+    """The bundled disclosure as a frame shaped like a ``HOLDINGS_DIR`` file"""
+    return pd.DataFrame([(fund, stock, weight) for fund, holdings in SAMPLE_HOLDINGS.items()
+                         for stock, weight in holdings], columns=['Fund Name', 'Stock', 'Weight (%)'])
+
+
+class HoldingsMonth:
+    """One disclosure month: CSR weights (funds x stocks) and the lazily computed Gram matrix"""
+
+    def __init__(self, month, funds, stocks, weights):
+        self.month = month
+        self.funds = pd.Index(funds)
+        self.stocks = pd.Index(stocks)  # display name per column
+        self.weights = weights.tocsr()
+        self._gram = None
+        self._overlap = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, month, frame, resolver=None):
+        """Build from disclosure rows; repeated (fund, stock) rows are summed"""
+        names = frame['Stock'].astype(str).str.strip()
+        keys = pd.Series(np.nan, index=frame.index, dtype=object)
+        if 'ISIN' in frame.columns:
+            keys = frame['ISIN'].where(frame['ISIN'].notna()).astype(object).str.strip().replace('', np.nan)
+        # Rows without an ISIN are keyed by name, never lumped together under a missing ISIN
+        missing = keys.isna()
+        if missing.any():
+            keys[missing] = _stock_keys(names[missing], resolver)
+        funds, fund_names = pd.factorize(frame['Fund Name'].astype(str).str.strip())
+        stocks, stock_keys = pd.factorize(keys)
+        weights = sparse.csr_matrix((frame['Weight (%)'].to_numpy(dtype=float) / 100, (funds, stocks)),
+                                    shape=(len(fund_names), len(stock_keys)))
+        # First disclosed name for each stock column
+        labels = names.groupby(stocks, sort=True).first().to_numpy()
+        return cls(month, fund_names, labels, weights)
+
+    def gram(self):
+        """``W W'``: one sparse product, computed once per month"""
+        with self._lock:
+            if self._gram is None:
+                with tracer.span("fund_holdings: gram", funds=len(self.funds), holdings=self.weights.nnz):
+                    self._gram = (self.weights @ self.weights.T).tocsr()
+            return self._gram
+
+    def overlap(self, metric='cosine'):
+        """Sparse funds x funds similarity (zero where two funds share no stock), cached per metric"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown overlap metric '{metric}', expected one of {list(METRICS)}")
+        with self._lock:
+            cached = self._overlap.get(metric)
+        if cached is not None:
+            return cached
+        gram = self.gram()
+        norms = gram.diagonal()
+        rows = np.repeat(np.arange(gram.shape[0]), np.diff(gram.indptr))
+        if metric == 'cosine':
+            denominator = np.sqrt(norms[rows] * norms[gram.indices])
+        else:
+            denominator = norms[rows] + norms[gram.indices] - gram.data
+        values = np.divide(gram.data, denominator, out=np.zeros_like(gram.data), where=denominator > 0)
+        result = sparse.csr_matrix((values, gram.indices, gram.indptr), shape=gram.shape)
+        with self._lock:
+            self._overlap[metric] = result
+        return result
+
+    def similar(self, fund, metric='cosine', top=5):
+        """The ``top`` funds in the whole universe most similar to ``fund``"""
+        row = self.overlap(metric)[self.funds.get_loc(fund)].tocoo()
+        scores = pd.Series(row.data, index=self.funds[row.col], name=metric).drop(fund, errors='ignore')
+        return scores.nlargest(top)
+
+    def _rows(self, funds):
+        return self.weights[self.funds.get_indexer(funds)].toarray()
+
+    def common_weight(self, funds):
+        """Exact pairwise overlap % (sum of the smaller weight in every shared stock) for selected funds"""
+        rows = self._rows(funds)
+        common = np.minimum(rows[:, None, :], rows[None, :, :]).sum(axis=2)
+        return pd.DataFrame(common * 100, index=funds, columns=funds)
+
+    def combined(self, funds, allocation=None):
+        """Look-through stock weights (fractions of the invested amount) of a mix of funds"""
+        allocation = np.ones(len(funds)) if allocation is None else np.asarray(allocation, dtype=float)
+        look_through = (allocation / allocation.sum()) @ self._rows(funds)
+        return pd.Series(look_through, index=self.stocks).loc[lambda s: s > 0].sort_values(ascending=False)
+
+    def diversification(self, funds, allocation=None):
+        """Diversification of a mix of funds
+
+        ``score`` is 100 x (1 - mean pairwise common weight): 100 when the funds
+        share no stock, 0 when they hold the same portfolio. ``effective_stocks``
+        is the inverse Herfindahl index of the combined look-through weights.
+        """
+        look_through = self.combined(funds, allocation)
+        shares = look_through / look_through.sum() if len(look_through) else look_through
+        common = self.common_weight(funds).to_numpy() / 100
+        pairs = common[np.triu_indices(len(funds), k=1)]
+        return {'score': 100 * (1 - pairs.mean()) if len(pairs) else np.nan,
+                'mean_overlap': pairs.mean() * 100 if len(pairs) else np.nan,
+                'effective_stocks': 1 / (shares ** 2).sum() if len(shares) else 0.0,
+                'distinct_stocks': len(look_through)}
+
+
+def _stock_keys(names, resolver=None):
+    """NSE ticker for names the resolver matches exactly or by prefix, else the name itself
+
+    Fuzzy matches are left out: merging two different small caps would
+    overstate overlap.
+    """
+    if resolver is None:
+        from entity_resolver import get_resolver
+        resolver = get_resolver()
+    codes, uniques = pd.factorize(names)
+    keys = []
+    for name in uniques:
+        match = resolver.match(name)
+        keys.append(match.ticker if match.method in ('exact', 'prefix') else name)
+    return pd.Series(np.array(keys + [None], dtype=object)[codes], index=names.index)
+
+
+class FundHoldings:
+    """Monthly disclosures under ``HOLDINGS_DIR``, parsed once per month and file version"""
+
+    def __init__(self, root=None, resolver=None):
+        self.root = root or os.getenv('HOLDINGS_DIR', DEFAULT_DIR)
+        self.resolver = resolver
+        self._months = {}  # month -> (file mtime, HoldingsMonth)
+        self._lock = threading.Lock()
+
+    def _path(self, month):
+        return os.path.join(self.root, f"{month}.csv")
+
+    def months(self):
+        """Disclosure months on disk, plus the bundled sample month, oldest first"""
+        found = set()
+        if os.path.isdir(self.root):
+            found = {f[:-4] for f in os.listdir(self.root) if f.endswith('.csv')}
+        return sorted(found | {SAMPLE_MONTH})
+
+    def month(self, month=None):
+        """``HoldingsMonth`` for ``month`` (latest by default); re-read only when its file changes"""
+        month = month or self.months()[-1]
+        path = self._path(month)
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        with self._lock:
+            cached = self._months.get(month)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        if mtime is None and month != SAMPLE_MONTH:
+            raise KeyError(f"no holdings disclosure for {month} in {self.root}")
+        with tracer.span("fund_holdings: load", month=month):
+            frame = pd.read_csv(path) if mtime is not None else sample_disclosure()
+            holdings = HoldingsMonth.from_frame(month, frame, self.resolver)
+        with self._lock:
+            self._months[month] = (mtime, holdings)
+        return holdings
+
+
+_holdings = None
+_holdings_lock = threading.Lock()
+
+
+def get_fund_holdings():
+    """Process-wide disclosures at ``HOLDINGS_DIR``"""
+    global _holdings
+    with _holdings_lock:
+        if _holdings is None:
+            _holdings = FundHoldings()
+        return _holdings
@@ -1,14 +1,25 @@
 import pandas as pd
 from datetime import datetime
+from event_ingestion import get_ingestor, TIMELINES
+from performance_tracker import tracer
+from snapshot_store import versioned
 
+ALERT_ICONS = {'Critical': '🚨', 'Very High': '⚠️', 'High': '📈'}
+
+@tracer.instrument
 class GlobalImpactAnalyzer:
     """Analyze global events and their impact on Indian stocks"""
     
-    def __init__(self):
-        self.commodity_map = self.load_commodity_dependencies()
-        self.global_events = self.load_recent_events()
+    def __init__(self, as_of=None):
+        """``as_of`` loads the commodity map and events recorded at that date instead of live ones"""
+        commodity_map = versioned('commodity_map', self.load_commodity_dependencies, as_of)
+        global_events = versioned('global_events', self.load_recent_events, as_of)
+        self.commodity_map, self.global_events = commodity_map.value, global_events.value
+        # Datasets with nothing recorded by ``as_of``, shown live
+        self.live_datasets = [r.name for r in (commodity_map, global_events) if r.live]
     
-    def load_commodity_dependencies(self):
+    @staticmethod
+    def load_commodity_dependencies():
         """Map commodities to dependent sectors and substitutes"""
         return {
             'Cobalt': {
@@ -85,7 +96,14 @@ class GlobalImpactAnalyzer:
         }
     
     def load_recent_events(self):
-        """Load recent global events affecting supply chains"""
+        """Built-in events plus anything new from the ``EVENT_FEED`` sources, newest first"""
+        ingestor = event_ingestor()
+        ingestor.poll()
+        return ingestor.events()
+    
+    @staticmethod
+    def builtin_events():
+        """Curated global events affecting supply chains"""
         return [
             {
                 'date': '2025-01-15',
@@ -253,30 +271,87 @@ class GlobalImpactAnalyzer:
                 })
         
         return opportunities
+    
+    def get_strategy_recommendations(self):
+        """BUY / AVOID themes derived from the current disruptions"""
+        return [
+            {'action': 'BUY', 'theme': 'LFP Battery Makers', 'trigger': 'Cobalt shortage', 'commodity': 'Cobalt',
+             'stocks': ['Reliance New Energy', 'Exide Industries'], 'note': None},
+            {'action': 'BUY', 'theme': 'Green Hydrogen', 'trigger': 'Oil price surge', 'commodity': 'Crude Oil',
+             'stocks': ['Reliance', 'Adani Green', 'NTPC'], 'note': None},
+            {'action': 'BUY', 'theme': 'Semiconductor Ecosystem', 'trigger': 'Chip shortage', 'commodity': 'Semiconductor Chips',
+             'stocks': ['Tata Electronics', 'HCL Tech', 'Dixon'], 'note': None},
+            {'action': 'BUY', 'theme': 'Domestic Mining', 'trigger': 'Rare earth curbs', 'commodity': 'Rare Earth Elements',
+             'stocks': ['IREL India', 'Coal India'], 'note': '(diversification)'},
+            {'action': 'BUY', 'theme': 'Battery Recycling', 'trigger': 'Resource scarcity', 'commodity': 'Cobalt',
+             'stocks': ['Attero Recycling', 'Gravita India'], 'note': None},
+            {'action': 'AVOID', 'theme': 'High Cobalt Dependency EVs', 'trigger': None, 'commodity': 'Cobalt',
+             'stocks': [], 'note': 'Companies without LFP transition plans'},
+            {'action': 'AVOID', 'theme': 'Import-Heavy Electronics', 'trigger': None, 'commodity': 'Semiconductor Chips',
+             'stocks': [], 'note': 'No domestic manufacturing pivot'},
+            {'action': 'AVOID', 'theme': 'Fuel-Intensive Airlines', 'trigger': None, 'commodity': 'Crude Oil',
+             'stocks': [], 'note': 'Rising crude oil prices'},
+            {'action': 'AVOID', 'theme': 'China-Dependent Supply Chains', 'trigger': None, 'commodity': 'Rare Earth Elements',
+             'stocks': [], 'note': 'Rare earth, semiconductors exposure'},
+            {'action': 'AVOID', 'theme': 'Single-Source Commodity Traders', 'trigger': None, 'commodity': None,
+             'stocks': [], 'note': 'Geopolitical risk concentration'}
+        ]
+    
+    def get_event_date(self, commodity):
+        """Earliest recorded event date for a commodity (None if no event)"""
+        dates = [e['date'] for e in self.global_events if e['commodity'] == commodity]
+        return min(dates) if dates else None
 
+@tracer.instrument
 class SupplyChainMonitor:
     """Monitor global supply chain disruptions"""
     
+    def __init__(self, as_of=None):
+        """``as_of`` loads the alerts recorded at that date instead of live ones"""
+        self.as_of = as_of
+        self.live_datasets = []
+    
+    def get_critical_alerts(self):
+        """Get critical supply chain alerts (curated plus high-impact ingested events)"""
+        alerts = versioned('critical_alerts', self.live_alerts, self.as_of)
+        self.live_datasets = [alerts.name] if alerts.live else []
+        return alerts.value
+    
+    @staticmethod
+    def live_alerts():
+        ingestor = event_ingestor()
+        ingestor.poll()
+        return SupplyChainMonitor.builtin_alerts() + alerts_from_events(ingestor.events(ingested_only=True),
+                                                                         ingestor.commodity_map)
+    
     @staticmethod
-    def get_critical_alerts():
-        """Get critical supply chain alerts"""
+    def builtin_alerts():
+        """Curated critical supply chain alerts"""
         return [
             {
+                'date': '2025-01-15',
+                'commodity': 'Cobalt',
                 'alert': '🚨 Cobalt prices up 42% - Congo export restrictions extended (FY26)',
                 'action': 'BUY: LFP battery makers, SELL: Cobalt-dependent EV stocks',
                 'stocks': 'BUY: Reliance (LFP scaling), Exide | AVOID: High cobalt dependency stocks'
             },
             {
+                'date': '2025-01-20',
+                'commodity': 'Rare Earth Elements',
                 'alert': '⚠️ Rare earth shortage intensifies - China quotas reduced (FY26)',
                 'action': 'BUY: Domestic mining, recycling tech',
                 'stocks': 'BUY: IREL India, Attero Recycling'
             },
             {
+                'date': '2025-01-10',
+                'commodity': 'Semiconductor Chips',
                 'alert': '📈 Semiconductor shortage persists - Taiwan capacity constraints (FY26)',
                 'action': 'BUY: India Semiconductor Mission beneficiaries',
                 'stocks': 'BUY: Tata Electronics, HCL Tech (design), Dixon (assembly)'
             },
             {
+                'date': '2025-02-01',
+                'commodity': 'Crude Oil',
                 'alert': '⚡ Oil prices surge 18% - OPEC+ cuts extended (FY26)',
                 'action': 'BUY: Green energy, EV stocks | SELL: High fuel cost airlines',
                 'stocks': 'BUY: Adani Green, Tata Power, Ola Electric'
@@ -293,3 +368,24 @@ class SupplyChainMonitor:
             'India_Dependency': ['Medium', 'High', 'Very High', 'High', 'Low'],
             'Mitigation_Status': ['In Progress', 'Planned', 'Active', 'Diversifying', 'Completed']
         })
+
+def event_ingestor():
+    """Process-wide event ingestor seeded with the curated events"""
+    return get_ingestor(GlobalImpactAnalyzer.load_commodity_dependencies(), GlobalImpactAnalyzer.builtin_events())
+
+def alerts_from_events(events, commodity_map):
+    """Alert dicts (as ``get_critical_alerts``) for ingested events rated High or above"""
+    alerts = []
+    for event in events:
+        if event['impact_level'] not in ALERT_ICONS:
+            continue
+        data = commodity_map[event['commodity']]
+        substitutes = [c for companies in data['substitutes'].values() for c in companies][:3]
+        alerts.append({
+            'date': event['date'],
+            'commodity': event['commodity'],
+            'alert': f"{ALERT_ICONS[event['impact_level']]} {event['event']} ({event['price_impact']})",
+            'action': f"BUY: {', '.join(event['opportunities'][:2])} ({TIMELINES[event['impact_level']]} disruption)",
+            'stocks': f"BUY: {', '.join(substitutes)} | AVOID: {', '.join(data['indian_companies_affected'][:3])}"
+        })
+    return alerts
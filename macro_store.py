@@ -0,0 +1,263 @@
+"""Macro indicator time series aligned to daily sector returns
+
+Each indicator is a Series on a sorted DatetimeIndex stamped with the date
+the value became known (release date for GDP/CPI, decision date for the repo
+rate, trading date for market prices), so as-of joins never look ahead.
+``MacroStore.asof(dates)`` aligns every indicator onto a daily index with one
+``merge_asof``; ``rolling_betas`` then regresses all sector returns on a
+macro factor's daily changes with cumulative sums instead of a per-window loop.
+
+GDP, CPI and repo history are built in up to 2025-09. Dated series in
+``MACRO_DIR/<indicator>.csv`` (default ``data/macro``; columns ``date`` and
+``value``) extend or override them, and are the only source of FII/DII
+flows. An indicator with no dated series is left out of the store, so it
+never takes part in joins, betas or alert features; ``snapshot()`` shows
+its ``MACRO_DEFAULTS`` value flagged as a placeholder. ``stale()`` lists
+the indicators whose last observation is older than one release period.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_providers import get_provider, MACRO_DEFAULTS, TROY_OUNCE_GRAMS
+from performance_tracker import tracer
+from quote_stream import MACRO_SYMBOLS
+
+INDICATORS = {
+    'gdp_growth': 'GDP Growth %',
+    'inflation_cpi': 'Inflation (CPI) %',
+    'repo_rate': 'Repo Rate %',
+    'usd_inr': 'USD/INR',
+    'crude_oil': 'Brent Crude ($/bbl)',
+    'gold_price': 'Gold (₹/10g)',
+    'fii_inflow': 'FII Net Flow (₹ Cr)',
+    'dii_inflow': 'DII Net Flow (₹ Cr)'
+}
+
+# Percent/flow levels: sensitivities are to the change in level, prices to the % change
+LEVEL_INDICATORS = {'gdp_growth', 'inflation_cpi', 'repo_rate', 'fii_inflow', 'dii_inflow'}
+
+DEFAULT_DIR = os.path.join('data', 'macro')
+
+# Longest expected gap between observations; an older last value is stale. The repo
+# series only records rate changes, so an old last change is not stale by itself
+RELEASE_PERIODS = {
+    'gdp_growth': pd.Timedelta(days=95),
+    'inflation_cpi': pd.Timedelta(days=35),
+    'usd_inr': pd.Timedelta(days=7),
+    'crude_oil': pd.Timedelta(days=7),
+    'gold_price': pd.Timedelta(days=7),
+    'fii_inflow': pd.Timedelta(days=7),
+    'dii_inflow': pd.Timedelta(days=7)
+}
+
+# Real GDP growth YoY by quarter, stamped at the MoSPI release (end of the following 2 months)
+GDP_RELEASES = {
+    '2022-08-31': 13.1, '2022-11-30': 6.2, '2023-02-28': 4.5, '2023-05-31': 6.1,
+    '2023-08-31': 7.8, '2023-11-30': 7.6, '2024-02-29': 8.4, '2024-05-31': 7.8,
+    '2024-08-30': 6.7, '2024-11-29': 5.4, '2025-02-28': 6.2, '2025-05-30': 7.4,
+    '2025-08-29': 7.8
+}
+
+# CPI inflation YoY by month, stamped at the release on the 12th of the following month
+CPI_RELEASES = {
+    '2023-02-13': 6.52, '2023-03-13': 6.44, '2023-04-12': 5.66, '2023-05-12': 4.70,
+    '2023-06-12': 4.25, '2023-07-12': 4.81, '2023-08-14': 7.44, '2023-09-12': 6.83,
+    '2023-10-12': 5.02, '2023-11-13': 4.87, '2023-12-12': 5.55, '2024-01-12': 5.69,
+    '2024-02-12': 5.10, '2024-03-12': 5.09, '2024-04-12': 4.85, '2024-05-13': 4.83,
+    '2024-06-12': 4.75, '2024-07-12': 5.08, '2024-08-12': 3.54, '2024-09-12': 3.65,
+    '2024-10-14': 5.49, '2024-11-12': 6.21, '2024-12-12': 5.48, '2025-01-13': 5.22,
+    '2025-02-12': 4.31, '2025-03-12': 3.61, '2025-04-15': 3.34, '2025-05-14': 3.16,
+    '2025-06-12': 2.82, '2025-07-14': 2.10, '2025-08-12': 1.55, '2025-09-12': 2.07
+}
+
+# RBI policy repo rate, stamped at each MPC decision
+REPO_DECISIONS = {
+    '2020-05-22': 4.00, '2022-05-04': 4.40, '2022-06-08': 4.90, '2022-08-05': 5.40,
+    '2022-09-30': 5.90, '2022-12-07': 6.25, '2023-02-08': 6.50, '2025-02-07': 6.25,
+    '2025-04-09': 6.00, '2025-06-06': 5.50
+}
+
+
+def _series(values, name):
+    series = pd.Series(values, name=name, dtype=float)
+    series.index = pd.DatetimeIndex(pd.to_datetime(series.index)).as_unit('ns')
+    return series.sort_index()
+
+
+def load_series_files(root=None):
+    """Dated series from ``root/<indicator>.csv`` (columns 'date', 'value'), keyed by indicator"""
+    root = root or os.getenv('MACRO_DIR', DEFAULT_DIR)
+    series = {}
+    if not os.path.isdir(root):
+        return series
+    for filename in sorted(os.listdir(root)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.csv':
+            continue
+        frame = pd.read_csv(os.path.join(root, filename), parse_dates=['date'])
+        series[name] = _series(frame.set_index('date')['value'], name)
+    return series
+
+
+def rolling_sums(values, window):
+    """Trailing ``window``-row sums along axis 0 (NaN-free input), via one cumulative sum"""
+    csum = np.cumsum(values, axis=0)
+    out = csum.copy()
+    out[window:] -= csum[:-window]
+    return out
+
+
+class MacroStore:
+    """Indicator series keyed by name, merged lazily into one wide as-of frame"""
+
+    def __init__(self, series=None):
+        self._series = {}
+        self._wide = None
+        for name, values in (series or {}).items():
+            self.update(name, values)
+
+    @classmethod
+    def reference(cls, root=None):
+        """Store with the built-in GDP, CPI and repo-rate history plus the series files under ``MACRO_DIR``"""
+        store = cls({
+            'gdp_growth': _series(GDP_RELEASES, 'gdp_growth'),
+            'inflation_cpi': _series(CPI_RELEASES, 'inflation_cpi'),
+            'repo_rate': _series(REPO_DECISIONS, 'repo_rate')
+        })
+        for name, values in load_series_files(root).items():
+            store.update(name, values)
+        return store
+
+    @classmethod
+    def load(cls, provider=None, period='2y'):
+        """Reference history and series files plus daily USD/INR, crude and gold closes from the provider"""
+        store = cls.reference()
+        symbols = {MACRO_SYMBOLS['USD/INR']: 'usd_inr', MACRO_SYMBOLS['Crude Oil']: 'crude_oil',
+                   MACRO_SYMBOLS['Gold']: 'gold_price'}
+        try:
+            close = (provider or get_provider()).download(list(symbols), period=period)['Close']
+            close = close.rename(columns=symbols).dropna(how='all')
+        except:
+            close = pd.DataFrame()
+        if 'gold_price' in close and 'usd_inr' in close:
+            # USD per troy ounce -> INR per 10 g
+            close['gold_price'] = close['gold_price'] * close['usd_inr'].ffill() / TROY_OUNCE_GRAMS * 10
+        for name in symbols.values():
+            if name in close:
+                store.update(name, close[name].dropna())
+        # Flows have no free daily source: without a series file they stay out of
+        # the store rather than forward-filling one point over the whole history
+        return store
+
+    def __contains__(self, name):
+        return name in self._series
+
+    @property
+    def names(self):
+        return [name for name in INDICATORS if name in self._series] + \
+            [name for name in self._series if name not in INDICATORS]
+
+    def update(self, name, values):
+        """Merge new observations for ``name``; later values win on duplicate dates"""
+        values = pd.Series(values, dtype=float).dropna()
+        if values.empty:
+            return
+        values.index = pd.DatetimeIndex(values.index).tz_localize(None).as_unit('ns')
+        if name in self._series:
+            values = pd.concat([self._series[name], values])
+        values = values[~values.index.duplicated(keep='last')].sort_index()
+        values.name = name
+        self._series[name] = values
+        self._wide = None
+
+    def series(self, name):
+        return self._series[name]
+
+    def wide(self):
+        """All indicators on the union of their dates, forward-filled"""
+        if self._wide is None:
+            self._wide = pd.concat([self._series[name] for name in self.names], axis=1, sort=True).ffill()
+            self._wide.index.name = 'date'
+        return self._wide
+
+    def asof(self, dates, columns=None):
+        """Latest known value of each indicator on every date in ``dates`` (NaN for indicators with no series)"""
+        dates = pd.DatetimeIndex(dates).tz_localize(None).as_unit('ns')
+        wide = self.wide() if columns is None else self.wide().reindex(columns=list(columns))
+        with tracer.span("macro_store: asof", rows=len(dates), columns=wide.shape[1]):
+            order = np.argsort(dates.asi8, kind='stable')
+            left = pd.DataFrame({'date': dates[order]})
+            merged = pd.merge_asof(left, wide.reset_index(), on='date', direction='backward')
+            aligned = merged.drop(columns='date').to_numpy()
+            out = np.empty_like(aligned)
+            out[order] = aligned
+        return pd.DataFrame(out, index=dates, columns=wide.columns)
+
+    def factor_changes(self, dates, columns=None):
+        """Daily change of each indicator aligned to ``dates`` (level diff or % change)"""
+        levels = self.asof(dates, columns)
+        changes = levels.diff()
+        prices = [col for col in levels.columns if col not in LEVEL_INDICATORS]
+        changes[prices] = levels[prices].pct_change(fill_method=None)
+        return changes
+
+    def latest(self):
+        """Most recent value per indicator, falling back to ``MACRO_DEFAULTS``"""
+        indicators = dict(MACRO_DEFAULTS)
+        indicators.update({name: float(series.iloc[-1]) for name, series in self._series.items()})
+        return indicators
+
+    def snapshot(self):
+        """Latest value, change vs the previous observation and as-of date per indicator
+
+        Indicators with no series get their ``MACRO_DEFAULTS`` value, no date and ``placeholder=True``.
+        """
+        rows = []
+        for name in self.names:
+            series = self._series[name]
+            rows.append({
+                'indicator': name,
+                'label': INDICATORS.get(name, name),
+                'value': series.iloc[-1],
+                'change': series.iloc[-1] - series.iloc[-2] if len(series) > 1 else 0.0,
+                'as_of': series.index[-1],
+                'placeholder': False
+            })
+        for name in INDICATORS:
+            if name not in self._series:
+                rows.append({'indicator': name, 'label': INDICATORS[name], 'value': float(MACRO_DEFAULTS[name]),
+                             'change': 0.0, 'as_of': pd.NaT, 'placeholder': True})
+        return pd.DataFrame(rows).set_index('indicator')
+
+    def stale(self, now=None, names=None):
+        """Last observation date of each indicator (of ``names``) older than its release period"""
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        names = self.names if names is None else [name for name in names if name in self._series]
+        return {name: self._series[name].index[-1] for name in names
+                if name in RELEASE_PERIODS and now - self._series[name].index[-1] > RELEASE_PERIODS[name]}
+
+    def rolling_betas(self, returns, factor, window=63, min_fraction=0.8):
+        """Rolling OLS beta of every ``returns`` column on the daily change of ``factor``
+
+        ``returns`` is a wide (dates x sectors) frame. All windows and sectors
+        come from running sums of x, x^2, y and xy over the valid rows, so the
+        cost is one pass over the data regardless of the window length.
+        """
+        x = self.factor_changes(returns.index, [factor])[factor].to_numpy(dtype=float)
+        y = returns.to_numpy(dtype=float, copy=True)
+        with tracer.span("macro_store: rolling_betas", rows=len(y), sectors=y.shape[1], window=window):
+            valid = ~np.isnan(y) & ~np.isnan(x)[:, None]
+            xv = np.where(valid, x[:, None], 0.0)
+            yv = np.where(valid, y, 0.0)
+            n = rolling_sums(valid.astype(float), window)
+            sx, sy = rolling_sums(xv, window), rolling_sums(yv, window)
+            sxx, sxy = rolling_sums(xv * xv, window), rolling_sums(xv * yv, window)
+            # Step-like factors (repo rate) leave many windows without a single move
+            moves = rolling_sums((xv != 0).astype(float), window)
+            var = n * sxx - sx * sx
+            with np.errstate(divide='ignore', invalid='ignore'):
+                beta = (n * sxy - sx * sy) / var
+            beta[(n < window * min_fraction) | (moves < 2) | (var <= 0)] = np.nan
+        return pd.DataFrame(beta, index=returns.index, columns=returns.columns)
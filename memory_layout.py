@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+INT32_MAX = np.iinfo(np.int32).max
+
+
+def compact_ohlcv(hist):
+    """Downcast a yfinance OHLCV frame: float32 prices, int32 volume"""
+    out = hist.copy()
+    for col in out.columns:
+        if col == 'Volume':
+            out[col] = out[col].fillna(0).clip(upper=INT32_MAX).astype(np.int32)
+        elif pd.api.types.is_float_dtype(out[col]):
+            out[col] = out[col].astype(np.float32)
+    return out
+
+
+def compact_frame(df, categorical=(), float32=()):
+    """Convert label columns to categoricals and float columns to float32"""
+    out = df.copy()
+    for col in categorical:
+        if col in out.columns:
+            out[col] = out[col].astype('category')
+    for col in float32:
+        if col in out.columns:
+            out[col] = out[col].astype(np.float32)
+    return out
+
+
+def footprint(obj):
+    """Deep memory footprint in bytes of a DataFrame/Series"""
+    usage = obj.memory_usage(deep=True)
+    return int(usage.sum() if hasattr(usage, 'sum') else usage)
+
+
+def footprint_report(pairs):
+    """Compare (default, compact) footprints; ``pairs`` maps name -> (before, after)
+
+    Entries may be DataFrames or plain byte counts.
+    """
+    rows = []
+    for name, (before, after) in pairs.items():
+        before_bytes = before if isinstance(before, (int, np.integer)) else footprint(before)
+        after_bytes = after if isinstance(after, (int, np.integer)) else footprint(after)
+        rows.append({
+            'Dataset': name,
+            'Default (MB)': round(before_bytes / 1024 / 1024, 3),
+            'Compact (MB)': round(after_bytes / 1024 / 1024, 3),
+            'Reduction %': round((1 - after_bytes / before_bytes) * 100, 1) if before_bytes else 0.0
+        })
+    return pd.DataFrame(rows)
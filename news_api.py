@@ -1,5 +1,6 @@
-import requests
 from datetime import datetime, timedelta
+from data_providers import get_provider
+from performance_tracker import tracer
 
 def get_current_fy_dates():
     """Get current financial year start and end dates (April 1 - March 31)"""
@@ -12,12 +13,14 @@ def get_current_fy_dates():
         fy_end = datetime(today.year, 3, 31)
     return fy_start, fy_end
 
+@tracer.instrument
 class NewsAPI:
     """Fetch real-time news for sectors"""
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, provider=None):
         self.api_key = api_key or "YOUR_NEWSAPI_KEY"  # Get free key from newsapi.org
         self.base_url = "https://newsapi.org/v2/everything"
+        self.provider = provider or get_provider()
     
     def get_sector_news(self, sector, days=7):
         """Fetch news for specific sector"""
@@ -45,10 +48,7 @@ class NewsAPI:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            if response.status_code == 200:
-                return response.json().get('articles', [])[:10]
-            return []
+            return self.provider.news(self.base_url, params)[:10]
         except:
             return []
     
@@ -63,30 +63,17 @@ class NewsAPI:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            if response.status_code == 200:
-                return response.json().get('articles', [])[:15]
-            return []
+            return self.provider.news(self.base_url, params)[:15]
         except:
             return []
 
 # Alternative: Google News RSS (No API key needed)
-def get_google_news(sector):
+@tracer.traced('get_google_news')
+def get_google_news(sector, provider=None):
     """Fetch news from Google News RSS"""
-    import feedparser
-    
     rss_url = f"https://news.google.com/rss/search?q={sector}+India+stock+market&hl=en-IN&gl=IN&ceid=IN:en"
     
     try:
-        feed = feedparser.parse(rss_url)
-        news = []
-        for entry in feed.entries[:10]:
-            news.append({
-                'title': entry.title,
-                'link': entry.link,
-                'published': entry.published,
-                'source': entry.source.title if hasattr(entry, 'source') else 'Google News'
-            })
-        return news
+        return (provider or get_provider()).rss(rss_url)[:10]
     except:
         return []
@@ -0,0 +1,120 @@
+"""Concurrent data loading for a page, with sections streamed as they complete
+
+A page declares its data loads (with the loads they depend on) and its
+sections (with the loads they render). ``run()`` submits every load whose
+dependencies are met to a thread pool and, on the script thread, renders
+each section into the placeholder reserved for it as soon as its last input
+arrives. Page order is kept by the placeholders while time-to-first-content
+is bounded by the fastest section rather than the sum of all loads.
+
+Streamlit elements may only be created from the script thread, so loads
+must be plain data functions; all ``st.*`` calls belong in the renderers.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from performance_tracker import tracer
+
+MAX_WORKERS = int(os.getenv('PAGE_LOADER_WORKERS', '8'))
+
+
+class LoadError(Exception):
+    """A load failed or one of its dependencies did"""
+
+
+class PageLoader:
+    """Dependency-aware parallel loader for one page render"""
+
+    def __init__(self, name, max_workers=MAX_WORKERS):
+        self.name = name
+        self.max_workers = max_workers
+        self._loads = {}
+        self._sections = []
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+
+    def load(self, key, func, *args, deps=(), **kwargs):
+        """Register ``func(*dep_results, *args, **kwargs)`` under ``key``"""
+        missing = [dep for dep in deps if dep not in self._loads]
+        if missing:
+            raise ValueError(f"Load '{key}' depends on undeclared {missing}")
+        self._loads[key] = (func, tuple(deps), args, kwargs)
+        return self
+
+    def section(self, render, *deps, placeholder=None, loading="Loading..."):
+        """Reserve a placeholder now; ``render(*dep_results)`` runs in it once ``deps`` have loaded"""
+        import streamlit as st
+
+        missing = [dep for dep in deps if dep not in self._loads]
+        if missing:
+            raise ValueError(f"Section '{render.__name__}' depends on undeclared {missing}")
+        placeholder = placeholder if placeholder is not None else st.empty()
+        if loading:
+            placeholder.caption(f"⏳ {loading}")
+        self._sections.append((render, tuple(deps), placeholder))
+        return placeholder
+
+    def _call(self, key, parent, inputs):
+        func, _, args, kwargs = self._loads[key]
+        with tracer.attach(parent), tracer.span(f"load: {key}") as span:
+            result = func(*inputs, *args, **kwargs)
+        return result, span.wall_ms if span is not None else None
+
+    def _render(self, render, deps, placeholder):
+        failed = [dep for dep in deps if dep in self.errors]
+        with placeholder.container():
+            if failed:
+                import streamlit as st
+                st.error(f"Could not load {', '.join(failed)}: {self.errors[failed[0]]}")
+                return
+            with tracer.span(f"section: {render.__name__}"):
+                render(*(self.results[dep] for dep in deps))
+
+    def _ready(self, deps):
+        return all(dep in self.results or dep in self.errors for dep in deps)
+
+    def iter_completed(self):
+        """Run the loads; yield each key as its result (or error) becomes available"""
+        parent = tracer.current()
+        pending = dict(self._loads)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        finished = False
+        try:
+            with tracer.span(f"page_loader: {self.name}", loads=len(pending)):
+                running = {}
+                while pending or running:
+                    for key in [k for k, (_, deps, _, _) in pending.items() if self._ready(deps)]:
+                        deps = pending.pop(key)[1]
+                        failed = [dep for dep in deps if dep in self.errors]
+                        if failed:
+                            self.errors[key] = LoadError(f"dependency '{failed[0]}' failed")
+                            yield key
+                            continue
+                        inputs = [self.results[dep] for dep in deps]
+                        running[pool.submit(self._call, key, parent, inputs)] = key
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key = running.pop(future)
+                        try:
+                            self.results[key], self.timings[key] = future.result()
+                        except Exception as e:
+                            self.errors[key] = e
+                        yield key
+            finished = True
+        finally:
+            # An abandoned render (rerun, early exit) must not wait for slow loads
+            pool.shutdown(wait=finished, cancel_futures=not finished)
+
+    def run(self):
+        """Load everything and render each section the moment its inputs are ready"""
+        sections = list(self._sections)
+        for _ in self.iter_completed():
+            for entry in [s for s in sections if self._ready(s[1])]:
+                sections.remove(entry)
+                self._render(*entry)
+        for entry in sections:  # sections without loads
+            self._render(*entry)
+        return self.results
@@ -0,0 +1,283 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+
+class Span:
+    """A single timed unit of work inside a trace"""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'trace_id', 'attrs',
+                 'started_at', 'start', 'wall_ms', 'bytes', 'thread')
+
+    def __init__(self, name, span_id, parent, attrs):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else span_id
+        self.attrs = attrs
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.start = time.perf_counter()
+        self.wall_ms = None
+        self.bytes = 0
+        self.thread = threading.current_thread().name
+
+    def to_record(self):
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'started_at': self.started_at,
+            'wall_ms': round(self.wall_ms, 3) if self.wall_ms is not None else None,
+            'bytes': self.bytes,
+            'thread': self.thread,
+            'attrs': self.attrs
+        }
+
+
+class Tracer:
+    """Lightweight nested-span tracer for page renders and data fetches
+
+    Spans nest per thread; finished traces are kept in memory for the
+    Performance page and, when ``PERF_TRACE_FILE`` is set, appended to a
+    JSONL file (one span per line) for offline analysis.
+    """
+
+    def __init__(self, max_traces=200, export_path=None):
+        self.export_path = export_path if export_path is not None else os.getenv('PERF_TRACE_FILE')
+        self.enabled = os.getenv('PERF_TRACING', 'true').lower() == 'true'
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = {}
+        self._traces = deque(maxlen=max_traces)
+        self._stats = {}
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def current(self):
+        """Return the innermost open span on this thread"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def start(self, name, **attrs):
+        """Open a span; prefer ``span()`` unless the scope can't be a with-block"""
+        if not self.enabled:
+            return None
+        span = Span(name, next(self._ids), self.current(), attrs)
+        self._stack().append(span)
+        with self._lock:
+            if span.parent_id is None or span.trace_id in self._open:
+                self._open.setdefault(span.trace_id, []).append(span)
+        return span
+
+    def finish(self, span):
+        """Close a span opened with ``start()``"""
+        if span is None:
+            return
+        span.wall_ms = (time.perf_counter() - span.start) * 1000
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+
+        with self._lock:
+            stats = self._stats.setdefault(span.name, {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'bytes': 0})
+            stats['calls'] += 1
+            stats['total_ms'] += span.wall_ms
+            stats['max_ms'] = max(stats['max_ms'], span.wall_ms)
+            stats['bytes'] += span.bytes
+
+            if span.parent_id is not None:
+                return
+            spans = self._open.pop(span.trace_id, [])
+
+        records = [s.to_record() for s in spans]
+        self._traces.append(records)
+        self._export(records)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time a block as a child of the current span"""
+        span = self.start(name, **attrs)
+        try:
+            yield span
+        finally:
+            self.finish(span)
+
+    @contextmanager
+    def attach(self, parent):
+        """Make ``parent`` (from another thread) the current span for this block"""
+        if parent is None:
+            yield
+            return
+        stack = self._stack()
+        stack.append(parent)
+        try:
+            yield
+        finally:
+            stack.remove(parent)
+
+    def add_bytes(self, n):
+        """Attribute fetched bytes to the current span"""
+        span = self.current()
+        if span is not None and n:
+            span.bytes += int(n)
+
+    def traced(self, name=None):
+        """Decorator that wraps each call in a span"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument(self, cls):
+        """Class decorator that traces every public method of ``cls``"""
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_'):
+                continue
+            span_name = f"{cls.__name__}.{attr}"
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(self.traced(span_name)(value.__func__)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attr, classmethod(self.traced(span_name)(value.__func__)))
+            elif callable(value):
+                setattr(cls, attr, self.traced(span_name)(value))
+        return cls
+
+    def _export(self, records):
+        if not self.export_path:
+            return
+        try:
+            with self._lock, open(self.export_path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + '\n')
+        except OSError:
+            pass
+
+    def summary(self):
+        """Aggregate call counts, wall time and bytes per span name"""
+        with self._lock:
+            rows = [{'span': name, **stats} for name, stats in self._stats.items()]
+        if not rows:
+            return pd.DataFrame(columns=['span', 'calls', 'total_ms', 'mean_ms', 'max_ms', 'bytes'])
+        df = pd.DataFrame(rows)
+        df['mean_ms'] = df['total_ms'] / df['calls']
+        df = df[['span', 'calls', 'total_ms', 'mean_ms', 'max_ms', 'bytes']]
+        return df.sort_values('total_ms', ascending=False).round(3).reset_index(drop=True)
+
+    def recent_traces(self, n=None):
+        """Return the last ``n`` (default all) finished traces, newest first"""
+        traces = list(self._traces)
+        return (traces[-n:] if n else traces)[::-1]
+
+    def reset(self):
+        with self._lock:
+            self._traces.clear()
+            self._stats.clear()
+
+
+tracer = Tracer()
+
+
+def frame_bytes(df):
+    """Approximate payload size of a fetched DataFrame (yfinance hides wire bytes)"""
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+
+def _trace_tree(records):
+    """Flatten a trace into display rows with indented span names"""
+    children = {}
+    for record in records:
+        children.setdefault(record['parent_id'], []).append(record)
+
+    rows = []
+
+    def walk(parent_id, depth):
+        for record in sorted(children.get(parent_id, []), key=lambda r: r['started_at']):
+            rows.append({
+                'span': '  ' * depth + record['name'],
+                'wall_ms': record['wall_ms'],
+                'bytes': record['bytes'],
+                'thread': record['thread']
+            })
+            walk(record['span_id'], depth + 1)
+
+    walk(None, 0)
+    return pd.DataFrame(rows)
+
+
+def display_performance_page():
+    """Display collected spans in Streamlit"""
+    import streamlit as st
+    import plotly.express as px
+    from chart_cache import chart_cache
+    from fetch_planner import get_fetch_planner
+
+    st.header("⏱ Performance")
+
+    summary = tracer.summary()
+    if summary.empty:
+        st.info("No spans recorded yet. Visit other pages to collect timings.")
+        return
+
+    charts = chart_cache.stats()
+    planner = get_fetch_planner()
+    fetches = planner.report()
+    if not planner.calendar.covers(planner.calendar.now()):
+        st.warning("The NSE holiday calendar has no dates for this year: holidays are requested as sessions. "
+                   "List them in NSE_HOLIDAYS_FILE.")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Spans Recorded", int(summary['calls'].sum()))
+    with col2:
+        st.metric("Bytes Fetched", f"{summary['bytes'].sum() / 1024:,.1f} KB")
+    with col3:
+        st.metric("Chart Cache Hits", f"{charts['hits']} / {charts['hits'] + charts['misses']}",
+                  f"{charts['entries']} figures, {charts['bytes'] / 1024:,.0f} KB", delta_color="off")
+    with col4:
+        st.metric("Price Requests", f"{fetches['executed']} / {fetches['planned']} planned",
+                  f"vs {fetches['blind'] + fetches['unplanned']} blind, {fetches['skipped_days']} closed days skipped",
+                  delta_color="off")
+
+    st.subheader("Slowest Spans (total wall time)")
+    fig = px.bar(summary.head(15), x='total_ms', y='span', orientation='h',
+                 hover_data=['calls', 'mean_ms', 'max_ms', 'bytes'])
+    fig.update_layout(yaxis={'autorange': 'reversed'})
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    st.subheader("Recent Traces")
+    for records in tracer.recent_traces(10):
+        root = next((r for r in records if r['parent_id'] is None), records[0])
+        with st.expander(f"{root['name']} - {root['wall_ms']} ms ({root['started_at']})"):
+            st.dataframe(_trace_tree(records), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        jsonl = '\n'.join(json.dumps(r, default=str) for records in tracer.recent_traces() for r in records)
+        st.download_button("Download JSONL", jsonl, file_name="perf_traces.jsonl")
+    with col2:
+        if st.button("Reset"):
+            tracer.reset()
+            st.rerun()
+    if tracer.export_path:
+        st.caption(f"Spans are also appended to `{tracer.export_path}`")
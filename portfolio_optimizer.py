@@ -0,0 +1,179 @@
+"""Budget-tilted portfolio allocation over the BudgetTracker stock universe
+
+The covariance matrix is the Ledoit-Wolf shrinkage estimate (towards a
+scaled identity) of daily returns, annualized. Both solvers keep their last
+solution and restart from it, so moving a tilt or cap slider only costs a few
+iterations:
+
+* mean-variance: accelerated projected gradient on the capped simplex
+* risk parity: damped Newton on the convex risk-budgeting objective, with
+  risk budgets tilted towards sectors with higher budget growth
+"""
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+
+TRADING_DAYS = 252
+MIN_OBSERVATIONS = 60
+
+
+def ledoit_wolf(returns):
+    """Shrunk covariance of a (T x N) return array; returns (cov, shrinkage)"""
+    x = returns - returns.mean(axis=0)
+    t, n = x.shape
+    sample = x.T @ x / t
+    mu = np.trace(sample) / n
+    target = mu * np.eye(n)
+    delta = ((sample - target) ** 2).sum() / n
+    # (1/T^2) sum_t ||x_t x_t' - S||^2 = (sum_t ||x_t||^4 / T - ||S||^2) / T
+    beta = ((x ** 2).sum(axis=1) ** 2).sum() / t - (sample ** 2).sum()
+    beta = min(beta / (t * n), delta)
+    shrinkage = beta / delta if delta else 1.0
+    return shrinkage * target + (1 - shrinkage) * sample, shrinkage
+
+
+def project_capped_simplex(v, cap=1.0):
+    """Euclidean projection onto {w : sum(w) = 1, 0 <= w <= cap}
+
+    sum(clip(v - tau, 0, cap)) is piecewise linear in tau with kinks at
+    v - cap and v, so one sort of the kinks finds the exact shift.
+    """
+    n = len(v)
+    kinks = np.concatenate([v - cap, v])
+    order = np.argsort(kinks, kind='stable')
+    kinks = kinks[order]
+    slope = -np.cumsum(np.where(order < n, 1, -1))
+    total = n * cap + np.concatenate([[0.0], np.cumsum(slope[:-1] * np.diff(kinks))])
+    k = np.searchsorted(-total, -1.0, side='left')
+    if k == 0:
+        tau = kinks[0]
+    else:
+        tau = kinks[k - 1] + (1.0 - total[k - 1]) / slope[k - 1]
+    return np.clip(v - tau, 0, cap)
+
+
+def budget_tilt(yoy):
+    """Standardized budget growth per asset (0 when all sectors grow alike)"""
+    yoy = np.asarray(yoy, dtype=float)
+    std = yoy.std()
+    return (yoy - yoy.mean()) / std if std else np.zeros_like(yoy)
+
+
+class PortfolioOptimizer:
+    """Mean-variance and risk-parity allocations tilted by budget priority"""
+
+    def __init__(self, prices, universe):
+        """``prices`` is a wide close frame; ``universe`` rows as from ``BudgetTracker.get_stock_universe``"""
+        universe = universe.dropna(subset=['Ticker'])
+        # A stock listed under several sectors keeps its strongest budget growth
+        growth = universe.groupby('Ticker')['YoY_Change_%'].max()
+        sector = universe.sort_values('YoY_Change_%').groupby('Ticker')['Sector'].last()
+
+        with tracer.span("optimizer: covariance", assets=prices.shape[1]):
+            returns = prices.sort_index().ffill().pct_change(fill_method=None).iloc[1:]
+            returns = returns.loc[:, returns.count() >= MIN_OBSERVATIONS]
+            returns = returns[[t for t in returns.columns if t in growth.index]]
+            values = returns.to_numpy(dtype=float, copy=True)
+            means = np.nanmean(values, axis=0)
+            values = np.where(np.isnan(values), means, values)
+            cov, self.shrinkage = ledoit_wolf(values)
+
+        self.tickers = returns.columns
+        self.sectors = sector.reindex(self.tickers)
+        self.yoy = growth.reindex(self.tickers).to_numpy(dtype=float)
+        self.cov = cov * TRADING_DAYS
+        self.mu = means * TRADING_DAYS
+        self._lipschitz = np.linalg.eigvalsh(self.cov)[-1]
+        self._warm = {}
+        self.last_iterations = 0
+
+    def expected_returns(self, tilt):
+        """Historical mean plus ``tilt`` times each sector's budget growth above average"""
+        return self.mu + tilt * (self.yoy - self.yoy.mean()) / 100
+
+    def mean_variance(self, tilt=0.5, risk_aversion=5.0, max_weight=0.10, tol=1e-7, max_iter=2000):
+        """Long-only, fully invested max(mu'w - risk_aversion/2 w'Sw) with a per-asset cap"""
+        n = len(self.tickers)
+        cap = max(max_weight, 1.0 / n)
+        mu = self.expected_returns(tilt)
+        step = 1.0 / (risk_aversion * self._lipschitz)
+
+        w = project_capped_simplex(self._warm.get('mv', np.full(n, 1.0 / n)), cap)
+        y, momentum = w.copy(), 1.0
+        with tracer.span("optimizer: mean_variance", assets=n):
+            for i in range(1, max_iter + 1):
+                w_next = project_capped_simplex(y - step * (risk_aversion * (self.cov @ y) - mu), cap)
+                if (y - w_next) @ (w_next - w) > 0:
+                    momentum = 1.0  # adaptive restart once momentum stops helping
+                momentum_next = (1 + np.sqrt(1 + 4 * momentum ** 2)) / 2
+                y = w_next + (momentum - 1) / momentum_next * (w_next - w)
+                converged = np.abs(w_next - w).max() < tol
+                w, momentum = w_next, momentum_next
+                if converged:
+                    break
+        self._warm['mv'] = w
+        self.last_iterations = i
+        return pd.Series(w, index=self.tickers, name='Weight')
+
+    def risk_parity(self, tilt=0.5, tol=1e-10, max_iter=100):
+        """Risk budgeting: each asset's risk contribution proportional to exp(tilt * z(YoY))
+
+        Minimizes 0.5 y'Sy - b'log(y) (convex, unique positive optimum) and
+        normalizes y to weights.
+        """
+        n = len(self.tickers)
+        budgets = np.exp(tilt * budget_tilt(self.yoy))
+        budgets /= budgets.sum()
+
+        def objective(y):
+            return 0.5 * y @ self.cov @ y - budgets @ np.log(y)
+
+        y = self._warm.get('rp')
+        if y is None:
+            y = np.sqrt(budgets / np.diag(self.cov))
+        with tracer.span("optimizer: risk_parity", assets=n):
+            value = objective(y)
+            for i in range(1, max_iter + 1):
+                grad = self.cov @ y - budgets / y
+                hessian = self.cov + np.diag(budgets / y ** 2)
+                direction = np.linalg.solve(hessian, grad)
+                if grad @ direction < tol:
+                    break
+                step = 1.0
+                while np.any(y - step * direction <= 0) or objective(y - step * direction) > value:
+                    step /= 2
+                    if step < 1e-12:
+                        break
+                y = y - step * direction
+                value = objective(y)
+        self._warm['rp'] = y
+        self.last_iterations = i
+        return pd.Series(y / y.sum(), index=self.tickers, name='Weight')
+
+    def risk_contributions(self, weights):
+        w = weights.reindex(self.tickers).fillna(0).to_numpy()
+        contrib = w * (self.cov @ w)
+        return pd.Series(contrib / contrib.sum(), index=self.tickers, name='Risk Contribution')
+
+    def portfolio_stats(self, weights, tilt=0.0):
+        w = weights.reindex(self.tickers).fillna(0).to_numpy()
+        volatility = float(np.sqrt(w @ self.cov @ w))
+        return {
+            'expected_return': float(self.expected_returns(tilt) @ w),
+            'volatility': volatility,
+            'effective_assets': float(1 / (w ** 2).sum()),
+            'budget_growth': float(self.yoy @ w)
+        }
+
+    def allocation_table(self, weights, min_weight=1e-4):
+        """Weights with sector, budget growth and risk contribution, largest first"""
+        table = pd.DataFrame({
+            'Ticker': self.tickers,
+            'Sector': self.sectors.to_numpy(),
+            'YoY_Change_%': self.yoy,
+            'Weight %': (weights.reindex(self.tickers).to_numpy() * 100).round(2),
+            'Risk Contribution %': (self.risk_contributions(weights).to_numpy() * 100).round(2)
+        })
+        table = table[table['Weight %'] >= min_weight * 100]
+        return table.sort_values('Weight %', ascending=False).reset_index(drop=True)
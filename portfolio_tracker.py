@@ -0,0 +1,333 @@
+"""Watchlist and lot-level portfolio with incremental mark-to-market
+
+``PortfolioStore`` persists open lots and the watchlist in SQLite
+(``PORTFOLIO_DB``, default ``data/portfolio.db``). ``PortfolioBook`` holds
+the same lots in memory as per-ticker arrays (quantity, cost, last price,
+sector and budget-priority codes) plus running totals: market value, the
+cost of priced positions, and value by ``SectorAnalyzer`` sector and by
+``BudgetTracker`` priority.
+
+``mark(prices)`` only touches tickers whose price actually changed. Each
+one's value delta is added to the totals and scattered into the exposure
+buckets with ``np.add.at``, so a tick for three stocks costs the same at 50
+positions or 5,000. Adding or removing a lot is the same kind of delta.
+The full per-position table is only built when a page asks for it.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+
+DEFAULT_DB = os.path.join('data', 'portfolio.db')
+UNCLASSIFIED = 'Unclassified'
+PRIORITY_ORDER = ['Very High', 'High', 'Medium', 'Low']
+# Re-add the totals from scratch after this many price changes so float drift stays bounded
+RESYNC_UPDATES = 1_000_000
+
+LOT_COLUMNS = ['id', 'ticker', 'quantity', 'price', 'opened', 'note']
+
+
+class PortfolioStore:
+    """SQLite tables of open lots and watched tickers"""
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('PORTFOLIO_DB', DEFAULT_DB)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS lots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT NOT NULL,
+                quantity REAL NOT NULL,
+                price REAL NOT NULL,
+                opened TEXT NOT NULL,
+                note TEXT NOT NULL DEFAULT ''
+            )""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS watchlist (
+                ticker TEXT PRIMARY KEY,
+                added TEXT NOT NULL,
+                note TEXT NOT NULL DEFAULT ''
+            )""")
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+    def add_lot(self, ticker, quantity, price, opened=None, note=''):
+        """Insert a lot and return its id"""
+        opened = opened or datetime.now().strftime('%Y-%m-%d')
+        with self._connection() as conn:
+            cursor = conn.execute("INSERT INTO lots (ticker, quantity, price, opened, note) VALUES (?, ?, ?, ?, ?)",
+                                  (ticker, float(quantity), float(price), str(opened), note))
+        return cursor.lastrowid
+
+    def add_lots(self, lots):
+        """Bulk insert a frame with ticker/quantity/price (and optionally opened/note) columns"""
+        lots = lots.assign(opened=lots.get('opened', datetime.now().strftime('%Y-%m-%d')),
+                           note=lots.get('note', ''))
+        rows = lots[['ticker', 'quantity', 'price', 'opened', 'note']].astype(
+            {'quantity': float, 'price': float, 'opened': str}).itertuples(index=False, name=None)
+        with self._connection() as conn:
+            conn.executemany("INSERT INTO lots (ticker, quantity, price, opened, note) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def remove_lot(self, lot_id):
+        """Delete a lot; returns the removed row as a dict, or None if it did not exist"""
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM lots WHERE id = ?", (int(lot_id),)).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM lots WHERE id = ?", (int(lot_id),))
+        return dict(zip(LOT_COLUMNS, row)) if row is not None else None
+
+    def lots(self):
+        return pd.read_sql_query("SELECT * FROM lots ORDER BY id", self._connection())
+
+    def watch(self, ticker, note=''):
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO watchlist VALUES (?, ?, ?)",
+                         (ticker, datetime.now().strftime('%Y-%m-%d'), note))
+
+    def unwatch(self, ticker):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM watchlist WHERE ticker = ?", (ticker,))
+
+    def watchlist(self):
+        return pd.read_sql_query("SELECT * FROM watchlist ORDER BY ticker", self._connection())
+
+
+def priority_map(universe):
+    """Ticker -> highest budget priority among its ``BudgetTracker.get_stock_universe`` rows"""
+    universe = universe.dropna(subset=['Ticker'])
+    rank = universe['Priority'].map({p: i for i, p in enumerate(PRIORITY_ORDER)})
+    best = universe.assign(rank=rank).sort_values('rank').drop_duplicates('Ticker')
+    return dict(zip(best['Ticker'], best['Priority']))
+
+
+class PortfolioBook:
+    """Open lots aggregated per ticker, with running value, P&L and exposure totals"""
+
+    def __init__(self, sectors, priorities=None):
+        """``sectors`` is ``SectorAnalyzer().sectors``; ``priorities`` maps ticker -> budget priority"""
+        # A ticker listed under several sectors counts towards the first, so exposures sum to the book
+        self._sector_of = {}
+        for name, data in sectors.items():
+            for ticker in data['stocks']:
+                self._sector_of.setdefault(ticker, name)
+        self.sector_names = list(sectors) + [UNCLASSIFIED]
+        self.priority_names = PRIORITY_ORDER + [UNCLASSIFIED]
+        self._sector_code = {name: i for i, name in enumerate(self.sector_names)}
+        self._priority_code = {name: i for i, name in enumerate(self.priority_names)}
+        self._priority_of = priorities or {}
+
+        self.tickers = []
+        self._slots = {}
+        self._index = pd.Index([], dtype=object)
+        self.quantity = np.zeros(0)
+        self.cost = np.zeros(0)
+        self.price = np.zeros(0)
+        self.sector = np.zeros(0, dtype=np.int32)
+        self.priority = np.zeros(0, dtype=np.int32)
+        self.lot_ids = np.zeros(0, dtype=np.int64)
+        self.lot_slots = np.zeros(0, dtype=np.int64)
+        self.lot_quantity = np.zeros(0)
+        self.lot_price = np.zeros(0)
+
+        self.value = 0.0
+        self.priced_cost = 0.0
+        self.sector_value = np.zeros(len(self.sector_names))
+        self.priority_value = np.zeros(len(self.priority_names))
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return int((self.quantity != 0).sum())
+
+    def _slot_array(self, tickers):
+        """Slot per ticker, appending unseen tickers with their sector/priority codes"""
+        tickers = pd.Index(tickers)
+        slots = self._index.get_indexer(tickers)
+        new = pd.unique(tickers[slots < 0])
+        if len(new):
+            start = len(self.tickers)
+            self.tickers.extend(new)
+            self._slots.update((ticker, start + i) for i, ticker in enumerate(new))
+            self._index = pd.Index(self.tickers, dtype=object)
+            zeros = np.zeros(len(new))
+            self.quantity = np.concatenate([self.quantity, zeros])
+            self.cost = np.concatenate([self.cost, zeros])
+            self.price = np.concatenate([self.price, np.full(len(new), np.nan)])
+            self.sector = np.concatenate([self.sector, np.array(
+                [self._sector_code[self._sector_of.get(t, UNCLASSIFIED)] for t in new], dtype=np.int32)])
+            self.priority = np.concatenate([self.priority, np.array(
+                [self._priority_code[self._priority_of.get(t, UNCLASSIFIED)] for t in new], dtype=np.int32)])
+            slots = self._index.get_indexer(tickers)
+        return slots
+
+    def _apply(self, slots, quantity, cost):
+        """Add quantity/cost deltas to positions and to the totals of those already priced"""
+        np.add.at(self.quantity, slots, quantity)
+        np.add.at(self.cost, slots, cost)
+        price = self.price[slots]
+        priced = ~np.isnan(price)
+        value = np.where(priced, quantity * np.nan_to_num(price), 0.0)
+        self.value += value.sum()
+        self.priced_cost += cost[priced].sum()
+        np.add.at(self.sector_value, self.sector[slots], value)
+        np.add.at(self.priority_value, self.priority[slots], value)
+
+    def load(self, lots):
+        """Add every lot in a ``PortfolioStore.lots()`` frame"""
+        if lots.empty:
+            return
+        with self._lock, tracer.span("portfolio: load", lots=len(lots)):
+            slots = self._slot_array(lots['ticker'])
+            quantity = lots['quantity'].to_numpy(float)
+            price = lots['price'].to_numpy(float)
+            self.lot_ids = np.concatenate([self.lot_ids, lots['id'].to_numpy(np.int64)])
+            self.lot_slots = np.concatenate([self.lot_slots, slots])
+            self.lot_quantity = np.concatenate([self.lot_quantity, quantity])
+            self.lot_price = np.concatenate([self.lot_price, price])
+            self._apply(slots, quantity, quantity * price)
+
+    def add_lot(self, lot_id, ticker, quantity, price):
+        self.load(pd.DataFrame({'id': [lot_id], 'ticker': [ticker], 'quantity': [quantity], 'price': [price]}))
+
+    def remove_lot(self, lot_id):
+        """Take a lot out of the book; False if it is not held"""
+        with self._lock:
+            found = np.flatnonzero(self.lot_ids == lot_id)
+            if not len(found):
+                return False
+            i = found[0]
+            slot, quantity, price = self.lot_slots[i], self.lot_quantity[i], self.lot_price[i]
+            keep = np.arange(len(self.lot_ids)) != i
+            self.lot_ids, self.lot_slots = self.lot_ids[keep], self.lot_slots[keep]
+            self.lot_quantity, self.lot_price = self.lot_quantity[keep], self.lot_price[keep]
+            self._apply(np.array([slot]), np.array([-quantity]), np.array([-quantity * price]))
+        return True
+
+    def mark(self, prices):
+        """Apply new prices (ticker -> price); only held tickers whose price changed are revalued
+
+        Returns the number of positions revalued.
+        """
+        prices = pd.Series(prices, dtype=float).dropna()
+        if prices.empty or not self.tickers:
+            return 0
+        with self._lock:
+            slots = self._index.get_indexer(prices.index)
+            held = slots >= 0
+            slots, new = slots[held], prices.to_numpy()[held]
+            old = self.price[slots]
+            changed = new != old  # NaN (never priced) compares unequal
+            if not changed.any():
+                return 0
+            slots, new, old = slots[changed], new[changed], old[changed]
+            quantity = self.quantity[slots]
+            first = np.isnan(old)
+            delta = quantity * new - np.where(first, 0.0, quantity * np.nan_to_num(old))
+            self.value += delta.sum()
+            self.priced_cost += self.cost[slots][first].sum()
+            np.add.at(self.sector_value, self.sector[slots], delta)
+            np.add.at(self.priority_value, self.priority[slots], delta)
+            self.price[slots] = new
+            self.updates += len(slots)
+            if self.updates >= RESYNC_UPDATES:
+                self._resync()
+        return len(slots)
+
+    def _resync(self):
+        """Recompute the running totals from the position arrays"""
+        priced = ~np.isnan(self.price)
+        value = np.where(priced, self.quantity * np.nan_to_num(self.price), 0.0)
+        self.value = value.sum()
+        self.priced_cost = self.cost[priced].sum()
+        self.sector_value = np.bincount(self.sector, value, minlength=len(self.sector_names))
+        self.priority_value = np.bincount(self.priority, value, minlength=len(self.priority_names))
+        self.updates = 0
+
+    def summary(self):
+        """Book totals from the running sums; P&L covers positions that have a price"""
+        pnl = self.value - self.priced_cost
+        return {
+            'positions': len(self),
+            'lots': len(self.lot_ids),
+            'priced': int(((self.quantity != 0) & ~np.isnan(self.price)).sum()),
+            'value': float(self.value),
+            'cost': float(self.cost.sum()),
+            'pnl': float(pnl),
+            'pnl_%': float(pnl / self.priced_cost * 100) if self.priced_cost else 0.0
+        }
+
+    def exposure(self, by='sector'):
+        """Market value and weight per sector or budget priority, read from the running buckets"""
+        names, values = (self.sector_names, self.sector_value) if by == 'sector' else \
+            (self.priority_names, self.priority_value)
+        order = np.argsort(-values, kind='stable')
+        order = order[np.abs(values[order]) > 1e-6]
+        return pd.DataFrame({by.title(): np.array(names, dtype=object)[order], 'Value': values[order],
+                             'Weight_%': values[order] / self.value * 100 if self.value else 0.0})
+
+    def positions(self, top=None):
+        """Per-ticker quantity, average cost, price, value and P&L; ``top`` keeps the largest by |P&L|"""
+        held = np.flatnonzero(self.quantity != 0)
+        quantity, cost, price = self.quantity[held], self.cost[held], self.price[held]
+        value = quantity * price
+        pnl = value - cost
+        if top is not None and len(held) > top:
+            keep = np.argpartition(-np.nan_to_num(np.abs(pnl), nan=-1.0), top)[:top]
+            held, quantity, cost, price, value, pnl = (a[keep] for a in (held, quantity, cost, price, value, pnl))
+        frame = pd.DataFrame({
+            'Ticker': pd.Categorical.from_codes(held, self.tickers),
+            'Sector': pd.Categorical.from_codes(self.sector[held], self.sector_names),
+            'Priority': pd.Categorical.from_codes(self.priority[held], self.priority_names),
+            'Quantity': quantity,
+            'Avg_Cost': cost / quantity,
+            'Price': price,
+            'Value': value,
+            'PnL': pnl,
+            'PnL_%': pnl / cost * 100
+        })
+        return frame.sort_values('PnL', key=np.abs, ascending=False, na_position='last').reset_index(drop=True)
+
+    def position(self, ticker):
+        """Single-ticker row (quantity, avg cost, price, value, P&L) or None if not held"""
+        slot = self._slots.get(ticker)
+        if slot is None or self.quantity[slot] == 0:
+            return None
+        quantity, cost, price = self.quantity[slot], self.cost[slot], self.price[slot]
+        return {'quantity': quantity, 'avg_cost': cost / quantity, 'price': price,
+                'value': quantity * price, 'pnl': quantity * price - cost, 'pnl_%': (quantity * price / cost - 1) * 100}
+
+    def lots(self):
+        """Lot-level P&L against each ticker's last price"""
+        price = self.price[self.lot_slots]
+        return pd.DataFrame({
+            'Lot': self.lot_ids,
+            'Ticker': pd.Categorical.from_codes(self.lot_slots, self.tickers),
+            'Quantity': self.lot_quantity,
+            'Cost': self.lot_price,
+            'Price': price,
+            'PnL': self.lot_quantity * (price - self.lot_price)
+        })
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_portfolio_store():
+    """Process-wide store at ``PORTFOLIO_DB``"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PortfolioStore()
+        return _store
@@ -0,0 +1,351 @@
+import csv
+import json
+import math
+import os
+import socket
+import time
+from collections import deque
+
+import pandas as pd
+
+# Macro page labels -> feed symbols
+MACRO_SYMBOLS = {
+    'USD/INR': 'USDINR=X',
+    'Crude Oil': 'BZ=F',
+    'Gold': 'GC=F',
+    'Interest Rate': 'IN.REPO'
+}
+
+
+class Tick:
+    """A single trade/quote from the feed"""
+
+    __slots__ = ('ts', 'symbol', 'price', 'volume')
+
+    def __init__(self, ts, symbol, price, volume=0.0):
+        self.ts = float(ts)
+        self.symbol = symbol
+        self.price = float(price)
+        self.volume = float(volume or 0.0)
+
+    @classmethod
+    def from_dict(cls, d):
+        ts = d.get('ts', d.get('timestamp'))
+        if isinstance(ts, str):
+            try:
+                ts = float(ts)
+            except ValueError:
+                ts = pd.Timestamp(ts).timestamp()
+        if not d['symbol']:
+            raise KeyError('symbol')  # blank CSV field
+        return cls(ts, d['symbol'], d['price'], d.get('volume', 0.0))
+
+
+class RunningStats:
+    """Welford running mean/variance, O(1) per update"""
+
+    __slots__ = ('n', 'mean', '_m2')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class EMA:
+    """Exponential moving average seeded with the first value"""
+
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, span):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def update(self, x):
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        return self.value
+
+
+class VWAP:
+    """Cumulative volume-weighted average price"""
+
+    __slots__ = ('_pv', '_v', '_last')
+
+    def __init__(self):
+        self._pv = 0.0
+        self._v = 0.0
+        self._last = None
+
+    def update(self, price, volume):
+        self._last = price
+        if volume > 0:
+            self._pv += price * volume
+            self._v += volume
+
+    @property
+    def value(self):
+        return self._pv / self._v if self._v else self._last
+
+
+class SymbolState:
+    """Incremental statistics for one symbol"""
+
+    __slots__ = ('symbol', 'first', 'last', 'prev', 'ema', 'vwap', 'returns', 'ticks', 'updated')
+
+    def __init__(self, symbol, ema_span):
+        self.symbol = symbol
+        self.first = None
+        self.last = None
+        self.prev = None
+        self.ema = EMA(ema_span)
+        self.vwap = VWAP()
+        self.returns = RunningStats()
+        self.ticks = 0
+        self.updated = None
+
+    def update(self, tick):
+        if self.first is None:
+            self.first = tick.price
+        elif self.last:
+            self.returns.update(tick.price / self.last - 1)
+        self.prev = self.last
+        self.last = tick.price
+        self.ema.update(tick.price)
+        self.vwap.update(tick.price, tick.volume)
+        self.ticks += 1
+        self.updated = tick.ts
+
+    def snapshot(self):
+        return {
+            'symbol': self.symbol,
+            'price': self.last,
+            'change': (self.last - self.prev) if self.prev is not None else 0.0,
+            'return_%': (self.last / self.first - 1) * 100 if self.first else 0.0,
+            'ema': self.ema.value,
+            'vwap': self.vwap.value,
+            'volatility_%': self.returns.std * 100,
+            'ticks': self.ticks
+        }
+
+
+class SectorIndexTracker:
+    """Equal-weighted sector index maintained in O(1) per constituent tick
+
+    level = base_level * mean(price_i / base_price_i); only the ticking
+    stock's relative changes, so the running sum is adjusted by its delta.
+    Constituents that have not ticked yet count at their base (relative 1).
+    """
+
+    def __init__(self, sector, tickers, base_level=1000.0, ema_span=20):
+        self.sector = sector
+        self.base_level = base_level
+        self._n = len(tickers)
+        self._base = {}
+        self._rel = {t: 1.0 for t in tickers}
+        self._rel_sum = float(self._n)
+        self.prev_level = None
+        self.level = base_level
+        self.ema = EMA(ema_span)
+        self.returns = RunningStats()
+
+    def update(self, ticker, price):
+        if ticker not in self._rel or price <= 0:
+            return False
+        base = self._base.setdefault(ticker, price)
+        rel = price / base
+        self._rel_sum += rel - self._rel[ticker]
+        self._rel[ticker] = rel
+
+        self.prev_level = self.level
+        self.level = self.base_level * self._rel_sum / self._n
+        self.ema.update(self.level)
+        if self.prev_level:
+            self.returns.update(self.level / self.prev_level - 1)
+        return True
+
+    def snapshot(self):
+        return {
+            'sector': self.sector,
+            'level': self.level,
+            'change': self.level - self.prev_level if self.prev_level else 0.0,
+            'return_%': (self.level / self.base_level - 1) * 100,
+            'ema': self.ema.value,
+            'volatility_%': self.returns.std * 100
+        }
+
+
+class QuoteStreamEngine:
+    """Apply ticks incrementally and collect deltas for the UI"""
+
+    def __init__(self, sectors, ema_span=20):
+        self.ema_span = ema_span
+        self.symbols = {}
+        self.sector_trackers = {name: SectorIndexTracker(name, data['stocks'], ema_span=ema_span)
+                                for name, data in sectors.items()}
+        self._sectors_by_ticker = {}
+        for name, data in sectors.items():
+            for ticker in data['stocks']:
+                self._sectors_by_ticker.setdefault(ticker, []).append(name)
+        self._dirty_symbols = set()
+        self._dirty_sectors = set()
+        self.ticks_processed = 0
+
+    def on_tick(self, tick):
+        state = self.symbols.get(tick.symbol)
+        if state is None:
+            state = self.symbols[tick.symbol] = SymbolState(tick.symbol, self.ema_span)
+        state.update(tick)
+        self._dirty_symbols.add(tick.symbol)
+        for sector in self._sectors_by_ticker.get(tick.symbol, ()):
+            if self.sector_trackers[sector].update(tick.symbol, tick.price):
+                self._dirty_sectors.add(sector)
+        self.ticks_processed += 1
+
+    def consume(self, ticks):
+        for tick in ticks:
+            self.on_tick(tick)
+
+    def drain_deltas(self):
+        """Snapshots of symbols/sectors that changed since the last drain"""
+        deltas = {
+            'symbols': {s: self.symbols[s].snapshot() for s in self._dirty_symbols},
+            'sectors': {s: self.sector_trackers[s].snapshot() for s in self._dirty_sectors}
+        }
+        self._dirty_symbols.clear()
+        self._dirty_sectors.clear()
+        return deltas
+
+    def symbol(self, symbol):
+        state = self.symbols.get(symbol)
+        return state.snapshot() if state else None
+
+    def sector_table(self):
+        return pd.DataFrame([t.snapshot() for t in self.sector_trackers.values()])
+
+
+class ReplayFeed:
+    """Replay ticks from a CSV (timestamp,symbol,price,volume) or JSONL file
+
+    speed=1.0 paces ticks in real time relative to the first tick, larger
+    values replay faster, and 0 releases everything as fast as it's polled.
+    """
+
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+        self._file = open(path, encoding='utf-8')
+        self._is_csv = not path.endswith(('.jsonl', '.json'))
+        self._reader = csv.DictReader(self._file) if self._is_csv else None
+        self._pending = None
+        self._t0 = None
+        self._wall0 = None
+        self.exhausted = False
+        self.skipped = 0  # rows that were not a valid tick
+
+    def _next(self):
+        if self._pending is not None:
+            tick, self._pending = self._pending, None
+            return tick
+        while True:
+            try:
+                if self._is_csv:
+                    row = next(self._reader)
+                else:
+                    line = ''
+                    while not line.strip():
+                        line = next(self._file)
+                    row = json.loads(line)
+                tick = Tick.from_dict(row)
+            except StopIteration:
+                self.exhausted = True
+                return None
+            except (AttributeError, KeyError, TypeError, ValueError):
+                self.skipped += 1
+                continue
+            return tick
+
+    def poll(self, max_ticks=10000):
+        """Return ticks that are due now (never blocks)"""
+        ticks = []
+        now = time.monotonic()
+        while len(ticks) < max_ticks:
+            tick = self._next()
+            if tick is None:
+                break
+            if self._t0 is None:
+                self._t0, self._wall0 = tick.ts, now
+            if self.speed and (tick.ts - self._t0) / self.speed > now - self._wall0:
+                self._pending = tick
+                break
+            ticks.append(tick)
+        return ticks
+
+    def close(self):
+        self._file.close()
+
+
+class SocketFeed:
+    """Line-delimited JSON ticks from a TCP socket (stand-in for the exchange feed)"""
+
+    def __init__(self, host, port, timeout=5.0):
+        self._sock = socket.create_connection((host, int(port)), timeout=timeout)
+        self._sock.setblocking(False)
+        self._buffer = b''
+        self._backlog = deque()
+        self.exhausted = False
+        self.skipped = 0  # lines that were not a valid tick
+
+    def poll(self, max_ticks=10000):
+        try:
+            while True:
+                chunk = self._sock.recv(65536)
+                if not chunk:
+                    self.exhausted = True
+                    break
+                self._buffer += chunk
+        except BlockingIOError:
+            pass
+        except OSError:
+            # Reset or broken connection: the ticks already received are still served
+            self.exhausted = True
+        *lines, self._buffer = self._buffer.split(b'\n')
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                self._backlog.append(Tick.from_dict(json.loads(line)))
+            except (AttributeError, KeyError, TypeError, ValueError):
+                self.skipped += 1
+        return [self._backlog.popleft() for _ in range(min(max_ticks, len(self._backlog)))]
+
+    def close(self):
+        self._sock.close()
+
+
+def feed_from_env():
+    """Build the feed named by QUOTE_FEED ('replay:<path>[@speed]' or 'socket:<host>:<port>')"""
+    spec = os.getenv('QUOTE_FEED')
+    if not spec:
+        return None
+    kind, _, target = spec.partition(':')
+    if kind == 'replay':
+        path, _, speed = target.partition('@')
+        return ReplayFeed(path, speed=float(speed) if speed else 1.0)
+    if kind == 'socket':
+        host, _, port = target.rpartition(':')
+        return SocketFeed(host, port)
+    raise ValueError(f"Unknown QUOTE_FEED '{spec}'")
@@ -1,12 +1,53 @@
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
+from memory_layout import compact_ohlcv
+from data_providers import get_provider, MACRO_DEFAULTS
+from corporate_actions import get_corporate_actions
+from fetch_planner import get_fetch_planner, SESSION_CLOSE
+from macro_store import MacroStore
+from performance_tracker import tracer
 
+class StockSummary:
+    """Per-stock summary record (slots keep thousands of these small)"""
+    
+    __slots__ = ('name', 'ticker', 'returns', 'pe_ratio', 'market_cap', 'current_price')
+    
+    def __init__(self, name, ticker, returns, pe_ratio, market_cap, current_price):
+        self.name = name
+        self.ticker = ticker
+        self.returns = returns
+        self.pe_ratio = pe_ratio
+        self.market_cap = market_cap
+        self.current_price = current_price
+    
+    def __getitem__(self, key):
+        # Dict-style access kept for callers written against the old dict records
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+    
+    def __repr__(self):
+        return f"StockSummary({self.ticker}, returns={self.returns})"
+
+@tracer.instrument
 class SectorAnalyzer:
     """Analyze sector performance and fundamentals"""
     
-    def __init__(self):
+    def __init__(self, compact=False, tick_store=None, provider=None, actions=None, planner=None):
+        # compact: float32/int32 prices and categorical labels for large universes
+        self.compact = compact
         self.sectors = self._load_sector_data()
+        self.price_history = None
+        self.tick_store = tick_store
+        self.provider = provider or get_provider()
+        self.actions = actions or get_corporate_actions()
+        # Every daily fetch goes through the planner: cached sessions are never requested again
+        self.planner = planner or get_fetch_planner(self.provider)
     
     def _load_sector_data(self):
         """Load sector indices and stocks"""
@@ -43,30 +84,51 @@ class SectorAnalyzer:
             }
         }
     
+    def get_histories(self, tickers, period='6mo', adjusted=True):
+        """Daily bars per ticker, fetched together through the planner and adjusted unless ``adjusted=False``
+        
+        Actions reported alongside the bars are recorded first, so the cached
+        history never has to be rewritten. The bars already carry splits, so
+        adjusting only applies dividends.
+        """
+        histories = self.planner.histories(tickers, period=period)
+        for ticker, hist in histories.items():
+            if not hist.empty:
+                self.actions.ingest(ticker, hist)
+                if adjusted:
+                    histories[ticker] = self.actions.adjust(hist, ticker)
+        return histories
+    
+    def get_history(self, ticker, period='6mo', interval='1d', adjusted=True):
+        """Bars for one ticker; daily bars come from ``get_histories``, intraday ones straight from the provider"""
+        if interval == '1d':
+            return self.get_histories([ticker], period=period, adjusted=adjusted)[ticker]
+        return self.provider.history(ticker, period=period, interval=interval)
+    
+    def _performance(self, sector, raw):
+        """Performance record of a sector index from its raw bars: total return (adjusted) and price return (raw)"""
+        if raw.empty:
+            return None
+        hist = self.actions.adjust(raw, self.sectors[sector]['index'])
+        returns = ((hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]) * 100
+        raw_returns = ((raw['Close'].iloc[-1] - raw['Close'].iloc[0]) / raw['Close'].iloc[0]) * 100
+        
+        return {
+            'sector': sector,
+            'returns': round(returns, 2),
+            'raw_returns': round(raw_returns, 2),
+            'current_price': round(raw['Close'].iloc[-1], 2),
+            'high': round(hist['High'].max(), 2),
+            'low': round(hist['Low'].min(), 2)
+        }
+    
     def get_sector_performance(self, sector, period='6mo'):
-        """Get sector index performance"""
+        """Get sector index performance: total return (adjusted) and price return (raw)"""
         try:
             sector_data = self.sectors.get(sector)
             if not sector_data:
                 return None
-            
-            index = yf.Ticker(sector_data['index'])
-            hist = index.history(period=period)
-            
-            if hist.empty:
-                return None
-            
-            start_price = hist['Close'].iloc[0]
-            end_price = hist['Close'].iloc[-1]
-            returns = ((end_price - start_price) / start_price) * 100
-            
-            return {
-                'sector': sector,
-                'returns': round(returns, 2),
-                'current_price': round(end_price, 2),
-                'high': round(hist['High'].max(), 2),
-                'low': round(hist['Low'].min(), 2)
-            }
+            return self._performance(sector, self.get_history(sector_data['index'], period=period, adjusted=False))
         except:
             return None
     
@@ -77,39 +139,164 @@ class SectorAnalyzer:
             return []
         
         stocks_performance = []
+        histories = self.get_histories(sector_data['stocks'], period='6mo')
         for ticker, name in zip(sector_data['stocks'], sector_data['names']):
             try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period='6mo')
-                info = stock.info
+                hist = histories[ticker]
+                info = self.provider.info(ticker)
                 
                 if not hist.empty:
                     returns = ((hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]) * 100
                     
-                    stocks_performance.append({
-                        'name': name,
-                        'ticker': ticker,
-                        'returns': round(returns, 2),
-                        'pe_ratio': info.get('trailingPE', 'N/A'),
-                        'market_cap': info.get('marketCap', 0) / 10000000,  # In Crores
-                        'current_price': round(hist['Close'].iloc[-1], 2)
-                    })
+                    stocks_performance.append(StockSummary(
+                        name=name,
+                        ticker=ticker,
+                        returns=round(float(returns), 2),
+                        pe_ratio=info.get('trailingPE', 'N/A'),
+                        market_cap=info.get('marketCap', 0) / 10000000,  # In Crores
+                        current_price=round(float(hist['Close'].iloc[-1]), 2)
+                    ))
             except:
                 continue
         
-        return sorted(stocks_performance, key=lambda x: x['returns'], reverse=True)
+        return sorted(stocks_performance, key=lambda x: x.returns, reverse=True)
+    
+    def load_price_history(self, sectors=None, period='6mo'):
+        """Load OHLCV for every stock into one long frame (Date, Ticker, Sector, OHLCV)
+        
+        In compact mode prices are float32, volume int32 and Ticker/Sector are
+        categoricals, roughly halving the footprint of a full-universe frame.
+        """
+        frames = []
+        tickers = []
+        sector_labels = []
+        sectors = [sector for sector in sectors or self.sectors.keys() if self.sectors.get(sector)]
+        histories = self.get_histories([t for sector in sectors for t in self.sectors[sector]['stocks']], period=period)
+        for sector in sectors:
+            for ticker in self.sectors[sector]['stocks']:
+                hist = histories[ticker]
+                if hist.empty:
+                    continue
+                hist = hist[['Open', 'High', 'Low', 'Close', 'Volume']]
+                frames.append(compact_ohlcv(hist) if self.compact else hist)
+                tickers.append(ticker)
+                sector_labels.append(sector)
+        
+        if not frames:
+            self.price_history = pd.DataFrame(columns=['Date', 'Ticker', 'Sector', 'Open', 'High', 'Low', 'Close', 'Volume'])
+            return self.price_history
+        
+        lengths = [len(f) for f in frames]
+        df = pd.concat(frames)
+        df.index.name = 'Date'
+        df = df.reset_index()
+        ticker_col = np.repeat(tickers, lengths)
+        sector_col = np.repeat(sector_labels, lengths)
+        if self.compact:
+            df.insert(1, 'Ticker', pd.Categorical(ticker_col, categories=list(dict.fromkeys(tickers))))
+            df.insert(2, 'Sector', pd.Categorical(sector_col, categories=list(dict.fromkeys(sector_labels))))
+        else:
+            df.insert(1, 'Ticker', ticker_col)
+            df.insert(2, 'Sector', sector_col)
+        
+        self.price_history = df
+        return df
+    
+    def get_price_matrix(self, sectors=None, period='1y', fields=('High', 'Low', 'Close'), tickers=None,
+                         adjusted=False):
+        """Fetch all sector stocks (or explicit ``tickers``) in one batched download as wide (dates x tickers) frames
+        
+        Bars are raw; ``adjusted=True`` applies stored splits/dividends to the
+        tickers that have any (split factors only for 'Volume').
+        """
+        if tickers is None:
+            tickers = [t for sector in (sectors or self.sectors.keys())
+                       for t in self.sectors.get(sector, {}).get('stocks', [])]
+        tickers = list(tickers)
+        if not tickers:
+            return {field: pd.DataFrame() for field in fields}
+        wanted = tuple(dict.fromkeys(tuple(fields) + (('Close',) if adjusted else ())))
+        raw = self.planner.matrix(tickers, period=period, fields=wanted)
+        if raw is None:
+            raw = self._download_matrix(tickers, period, wanted)
+        matrices = {}
+        for field in fields:
+            frame = raw[field].astype(np.float32 if self.compact else np.float64)
+            if adjusted and not frame.empty:
+                frame = self.actions.adjust_matrix(frame, raw['Close'].reindex(frame.index), volume=field == 'Volume')
+            matrices[field] = frame
+        return matrices
+    
+    def _download_matrix(self, tickers, period, fields):
+        """One blind batched download, for periods the planner cannot express as sessions ('max')"""
+        try:
+            data = self.provider.download(tickers, period=period)
+        except:
+            return {field: pd.DataFrame() for field in fields}
+        matrices = {}
+        for field in fields:
+            frame = data[field] if field in data.columns.get_level_values(0) else pd.DataFrame()
+            if isinstance(frame, pd.Series):
+                frame = frame.to_frame(tickers[0])
+            matrices[field] = frame.dropna(how='all')
+        return matrices
+    
+    def ticker_labels(self):
+        """Map ticker -> display name and ticker -> sector for every tracked stock"""
+        names, sectors = {}, {}
+        for sector, data in self.sectors.items():
+            for ticker, name in zip(data['stocks'], data['names']):
+                names[ticker] = name
+                sectors[ticker] = sector
+        return names, sectors
+    
+    def record_intraday(self, ticker, period='5d', interval='1m'):
+        """Fetch recent intraday bars and append the new ones to the tick store"""
+        if self.tick_store is None:
+            return 0
+        calendar = self.planner.calendar
+        last = self.tick_store.last_timestamp(ticker)
+        if last is not None and not calendar.is_open() and \
+                last.tz_localize(None) >= calendar.last_complete() + SESSION_CLOSE - pd.Timedelta(minutes=1):
+            return 0  # already holds the last session's closing bar; nothing trades until the next open
+        try:
+            hist = self.provider.history(ticker, period=period, interval=interval)
+        except:
+            return 0
+        return self.tick_store.append(ticker, hist)
+    
+    def get_intraday_bars(self, ticker, freq='5m', start=None, end=None):
+        """Resample stored intraday data for a time slice into 1m/5m/1d bars"""
+        if self.tick_store is None:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+        return self.tick_store.resample(ticker, freq, start, end)
     
     def compare_sectors(self, period='6mo'):
         """Compare performance across all sectors"""
         comparison = []
+        indices = {sector: data['index'] for sector, data in self.sectors.items()}
+        histories = self.get_histories(list(indices.values()), period=period, adjusted=False)
         
-        for sector in self.sectors.keys():
-            perf = self.get_sector_performance(sector, period)
+        for sector, index in indices.items():
+            try:
+                perf = self._performance(sector, histories[index])
+            except:
+                continue
             if perf:
                 comparison.append(perf)
         
         return sorted(comparison, key=lambda x: x['returns'], reverse=True)
     
+    def get_sector_returns(self, period='2y'):
+        """Daily close-to-close returns of every sector index in one batched download (dates x sectors)"""
+        indices = {data['index']: sector for sector, data in self.sectors.items()}
+        close = self.get_price_matrix(tickers=list(indices), period=period, fields=('Close',))['Close']
+        if close.empty:
+            return pd.DataFrame(columns=list(self.sectors))
+        close = close.rename(columns=indices)
+        close = close[[sector for sector in self.sectors if sector in close.columns]]
+        return close.astype(np.float64).sort_index().pct_change(fill_method=None).iloc[1:]
+    
     def get_sector_fundamentals(self, sector):
         """Get average fundamentals for sector"""
         sector_data = self.sectors.get(sector)
@@ -122,8 +309,7 @@ class SectorAnalyzer:
         
         for ticker in sector_data['stocks']:
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                info = self.provider.info(ticker)
                 
                 if 'trailingPE' in info and info['trailingPE']:
                     pe_ratios.append(info['trailingPE'])
@@ -141,35 +327,32 @@ class SectorAnalyzer:
             'avg_roe': round(sum(roe_values) / len(roe_values), 2) if roe_values else 'N/A'
         }
 
+@tracer.instrument
 class MacroEconomicData:
     """Fetch macro economic indicators"""
     
     @staticmethod
-    def get_indicators():
-        """Get current macro indicators (mock data - integrate with real APIs)"""
-        return {
-            'gdp_growth': 7.2,
-            'inflation_cpi': 5.1,
-            'repo_rate': 6.5,
-            'usd_inr': 83.2,
-            'crude_oil': 82.5,
-            'gold_price': 62500,
-            'fii_inflow': 15000,  # Crores
-            'dii_inflow': 18000   # Crores
-        }
+    def get_indicators(provider=None):
+        """Get current macro indicators (market-priced ones from the provider, the rest static)"""
+        try:
+            return (provider or get_provider()).macro()
+        except:
+            return dict(MACRO_DEFAULTS)
     
     @staticmethod
-    def get_gdp_trend():
-        """Get GDP growth trend"""
+    def get_gdp_trend(quarters=5):
+        """Get GDP growth trend (latest releases from the macro store)"""
+        gdp = MacroStore.reference().series('gdp_growth').iloc[-quarters:]
         return pd.DataFrame({
-            'Quarter': ['Q1 2023', 'Q2 2023', 'Q3 2023', 'Q4 2023', 'Q1 2024'],
-            'GDP_Growth': [6.1, 6.3, 7.6, 8.4, 7.2]
+            'Quarter': gdp.index.strftime('%b %Y'),
+            'GDP_Growth': gdp.to_numpy()
         })
     
     @staticmethod
-    def get_inflation_trend():
-        """Get inflation trend"""
+    def get_inflation_trend(months=6):
+        """Get inflation trend (latest releases from the macro store)"""
+        cpi = MacroStore.reference().series('inflation_cpi').iloc[-months:]
         return pd.DataFrame({
-            'Month': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
-            'CPI': [5.7, 5.9, 4.9, 4.8, 4.7, 5.1]
+            'Month': cpi.index.strftime('%b %y'),
+            'CPI': cpi.to_numpy()
         })
@@ -0,0 +1,172 @@
+"""Rolling multi-factor regression of sector returns on macro factor changes
+
+For every window length, every trailing window and every sector the model
+
+    return = alpha + sum_j beta_j * change_j
+
+is solved at once: the normal equations X'X (shared by all sectors) and X'Y
+come from cumulative sums over the rows, and ``np.linalg.solve`` factors all
+the (k x k) systems in one batched call. ``extend`` handles new trading days
+incrementally by adding the new row to the running sums and dropping the row
+that leaves each window, so a daily refresh costs O(windows * k^2 * sectors).
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from macro_store import INDICATORS
+from performance_tracker import tracer
+
+DEFAULT_FACTORS = ('repo_rate', 'crude_oil', 'usd_inr')
+DEFAULT_WINDOWS = (63, 126, 252, 504)
+
+
+def _windowed(cumulative, window):
+    """Trailing ``window``-row sums from cumulative sums along axis 0"""
+    out = cumulative.copy()
+    out[window:] -= cumulative[:-window]
+    return out
+
+
+def solve_normal_equations(xtx, xty, dead):
+    """Batched OLS coefficients from (..., k, k) X'X and (..., k, S) X'Y
+
+    Factors flagged in ``dead`` (..., k) did not move enough within the window;
+    their row/column is replaced by the identity so the remaining factors are
+    still estimated, and their coefficients come back as NaN.
+    """
+    xtx, xty = xtx.copy(), xty.copy()
+    rows = np.nonzero(dead)
+    xtx[rows[:-1] + (rows[-1], slice(None))] = 0.0
+    xtx[rows[:-1] + (slice(None), rows[-1])] = 0.0
+    xtx[rows + (rows[-1],)] = 1.0
+    xty[rows[:-1] + (rows[-1], slice(None))] = 0.0
+    try:
+        coef = np.linalg.solve(xtx, xty)
+    except np.linalg.LinAlgError:
+        # Collinear factors in some window: minimum-norm solution for the whole batch
+        coef = np.linalg.pinv(xtx) @ xty
+    coef[rows[:-1] + (rows[-1], slice(None))] = np.nan
+    return coef
+
+
+class SectorRegression:
+    """Rolling alphas/betas of each sector on the daily changes of ``factors``"""
+
+    def __init__(self, factors=DEFAULT_FACTORS, windows=DEFAULT_WINDOWS, min_moves=2):
+        self.factors = list(factors)
+        self.windows = sorted(windows)
+        self.min_moves = min_moves
+        self.sectors = []
+        self.index = pd.DatetimeIndex([])
+        self._chunks = {}
+        self._coef = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _design(changes):
+        x = np.column_stack([np.ones(len(changes)), changes])
+        return x, (x != 0).astype(float)
+
+    def fit(self, returns, changes):
+        """Solve every window position; ``changes`` is (dates x factors) aligned to ``returns``"""
+        data = pd.concat([returns, changes[self.factors]], axis=1, keys=['y', 'x']).dropna()
+        y = data['y'].to_numpy(dtype=float)
+        x, moved = self._design(data['x'].to_numpy(dtype=float))
+        with tracer.span("regression: fit", rows=len(y), sectors=y.shape[1], windows=len(self.windows)):
+            cum_xtx = np.cumsum(x[:, :, None] * x[:, None, :], axis=0)
+            cum_xty = np.cumsum(x[:, :, None] * y[:, None, :], axis=0)
+            cum_moves = np.cumsum(moved, axis=0)
+            chunks, sums = {}, {}
+            for window in self.windows:
+                xtx, xty = _windowed(cum_xtx, window), _windowed(cum_xty, window)
+                moves = _windowed(cum_moves, window)
+                dead = moves < self.min_moves
+                dead[:, 0] = False  # intercept
+                coef = solve_normal_equations(xtx, xty, dead)
+                coef[:window - 1] = np.nan
+                chunks[window] = [coef]
+                sums[window] = [xtx[-1].copy(), xty[-1].copy(), moves[-1].copy()]
+        with self._lock:
+            self.sectors = list(data['y'].columns)
+            self.index = data.index
+            self._chunks = chunks
+            self._sums = sums
+            self._coef = {}
+            # Rows still inside the longest window (plus the one about to leave it)
+            self._x = x[-self.windows[-1] - 1:]
+            self._y = y[-self.windows[-1] - 1:]
+            self._moved = moved[-self.windows[-1] - 1:]
+        return self
+
+    def extend(self, returns, changes):
+        """Apply rows after the last fitted date one day at a time; refit if history changed"""
+        data = pd.concat([returns, changes[self.factors]], axis=1, keys=['y', 'x']).dropna()
+        if not len(self.index) or list(data['y'].columns) != self.sectors or \
+                not data.index[:len(self.index)].equals(self.index):
+            return self.fit(returns, changes)
+        new = data.loc[data.index > self.index[-1]]
+        for date, row in zip(new.index, new.itertuples(index=False)):
+            values = np.asarray(row, dtype=float)
+            self.update(date, values[:len(self.sectors)], values[len(self.sectors):])
+        return self
+
+    def update(self, date, returns_row, changes_row):
+        """Add one trading day to every window's running sums: O(k^2 * sectors) per window"""
+        x_row, moved_row = self._design(np.asarray(changes_row, dtype=float)[None, :])
+        y_row = np.asarray(returns_row, dtype=float)[None, :]
+        with self._lock, tracer.span("regression: update", sectors=len(self.sectors)):
+            keep = self.windows[-1] + 1
+            self._x = np.vstack([self._x, x_row])[-keep:]
+            self._y = np.vstack([self._y, y_row])[-keep:]
+            self._moved = np.vstack([self._moved, moved_row])[-keep:]
+            for window in self.windows:
+                xtx, xty, moves = self._sums[window]
+                xtx += np.outer(x_row[0], x_row[0])
+                xty += np.outer(x_row[0], y_row[0])
+                moves += moved_row[0]
+                if len(self._x) > window:
+                    old_x, old_y = self._x[-window - 1], self._y[-window - 1]
+                    xtx -= np.outer(old_x, old_x)
+                    xty -= np.outer(old_x, old_y)
+                    moves -= self._moved[-window - 1]
+                if len(self.index) + 1 < window:
+                    coef = np.full((1, len(self.factors) + 1, len(self.sectors)), np.nan)
+                else:
+                    dead = moves < self.min_moves
+                    dead[0] = False
+                    coef = solve_normal_equations(xtx, xty, dead)[None]
+                self._chunks[window].append(coef)
+                self._coef.pop(window, None)
+            self.index = self.index.append(pd.DatetimeIndex([date]))
+
+    def coefficients(self, window):
+        """(dates x k+1 x sectors) coefficient array for ``window``; chunks joined lazily"""
+        with self._lock:
+            if window not in self._coef:
+                self._coef[window] = np.concatenate(self._chunks[window], axis=0)
+                self._chunks[window] = [self._coef[window]]
+            return self._coef[window]
+
+    def betas(self, factor, window):
+        """Rolling beta of every sector on ``factor`` (dates x sectors)"""
+        coef = self.coefficients(window)[:, 1 + self.factors.index(factor), :]
+        return pd.DataFrame(coef, index=self.index, columns=self.sectors)
+
+    def latest(self, window, labels=True):
+        """Most recent betas (sectors x factors), labelled for display by default"""
+        coef = self.coefficients(window)[-1, 1:, :].T
+        columns = [INDICATORS.get(f, f) for f in self.factors] if labels else self.factors
+        return pd.DataFrame(coef, index=self.sectors, columns=columns)
+
+    def sensitivity_ranking(self, window):
+        """Sectors ordered by the largest absolute standardized beta across factors
+
+        Each beta is scaled by its factor's std over the sector's own return
+        std, so volatile sectors do not outrank steadier ones by scale alone.
+        """
+        x = self._x[-window:, 1:]
+        sector_std = pd.Series(self._y[-window:].std(axis=0), index=self.sectors).replace(0.0, np.nan)
+        exposure = (self.latest(window, labels=False).abs() * x.std(axis=0)).div(sector_std, axis=0)
+        return exposure.max(axis=1).sort_values(ascending=False)
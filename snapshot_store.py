@@ -0,0 +1,268 @@
+"""Versioned, content-addressed snapshots of the datasets behind each page
+
+``SnapshotStore.save(name, value)`` splits a dataset into chunks, stores each
+chunk compressed under the SHA-256 of its bytes and writes a small JSON
+manifest listing the chunk hashes. A chunk that already exists is never
+written again, so a new version only costs the chunks that changed. Frames
+on a ``DatetimeIndex`` are chunked by calendar month, which keeps the
+boundaries stable when a rolling '1y' window moves forward and most months
+dedupe. Other frames are chunked every ``CHUNK_ROWS`` rows. Any other
+object (dicts, event lists, ``MacroStore``) is a single chunk.
+
+``load(name, as_of)`` picks the last version saved at or before ``as_of``
+and only reads the chunks it needs: the requested keys of a dict of frames,
+and only the months overlapping ``start``/``end``. ``versioned()`` is the
+loader hook: live data is recorded as it is produced, and with ``as_of`` set
+the recorded version is returned instead. It returns ``Versioned(value,
+live, name)``: ``live`` is set when nothing was recorded by ``as_of`` and
+the live value was served instead, so a page never passes live data off as
+the record.
+
+Layout under ``SNAPSHOT_DIR`` (default ``data/snapshots``)::
+
+    chunks/<ab>/<sha256>                  zlib-compressed pickle
+    manifests/<dataset>/<epoch ns>.json   one file per version
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+import zlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from performance_tracker import tracer
+
+CHUNK_ROWS = 10_000
+CACHE_CHUNKS = 256
+
+Versioned = namedtuple('Versioned', ['value', 'live', 'name'])
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _normalize(frame):
+    """Same content -> same pickle bytes: fresh consolidated blocks and no index ``freq``"""
+    frame = frame.copy()
+    if isinstance(frame.index, pd.DatetimeIndex):
+        frame.index = frame.index._with_freq(None)
+    return frame
+
+
+def _boundaries(index):
+    """Row offsets where chunks start: month starts for sorted datetimes, else every ``CHUNK_ROWS``"""
+    if isinstance(index, pd.DatetimeIndex) and index.is_monotonic_increasing and len(index):
+        months = index.year * 12 + index.month
+        return [0] + (np.flatnonzero(np.diff(months)) + 1).tolist() + [len(index)]
+    return list(range(0, len(index), CHUNK_ROWS)) + [len(index)]
+
+
+class SnapshotStore:
+    """Content-addressed chunk files plus one JSON manifest per dataset version"""
+
+    def __init__(self, root=None, cache_chunks=CACHE_CHUNKS):
+        self.root = root or os.getenv('SNAPSHOT_DIR', os.path.join('data', 'snapshots'))
+        os.makedirs(os.path.join(self.root, 'chunks'), exist_ok=True)
+        os.makedirs(os.path.join(self.root, 'manifests'), exist_ok=True)
+        self.cache_chunks = cache_chunks
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.chunks_written = 0
+        self.chunks_read = 0
+
+    def _manifest_dir(self, name):
+        safe = re.sub(r'[^A-Za-z0-9._-]', lambda m: f"%{ord(m.group()):02X}", name)
+        return os.path.join(self.root, 'manifests', safe)
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.root, 'chunks', digest[:2], digest)
+
+    # ---- writing ----
+
+    def _put(self, obj):
+        """Store ``obj`` once under the hash of its pickle; returns (hash, stored bytes)"""
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = _digest(data)
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = zlib.compress(data)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+        self.chunks_written += 1
+        return digest, len(payload)
+
+    def _put_frame(self, frame):
+        series = isinstance(frame, pd.Series)
+        frame = _normalize(frame.to_frame() if series else frame)
+        bounds = _boundaries(frame.index)
+        dated = isinstance(frame.index, pd.DatetimeIndex) and frame.index.is_monotonic_increasing
+        chunks, written = [], 0
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            digest, size = self._put(frame.iloc[lo:hi])
+            written += size
+            chunk = {'hash': digest, 'rows': hi - lo}
+            if dated:
+                chunk['first'], chunk['last'] = frame.index[lo].isoformat(), frame.index[hi - 1].isoformat()
+            chunks.append(chunk)
+        if not chunks:  # keep the (empty) schema
+            digest, written = self._put(frame)
+            chunks.append({'hash': digest, 'rows': 0})
+        return {'kind': 'series' if series else 'frame', 'chunks': chunks}, written
+
+    def save(self, name, value, saved_at=None):
+        """Record a version of ``name``; unchanged content adds no version. Returns the bytes written"""
+        with tracer.span(f"snapshot: save {name}"):
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                manifest, written = self._put_frame(value)
+            elif isinstance(value, dict) and value and \
+                    all(isinstance(v, (pd.DataFrame, pd.Series)) for v in value.values()):
+                parts, written = {}, 0
+                for key, frame in value.items():
+                    parts[key], size = self._put_frame(frame)
+                    written += size
+                manifest = {'kind': 'frames', 'parts': parts}
+            else:
+                digest, written = self._put(value)
+                manifest = {'kind': 'object', 'chunks': [{'hash': digest, 'rows': 0}]}
+            digest = _digest(json.dumps(manifest, sort_keys=True).encode())
+            tracer.add_bytes(written)
+            if self._newest_digest(name) == digest:
+                return 0
+
+            saved_at = pd.Timestamp(saved_at) if saved_at is not None else pd.Timestamp.now()
+            manifest.update(dataset=name, digest=digest, saved_at=saved_at.isoformat())
+            folder = self._manifest_dir(name)
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"{saved_at.value}.json"), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            return written
+
+    def _newest_digest(self, name):
+        try:
+            return self.manifest(name)['digest']
+        except KeyError:
+            return None
+
+    # ---- reading ----
+
+    def datasets(self):
+        return sorted(os.listdir(os.path.join(self.root, 'manifests')))
+
+    def versions(self, name):
+        """Save times of every version of ``name``, oldest first"""
+        folder = self._manifest_dir(name)
+        if not os.path.isdir(folder):
+            return []
+        stamps = sorted(int(f[:-5]) for f in os.listdir(folder) if f.endswith('.json'))
+        return [pd.Timestamp(ns) for ns in stamps]
+
+    def manifest(self, name, as_of=None):
+        """Manifest of the newest version saved at or before ``as_of``; KeyError if there is none"""
+        versions = self.versions(name)
+        if as_of is not None:
+            as_of = pd.Timestamp(as_of)
+            versions = [v for v in versions if v <= as_of]
+        if not versions:
+            raise KeyError(f"no snapshot of {name!r}" + (f" as of {as_of}" if as_of is not None else ''))
+        with open(os.path.join(self._manifest_dir(name), f"{versions[-1].value}.json"), encoding='utf-8') as f:
+            return json.load(f)
+
+    def _get(self, digest):
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+        with open(self._chunk_path(digest), 'rb') as f:
+            value = pickle.loads(zlib.decompress(f.read()))
+        with self._lock:
+            self.chunks_read += 1
+            self._cache[digest] = value
+            while len(self._cache) > self.cache_chunks:
+                self._cache.popitem(last=False)
+        return value
+
+    def _load_frame(self, part, start=None, end=None):
+        chunks = part['chunks']
+        if start is not None:
+            chunks = [c for c in chunks if 'last' not in c or pd.Timestamp(c['last']) >= pd.Timestamp(start)]
+        if end is not None:
+            chunks = [c for c in chunks if 'first' not in c or pd.Timestamp(c['first']) <= pd.Timestamp(end)]
+        frames = [self._get(c['hash']) for c in chunks] or [self._get(part['chunks'][0]['hash']).iloc[:0]]
+        frame = pd.concat(frames) if len(frames) > 1 else frames[0].copy()
+        if isinstance(frame.index, pd.DatetimeIndex) and (start is not None or end is not None):
+            frame = frame.loc[start:end]
+        return frame.iloc[:, 0] if part['kind'] == 'series' else frame
+
+    def load(self, name, as_of=None, start=None, end=None, keys=None):
+        """Dataset as of ``as_of`` (newest if None), reading only the chunks in ``start``..``end`` / ``keys``"""
+        manifest = self.manifest(name, as_of)
+        with tracer.span(f"snapshot: load {name}", version=manifest['saved_at']):
+            if manifest['kind'] == 'object':
+                return pickle.loads(pickle.dumps(self._get(manifest['chunks'][0]['hash'])))
+            if manifest['kind'] == 'frames':
+                keys = keys if keys is not None else list(manifest['parts'])
+                return {key: self._load_frame(manifest['parts'][key], start, end)
+                        for key in keys if key in manifest['parts']}
+            return self._load_frame(manifest, start, end)
+
+    def stats(self):
+        """Versions per dataset and bytes on disk, to show how much deduplication saves"""
+        rows = []
+        for name in self.datasets():
+            versions = self.versions(name)
+            rows.append({'dataset': name, 'versions': len(versions),
+                         'first': versions[0] if versions else None, 'last': versions[-1] if versions else None})
+        chunk_bytes = sum(entry.stat().st_size for folder in os.scandir(os.path.join(self.root, 'chunks'))
+                          if folder.is_dir() for entry in os.scandir(folder.path))
+        return pd.DataFrame(rows, columns=['dataset', 'versions', 'first', 'last']), chunk_bytes
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store():
+    """Process-wide store at ``SNAPSHOT_DIR``"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore()
+        return _store
+
+
+def versioned(name, produce, as_of=None, store=None, **load_kwargs):
+    """``Versioned`` result: ``produce()`` recorded as the latest version of ``name``, or the version as of ``as_of``
+
+    Falls back to the live value, with ``live=True``, when nothing was
+    recorded by ``as_of``. The flag travels with the value, so it survives
+    caching. Empty results (a failed fetch) are not recorded, so they never
+    shadow good data.
+    """
+    store = store or get_snapshot_store()
+    if as_of is not None:
+        try:
+            return Versioned(store.load(name, as_of, **load_kwargs), False, name)
+        except KeyError:
+            return Versioned(produce(), True, name)
+    value = produce()
+    if not _is_empty(value):
+        store.save(name, value)
+    return Versioned(value, False, name)
+
+
+def _is_empty(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, dict) and value and all(isinstance(v, (pd.DataFrame, pd.Series)) for v in value.values()):
+        return all(v.empty for v in value.values())
+    return value is None or (isinstance(value, (dict, list, tuple)) and not value)
@@ -0,0 +1,219 @@
+"""Technical indicators over whole (dates x tickers) price matrices
+
+Every function takes wide DataFrames (one column per ticker) and works on
+all columns at once through pandas' ewm/rolling kernels or plain NumPy, so
+there is never a per-ticker loop or ``rolling().apply``. ``IndicatorState``
+carries the recursive state forward so one new bar costs O(tickers).
+"""
+import numpy as np
+import pandas as pd
+
+
+def _ema(frame, span=None, alpha=None, min_periods=0):
+    return frame.ewm(span=span, alpha=alpha, adjust=False, min_periods=min_periods).mean()
+
+
+def sma(close, window):
+    return close.rolling(window, min_periods=window).mean()
+
+
+def rsi(close, period=14):
+    """Wilder RSI"""
+    delta = close.diff()
+    avg_gain = _ema(delta.clip(lower=0), alpha=1 / period, min_periods=period)
+    avg_loss = _ema(-delta.clip(upper=0), alpha=1 / period, min_periods=period)
+    rs = avg_gain / avg_loss.replace(0, np.nan)
+    return (100 - 100 / (1 + rs)).where(avg_loss != 0, 100.0).where(avg_gain.notna())
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    macd_line = _ema(close, span=fast) - _ema(close, span=slow)
+    signal_line = _ema(macd_line, span=signal)
+    return {'macd': macd_line, 'macd_signal': signal_line, 'macd_hist': macd_line - signal_line}
+
+
+def bollinger(close, window=20, num_std=2.0):
+    mid = sma(close, window)
+    std = close.rolling(window, min_periods=window).std(ddof=0)
+    upper, lower = mid + num_std * std, mid - num_std * std
+    return {'bb_mid': mid, 'bb_upper': upper, 'bb_lower': lower,
+            'bb_pct_b': (close - lower) / (upper - lower).replace(0, np.nan)}
+
+
+def true_range(high, low, close):
+    prev_close = close.shift(1)
+    tr = np.maximum(high - low, np.maximum((high - prev_close).abs(), (low - prev_close).abs()))
+    return tr.where(prev_close.notna(), high - low)
+
+
+def atr(high, low, close, period=14):
+    """Wilder ATR"""
+    return _ema(true_range(high, low, close), alpha=1 / period, min_periods=period)
+
+
+def crossovers(fast_line, slow_line):
+    """+1 where fast crosses above slow, -1 where it crosses below, else 0"""
+    above = np.sign(fast_line - slow_line)
+    prev = above.shift(1)
+    cross = ((above > 0) & (prev <= 0)).astype(int) - ((above < 0) & (prev >= 0)).astype(int)
+    return cross.where(fast_line.notna() & slow_line.notna(), 0)
+
+
+def compute_indicators(high, low, close, fast_ma=50, slow_ma=200):
+    """All indicators for the universe; returns a dict of wide frames"""
+    close = close.ffill()
+    high = high.reindex_like(close).ffill()
+    low = low.reindex_like(close).ffill()
+
+    out = {'rsi': rsi(close), 'atr': atr(high, low, close)}
+    out.update(macd(close))
+    out.update(bollinger(close))
+    out['sma_fast'] = sma(close, fast_ma)
+    out['sma_slow'] = sma(close, slow_ma)
+    out['ma_cross'] = crossovers(out['sma_fast'], out['sma_slow'])
+    out['macd_cross'] = crossovers(out['macd'], out['macd_signal'])
+    return out
+
+
+SIGNALS = [
+    ('ma_cross', 1, 'Golden Cross (50/200 DMA)', 'Bullish'),
+    ('ma_cross', -1, 'Death Cross (50/200 DMA)', 'Bearish'),
+    ('macd_cross', 1, 'MACD Bullish Crossover', 'Bullish'),
+    ('macd_cross', -1, 'MACD Bearish Crossover', 'Bearish'),
+]
+
+
+def screen_signals(indicators, close, lookback=5, names=None, sectors=None):
+    """List crossovers in the last ``lookback`` bars plus current RSI/Bollinger extremes"""
+    recent_index = close.index[-lookback:]
+    frames = []
+    for key, value, label, bias in SIGNALS:
+        hits = (indicators[key].loc[recent_index] == value).stack()
+        hits = hits[hits]
+        if len(hits):
+            frames.append(pd.DataFrame({'Date': hits.index.get_level_values(0),
+                                        'Ticker': hits.index.get_level_values(1),
+                                        'Signal': label, 'Bias': bias}))
+
+    last = close.index[-1]
+    latest_rsi = indicators['rsi'].loc[last]
+    pct_b = indicators['bb_pct_b'].loc[last]
+    for mask, label, bias in [(latest_rsi < 30, 'RSI Oversold (<30)', 'Bullish'),
+                              (latest_rsi > 70, 'RSI Overbought (>70)', 'Bearish'),
+                              (pct_b > 1, 'Close Above Upper Bollinger', 'Bearish'),
+                              (pct_b < 0, 'Close Below Lower Bollinger', 'Bullish')]:
+        tickers = mask[mask].index
+        if len(tickers):
+            frames.append(pd.DataFrame({'Date': last, 'Ticker': tickers, 'Signal': label, 'Bias': bias}))
+
+    if not frames:
+        return pd.DataFrame(columns=['Date', 'Ticker', 'Name', 'Sector', 'Signal', 'Bias', 'Close', 'RSI'])
+    df = pd.concat(frames, ignore_index=True)
+    df['Name'] = df['Ticker'].map(names or {})
+    df['Sector'] = df['Ticker'].map(sectors or {})
+    df['Close'] = close.loc[last].reindex(df['Ticker']).round(2).to_numpy()
+    df['RSI'] = latest_rsi.reindex(df['Ticker']).round(1).to_numpy()
+    df = df[['Date', 'Ticker', 'Name', 'Sector', 'Signal', 'Bias', 'Close', 'RSI']]
+    return df.sort_values(['Date', 'Signal'], ascending=[False, True]).reset_index(drop=True)
+
+
+class IndicatorState:
+    """Recursive indicator state so each new bar updates in O(tickers)
+
+    Built from a full ``compute_indicators`` pass; ``update`` then applies the
+    same recursions (EMA, Wilder smoothing, running sums over a ring buffer)
+    as the bulk kernels, so results match a full recompute.
+    """
+
+    def __init__(self, high, low, close, fast_ma=50, slow_ma=200, bb_window=20, bb_std=2.0,
+                 rsi_period=14, atr_period=14, macd_spans=(12, 26, 9)):
+        if len(close) < slow_ma:
+            raise ValueError(f"IndicatorState needs at least {slow_ma} bars, got {len(close)}")
+        close = close.ffill()
+        high = high.reindex_like(close).ffill()
+        low = low.reindex_like(close).ffill()
+        self.tickers = close.columns
+        self.fast_ma, self.slow_ma = fast_ma, slow_ma
+        self.bb_window, self.bb_std = bb_window, bb_std
+        self.rsi_alpha, self.atr_alpha = 1 / rsi_period, 1 / atr_period
+        self.macd_alphas = tuple(2 / (s + 1) for s in macd_spans)
+
+        delta = close.diff()
+        self.avg_gain = _ema(delta.clip(lower=0), alpha=self.rsi_alpha).iloc[-1].to_numpy(dtype=float, copy=True)
+        self.avg_loss = _ema(-delta.clip(upper=0), alpha=self.rsi_alpha).iloc[-1].to_numpy(dtype=float, copy=True)
+        self.atr = _ema(true_range(high, low, close), alpha=self.atr_alpha).iloc[-1].to_numpy(dtype=float, copy=True)
+        fast, slow = _ema(close, span=macd_spans[0]), _ema(close, span=macd_spans[1])
+        self.ema_fast = fast.iloc[-1].to_numpy(dtype=float, copy=True)
+        self.ema_slow = slow.iloc[-1].to_numpy(dtype=float, copy=True)
+        self.macd_signal = _ema(fast - slow, span=macd_spans[2]).iloc[-1].to_numpy(dtype=float, copy=True)
+
+        # Ring buffer of the last slow_ma closes (oldest at self.pos) feeds
+        # running sums for every rolling window
+        self.window = close.iloc[-slow_ma:].to_numpy(dtype=float, copy=True)
+        self.pos = 0
+        self.sum_fast = self.window[-fast_ma:].sum(axis=0)
+        self.sum_slow = self.window.sum(axis=0)
+        self.sum_bb = self.window[-bb_window:].sum(axis=0)
+        self.sumsq_bb = (self.window[-bb_window:] ** 2).sum(axis=0)
+        self.prev_close = close.iloc[-1].to_numpy(dtype=float, copy=True)
+        self.prev_high = high.iloc[-1].to_numpy(dtype=float, copy=True)
+        self.prev_low = low.iloc[-1].to_numpy(dtype=float, copy=True)
+        self.prev_ma_diff = self.sum_fast / fast_ma - self.sum_slow / slow_ma
+        self.prev_macd_diff = (self.ema_fast - self.ema_slow) - self.macd_signal
+
+    def _push(self, close):
+        """Slide every rolling window forward by one bar in O(tickers)"""
+        n = len(self.window)
+        leaving_fast = self.window[(self.pos - self.fast_ma) % n]
+        leaving_bb = self.window[(self.pos - self.bb_window) % n]
+        leaving_slow = self.window[self.pos]
+        self.sum_fast += close - leaving_fast
+        self.sum_bb += close - leaving_bb
+        self.sumsq_bb += close ** 2 - leaving_bb ** 2
+        self.sum_slow += close - leaving_slow
+        self.window[self.pos] = close
+        self.pos = (self.pos + 1) % n
+
+    def update(self, high, low, close):
+        """Apply one bar (Series/arrays aligned to ``tickers``); returns the latest indicators"""
+        high, low, close = (np.asarray(pd.Series(x).reindex(self.tickers) if isinstance(x, (pd.Series, dict)) else x,
+                                       dtype=float) for x in (high, low, close))
+        # Carry missing values forward, as the bulk path's ffill does
+        close = np.where(np.isnan(close), self.prev_close, close)
+        high = np.where(np.isnan(high), self.prev_high, high)
+        low = np.where(np.isnan(low), self.prev_low, low)
+
+        delta = close - self.prev_close
+        self.avg_gain += self.rsi_alpha * (np.clip(delta, 0, None) - self.avg_gain)
+        self.avg_loss += self.rsi_alpha * (np.clip(-delta, 0, None) - self.avg_loss)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi_now = np.where(self.avg_loss == 0, 100.0, 100 - 100 / (1 + self.avg_gain / self.avg_loss))
+
+        tr = np.maximum(high - low, np.maximum(np.abs(high - self.prev_close), np.abs(low - self.prev_close)))
+        self.atr += self.atr_alpha * (tr - self.atr)
+
+        a_fast, a_slow, a_sig = self.macd_alphas
+        self.ema_fast += a_fast * (close - self.ema_fast)
+        self.ema_slow += a_slow * (close - self.ema_slow)
+        macd_now = self.ema_fast - self.ema_slow
+        self.macd_signal += a_sig * (macd_now - self.macd_signal)
+
+        self._push(close)
+        mid = self.sum_bb / self.bb_window
+        std = np.sqrt(np.clip(self.sumsq_bb / self.bb_window - mid ** 2, 0, None))
+        upper, lower = mid + self.bb_std * std, mid - self.bb_std * std
+
+        ma_diff = self.sum_fast / self.fast_ma - self.sum_slow / self.slow_ma
+        macd_diff = macd_now - self.macd_signal
+        ma_cross = ((ma_diff > 0) & (self.prev_ma_diff <= 0)).astype(int) - ((ma_diff < 0) & (self.prev_ma_diff >= 0)).astype(int)
+        macd_cross = ((macd_diff > 0) & (self.prev_macd_diff <= 0)).astype(int) - ((macd_diff < 0) & (self.prev_macd_diff >= 0)).astype(int)
+        self.prev_ma_diff, self.prev_macd_diff, self.prev_close = ma_diff, macd_diff, close
+        self.prev_high, self.prev_low = high, low
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_b = (close - lower) / (upper - lower)
+        return pd.DataFrame({
+            'rsi': rsi_now, 'atr': self.atr.copy(), 'macd': macd_now, 'macd_signal': self.macd_signal.copy(),
+            'macd_hist': macd_diff, 'bb_mid': mid, 'bb_upper': upper, 'bb_lower': lower, 'bb_pct_b': pct_b,
+            'ma_cross': ma_cross, 'macd_cross': macd_cross
+        }, index=self.tickers)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from corporate_actions import CorporateActions
+
+
+def _split_adjusted_bars():
+    """yfinance-style bars: a 1:2 split on the 20th bar, already divided out of the earlier prices"""
+    index = pd.bdate_range('2026-01-01', periods=40)
+    close = np.linspace(100.0, 110.0, len(index))
+    frame = pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                          'Volume': np.full(len(index), 2e6), 'Dividends': 0.0, 'Stock Splits': 0.0}, index=index)
+    frame.iloc[20, frame.columns.get_loc('Stock Splits')] = 2.0
+    frame.iloc[30, frame.columns.get_loc('Dividends')] = 1.0
+    return frame
+
+
+def test_provider_splits_are_not_applied_twice(tmp_path):
+    actions = CorporateActions(str(tmp_path / 'actions.db'))
+    bars = _split_adjusted_bars()
+    assert actions.ingest('SPLT.NS', bars) == 2
+
+    adjusted = actions.adjust(bars, 'SPLT.NS')
+    close = adjusted['Close']
+    # Continuous across the split ex-date; only the dividend scales the earlier bars
+    assert abs(close.iloc[20] / close.iloc[19] - bars['Close'].iloc[20] / bars['Close'].iloc[19]) < 1e-9
+    factor = 1 - 1.0 / bars['Close'].iloc[29]
+    assert np.allclose(close.iloc[:30], bars['Close'].iloc[:30] * factor)
+    assert np.allclose(adjusted['Volume'], bars['Volume'])
+    assert actions.events('SPLT.NS').set_index('kind')['applied'].to_dict() == {'dividend': False, 'split': True}
+
+
+def test_recorded_split_is_applied(tmp_path):
+    actions = CorporateActions(str(tmp_path / 'actions.db'))
+    bars = _split_adjusted_bars().drop(columns=['Dividends', 'Stock Splits'])
+    actions.record_split('RAW.NS', bars.index[20], 2.0)
+    adjusted = actions.adjust(bars, 'RAW.NS')
+    assert np.allclose(adjusted['Close'].iloc[:20], bars['Close'].iloc[:20] / 2)
+    assert np.allclose(adjusted['Volume'].iloc[:20], bars['Volume'].iloc[:20] * 2)
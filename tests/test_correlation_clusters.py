@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from correlation_clusters import CorrelationClusters
+
+
+def _returns(n_days=120, n_tickers=12, seed=0):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (n_days, 4))
+    loadings = np.repeat(np.eye(4), n_tickers // 4, axis=0)
+    values = factors @ loadings.T + rng.normal(0, 0.004, (n_days, n_tickers))
+    return pd.DataFrame(values, index=pd.bdate_range('2026-01-01', periods=n_days),
+                        columns=[f"S{i}.NS" for i in range(n_tickers)])
+
+
+def test_settings_are_per_call_on_a_shared_instance():
+    clustering = CorrelationClusters().fit(_returns())
+    coarse = clustering.clusters(n_clusters=2, drift=0.1)
+    fine = clustering.clusters(n_clusters=4, drift=0.1)
+    assert coarse.nunique() == 2
+    assert fine.nunique() == 4
+    # Each setting keeps its own cached labels
+    assert clustering.clusters(n_clusters=2, drift=0.1).nunique() == 2
+    assert clustering.cache_hits == 1
+    assert clustering.n_clusters == 8
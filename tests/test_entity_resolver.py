@@ -0,0 +1,42 @@
+import pytest
+
+from entity_resolver import EntityResolver, TICKER_ALIASES, get_resolver
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    return get_resolver()
+
+
+@pytest.mark.parametrize('name, ticker', [
+    ('Tata Motors (EV)', 'TATAMOTORS.NS'),
+    ("Dr. Reddy's", 'DRREDDY.NS'),
+    ('Ambuja', 'AMBUJACEM.NS'),
+    ('Relaince Industries', 'RELIANCE.NS'),  # swapped letters in the first word
+    ('Larsen and Tubro', 'LT.NS'),
+    ('Maruti Suzki', 'MARUTI.NS'),
+])
+def test_resolves_names_and_typos(resolver, name, ticker):
+    assert resolver.resolve(name) == ticker
+
+
+@pytest.mark.parametrize('name, suggestion', [
+    ('Bank of India', 'State Bank of India'),
+    ('Tata Technologies', 'HCL Technologies'),
+    ('Oil India', 'Indian Oil'),
+    ('Reliance Power', None),
+    ('Adani Power', None),
+])
+def test_distinct_companies_stay_unresolved(resolver, name, suggestion):
+    match = resolver.match(name)
+    assert match.ticker is None
+    assert match.method is None
+    if suggestion is not None:
+        assert match.suggestion == suggestion
+
+
+def test_first_word_must_match_for_fuzzy():
+    resolver = EntityResolver({'State Bank of India': 'SBIN.NS', 'Indian Oil': 'IOC.NS'})
+    assert resolver.resolve('Bank of India') is None
+    assert resolver.resolve('State Bnk of India') == 'SBIN.NS'
+    assert resolver.resolve('Oil India') is None
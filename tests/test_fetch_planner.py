@@ -0,0 +1,72 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import FakeTicker, fake_download
+from data_providers import DataProvider, RecordingProvider, ReplayProvider
+from fetch_planner import BarCache, FetchPlanner, NSECalendar
+
+NOW = pd.Timestamp('2026-09-30 18:00')  # after the close of the fixtures' last bar
+
+
+class FakeProvider(DataProvider):
+    def history(self, ticker, period='6mo', interval='1d'):
+        return FakeTicker(ticker).history(period=period)
+
+
+class DroppingProvider:
+    """Batched downloads that silently leave out ``missing`` tickers, as yfinance does for bad symbols"""
+
+    def __init__(self, missing):
+        self.missing = set(missing)
+        self.requests = []
+
+    def download_range(self, tickers, start, end):
+        self.requests.append(list(tickers))
+        return fake_download([t for t in tickers if t not in self.missing], start=start, end=end)
+
+
+def test_ticker_missing_from_batch_is_not_cached(tmp_path):
+    provider = DroppingProvider(['BAD.NS'])
+    planner = FetchPlanner(provider, BarCache(str(tmp_path / 'bars.db')))
+
+    first = planner.histories(['GOOD.NS', 'BAD.NS'], period='1mo', now=NOW)
+    assert len(first['GOOD.NS']) > 0
+    assert len(first['BAD.NS']) == 0
+
+    planner.histories(['GOOD.NS', 'BAD.NS'], period='1mo', now=NOW)
+    # GOOD.NS is served from the cache; BAD.NS is asked for again
+    assert provider.requests[-1] == ['BAD.NS']
+    assert len(provider.requests) == 2
+
+
+def test_holidays_file_extends_the_calendar(tmp_path, monkeypatch):
+    path = tmp_path / 'holidays.txt'
+    path.write_text("# NSE 2027\n2027-01-26  # Republic Day\n\n")
+    monkeypatch.setenv('NSE_HOLIDAYS_FILE', str(path))
+    calendar = NSECalendar()
+    assert not calendar.is_session('2027-01-26')
+    assert not calendar.is_session('2026-01-26')  # built-in dates are kept
+    assert calendar.covers('2027-03-01')
+
+
+def test_calendar_warns_once_when_it_runs_out():
+    calendar = NSECalendar()
+    with pytest.warns(UserWarning, match='2028'):
+        calendar.sessions('2028-01-01', '2028-02-01')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        calendar.sessions('2028-03-01', '2028-04-01')
+
+
+def test_replay_on_a_later_day_finds_the_recording(tmp_path):
+    path = str(tmp_path / 'responses.sqlite')
+    recorder = RecordingProvider(FakeProvider(), path)
+    recorded = FetchPlanner(recorder, BarCache(str(tmp_path / 'record.db'))).histories(['TCS.NS'], '1mo', now=NOW)
+
+    replay = ReplayProvider(path)
+    later = NOW + pd.Timedelta(days=3)
+    replayed = FetchPlanner(replay, BarCache(str(tmp_path / 'replay.db'))).histories(['TCS.NS'], '1mo', now=later)
+    assert replay.misses == 0
+    pd.testing.assert_frame_equal(replayed['TCS.NS'], recorded['TCS.NS'])
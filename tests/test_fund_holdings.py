@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from entity_resolver import EntityResolver
+from fund_holdings import HoldingsMonth
+
+
+def test_rows_without_isin_are_keyed_by_name():
+    frame = pd.DataFrame({
+        'Fund Name': ['A', 'A', 'A', 'B', 'B'],
+        'Stock': ['HDFC Bank', 'Unlisted Co One', 'Unlisted Co Two', 'HDFC Bank Ltd.', 'Unlisted Co Two'],
+        'Weight (%)': [10.0, 5.0, 4.0, 8.0, 3.0],
+        'ISIN': ['INE040A01034', np.nan, None, 'INE040A01034', ''],
+    })
+    month = HoldingsMonth.from_frame('2026-09', frame, EntityResolver({'HDFC Bank': 'HDFCBANK'}))
+    assert sorted(month.stocks) == ['HDFC Bank', 'Unlisted Co One', 'Unlisted Co Two']
+    overlap = month.common_weight(['A', 'B'])
+    # HDFC Bank (8%) and Unlisted Co Two (3%) are shared; the two unidentified stocks are not merged
+    assert np.isclose(overlap.loc['A', 'B'], 11.0)
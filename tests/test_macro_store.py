@@ -0,0 +1,33 @@
+import pandas as pd
+
+from macro_store import MacroStore
+
+
+def test_flows_without_a_series_file_stay_out_of_joins(tmp_path):
+    store = MacroStore.reference(root=str(tmp_path))
+    assert 'fii_inflow' not in store.names
+    assert 'fii_inflow' not in store.wide()
+    snapshot = store.snapshot()
+    assert snapshot.loc['fii_inflow', 'placeholder']
+    assert pd.isna(snapshot.loc['fii_inflow', 'as_of'])
+    assert not snapshot.loc['gdp_growth', 'placeholder']
+
+
+def test_series_files_extend_the_reference(tmp_path):
+    pd.DataFrame({'date': ['2026-01-05', '2026-01-12'], 'value': [-1200.0, 850.0]}).to_csv(
+        tmp_path / 'fii_inflow.csv', index=False)
+    pd.DataFrame({'date': ['2025-11-28'], 'value': [8.2]}).to_csv(tmp_path / 'gdp_growth.csv', index=False)
+    store = MacroStore.reference(root=str(tmp_path))
+
+    assert store.series('fii_inflow').to_list() == [-1200.0, 850.0]
+    assert store.series('gdp_growth').index[-1] == pd.Timestamp('2025-11-28')
+    dates = pd.to_datetime(['2026-01-06', '2026-01-13'])
+    assert store.asof(dates)['fii_inflow'].to_list() == [-1200.0, 850.0]
+
+
+def test_stale_flags_indicators_past_their_release_period(tmp_path):
+    store = MacroStore.reference(root=str(tmp_path))
+    assert store.stale(now='2025-10-01') == {}
+    stale = store.stale(now='2026-01-01')
+    assert set(stale) == {'gdp_growth', 'inflation_cpi'}
+    assert store.stale(now='2026-01-01', names=['repo_rate', 'fii_inflow']) == {}
@@ -0,0 +1,73 @@
+import socket
+import time
+
+from quote_stream import ReplayFeed, SocketFeed
+
+
+class ResetSocket:
+    def recv(self, size):
+        raise ConnectionResetError(104, 'Connection reset by peer')
+
+    def close(self):
+        pass
+
+
+def _poll_until(feed, n, timeout=2.0):
+    ticks, deadline = [], time.monotonic() + timeout
+    while len(ticks) < n and time.monotonic() < deadline:
+        ticks += feed.poll()
+        time.sleep(0.01)
+    return ticks
+
+
+def test_bad_lines_are_skipped_not_the_batch():
+    with socket.create_server(('127.0.0.1', 0)) as server:
+        feed = SocketFeed(*server.getsockname())
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(b'{"ts": 1, "symbol": "TCS.NS", "price": 4000}\n'
+                         b'{"ts": 2, "symbol": \n'
+                         b'[1, 2]\n'
+                         b'{"ts": 3, "price": 10}\n'
+                         b'{"ts": 4, "symbol": "INFY.NS", "price": 1800}\n')
+            ticks = _poll_until(feed, 2)
+        feed.close()
+    assert [t.symbol for t in ticks] == ['TCS.NS', 'INFY.NS']
+    assert feed.skipped == 3
+
+
+def test_connection_reset_ends_the_feed():
+    with socket.create_server(('127.0.0.1', 0)) as server:
+        feed = SocketFeed(*server.getsockname())
+        feed._sock.close()
+        feed._sock = ResetSocket()
+        assert feed.poll() == []
+    assert feed.exhausted
+
+
+def test_replay_feed_skips_bad_rows(tmp_path):
+    path = tmp_path / 'ticks.csv'
+    path.write_text("ts,symbol,price,volume\n"
+                    "1,TCS.NS,4000,10\n"
+                    "2,TCS.NS,,10\n"
+                    "3,,4010,\n"
+                    "not a time,INFY.NS,1800,5\n"
+                    "4,INFY.NS,1800,5\n")
+    feed = ReplayFeed(str(path), speed=0)
+    ticks = feed.poll()
+    feed.close()
+    assert [(t.symbol, t.price) for t in ticks] == [('TCS.NS', 4000.0), ('INFY.NS', 1800.0)]
+    assert feed.skipped == 3
+
+
+def test_replay_feed_skips_bad_json_lines(tmp_path):
+    path = tmp_path / 'ticks.jsonl'
+    path.write_text('{"ts": 1, "symbol": "TCS.NS", "price": 4000}\n'
+                    '{"ts": 2, "symbol"\n'
+                    '{"ts": 3, "price": 4010}\n'
+                    '"just a string"\n'
+                    '{"ts": 4, "symbol": "INFY.NS", "price": 1800}\n')
+    feed = ReplayFeed(str(path), speed=0)
+    assert [t.symbol for t in feed.poll()] == ['TCS.NS', 'INFY.NS']
+    assert feed.skipped == 3
+    assert feed.exhausted
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from sector_regression import SectorRegression
+
+
+def test_ranking_is_scale_free_per_sector():
+    rng = np.random.default_rng(38)
+    index = pd.bdate_range('2025-01-01', periods=200)
+    changes = pd.DataFrame({'repo_rate': rng.choice([0.0, 0.25, -0.25], 200, p=[0.8, 0.1, 0.1]),
+                            'crude_oil': rng.normal(0, 0.02, 200), 'usd_inr': rng.normal(0, 0.004, 200)},
+                           index=index)
+    steady = 0.3 * changes['crude_oil'] + rng.normal(0, 0.01, 200)
+    noisy = 0.3 * changes['crude_oil'] + rng.normal(0, 0.01, 200)
+    returns = pd.DataFrame({'Steady': steady, 'Volatile': 10 * steady, 'Noisy': noisy})
+
+    ranking = SectorRegression(windows=(126,)).fit(returns, changes).sensitivity_ranking(126)
+    # Scaling a sector's returns scales its betas and its std alike
+    assert np.isclose(ranking['Steady'], ranking['Volatile'])
+    assert np.isclose(ranking['Steady'], ranking['Noisy'], rtol=0.5)
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from snapshot_store import SnapshotStore, versioned
+
+
+def test_live_fallback_is_flagged_with_the_value(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    recorded = pd.DataFrame({'Close': [1.0, 2.0]}, index=pd.date_range('2026-09-01', periods=2))
+    store.save('prices', recorded, saved_at='2026-09-02')
+    live = recorded * 10
+
+    before = versioned('prices', lambda: live, pd.Timestamp('2026-08-31'), store)
+    assert before.live and before.name == 'prices'
+    assert before.value.equals(live)
+
+    after = versioned('prices', lambda: live, pd.Timestamp('2026-09-03'), store)
+    assert not after.live
+    assert after.value.equals(recorded)
+
+    current = versioned('prices', lambda: live, None, store)
+    assert not current.live
+    assert store.load('prices').equals(live)  # recorded as the newest version
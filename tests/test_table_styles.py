@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+from table_styles import (BIAS_STYLES, LEVEL_STYLES, PRIORITY_STYLES, RATING_STYLES, mark_columns,
+                          styled_table)
+
+
+@pytest.mark.parametrize('styles', [RATING_STYLES, LEVEL_STYLES, PRIORITY_STYLES, BIAS_STYLES])
+def test_every_level_keeps_its_own_marker(styles):
+    marked = mark_columns(pd.DataFrame({'Level': list(styles)}), {'Level': styles})['Level']
+    markers = marked.str.split(' ', n=1).str[0]
+    assert markers.str.len().gt(0).all()
+    assert markers.is_unique
+
+
+def test_small_tables_keep_cell_colors():
+    small = pd.DataFrame({'Rating': ['STRONG BUY', 'BUY']})
+    assert isinstance(styled_table(small, {'Rating': RATING_STYLES}), pd.io.formats.style.Styler)
+    large = pd.DataFrame({'Rating': ['BUY'] * 1000})
+    assert styled_table(large, {'Rating': RATING_STYLES})['Rating'].iloc[0] == '🟢 BUY'
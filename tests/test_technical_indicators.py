@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from technical_indicators import IndicatorState, compute_indicators
+
+
+def _bars(n=260, tickers=('AAA.NS', 'BBB.NS'), seed=31):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2025-01-01', periods=n)
+    close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n, len(tickers))), axis=0)),
+                         index=index, columns=list(tickers))
+    spread = rng.uniform(0.5, 2.0, close.shape)
+    return close + spread, close - spread, close
+
+
+def test_nan_high_low_bar_matches_the_bulk_path():
+    high, low, close = _bars()
+    # Missing high/low on the second-to-last bar, missing close on the last one
+    high.iloc[-2, 0] = np.nan
+    low.iloc[-2, 0] = np.nan
+    close.iloc[-1, 1] = np.nan
+    state = IndicatorState(high.iloc[:-2], low.iloc[:-2], close.iloc[:-2])
+    for i in (-2, -1):
+        latest = state.update(high.iloc[i], low.iloc[i], close.iloc[i])
+
+    bulk = compute_indicators(high, low, close)
+    assert latest['atr'].notna().all()
+    np.testing.assert_allclose(latest['atr'], bulk['atr'].iloc[-1], rtol=1e-9)
+    np.testing.assert_allclose(latest['rsi'], bulk['rsi'].iloc[-1], rtol=1e-9)
@@ -0,0 +1,188 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Fixed-width little-endian record: 8 + 4*4 + 4 = 28 bytes
+RECORD_DTYPE = np.dtype([
+    ('ts', '<i8'),          # epoch nanoseconds, UTC
+    ('open', '<f4'),
+    ('high', '<f4'),
+    ('low', '<f4'),
+    ('close', '<f4'),
+    ('volume', '<i4')
+])
+
+FREQUENCIES = {'1m': 60, '5m': 300, '15m': 900, '30m': 1800, '1h': 3600, '1d': 86400}
+IST_OFFSET_NS = int(5.5 * 3600 * 1e9)  # bucket days on IST midnight, not UTC
+RESAMPLE_CHUNK = 1_000_000  # records per pass when resampling long slices
+
+
+def _to_ns(value):
+    """Timestamp-like -> epoch nanoseconds (naive values are taken as IST)"""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('Asia/Kolkata')
+    return int(ts.value)
+
+
+def _bisect(ts, value, side='left'):
+    """Binary search on a (possibly strided, memory-mapped) int64 view
+
+    np.searchsorted would first copy a strided field into a contiguous
+    buffer, i.e. read the whole file; this touches only ~log2(n) records.
+    """
+    lo, hi = 0, len(ts)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if ts[mid] < value or (side == 'right' and ts[mid] == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class TickStore:
+    """Append-only memory-mapped OHLCV store with one binary file per ticker"""
+
+    def __init__(self, root=None):
+        self.root = root or os.getenv('TICK_STORE_DIR', os.path.join('data', 'ticks'))
+        os.makedirs(self.root, exist_ok=True)
+        self._maps = {}
+
+    def _path(self, ticker):
+        safe = re.sub(r'[^A-Za-z0-9._-]', lambda m: f"%{ord(m.group()):02X}", ticker)
+        return os.path.join(self.root, f"{safe}.bin")
+
+    def tickers(self):
+        """Tickers that have at least one stored record"""
+        names = []
+        for fname in sorted(os.listdir(self.root)):
+            if fname.endswith('.bin') and os.path.getsize(os.path.join(self.root, fname)):
+                names.append(re.sub(r'%([0-9A-F]{2})', lambda m: chr(int(m.group(1), 16)), fname[:-4]))
+        return names
+
+    def _map(self, ticker):
+        """Memory-map a ticker file; remapped only when the file has grown"""
+        path = self._path(ticker)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        cached = self._maps.get(ticker)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+        if size < RECORD_DTYPE.itemsize:
+            mm = np.empty(0, dtype=RECORD_DTYPE)
+        else:
+            mm = np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(size // RECORD_DTYPE.itemsize,))
+        self._maps[ticker] = (size, mm)
+        return mm
+
+    def count(self, ticker):
+        return len(self._map(ticker))
+
+    def last_timestamp(self, ticker):
+        mm = self._map(ticker)
+        return pd.Timestamp(int(mm['ts'][-1]), tz='UTC').tz_convert('Asia/Kolkata') if len(mm) else None
+
+    def append(self, ticker, bars):
+        """Append bars (DataFrame with DatetimeIndex and OHLCV columns)
+
+        Rows at or before the last stored timestamp are dropped so the file
+        stays sorted; returns the number of records written.
+        """
+        if bars is None or len(bars) == 0:
+            return 0
+        index = pd.DatetimeIndex(bars.index)
+        if index.tz is None:
+            index = index.tz_localize('Asia/Kolkata')
+        records = np.empty(len(bars), dtype=RECORD_DTYPE)
+        records['ts'] = index.as_unit('ns').asi8
+        cols = {c.lower(): c for c in bars.columns}
+        for field in ('open', 'high', 'low', 'close'):
+            records[field] = bars[cols[field]].to_numpy(dtype=np.float32)
+        records['volume'] = np.clip(bars[cols['volume']].fillna(0).to_numpy(), 0, np.iinfo(np.int32).max)
+
+        records = records[np.argsort(records['ts'], kind='stable')]
+        last = self._map(ticker)
+        if len(last):
+            records = records[records['ts'] > last['ts'][-1]]
+        if len(records) > 1:
+            records = records[np.r_[True, records['ts'][1:] != records['ts'][:-1]]]
+        if not len(records):
+            return 0
+
+        with open(self._path(ticker), 'ab') as f:
+            f.write(records.tobytes())
+        return len(records)
+
+    def slice(self, ticker, start=None, end=None):
+        """Zero-copy view of records with start <= ts < end"""
+        mm = self._map(ticker)
+        ts = mm['ts']
+        lo = 0 if start is None else _bisect(ts, _to_ns(start))
+        hi = len(mm) if end is None else _bisect(ts, _to_ns(end))
+        return mm[lo:hi]
+
+    @staticmethod
+    def to_frame(records):
+        """Materialize a record view as an OHLCV DataFrame indexed in IST"""
+        index = pd.to_datetime(np.asarray(records['ts']), unit='ns', utc=True).tz_convert('Asia/Kolkata')
+        return pd.DataFrame({
+            'Open': np.asarray(records['open']),
+            'High': np.asarray(records['high']),
+            'Low': np.asarray(records['low']),
+            'Close': np.asarray(records['close']),
+            'Volume': np.asarray(records['volume'])
+        }, index=pd.DatetimeIndex(index, name='Datetime'))
+
+    @staticmethod
+    def _resample_chunk(records, width_ns):
+        ts = np.asarray(records['ts'])
+        bucket = (ts + IST_OFFSET_NS) // width_ns
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], len(ts)] - 1
+        return {
+            'bucket': bucket[starts],
+            'open': np.asarray(records['open'])[starts],
+            'high': np.maximum.reduceat(np.asarray(records['high']), starts),
+            'low': np.minimum.reduceat(np.asarray(records['low']), starts),
+            'close': np.asarray(records['close'])[ends],
+            'volume': np.add.reduceat(np.asarray(records['volume'], dtype=np.int64), starts)
+        }
+
+    def resample(self, ticker, freq='1d', start=None, end=None):
+        """Aggregate a time slice into 1m/5m/.../1d bars without loading the whole file
+
+        The slice is processed in fixed-size chunks; a bar split across two
+        chunks is merged before the result is assembled.
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency '{freq}', expected one of {list(FREQUENCIES)}")
+        width_ns = FREQUENCIES[freq] * 1_000_000_000
+        records = self.slice(ticker, start, end)
+        if not len(records):
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+
+        parts = []
+        for offset in range(0, len(records), RESAMPLE_CHUNK):
+            part = self._resample_chunk(records[offset:offset + RESAMPLE_CHUNK], width_ns)
+            if parts and parts[-1]['bucket'][-1] == part['bucket'][0]:
+                prev = parts[-1]
+                prev['high'][-1] = max(prev['high'][-1], part['high'][0])
+                prev['low'][-1] = min(prev['low'][-1], part['low'][0])
+                prev['close'][-1] = part['close'][0]
+                prev['volume'][-1] += part['volume'][0]
+                part = {k: v[1:] for k, v in part.items()}
+            parts.append(part)
+
+        merged = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        index = pd.to_datetime(merged['bucket'] * width_ns - IST_OFFSET_NS, unit='ns', utc=True).tz_convert('Asia/Kolkata')
+        return pd.DataFrame({
+            'Open': merged['open'],
+            'High': merged['high'],
+            'Low': merged['low'],
+            'Close': merged['close'],
+            'Volume': merged['volume']
+        }, index=pd.DatetimeIndex(index, name='Datetime'))